@@ -2,10 +2,13 @@
 
 import logging
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+import pandas as pd
 from django.db import models
+from django.db.models.fields.json import KT
 from django.utils import timezone
 
 from data_pipeline.models import VariableData
@@ -14,6 +17,86 @@ from location.models import Location
 if TYPE_CHECKING:
     from alert_framework.models import AlertTemplate, Detection
 
+# Columns of every frame returned by BaseDetector.get_variable_frame (plus "date")
+FRAME_COLUMNS = ("id", "start_date", "end_date", "gid_id", "value")
+
+# Rows fetched per round trip when streaming variable data into a frame
+FRAME_CHUNK_SIZE = 5000
+
+
+def lookup_date(value):
+    """Date of a datetime as compared by DateField lookups (in the default timezone)."""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+@dataclass(frozen=True)
+class DataRequirement:
+    """Variable data window a detector reads for a run (see ``BaseDetector.data_requirements``)."""
+
+    variable_code: str
+    start_date: datetime
+    end_date: datetime
+    admin_level: int | None = None
+    fields: tuple[str, ...] = ()
+    raw_data_fields: tuple[str, ...] = ()
+
+
+class VariableFrameCache:
+    """Variable frames loaded once and shared by the detectors of a run.
+
+    Holds one frame per variable and admin level, covering a date window and
+    a set of columns. ``BaseDetector.get_variable_frame`` serves requests
+    within that window and columns from memory (filtered as the database
+    query would be) and queries the database otherwise.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.frames: dict[tuple[str, str | None], tuple[DataRequirement, pd.DataFrame]] = {}
+
+    @staticmethod
+    def _key(variable_code: str, admin_level) -> tuple[str, str | None]:
+        return variable_code, None if admin_level is None else str(admin_level)
+
+    def add(self, requirement: DataRequirement, frame: pd.DataFrame) -> None:
+        """Store the frame loaded for a requirement (all records, matched or not)."""
+        self.frames[self._key(requirement.variable_code, requirement.admin_level)] = (requirement, frame)
+
+    def get(
+        self,
+        variable_code: str,
+        start_date=None,
+        end_date=None,
+        locations: list | None = None,
+        admin_level: int | None = None,
+        fields: tuple[str, ...] = (),
+        raw_data_fields: tuple[str, ...] = (),
+        matched_only: bool = False,
+    ) -> pd.DataFrame | None:
+        """Frame for a ``get_variable_frame`` request, or None if the request is not covered."""
+        cached = self.frames.get(self._key(variable_code, admin_level))
+        if cached is None or start_date is None or end_date is None:
+            return None
+
+        requirement, frame = cached
+        start, end = lookup_date(start_date), lookup_date(end_date)
+        if start < lookup_date(requirement.start_date) or end > lookup_date(requirement.end_date):
+            return None
+        if not set(fields) <= set(requirement.fields) or not set(raw_data_fields) <= set(requirement.raw_data_fields):
+            return None
+
+        mask = (frame["start_date"] <= end) & (frame["end_date"] >= start)
+        if locations:
+            mask &= frame["gid_id"].isin([location.id if isinstance(location, Location) else location for location in locations])
+        if matched_only:
+            mask &= frame["gid_id"].notna()
+        columns = [*FRAME_COLUMNS, *fields, *(f"raw_data_{key}" for key in raw_data_fields), "date"]
+        return frame.loc[mask, columns].reset_index(drop=True)
+
 
 class BaseDetector(ABC):
     """Abstract base class for all detection implementations."""
@@ -28,6 +111,9 @@ class BaseDetector(ABC):
         self.logger = logging.getLogger(f"alert_framework.detector.{self.__class__.__name__}")
         self.execution_context = {}
 
+        # Frames shared with the other detectors of a run (see alert_framework.orchestration)
+        self.frame_cache: VariableFrameCache | None = None
+
     @abstractmethod
     def detect(self, start_date: datetime, end_date: datetime, **kwargs) -> list[dict]:
         """
@@ -329,6 +415,76 @@ class BaseDetector(ABC):
             self.logger.error(f"Failed to retrieve variable data for {variable_code}: {str(e)}")
             return VariableData.objects.none()
 
+    def get_variable_frame(
+        self,
+        variable_code: str,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        locations: list | None = None,
+        admin_level: int | None = None,
+        fields: tuple[str, ...] = (),
+        raw_data_fields: tuple[str, ...] = (),
+        matched_only: bool = False,
+    ) -> pd.DataFrame:
+        """Retrieve variable data within time window as a DataFrame of plain values.
+
+        Rows are read with ``values_list`` over a chunked cursor (server-side
+        on PostgreSQL), so no model instances or related objects are built.
+        ``raw_data`` is never loaded whole: the requested keys are extracted
+        by the database into text columns named ``raw_data_<key>``.
+
+        Args:
+            variable_code: Variable code to retrieve
+            start_date: Data window start (optional)
+            end_date: Data window end (optional)
+            locations: Optional list of location IDs to filter
+            admin_level: Optional administrative level filter
+            fields: Additional VariableData columns (e.g. "text")
+            raw_data_fields: raw_data keys to extract, nested keys separated by "__" (e.g. "headline")
+            matched_only: Skip records without a matched location
+
+        Returns:
+            DataFrame with id, start_date, end_date, gid_id, value (float), date (datetime64 of
+            start_date) and the requested columns, in the order of ``get_variable_data``
+        """
+        if self.frame_cache is not None:
+            cached = self.frame_cache.get(variable_code, start_date, end_date, locations, admin_level, fields, raw_data_fields, matched_only)
+            if cached is not None:
+                return cached
+
+        raw_columns = {f"raw_data_{key}": KT(f"raw_data__{key}") for key in raw_data_fields}
+        columns = [*FRAME_COLUMNS, *fields, *raw_columns]
+
+        try:
+            queryset = self.get_variable_data(variable_code, start_date=start_date, end_date=end_date, locations=locations, admin_level=admin_level)
+            if matched_only:
+                queryset = queryset.filter(gid__isnull=False)
+            rows = queryset.annotate(**raw_columns).values_list(*columns).iterator(chunk_size=FRAME_CHUNK_SIZE)
+            df = pd.DataFrame.from_records(rows, columns=columns)
+        except Exception as e:
+            self.logger.error(f"Failed to load variable frame for {variable_code}: {str(e)}")
+            df = pd.DataFrame(columns=columns)
+
+        df["value"] = pd.to_numeric(df["value"], errors="coerce")
+        df["date"] = pd.to_datetime(df["start_date"])
+        return df
+
+    def data_requirements(self, start_date: datetime, end_date: datetime) -> list[DataRequirement]:
+        """Variable data windows ``detect`` reads through ``get_variable_frame`` for a run.
+
+        Detectors run together load each declared window once and share it
+        (see alert_framework.orchestration). Detectors that declare nothing
+        still run, reading their data themselves.
+
+        Args:
+            start_date: Analysis window start
+            end_date: Analysis window end
+
+        Returns:
+            List of DataRequirement
+        """
+        return []
+
     def get_locations_by_admin_level(self, admin_level: int) -> models.QuerySet:
         """Get all locations at specified administrative level.
 
@@ -4,12 +4,24 @@ import logging
 from datetime import timedelta
 from typing import TYPE_CHECKING, Optional
 
+from django.db.models import Prefetch
+from django.utils import timezone
+
 if TYPE_CHECKING:
     from alert_framework.models import Detection
 
 
 logger = logging.getLogger(__name__)
 
+# Detections of the same shock type this close in time, with overlapping locations, are temporal duplicates
+TEMPORAL_PROXIMITY = timedelta(hours=6)
+
+# Detections of the same shock type in parent/child locations, up to this much earlier, are geographic duplicates
+GEOGRAPHIC_PROXIMITY = timedelta(days=1)
+
+# Location columns needed for the hierarchy checks
+LOCATION_FIELDS = ("id", "geo_id", "path", "parent_id")
+
 
 class DuplicationChecker:
     """Handles detection deduplication to prevent redundant alerts."""
@@ -65,6 +77,64 @@ class DuplicationChecker:
             # In case of error, err on the side of not marking as duplicate
             return False
 
+    def mark_duplicates(self, batch: list[tuple["Detection", list]]) -> int:
+        """Mark the duplicates among new detections of one detector in a single pass.
+
+        Gives the same outcome as calling ``is_duplicate`` on each detection in
+        order: a detection is checked against the pending detections of its
+        detector and the earlier non-duplicate detections of the batch. The
+        candidates are loaded in one query and indexed by timestamp, location
+        and location hierarchy, and the duplicates are saved in one update.
+
+        Args:
+            batch: (saved Detection, its Location instances) pairs, in creation order
+
+        Returns:
+            int: Number of detections marked as duplicates
+        """
+        if not batch:
+            return 0
+
+        try:
+            from alert_framework.models import Detection
+            from location.models import Location
+
+            detector = batch[0][0].detector
+            if (detector.configuration or {}).get("disable_deduplication", False):
+                self.logger.info(f"Deduplication disabled for detector {detector.name}, allowing {len(batch)} detections")
+                return 0
+
+            index = _CandidateIndex()
+            earliest = min(detection.detection_timestamp for detection, _ in batch) - max(GEOGRAPHIC_PROXIMITY, TEMPORAL_PROXIMITY)
+            existing = (
+                Detection.objects.filter(detector=detector, detection_timestamp__gte=earliest, status="pending", duplicate_of__isnull=True)
+                .exclude(id__in=[detection.id for detection, _ in batch])
+                .prefetch_related(Prefetch("locations", queryset=Location.objects.only(*LOCATION_FIELDS)))
+            )
+            for candidate in existing:
+                index.add(candidate, list(candidate.locations.all()))
+
+            duplicates = []
+            processed_at = timezone.now()
+            for detection, locations in batch:
+                original = index.find_duplicate(detection, locations)
+                if original is None:
+                    index.add(detection, locations)
+                    continue
+                self.logger.info(f"Duplicate found for detection {detection.id}", extra={"original_id": original.id})
+                detection.duplicate_of = original
+                detection.status = "dismissed"
+                detection.processed_at = processed_at
+                duplicates.append(detection)
+
+            Detection.objects.bulk_update(duplicates, ["duplicate_of", "status", "processed_at"], batch_size=500)
+            return len(duplicates)
+
+        except Exception as e:
+            self.logger.error(f"Batch deduplication failed: {str(e)}")
+            # In case of error, err on the side of not marking as duplicates
+            return 0
+
     def _find_exact_duplicate(self, detection: "Detection") -> Optional["Detection"]:
         """Find exact duplicate based on detector, timestamp, and locations."""
         try:
@@ -108,12 +178,9 @@ class DuplicationChecker:
         try:
             from alert_framework.models import Detection
 
-            # Configuration for temporal proximity (can be made configurable later)
-            proximity_hours = 6  # Consider detections within 6 hours as potential duplicates
-
             # Calculate time window
-            start_time = detection.detection_timestamp - timedelta(hours=proximity_hours)
-            end_time = detection.detection_timestamp + timedelta(hours=proximity_hours)
+            start_time = detection.detection_timestamp - TEMPORAL_PROXIMITY
+            end_time = detection.detection_timestamp + TEMPORAL_PROXIMITY
 
             # Get detection locations
             detection_locations = set(detection.locations.values_list("id", flat=True))
@@ -164,7 +231,7 @@ class DuplicationChecker:
             # In production, this could include spatial distance calculations
 
             # Look for detections in parent/child locations within recent timeframe
-            recent_time = detection.detection_timestamp - timedelta(days=1)
+            recent_time = detection.detection_timestamp - GEOGRAPHIC_PROXIMITY
 
             candidates = (
                 Detection.objects.filter(
@@ -206,27 +273,74 @@ class DuplicationChecker:
     def _is_ancestor_descendant(self, loc1, loc2) -> bool:
         """Check if two locations have ancestor-descendant relationship."""
         try:
-            # Get ancestors for both locations (assuming Location model has get_ancestors method)
-            loc1_ancestors = set(loc1.get_ancestors().values_list("id", flat=True))
-            loc2_ancestors = set(loc2.get_ancestors().values_list("id", flat=True))
+            # Compared on the materialised location paths, no queries needed
+            return loc1.is_ancestor_of(loc2) or loc2.is_ancestor_of(loc1)
 
-            # Check if loc1 is ancestor of loc2
-            if loc1.id in loc2_ancestors:
-                return True
+        except Exception as e:
+            self.logger.error(f"Ancestor-descendant check failed: {str(e)}")
+            return False
 
-            # Check if loc2 is ancestor of loc1
-            if loc2.id in loc1_ancestors:
-                return True
 
-            return False
+class _CandidateIndex:
+    """Non-duplicate detections indexed for the checks of ``DuplicationChecker.is_duplicate``.
 
-        except (AttributeError, Exception) as e:
-            # If get_ancestors method doesn't exist or fails, use simple admin level comparison
-            try:
-                return loc1.admin_level != loc2.admin_level
-            except Exception:
-                self.logger.error(f"Ancestor-descendant check failed: {str(e)}")
-                return False
+    Candidates are checked in the order they were added, as the per-detection
+    queries return them.
+    """
+
+    def __init__(self):
+        self.candidates: list[tuple[Detection, frozenset]] = []
+        self.exact: dict[tuple, int] = {}
+        self.by_location: dict[int, list[int]] = {}
+        self.by_geo_id: dict[str, list[int]] = {}
+        self.by_ancestor: dict[str, list[int]] = {}
+
+    def add(self, detection: "Detection", locations: list) -> None:
+        """Add a detection that later detections may duplicate."""
+        if not locations:
+            return
+        position = len(self.candidates)
+        location_ids = frozenset(location.id for location in locations)
+        self.candidates.append((detection, location_ids))
+        self.exact.setdefault((detection.detection_timestamp, location_ids), position)
+        for location in locations:
+            self.by_location.setdefault(location.id, []).append(position)
+            self.by_geo_id.setdefault(location.geo_id, []).append(position)
+            for label in location.path_labels[:-1]:
+                self.by_ancestor.setdefault(label, []).append(position)
+
+    def find_duplicate(self, detection: "Detection", locations: list) -> Optional["Detection"]:
+        """First candidate the detection duplicates (exact, then temporal, then geographic), if any."""
+        if not locations:
+            return None
+        location_ids = frozenset(location.id for location in locations)
+        timestamp = detection.detection_timestamp
+
+        # Exact: same timestamp and locations
+        position = self.exact.get((timestamp, location_ids))
+        if position is not None:
+            return self.candidates[position][0]
+
+        # Temporal: same shock type, close in time, at least half of the locations shared
+        for position in sorted({position for location_id in location_ids for position in self.by_location.get(location_id, ())}):
+            candidate, candidate_ids = self.candidates[position]
+            if candidate.shock_type_id != detection.shock_type_id or abs(candidate.detection_timestamp - timestamp) > TEMPORAL_PROXIMITY:
+                continue
+            if len(location_ids & candidate_ids) / len(location_ids | candidate_ids) >= 0.5:
+                return candidate
+
+        # Geographic: same shock type, recent, in a parent or child location
+        related = set()
+        for location in locations:
+            related.update(self.by_ancestor.get(location.geo_id, ()))
+            for label in location.path_labels[:-1]:
+                related.update(self.by_geo_id.get(label, ()))
+        for position in sorted(related):
+            candidate, _ = self.candidates[position]
+            if candidate.shock_type_id == detection.shock_type_id and candidate.detection_timestamp >= timestamp - GEOGRAPHIC_PROXIMITY:
+                return candidate
+
+        return None
 
 
 # Singleton instance for easy access
@@ -4,11 +4,13 @@ import logging
 from datetime import datetime, time
 from typing import Any
 
+import pandas as pd
 import torch
 from django.utils import timezone
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
-from alert_framework.base_detector import BaseDetector
+from alert_framework.base_detector import FRAME_COLUMNS, BaseDetector, DataRequirement
+from data_pipeline.models import VariableData
 
 logger = logging.getLogger(__name__)
 
@@ -108,24 +110,57 @@ class DataminrBertDetector(BaseDetector):
     def _load_data(self, start_date=None, end_date=None):
         """Load data from the configured data source.
 
+        Only the columns needed to build headlines are loaded; ``raw_data`` is
+        read in full later, for the records classified as alerts.
+
         Args:
             start_date: Start date for data retrieval
             end_date: End date for data retrieval
 
         Returns:
-            QuerySet of VariableData records
+            DataFrame of VariableData rows (see ``get_variable_frame``), or None if no variable is configured
         """
         if not self.variable_code:
             self.logger.warning("No variable_code configured for DataminrBertDetector")
             return None
 
-        return self.get_variable_data(
+        return self.get_variable_frame(
             variable_code=self.variable_code,
             start_date=start_date,
             end_date=end_date,
             admin_level=self.admin_level,
+            **self._headline_columns(),
         )
 
+    def data_requirements(self, start_date: datetime, end_date: datetime) -> list[DataRequirement]:
+        """Headline columns of the analysis window read by ``detect``."""
+        if not self.variable_code:
+            return []
+        return [DataRequirement(self.variable_code, start_date, end_date, admin_level=self.admin_level, **self._headline_columns())]
+
+    def _headline_columns(self) -> dict[str, tuple[str, ...]]:
+        """Frame columns holding the configured headline field."""
+        if self.headline_field == "raw_data_headline":
+            return {"fields": ("text",), "raw_data_fields": ("headline",)}
+        if self.headline_field != "text" and self.headline_field not in FRAME_COLUMNS and self.headline_field in {field.attname for field in VariableData._meta.concrete_fields}:
+            return {"fields": ("text", self.headline_field)}
+        return {"fields": ("text",)}
+
+    def _extract_headlines(self, data) -> list[str]:
+        """Headline of each frame row, falling back to the text field."""
+        column = "raw_data_headline" if self.headline_field == "raw_data_headline" else self.headline_field
+        values = data[column] if column in data.columns else [None] * len(data)
+
+        headlines = []
+        for record_id, headline, text in zip(data["id"], values, data["text"], strict=True):
+            if pd.isna(headline) or not headline:
+                headline = text
+            if pd.isna(headline) or not headline:
+                self.logger.warning(f"No headline found for record {record_id}")
+                headline = ""
+            headlines.append(str(headline))
+        return headlines
+
     def _classify_headlines(self, headlines: list[str]) -> tuple[list[int], list[float]]:
         """Classify headlines using BERT model.
 
@@ -174,106 +209,75 @@ class DataminrBertDetector(BaseDetector):
         # Load data for the specified time window
         data = self._load_data(start_date=start_date, end_date=end_date)
 
-        if not data:
+        if data is None or data.empty:
             self.log_detection("No data found for Dataminr BERT detection", level="warning")
             return []
 
         detections = []
-        data_count = data.count()
+        data_count = len(data)
 
         self.log_detection(f"Processing {data_count} headlines for classification")
 
-        # Process in batches
-        records_list = list(data)
-        for i in range(0, len(records_list), self.batch_size):
-            batch_records = records_list[i : i + self.batch_size]
-
-            # Extract headlines
-            headlines = []
-            for record in batch_records:
-                headline = None
-
-                # Try to get headline based on field configuration
-                if self.headline_field == "raw_data_headline":
-                    # Extract from raw_data
-                    if record.raw_data and isinstance(record.raw_data, dict):
-                        headline = record.raw_data.get("headline")
-                elif self.headline_field == "text":
-                    # Use text field
-                    headline = record.text
-                else:
-                    # Try to get from record attribute
-                    headline = getattr(record, self.headline_field, None)
-
-                # Fallback to text field if no headline found
-                if not headline and record.text:
-                    headline = record.text
-
-                if not headline:
-                    self.logger.warning(f"No headline found for record {record.id}")
-                    headline = ""
+        # Classify in batches, keeping (record id, headline, prediction, probability) of alerts
+        # (classified as 1 and meeting the confidence threshold)
+        record_ids = data["id"].tolist()
+        headlines = self._extract_headlines(data)
+        alerts = []
+        for i in range(0, data_count, self.batch_size):
+            batch_headlines = headlines[i : i + self.batch_size]
+            predictions, probabilities = self._classify_headlines(batch_headlines)
 
-                headlines.append(str(headline))
-
-            # Classify batch
-            predictions, probabilities = self._classify_headlines(headlines)
-
-            # Create detections for alerts
-            for record, prediction, probability in zip(batch_records, predictions, probabilities, strict=False):
-                # Only create detection if classified as alert (1) and meets confidence threshold
+            for record_id, headline, prediction, probability in zip(record_ids[i : i + self.batch_size], batch_headlines, predictions, probabilities, strict=False):
                 if prediction == 1 and probability >= self.confidence_threshold:
-                    locations = []
-                    if record.gid:
-                        locations = [record.gid]
-
-                    # Convert date to timezone-aware datetime if needed
-                    detection_timestamp = record.start_date
-                    if isinstance(detection_timestamp, datetime):
-                        if timezone.is_naive(detection_timestamp):
-                            detection_timestamp = timezone.make_aware(detection_timestamp)
-                    else:
-                        # Convert date to datetime at midnight in the current timezone
-                        detection_timestamp = timezone.make_aware(datetime.combine(detection_timestamp, time.min))
-
-                    # Get headline text (same logic as extraction above)
-                    if self.headline_field == "raw_data_headline":
-                        headline = record.raw_data.get("headline", "") if record.raw_data else ""
-                    elif self.headline_field == "text":
-                        headline = record.text or ""
-                    else:
-                        headline = getattr(record, self.headline_field, "")
-
-                    if not headline and record.text:
-                        headline = record.text
-
-                    # Determine shock type using the mapping (similar to scoring detector)
-                    shock_type_name = self._determine_shock_type(record, headline)
-
-                    # Create title from headline (truncate to 200 chars for title field)
-                    title = headline[:200] if headline else f"BERT Alert - {record.start_date.strftime('%Y-%m-%d')}"
-
-                    detection = {
-                        "title": title,
-                        "detection_timestamp": detection_timestamp,
-                        "locations": locations,
-                        "confidence_score": probability,
-                        "shock_type_name": shock_type_name,
-                        "detection_data": {
-                            "variable_code": record.variable.code,
-                            "variable_name": record.variable.name,
-                            "headline": headline,
-                            "bert_prediction": prediction,
-                            "bert_confidence": probability,
-                            "confidence_threshold": self.confidence_threshold,
-                            "start_date": record.start_date.isoformat() if record.start_date else None,
-                            "end_date": record.end_date.isoformat() if record.end_date else None,
-                            "location_name": record.gid.name if record.gid else None,
-                            "admin_level": record.adm_level.code if record.adm_level else None,
-                            "detector_type": "dataminr_bert",
-                            "model_path": self.model_path,
-                        },
-                    }
-                    detections.append(detection)
+                    alerts.append((record_id, headline, prediction, probability))
+
+        # Load full records (with raw_data for shock type mapping) for the alerts only
+        records = VariableData.objects.select_related("variable", "gid", "adm_level").in_bulk([alert[0] for alert in alerts])
+
+        # Create detections for alerts
+        for record_id, headline, prediction, probability in alerts:
+            record = records[record_id]
+            locations = []
+            if record.gid:
+                locations = [record.gid]
+
+            # Convert date to timezone-aware datetime if needed
+            detection_timestamp = record.start_date
+            if isinstance(detection_timestamp, datetime):
+                if timezone.is_naive(detection_timestamp):
+                    detection_timestamp = timezone.make_aware(detection_timestamp)
+            else:
+                # Convert date to datetime at midnight in the current timezone
+                detection_timestamp = timezone.make_aware(datetime.combine(detection_timestamp, time.min))
+
+            # Determine shock type using the mapping (similar to scoring detector)
+            shock_type_name = self._determine_shock_type(record, headline)
+
+            # Create title from headline (truncate to 200 chars for title field)
+            title = headline[:200] if headline else f"BERT Alert - {record.start_date.strftime('%Y-%m-%d')}"
+
+            detection = {
+                "title": title,
+                "detection_timestamp": detection_timestamp,
+                "locations": locations,
+                "confidence_score": probability,
+                "shock_type_name": shock_type_name,
+                "detection_data": {
+                    "variable_code": record.variable.code,
+                    "variable_name": record.variable.name,
+                    "headline": headline,
+                    "bert_prediction": prediction,
+                    "bert_confidence": probability,
+                    "confidence_threshold": self.confidence_threshold,
+                    "start_date": record.start_date.isoformat() if record.start_date else None,
+                    "end_date": record.end_date.isoformat() if record.end_date else None,
+                    "location_name": record.gid.name if record.gid else None,
+                    "admin_level": record.adm_level.code if record.adm_level else None,
+                    "detector_type": "dataminr_bert",
+                    "model_path": self.model_path,
+                },
+            }
+            detections.append(detection)
 
         self.log_detection(
             "Dataminr BERT detection completed",
@@ -1,11 +1,29 @@
 """Statistical surge detection for conflict and displacement data."""
 
-from collections import defaultdict
 from datetime import datetime, timedelta
 
-from django.db import models
+import pandas as pd
 
-from alert_framework.base_detector import BaseDetector
+from alert_framework.base_detector import BaseDetector, DataRequirement, lookup_date
+from location.models import Location
+
+
+def window_totals(data: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """Total value and record count per location of the frame rows overlapping a window.
+
+    Rows overlap the window as in ``BaseDetector.get_variable_data``
+    (``start_date <= end`` and ``end_date >= start``); missing values count as 0.
+
+    Args:
+        data: Variable frame (see ``BaseDetector.get_variable_frame``)
+        start_date: Window start
+        end_date: Window end
+
+    Returns:
+        DataFrame indexed by location ID with "total" and "records" columns
+    """
+    overlaps = (data["start_date"] <= lookup_date(end_date)) & (data["end_date"] >= lookup_date(start_date))
+    return data[overlaps].groupby("gid_id")["value"].agg(total="sum", records="size")
 
 
 class ConflictSurgeDetector(BaseDetector):
@@ -35,28 +53,41 @@ class ConflictSurgeDetector(BaseDetector):
 
             self.log_detection("Starting conflict surge analysis", variable_code=variable_code, threshold_multiplier=threshold_multiplier, min_events=min_events)
 
-            # Get conflict event data for analysis period
-            analysis_data = self.get_variable_data(
+            # Load the analysis and lookback windows of all locations in one query
+            analysis_period_days = (end_date - start_date).days
+            historical_end = start_date - timedelta(days=1)
+            historical_start = historical_end - timedelta(days=lookback_period_days)
+            data = self.get_variable_frame(
                 variable_code=variable_code,
-                start_date=start_date,
+                start_date=historical_start,
                 end_date=end_date,
                 admin_level=config.get("admin_level", 2),  # Default to locality level
+                matched_only=True,
             )
 
-            if not analysis_data.exists():
+            recent = window_totals(data, start_date, end_date)
+            if recent.empty:
                 self.log_detection("No conflict data found for analysis period")
                 return detections
 
-            # Group data by location
-            location_data = self._group_data_by_location(analysis_data)
-
-            # Analyze each location for surges
-            for location_id, events in location_data.items():
-                surge_detection = self._analyze_location_surge(
+            # Compare recent counts with the historical averages of all locations at once
+            surges = recent[recent["total"] >= min_events].join(
+                self._calculate_historical_baselines(data, historical_start, historical_end, lookback_period_days, analysis_period_days), how="inner"
+            )
+            surges = surges[surges["historical_average"] > 0]
+            surges = surges.assign(surge_factor=surges["total"] / surges["historical_average"])
+            surges = surges[surges["surge_factor"] >= threshold_multiplier]
+
+            locations = Location.objects.in_bulk(surges.index.tolist())
+            for location_id, row in surges.iterrows():
+                location_id = int(location_id)
+                surge_detection = self._build_surge_detection(
+                    location=locations.get(location_id),
                     location_id=location_id,
-                    events=events,
+                    recent_count=float(row["total"]),
+                    historical_avg=float(row["historical_average"]),
+                    events_analyzed=int(row["records"]),
                     threshold_multiplier=threshold_multiplier,
-                    min_events=min_events,
                     analysis_start=start_date,
                     analysis_end=end_date,
                     lookback_days=lookback_period_days,
@@ -66,153 +97,101 @@ class ConflictSurgeDetector(BaseDetector):
                 if surge_detection:
                     detections.append(surge_detection)
 
-            self.log_detection("Conflict surge analysis completed", detections_found=len(detections), locations_analyzed=len(location_data))
+            self.log_detection("Conflict surge analysis completed", detections_found=len(detections), locations_analyzed=len(recent))
 
         except Exception as e:
             self.log_detection(f"Conflict surge detection failed: {str(e)}", level="error")
 
         return detections
 
-    def _group_data_by_location(self, data: models.QuerySet) -> dict[int, list]:
-        """Group variable data by location ID.
+    def _calculate_historical_baselines(self, data: pd.DataFrame, historical_start: datetime, historical_end: datetime, lookback_days: int, analysis_period_days: int) -> pd.Series:
+        """Calculate the historical baseline average of every location.
 
         Args:
-            data: QuerySet of VariableData records
+            data: Variable frame covering the lookback window
+            historical_start: Lookback window start
+            historical_end: Lookback window end
+            lookback_days: Days to look back for historical data
+            analysis_period_days: Length of analysis periods
 
         Returns:
-            Dictionary mapping location_id to list of data records
+            Series of historical averages named "historical_average", indexed by location ID
+            (locations without historical data are missing)
         """
-        location_groups = defaultdict(list)
-
-        for record in data:
-            if record.gid_id:  # Only include records with matched locations
-                location_groups[record.gid_id].append(record)
-
-        return dict(location_groups)
-
-    def _analyze_location_surge(
-        self, location_id: int, events: list, threshold_multiplier: float, min_events: int, analysis_start: datetime, analysis_end: datetime, lookback_days: int, variable_code: str
+        if not analysis_period_days:
+            return pd.Series(dtype=float, name="historical_average")
+
+        # Simple approach: sum all historical values and divide by number of equivalent analysis periods
+        equivalent_periods = max(1, lookback_days / analysis_period_days)
+        return (window_totals(data, historical_start, historical_end)["total"] / equivalent_periods).rename("historical_average")
+
+    def _build_surge_detection(
+        self,
+        location,
+        location_id: int,
+        recent_count: float,
+        historical_avg: float,
+        events_analyzed: int,
+        threshold_multiplier: float,
+        analysis_start: datetime,
+        analysis_end: datetime,
+        lookback_days: int,
+        variable_code: str,
     ) -> dict | None:
-        """Analyze a specific location for surge patterns.
+        """Build the detection of a location whose recent count exceeds its baseline.
 
         Args:
-            location_id: Location ID to analyze
-            events: List of VariableData records for this location
+            location: Location instance (None if it no longer exists)
+            location_id: Location ID
+            recent_count: Sum of values in the analysis period
+            historical_avg: Historical baseline average
+            events_analyzed: Number of records in the analysis period
             threshold_multiplier: Multiplier for surge detection threshold
-            min_events: Minimum events required to trigger detection
             analysis_start: Analysis period start
             analysis_end: Analysis period end
             lookback_days: Days to look back for historical baseline
             variable_code: Variable code being analyzed
 
         Returns:
-            Detection dictionary if surge detected, None otherwise
+            Detection dictionary, or None if the location is missing
         """
-        try:
-            # Calculate recent event count (analysis period)
-            recent_count = sum(record.value or 0 for record in events)
-
-            if recent_count < min_events:
-                return None
-
-            # Get historical baseline data
-            historical_avg = self._calculate_historical_baseline(
-                location_id=location_id,
-                variable_code=variable_code,
-                reference_date=analysis_start,
-                lookback_days=lookback_days,
-                analysis_period_days=(analysis_end - analysis_start).days,
-            )
-
-            if historical_avg is None or historical_avg == 0:
-                # No historical data or zero baseline - can't determine surge
-                return None
-
-            # Calculate surge factor
-            surge_factor = recent_count / historical_avg
-
-            # Check if surge threshold is met
-            if surge_factor >= threshold_multiplier:
-                # Get location object
-                from location.models import Location
-
-                try:
-                    location = Location.objects.get(id=location_id)
-                except Location.DoesNotExist:
-                    self.log_detection(f"Location {location_id} not found", level="warning")
-                    return None
-
-                # Calculate confidence score
-                confidence_score = min(0.95, max(0.1, (surge_factor - 1.0) / 3.0))
-
-                detection_data = {
-                    "variable_code": variable_code,
-                    "recent_count": recent_count,
-                    "historical_average": historical_avg,
-                    "surge_factor": surge_factor,
-                    "threshold_multiplier": threshold_multiplier,
-                    "analysis_period_days": (analysis_end - analysis_start).days,
-                    "lookback_period_days": lookback_days,
-                    "events_analyzed": len(events),
-                }
-
-                self.log_detection(
-                    f"Conflict surge detected in {location.name}", surge_factor=surge_factor, recent_count=recent_count, historical_avg=historical_avg, confidence=confidence_score
-                )
-
-                return {
-                    "detection_timestamp": analysis_end,
-                    "locations": [location_id],
-                    "confidence_score": confidence_score,
-                    "shock_type_name": "Conflict",
-                    "detection_data": detection_data,
-                }
-
-        except Exception as e:
-            self.log_detection(f"Location surge analysis failed for location {location_id}: {str(e)}", level="error")
-
-        return None
-
-    def _calculate_historical_baseline(self, location_id: int, variable_code: str, reference_date: datetime, lookback_days: int, analysis_period_days: int) -> float | None:
-        """Calculate historical baseline average for comparison.
-
-        Args:
-            location_id: Location ID
-            variable_code: Variable code to analyze
-            reference_date: Reference date for lookback calculation
-            lookback_days: Days to look back for historical data
-            analysis_period_days: Length of analysis periods
-
-        Returns:
-            Historical average or None if insufficient data
-        """
-        try:
-            # Calculate historical period boundaries
-            historical_end = reference_date - timedelta(days=1)
-            historical_start = historical_end - timedelta(days=lookback_days)
-
-            # Get historical data
-            historical_data = self.get_variable_data(variable_code=variable_code, start_date=historical_start, end_date=historical_end, locations=[location_id])
+        if location is None:
+            self.log_detection(f"Location {location_id} not found", level="warning")
+            return None
 
-            if not historical_data.exists():
-                return None
+        surge_factor = recent_count / historical_avg
 
-            # Group historical data into analysis-period-sized windows
-            total_value = 0
-            _period_count = 0  # Currently unused but may be needed for future counting logic
+        # Calculate confidence score
+        confidence_score = min(0.95, max(0.1, (surge_factor - 1.0) / 3.0))
 
-            # Simple approach: sum all historical values and divide by number of equivalent periods
-            for record in historical_data:
-                total_value += record.value or 0
+        detection_data = {
+            "variable_code": variable_code,
+            "recent_count": recent_count,
+            "historical_average": historical_avg,
+            "surge_factor": surge_factor,
+            "threshold_multiplier": threshold_multiplier,
+            "analysis_period_days": (analysis_end - analysis_start).days,
+            "lookback_period_days": lookback_days,
+            "events_analyzed": events_analyzed,
+        }
 
-            # Calculate number of equivalent analysis periods in historical data
-            equivalent_periods = max(1, lookback_days / analysis_period_days)
+        self.log_detection(
+            f"Conflict surge detected in {location.name}", surge_factor=surge_factor, recent_count=recent_count, historical_avg=historical_avg, confidence=confidence_score
+        )
 
-            return total_value / equivalent_periods
+        return {
+            "detection_timestamp": analysis_end,
+            "locations": [location_id],
+            "confidence_score": confidence_score,
+            "shock_type_name": "Conflict",
+            "detection_data": detection_data,
+        }
 
-        except Exception as e:
-            self.log_detection(f"Historical baseline calculation failed: {str(e)}", level="error")
-            return None
+    def data_requirements(self, start_date: datetime, end_date: datetime) -> list[DataRequirement]:
+        """Analysis and lookback windows read by ``detect``."""
+        config = self.config.configuration
+        historical_start = start_date - timedelta(days=1 + config.get("lookback_period_days", 30))
+        return [DataRequirement(config.get("variable_code", "acled_events"), historical_start, end_date, admin_level=config.get("admin_level", 2))]
 
     def get_configuration_schema(self) -> dict:
         """Return configuration schema for conflict surge detector."""
@@ -293,73 +272,68 @@ class DisplacementSurgeDetector(BaseDetector):
 
         return detections
 
+    def data_requirements(self, start_date: datetime, end_date: datetime) -> list[DataRequirement]:
+        """Analysis window of each displacement variable read by ``detect``."""
+        config = self.config.configuration
+        variable_codes = config.get("variable_codes", ["idmc_gidd_conflict_displacement", "idmc_idu_displacement"])
+        return [DataRequirement(variable_code, start_date, end_date, admin_level=config.get("admin_level", 1)) for variable_code in variable_codes]
+
     def _analyze_displacement_variable(self, variable_code: str, start_date: datetime, end_date: datetime, threshold_multiplier: float, min_displaced: int) -> list[dict]:
         """Analyze displacement variable for surge patterns."""
         detections = []
 
         try:
             # Get displacement data
-            displacement_data = self.get_variable_data(
-                variable_code=variable_code, start_date=start_date, end_date=end_date, admin_level=self.config.configuration.get("admin_level", 1)
+            displacement_data = self.get_variable_frame(
+                variable_code=variable_code, start_date=start_date, end_date=end_date, admin_level=self.config.configuration.get("admin_level", 1), matched_only=True
             )
 
-            if not displacement_data.exists():
+            if displacement_data.empty:
                 return detections
 
-            # Group by location and analyze
-            location_data = self._group_data_by_location(displacement_data)
-
-            for location_id, records in location_data.items():
-                total_displaced = sum(record.value or 0 for record in records)
-
-                if total_displaced >= min_displaced:
-                    # Simple detection based on absolute threshold for now
-                    # In production, this would compare against historical baselines
-
-                    from location.models import Location
-
-                    try:
-                        location = Location.objects.get(id=location_id)
-                    except Location.DoesNotExist:
-                        continue
-
-                    # Calculate confidence based on displacement volume
-                    confidence_score = min(0.9, max(0.3, total_displaced / (min_displaced * 5)))
-
-                    detections.append(
-                        {
-                            "detection_timestamp": end_date,
-                            "locations": [location_id],
-                            "confidence_score": confidence_score,
-                            "shock_type_name": "Displacement",
-                            "detection_data": {
-                                "variable_code": variable_code,
-                                "total_displaced": total_displaced,
-                                "records_analyzed": len(records),
-                                "displacement_type": self._classify_displacement_type(variable_code),
-                            },
-                        }
-                    )
-
-                    self.log_detection(
-                        f"Displacement surge detected in {location.name}", total_displaced=total_displaced, displacement_type=self._classify_displacement_type(variable_code)
-                    )
+            # Total per location and analyze
+            totals = window_totals(displacement_data, start_date, end_date)
+            totals = totals[totals["total"] >= min_displaced]
+
+            # Simple detection based on absolute threshold for now
+            # In production, this would compare against historical baselines
+            locations = Location.objects.in_bulk(totals.index.tolist())
+
+            for location_id, row in totals.iterrows():
+                location_id = int(location_id)
+                location = locations.get(location_id)
+                if location is None:
+                    continue
+
+                total_displaced = float(row["total"])
+
+                # Calculate confidence based on displacement volume
+                confidence_score = min(0.9, max(0.3, total_displaced / (min_displaced * 5)))
+
+                detections.append(
+                    {
+                        "detection_timestamp": end_date,
+                        "locations": [location_id],
+                        "confidence_score": confidence_score,
+                        "shock_type_name": "Displacement",
+                        "detection_data": {
+                            "variable_code": variable_code,
+                            "total_displaced": total_displaced,
+                            "records_analyzed": int(row["records"]),
+                            "displacement_type": self._classify_displacement_type(variable_code),
+                        },
+                    }
+                )
+
+                self.log_detection(
+                    f"Displacement surge detected in {location.name}", total_displaced=total_displaced, displacement_type=self._classify_displacement_type(variable_code)
+                )
 
         except Exception as e:
             self.log_detection(f"Displacement variable analysis failed for {variable_code}: {str(e)}", level="error")
 
         return detections
 
-    def _group_data_by_location(self, data: models.QuerySet) -> dict[int, list]:
-        """Group variable data by location ID."""
-        location_groups = defaultdict(list)
-
-        for record in data:
-            if record.gid_id:  # Only include records with matched locations
-                location_groups[record.gid_id].append(record)
-
-        return dict(location_groups)
-
     def _classify_displacement_type(self, variable_code: str) -> str:
         """Classify displacement type based on variable code."""
         if "conflict" in variable_code.lower():
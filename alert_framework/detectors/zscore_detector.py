@@ -6,9 +6,19 @@ import numpy as np
 import pandas as pd
 from django.utils import timezone
 
-from alert_framework.base_detector import BaseDetector
+from alert_framework.base_detector import BaseDetector, DataRequirement, lookup_date
+from alert_framework.models import RollingBaseline
 from data_pipeline.models import VariableData
 
+# Frequencies whose periods do not depend on where the loaded data starts, so stored periods stay aligned
+INCREMENTAL_FREQS = ("1D", "1W", "1M")
+
+
+def _naive_timestamp(value) -> pd.Timestamp:
+    """Timestamp without timezone information (wall time kept), to compare with the frame dates."""
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize(None) if timestamp.tzinfo else timestamp
+
 
 class ZScoreDetector(BaseDetector):
     """Multi-level Z-score based anomaly detection for humanitarian data."""
@@ -43,12 +53,45 @@ class ZScoreDetector(BaseDetector):
         # Alert filtering
         self.min_alert_level = config_dict.get("min_alert_level", 1)
 
-    def _load_data(self, start_date=None, end_date=None):
-        """Load the data from source."""
+        # Persisted rolling state (see RollingBaseline), so runs only read new data
+        self.incremental_baseline = config_dict.get("incremental_baseline", True)
+
+    def _load_data(self, start_date=None, end_date=None, since=None, locations=None) -> pd.DataFrame:
+        """Load the data from source as a frame of matched (date, gid_id, value, updated_at) rows.
+
+        Args:
+            start_date: Analysis window start
+            end_date: Analysis window end
+            since: Load records from this date instead of the baseline history before start_date
+            locations: Only these location IDs
+        """
         if start_date is None or end_date is None:
             raise ValueError("start_date and end_date are required for data loading")
 
-        # Find available variables if not specified
+        if not self._resolve_variable_code():
+            return pd.DataFrame()
+
+        # Extended date range to include baseline calculation data
+        extended_start = since if since is not None else start_date - timedelta(days=self.window_size + 30)
+
+        data = self.get_variable_frame(
+            variable_code=self.variable_code,
+            start_date=extended_start,
+            end_date=end_date,
+            locations=locations,
+            admin_level=self.admin_level,
+            fields=("updated_at",),
+            matched_only=True,
+        )
+
+        return data
+
+    def _resolve_variable_code(self) -> bool:
+        """Find an available variable if none is configured.
+
+        Returns:
+            bool: True if a variable code is set
+        """
         if self.variable_code is None:
             from data_pipeline.models import Variable
 
@@ -86,23 +129,160 @@ class ZScoreDetector(BaseDetector):
 
                 if not variables.exists():
                     self.logger.error(f"No variables found matching types: {data_types}")
-                    return VariableData.objects.none()
+                    return False
 
                 self.variable_code = variables.first().code
                 source_name = variables.first().source.name
                 self.logger.info(f"Using fallback variable: {self.variable_code} from source: {source_name}")
 
-        # Extended date range to include baseline calculation data
-        extended_start = start_date - timedelta(days=self.window_size + 30)
+        return True
 
-        data = self.get_variable_data(variable_code=self.variable_code, start_date=extended_start, end_date=end_date, admin_level=self.admin_level)
+    def data_requirements(self, start_date: datetime, end_date: datetime) -> list[DataRequirement]:
+        """Records read by ``detect``: from the earliest open period of the stored rolling states (or the window start), else the baseline history.
 
-        return data
+        Locations without a usable state are then read from the database with
+        their full history, as ``_load_incremental_data`` does.
+        """
+        if not self._resolve_variable_code():
+            return []
+
+        history_start = start_date - timedelta(days=self.window_size + 30)
+        if self.uses_rolling_state:
+            states = self._load_rolling_states(end_date)
+            if states:
+                history_start = self._incremental_start(states, start_date)
+        return [DataRequirement(self.variable_code, history_start, end_date, admin_level=self.admin_level, fields=("updated_at",))]
+
+    @property
+    def uses_rolling_state(self) -> bool:
+        """Whether runs continue from and update the stored rolling states."""
+        return bool(self.incremental_baseline and self.freq in INCREMENTAL_FREQS and getattr(self.config, "pk", None))
+
+    @property
+    def baseline_signature(self) -> str:
+        """Settings a stored rolling state depends on."""
+        return f"{self.variable_code}|{self.admin_level}|{self.freq}|{self.aggregation_func}|{self.window_size}"
+
+    def _load_rolling_states(self, end_date: datetime) -> dict[int, RollingBaseline]:
+        """Load the stored rolling states usable for a run ending at end_date.
+
+        States whose open period starts after the run's end (re-runs of past
+        windows) are not used; those runs recompute from history.
+        """
+        end_ts = _naive_timestamp(end_date)
+        states = RollingBaseline.objects.filter(detector=self.config, signature=self.baseline_signature)
+        return {state.location_id: state for state in states if pd.Timestamp(state.through) <= end_ts}
+
+    def _incremental_start(self, states: dict[int, RollingBaseline], start_date: datetime):
+        """First date read by an incremental run: the earliest open period, or the window start if earlier.
+
+        Reading from the window start finds locations without a state whose
+        records all fall before the other locations' open periods.
+        """
+        return min(min(state.through for state in states.values()), lookup_date(start_date))
+
+    def _backfilled_locations(self, states: dict[int, RollingBaseline]) -> set[int]:
+        """Locations with records added or changed, since their state was saved, before the state's open period."""
+        queryset = VariableData.objects.filter(variable__code=self.variable_code, gid_id__in=list(states), start_date__lt=max(state.through for state in states.values()))
+        if self.admin_level is not None:
+            queryset = queryset.filter(adm_level__code=str(self.admin_level))
+        watermarks = [state.data_updated_at for state in states.values()]
+        if all(watermarks):
+            queryset = queryset.filter(updated_at__gt=min(watermarks))
+
+        stale = set()
+        for location_id, start_date, updated_at in queryset.values_list("gid_id", "start_date", "updated_at"):
+            state = states[location_id]
+            if start_date < state.through and (state.data_updated_at is None or updated_at > state.data_updated_at):
+                stale.add(location_id)
+        return stale
+
+    def _load_incremental_data(self, start_date: datetime, end_date: datetime) -> tuple[pd.DataFrame, dict[int, RollingBaseline]]:
+        """Load new records of locations with a rolling state and the baseline history of the others.
+
+        Locations with a usable state only need the records of their open
+        period onward (two queries for all of them); the other locations are
+        loaded with the full baseline history, as without stored state.
+
+        Returns:
+            Tuple of (records frame, usable states by location ID)
+        """
+        states = self._load_rolling_states(end_date)
+        if not states:
+            return self._load_data(start_date, end_date), {}
+
+        recent = self._load_data(start_date, end_date, since=self._incremental_start(states, start_date))
+        if recent.empty:
+            return recent, {}
+
+        stale = self._backfilled_locations(states)
+        if stale:
+            self.log_detection("Rebuilding rolling baselines after backfilled data", locations=len(stale))
+        states = {location_id: state for location_id, state in states.items() if location_id not in stale}
+
+        throughs = recent["gid_id"].map({location_id: pd.Timestamp(state.through) for location_id, state in states.items()})
+        new_records = recent[recent["gid_id"].isin(list(states)) & (recent["date"] >= throughs)]
+
+        others = sorted({int(location_id) for location_id in recent["gid_id"].unique()} - set(states))
+        if not others:
+            return new_records, states
+        history = self._load_data(start_date, end_date, locations=others)
+        return pd.concat([new_records, history], ignore_index=True), states
+
+    def _state_periods(self, states: dict[int, RollingBaseline], location_ids) -> pd.DataFrame:
+        """Stored closed periods of locations as aggregated rows."""
+        rows = [
+            (pd.Timestamp(date), location_id, value)
+            for location_id in (int(location_id) for location_id in location_ids)
+            if location_id in states
+            for date, value in states[location_id].periods
+        ]
+        return pd.DataFrame(rows, columns=["date", "unit_id", "value"])
+
+    def _save_rolling_states(self, series: pd.DataFrame, open_periods: pd.Series, raw_data: pd.DataFrame, states: dict[int, RollingBaseline]) -> None:
+        """Store the closed periods (up to the window size) and open period start of each processed location.
+
+        Args:
+            series: Aggregated periods (stored and new) of the processed locations
+            open_periods: First record date of the last (open) period, by location ID
+            raw_data: Records loaded for the run
+            states: States the run continued from, by location ID
+        """
+        updated_at = raw_data.groupby("gid_id")["updated_at"].max()
+        rows = []
+        for location_id, periods in series.sort_values("date").groupby("unit_id"):
+            location_id = int(location_id)
+            closed = periods.iloc[:-1].tail(self.window_size)
+            watermarks = [
+                timestamp
+                for timestamp in (updated_at.get(location_id), getattr(states.get(location_id), "data_updated_at", None))
+                if timestamp is not None and not pd.isna(timestamp)
+            ]
+            rows.append(
+                RollingBaseline(
+                    detector=self.config,
+                    location_id=location_id,
+                    signature=self.baseline_signature,
+                    periods=[[date.date().isoformat(), float(value)] for date, value in zip(closed["date"], closed["value"], strict=True)],
+                    through=open_periods[location_id].date(),
+                    data_updated_at=pd.Timestamp(max(watermarks)).to_pydatetime() if watermarks else None,
+                )
+            )
+
+        RollingBaseline.objects.bulk_create(
+            rows, batch_size=1000, update_conflicts=True, unique_fields=["detector", "location"], update_fields=["signature", "periods", "through", "data_updated_at", "updated_at"]
+        )
 
     def detect(self, start_date: datetime, end_date: datetime, **kwargs) -> list[dict]:
         """
         Analyze data within time window and return Z-score based detections.
 
+        With ``incremental_baseline`` (default), each location's rolling state
+        is continued from its stored closed periods: only records of the open
+        period onward are read and scored, so periods closed by an earlier
+        run are not reported again. Runs for windows ending before a
+        location's open period recompute from history.
+
         Args:
             start_date: Analysis window start
             end_date: Analysis window end
@@ -121,22 +301,36 @@ class ZScoreDetector(BaseDetector):
                 window_size=self.window_size,
             )
 
-            # Load data with extended range for baseline calculation
-            raw_data = self._load_data(start_date, end_date)
+            # Load new data continuing the stored rolling states, or data with extended range for baseline calculation
+            if self.uses_rolling_state:
+                raw_data, states = self._load_incremental_data(start_date, end_date)
+            else:
+                raw_data, states = self._load_data(start_date, end_date), {}
 
-            if not raw_data.exists():
+            if raw_data.empty:
                 self.log_detection("No data found for Z-score analysis")
                 return detections
 
-            # Convert Django QuerySet to pandas DataFrame
-            df = self._queryset_to_dataframe(raw_data)
+            # Aggregate the raw values by frequency and location
+            df = self._aggregate_frame(raw_data)
 
             if df.empty:
                 self.log_detection("No valid data after conversion to DataFrame")
                 return detections
 
-            # Process time series data with Z-score analysis
+            # Prepend the stored closed periods, so rolling windows continue across runs
+            open_periods = df.groupby("unit_id")["first_date"].last()
+            df = df.drop(columns="first_date").assign(from_state=False)
+            stored = self._state_periods(states, df["unit_id"].unique())
+            if not stored.empty:
+                df = pd.concat([stored.assign(from_state=True), df], ignore_index=True)
+
+            # Process time series data with Z-score analysis (stored periods were scored by earlier runs)
             results_df = self._process_timeseries_data(df)
+            results_df = results_df[~results_df["from_state"]]
+
+            if self.uses_rolling_state:
+                self._save_rolling_states(df, open_periods, raw_data, states)
 
             # Filter for analysis period and alerts
             # Convert datetime to pandas timestamp for comparison, removing timezone info
@@ -163,35 +357,20 @@ class ZScoreDetector(BaseDetector):
 
         return detections
 
-    def _queryset_to_dataframe(self, queryset) -> pd.DataFrame:
-        """Convert Django QuerySet to pandas DataFrame for analysis with proper aggregation."""
-        records = []
-
-        for record in queryset:
-            if record.gid_id:  # Only include records with matched locations
-                records.append(
-                    {
-                        "date": record.start_date or record.end_date,
-                        "unit_id": record.gid_id,
-                        "value": float(record.value),
-                    }
-                )
+    def _aggregate_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Aggregate a variable frame (see ``get_variable_frame``) by frequency and location for analysis."""
+        # Only include records with matched locations
+        df = frame.loc[frame["gid_id"].notna(), ["date", "gid_id", "value"]].rename(columns={"gid_id": "unit_id"})
 
-        if not records:
+        if df.empty:
             return pd.DataFrame()
 
-        df = pd.DataFrame(records)
-        df["date"] = pd.to_datetime(df["date"])
-
         # Aggregate data by frequency and unit (preserving irregular spacing for meaningful baseline calculations)
-        df = df.set_index("date")
+        df = df.assign(first_date=df["date"]).set_index("date")
 
         # Group by frequency and unit_id, then aggregate using the specified function
-        agg_dict = {"value": self.aggregation_func}
-        if "location_name" in df.columns:
-            agg_dict["location_name"] = "first"  # Keep the first location name for each group
-
-        df_aggregated = df.groupby([pd.Grouper(freq=self.freq), "unit_id"]).agg(agg_dict)
+        # (first_date: earliest record date of each period, where incremental runs resume)
+        df_aggregated = df.groupby([pd.Grouper(freq=self.freq), "unit_id"]).agg(value=("value", self.aggregation_func), first_date=("first_date", "min"))
 
         # Reset index to get date and unit_id as columns
         df_aggregated = df_aggregated.reset_index()
@@ -456,6 +635,11 @@ class ZScoreDetector(BaseDetector):
                     "default": "mean",
                     "description": "Aggregation function for resampling data by frequency",
                 },
+                "incremental_baseline": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Persist rolling baselines per location and only read new data on later runs (1D, 1W and 1M frequencies)",
+                },
             },
             "required": ["variable_code"],
         }
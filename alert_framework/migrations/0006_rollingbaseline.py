@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-16 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alert_framework', '0005_alerttemplate_alert_frame_active_85e637_idx_and_more'),
+        ('location', '0015_simplifiedboundary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollingBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.CharField(help_text='Variable, admin level, frequency, aggregation and window the state was computed with', max_length=255)),
+                ('periods', models.JSONField(blank=True, default=list, help_text="Closed aggregated periods before 'through' as [ISO date, value] pairs, oldest first")),
+                ('through', models.DateField(help_text='First record date not folded into the periods (start of the open period)')),
+                ('data_updated_at', models.DateTimeField(blank=True, help_text='Latest VariableData.updated_at folded into the state', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('detector', models.ForeignKey(help_text='Detector this state belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='rolling_baselines', to='alert_framework.detector')),
+                ('location', models.ForeignKey(help_text='Location of the time series', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.location')),
+            ],
+            options={
+                'unique_together': {('detector', 'location')},
+            },
+        ),
+    ]
@@ -196,6 +196,35 @@ class Detection(models.Model):
         self.save(update_fields=["duplicate_of", "status", "processed_at"])
 
 
+class RollingBaseline(models.Model):
+    """Persisted rolling-window state of a detector at one location.
+
+    Holds the last aggregated periods of a location's time series (a ring
+    buffer of at most the detector's window size), so incremental runs only
+    read and aggregate data from ``through`` onward and score it against the
+    buffer. ``signature`` records the settings the buffer was computed with;
+    a mismatch discards the state.
+    """
+
+    detector = models.ForeignKey(Detector, on_delete=models.CASCADE, related_name="rolling_baselines", help_text="Detector this state belongs to")
+    location = models.ForeignKey("location.Location", on_delete=models.CASCADE, related_name="+", help_text="Location of the time series")
+    signature = models.CharField(max_length=255, help_text="Variable, admin level, frequency, aggregation and window the state was computed with")
+    periods = models.JSONField(default=list, blank=True, help_text="Closed aggregated periods before 'through' as [ISO date, value] pairs, oldest first")
+    through = models.DateField(help_text="First record date not folded into the periods (start of the open period)")
+    data_updated_at = models.DateTimeField(null=True, blank=True, help_text="Latest VariableData.updated_at folded into the state")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta configuration for RollingBaseline model."""
+
+        unique_together = [["detector", "location"]]
+
+    def __str__(self):
+        return f"{self.detector_id} - {self.location_id} (through {self.through})"
+
+
 class AlertTemplate(models.Model):
     """Multilingual message templates for alert generation."""
 
@@ -0,0 +1,129 @@
+"""Run several detectors over one window, sharing the variable data they read.
+
+Detectors declare the variable windows they read (``BaseDetector.data_requirements``).
+Requirements on the same variable and admin level are merged, each merged
+window is loaded once into a ``VariableFrameCache`` shared by the detectors,
+and the detectors then run concurrently in a thread pool. Detection records
+are created afterwards by the caller, in one batch (see
+``alert_framework.tasks.run_detector_group``).
+"""
+
+import logging
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+
+from alert_framework.base_detector import BaseDetector, DataRequirement, VariableFrameCache, lookup_date
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DetectorRun:
+    """Outcome of one detector in a group run."""
+
+    detector: BaseDetector
+    detections: list[dict] = field(default_factory=list)
+    error: str | None = None
+
+
+def merge_requirements(requirements: Iterable[DataRequirement]) -> list[DataRequirement]:
+    """Merge requirements on the same variable and admin level into one covering window and column set."""
+    merged: dict[tuple[str, str | None], DataRequirement] = {}
+    for requirement in requirements:
+        key = (requirement.variable_code, None if requirement.admin_level is None else str(requirement.admin_level))
+        current = merged.get(key)
+        if current is None:
+            merged[key] = requirement
+            continue
+        merged[key] = replace(
+            current,
+            start_date=min(current.start_date, requirement.start_date, key=lookup_date),
+            end_date=max(current.end_date, requirement.end_date, key=lookup_date),
+            fields=tuple(dict.fromkeys((*current.fields, *requirement.fields))),
+            raw_data_fields=tuple(dict.fromkeys((*current.raw_data_fields, *requirement.raw_data_fields))),
+        )
+    return list(merged.values())
+
+
+def load_shared_frames(detectors: list[BaseDetector], start_date: datetime, end_date: datetime) -> VariableFrameCache:
+    """Load the merged variable windows of detectors once and attach the cache to each detector.
+
+    Args:
+        detectors: Detector instances run together
+        start_date: Analysis window start
+        end_date: Analysis window end
+
+    Returns:
+        VariableFrameCache: Frames shared by the detectors
+    """
+    requirements, readers = [], {}
+    for detector in detectors:
+        try:
+            detector_requirements = detector.data_requirements(start_date, end_date)
+        except Exception as e:
+            detector.log_detection(f"Failed to determine data requirements: {str(e)}", level="warning")
+            continue
+        requirements.extend(detector_requirements)
+        for requirement in detector_requirements:
+            readers.setdefault(requirement.variable_code, []).append(detector.config.name)
+
+    cache = VariableFrameCache()
+    if detectors:
+        for requirement in merge_requirements(requirements):
+            frame = detectors[0].get_variable_frame(
+                requirement.variable_code,
+                start_date=requirement.start_date,
+                end_date=requirement.end_date,
+                admin_level=requirement.admin_level,
+                fields=requirement.fields,
+                raw_data_fields=requirement.raw_data_fields,
+            )
+            cache.add(requirement, frame)
+            logger.info(f"Loaded {len(frame)} records of '{requirement.variable_code}' shared by detectors {readers[requirement.variable_code]}")
+
+    for detector in detectors:
+        detector.frame_cache = cache
+    return cache
+
+
+def run_detectors(detectors: list[BaseDetector], start_date: datetime, end_date: datetime, max_workers: int | None = None, **kwargs) -> list[DetectorRun]:
+    """Run detectors over a window concurrently, sharing the variable data they read.
+
+    Args:
+        detectors: Detector instances
+        start_date: Analysis window start
+        end_date: Analysis window end
+        max_workers: Number of threads (defaults to the ALERT_DETECTOR_WORKERS setting, 4); 1 runs serially
+        **kwargs: Additional parameters passed to ``detect``
+
+    Returns:
+        list: DetectorRun of each detector, in the order given
+    """
+    if max_workers is None:
+        max_workers = getattr(settings, "ALERT_DETECTOR_WORKERS", 4)
+
+    load_shared_frames(detectors, start_date, end_date)
+
+    def run(detector: BaseDetector) -> DetectorRun:
+        try:
+            return DetectorRun(detector, detections=detector.detect(start_date, end_date, **kwargs))
+        except Exception as e:
+            detector.log_detection(f"Detector run failed: {str(e)}", level="error")
+            return DetectorRun(detector, error=str(e))
+
+    def run_in_thread(detector: BaseDetector) -> DetectorRun:
+        try:
+            return run(detector)
+        finally:
+            connections.close_all()
+
+    if max_workers == 1 or len(detectors) <= 1:
+        return [run(detector) for detector in detectors]
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detector") as executor:
+        return list(executor.map(run_in_thread, detectors))
@@ -13,6 +13,9 @@ logger = logging.getLogger(__name__)
 def trigger_detectors_for_source(sender, source, variables_processed, success_count, **kwargs):
     """Trigger all active detectors when source data is processed.
 
+    The triggered detectors run together in one ``run_detector_group`` task,
+    which loads the variable data they share once and runs them concurrently.
+
     Args:
         sender: Source class that sent the signal
         source: Source instance that completed processing
@@ -24,7 +27,7 @@ def trigger_detectors_for_source(sender, source, variables_processed, success_co
 
     try:
         from .models import Detector
-        from .tasks import run_detector
+        from .tasks import run_detector_group
 
         # Find detectors that should run for this source
         # Look for detectors that either:
@@ -55,26 +58,31 @@ def trigger_detectors_for_source(sender, source, variables_processed, success_co
                 should_trigger = True
 
             if should_trigger:
-                # Trigger detector asynchronously with recent time window
-                end_time = timezone.now()
-                start_time = end_time - timedelta(hours=1)  # Look at last hour of data
-
-                try:
-                    # Use utility function for Celery fallback logic
-                    task_result, execution_mode = run_task_with_fallback(
-                        run_detector,
-                        detector.id,
-                        start_date=start_time.isoformat(),
-                        end_date=end_time.isoformat(),
-                        triggered_by_source=source.id,
-                        task_name=f"Detector '{detector.name}'",
-                    )
+                triggered_detectors.append({"detector_id": detector.id, "detector_name": detector.name})
 
-                    task_id = task_result.id if hasattr(task_result, "id") else execution_mode
-                    triggered_detectors.append({"detector_id": detector.id, "detector_name": detector.name, "task_id": task_id})
-
-                except Exception as e:
-                    logger.error(f"Failed to trigger detector '{detector.name}' for source '{source.name}': {str(e)}")
+        if triggered_detectors:
+            # Trigger the detectors together asynchronously with recent time window
+            end_time = timezone.now()
+            start_time = end_time - timedelta(hours=1)  # Look at last hour of data
+
+            try:
+                # Use utility function for Celery fallback logic
+                task_result, execution_mode = run_task_with_fallback(
+                    run_detector_group,
+                    [d["detector_id"] for d in triggered_detectors],
+                    start_date=start_time.isoformat(),
+                    end_date=end_time.isoformat(),
+                    triggered_by_source=source.id,
+                    task_name=f"Detectors for source '{source.name}'",
+                )
+
+                task_id = task_result.id if hasattr(task_result, "id") else execution_mode
+                for triggered in triggered_detectors:
+                    triggered["task_id"] = task_id
+
+            except Exception as e:
+                logger.error(f"Failed to trigger detectors for source '{source.name}': {str(e)}")
+                triggered_detectors = []
 
         logger.info(f"Triggered {len(triggered_detectors)} detectors for source '{source.name}': {[d['detector_name'] for d in triggered_detectors]}")
 
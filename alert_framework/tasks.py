@@ -2,13 +2,15 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from alert_framework.models import Detection
 
 from celery import shared_task
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.module_loading import import_string
 
 from alert_framework.deduplication import duplication_checker
@@ -53,16 +55,7 @@ def run_detector(self, detector_id: int, start_date: str = None, end_date: str =
             raise ValueError(f"Detector {detector.name} is not active")
 
         # Parse date parameters
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-        else:
-            # Default to last 7 days
-            start_dt = timezone.now() - timedelta(days=7)
-
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-        else:
-            end_dt = timezone.now()
+        start_dt, end_dt = _parse_window(start_date, end_date)
 
         logger.info(
             f"Starting detector execution: {detector.name}",
@@ -70,38 +63,13 @@ def run_detector(self, detector_id: int, start_date: str = None, end_date: str =
         )
 
         # Load detector class dynamically
-        # Check if class_name already contains the full module path
-        if "alert_framework.detectors" in detector.class_name:
-            detector_class = import_string(detector.class_name)
-        else:
-            detector_class = import_string(f"alert_framework.detectors.{detector.class_name}")
-        detector_instance = detector_class(detector)
-
-        # Filter out task-specific kwargs that should not be passed to detector
-        # triggered_by_source is used for logging/tracking but not needed by detect() method
-        detector_kwargs = {k: v for k, v in kwargs.items() if k not in ['triggered_by_source']}
+        detector_instance = _load_detector_instance(detector)
 
         # Execute detection
-        detection_results = detector_instance.detect(start_dt, end_dt, **detector_kwargs)
-
-        # Process detection results
-        detections_created = 0
-        detections_duplicates = 0
-
-        for detection_data in detection_results:
-            detection = _create_detection_from_result(detector, detection_data)
-            if detection:
-                # Check for duplicates
-                if duplication_checker.is_duplicate(detection):
-                    detections_duplicates += 1
-                else:
-                    detections_created += 1
+        detection_results = detector_instance.detect(start_dt, end_dt, **_detector_kwargs(kwargs))
 
-        # Update detector statistics
-        detector.last_run = execution_start
-        detector.run_count += 1
-        detector.detection_count += detections_created
-        detector.save(update_fields=["last_run", "run_count", "detection_count"])
+        # Process detection results and update detector statistics
+        detections_created, detections_duplicates = _record_detections(detector, detection_results, execution_start)
 
         results.update(
             {
@@ -153,6 +121,141 @@ def run_detector(self, detector_id: int, start_date: str = None, end_date: str =
     return results
 
 
+@shared_task(bind=True)
+def run_detector_group(self, detector_ids: list[int], start_date: str = None, end_date: str = None, **kwargs) -> dict:
+    """Execute several detectors over one window, sharing the variable data they read.
+
+    Each variable window is loaded once for all detectors reading it and the
+    detectors run concurrently (see ``alert_framework.orchestration``), so the
+    group takes about as long as its slowest detector. Detections of all
+    detectors are then recorded and processed into alerts in one step.
+
+    Args:
+        detector_ids: IDs of detectors to run (inactive ones are skipped)
+        start_date: Analysis start date (ISO format)
+        end_date: Analysis end date (ISO format)
+        **kwargs: Additional detector parameters
+
+    Returns:
+        dict: Execution results with per-detector statistics
+    """
+    from alert_framework.models import Detector
+    from alert_framework.orchestration import run_detectors
+
+    execution_start = timezone.now()
+    results = {
+        "detector_ids": list(detector_ids),
+        "task_id": self.request.id,
+        "start_time": execution_start.isoformat(),
+        "success": False,
+        "detectors": [],
+        "detections_created": 0,
+        "detections_duplicates": 0,
+        "error_message": None,
+    }
+
+    try:
+        start_dt, end_dt = _parse_window(start_date, end_date)
+
+        instances = []
+        for detector in Detector.objects.filter(id__in=detector_ids, active=True).order_by("id"):
+            try:
+                instances.append(_load_detector_instance(detector))
+            except Exception as e:
+                logger.error(f"Failed to load detector '{detector.name}': {str(e)}")
+                results["detectors"].append({"detector_id": detector.id, "success": False, "error_message": str(e)})
+
+        logger.info(f"Starting detector group execution: {[instance.config.name for instance in instances]}", extra={"task_id": self.request.id})
+
+        for run in run_detectors(instances, start_dt, end_dt, **_detector_kwargs(kwargs)):
+            detector = run.detector.config
+            if run.error is not None:
+                results["detectors"].append({"detector_id": detector.id, "success": False, "error_message": run.error})
+                continue
+
+            detections_created, detections_duplicates = _record_detections(detector, run.detections, execution_start)
+            results["detectors"].append(
+                {"detector_id": detector.id, "success": True, "detections_created": detections_created, "detections_duplicates": detections_duplicates}
+            )
+            results["detections_created"] += detections_created
+            results["detections_duplicates"] += detections_duplicates
+
+        results.update({"success": True, "end_time": timezone.now().isoformat(), "duration_seconds": (timezone.now() - execution_start).total_seconds()})
+        logger.info(
+            "Detector group execution completed",
+            extra={"detections_created": results["detections_created"], "detections_duplicates": results["detections_duplicates"], "duration_seconds": results["duration_seconds"]},
+        )
+
+        # Process the new detections of all detectors into alerts at once
+        if results["detections_created"] > 0:
+            try:
+                processing_result = process_pending_detections(max_detections=max(100, results["detections_created"]))
+                results["alerts_created"] = processing_result.get("alerts_created", 0)
+            except Exception as e:
+                logger.error(f"Failed to process pending detections: {str(e)}")
+                results["processing_error"] = str(e)
+
+    except Exception as e:
+        results.update({"success": False, "error_message": str(e), "end_time": timezone.now().isoformat()})
+        logger.error(f"Detector group execution failed: {str(e)}", extra={"detector_ids": detector_ids, "task_id": self.request.id})
+
+    return results
+
+
+def _parse_window(start_date: str | None, end_date: str | None) -> tuple[datetime, datetime]:
+    """Parse an ISO analysis window, defaulting to the last 7 days."""
+    if start_date:
+        start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+    else:
+        # Default to last 7 days
+        start_dt = timezone.now() - timedelta(days=7)
+
+    if end_date:
+        end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+    else:
+        end_dt = timezone.now()
+    return start_dt, end_dt
+
+
+def _load_detector_instance(detector):
+    """Instantiate the detector class configured on a Detector."""
+    # Check if class_name already contains the full module path
+    if "alert_framework.detectors" in detector.class_name:
+        detector_class = import_string(detector.class_name)
+    else:
+        detector_class = import_string(f"alert_framework.detectors.{detector.class_name}")
+    return detector_class(detector)
+
+
+def _detector_kwargs(kwargs: dict) -> dict:
+    """Task kwargs to pass to ``detect``.
+
+    triggered_by_source is used for logging/tracking but not needed by detect() method.
+    """
+    return {k: v for k, v in kwargs.items() if k not in ["triggered_by_source"]}
+
+
+def _record_detections(detector, detection_results: list[dict], execution_start: datetime) -> tuple[int, int]:
+    """Create Detection records from detector results and update the detector statistics.
+
+    Returns:
+        Tuple of (detections created, duplicates)
+    """
+    created = _create_detections_from_results(detector, detection_results)
+
+    # Check the new detections for duplicates in one pass
+    detections_duplicates = duplication_checker.mark_duplicates(created)
+    detections_created = len(created) - detections_duplicates
+
+    # Update detector statistics
+    detector.last_run = execution_start
+    detector.run_count += 1
+    detector.detection_count += detections_created
+    detector.save(update_fields=["last_run", "run_count", "detection_count"])
+
+    return detections_created, detections_duplicates
+
+
 @shared_task
 def process_pending_detections(max_detections: int = 100) -> dict:
     """Process pending detections and generate alerts.
@@ -218,60 +321,109 @@ def process_pending_detections(max_detections: int = 100) -> dict:
     return results
 
 
-def _create_detection_from_result(detector, detection_data: dict) -> Optional["Detection"]:
-    """Create Detection model instance from detector result.
+def _create_detections_from_results(detector, detection_results: list[dict]) -> list[tuple["Detection", list]]:
+    """Create Detection records and their location links from detector results in bulk.
+
+    Shock types and locations are resolved with one query each, and the
+    detections and location links are inserted with ``bulk_create``. Results
+    without a timestamp, or repeating the detector, timestamp and title of a
+    non-duplicate detection, are skipped.
 
     Args:
         detector: Detector model instance
-        detection_data: Detection data from detector
+        detection_results: Detection data from detector
 
     Returns:
-        Detection instance or None if creation failed
+        list: (Detection, Location instances) of the created detections, in result order
     """
-    try:
-        from alert_framework.models import Detection
-        from alerts.models import ShockType
-        from location.models import Location
-
-        # Get shock type
-        shock_type = None
-        shock_type_name = detection_data.get("shock_type_name")
-        if shock_type_name:
-            try:
-                shock_type = ShockType.objects.get(name=shock_type_name)
-            except ShockType.DoesNotExist:
-                logger.warning(f"Shock type '{shock_type_name}' not found")
-
-        # Create detection
-        detection = Detection.objects.create(
+    from alert_framework.deduplication import LOCATION_FIELDS
+    from alert_framework.models import Detection
+    from alerts.models import ShockType
+    from location.models import Location
+
+    # Resolve shock types and locations once for all results
+    shock_type_names = {data["shock_type_name"] for data in detection_results if data.get("shock_type_name")}
+    shock_types = {shock_type.name: shock_type for shock_type in ShockType.objects.filter(name__in=shock_type_names)}
+    for name in shock_type_names - set(shock_types):
+        logger.warning(f"Shock type '{name}' not found")
+
+    location_ids = {_location_id(loc) for data in detection_results for loc in data.get("locations", [])} - {None}
+    locations = Location.objects.only(*LOCATION_FIELDS).in_bulk(location_ids)
+    for location_id in location_ids - set(locations):
+        logger.warning(f"Location ID {location_id} not found")
+
+    prepared = []
+    for data in detection_results:
+        timestamp = data.get("detection_timestamp")
+        if isinstance(timestamp, str):
+            timestamp = parse_datetime(timestamp)
+        if timestamp is None:
+            logger.error("Failed to create detection: missing detection_timestamp")
+            continue
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+
+        detection = Detection(
             detector=detector,
-            title=detection_data.get("title", f"Detection from {detector.name}"),
-            detection_timestamp=detection_data["detection_timestamp"],
-            confidence_score=detection_data.get("confidence_score"),
-            shock_type=shock_type,
-            detection_data=detection_data.get("detection_data", {}),
+            title=data.get("title", f"Detection from {detector.name}"),
+            detection_timestamp=timestamp,
+            confidence_score=data.get("confidence_score"),
+            shock_type=shock_types.get(data.get("shock_type_name")),
+            detection_data=data.get("detection_data", {}),
         )
+        detection_locations = list({location_id: locations[location_id] for location_id in map(_location_id, data.get("locations", [])) if location_id in locations}.values())
+        prepared.append((detection, detection_locations))
+
+    # Skip results that would repeat a non-duplicate detection (unique detector/timestamp/title)
+    taken = set(
+        Detection.objects.filter(
+            detector=detector, detection_timestamp__in={detection.detection_timestamp for detection, _ in prepared}, duplicate_of__isnull=True
+        ).values_list("detection_timestamp", "title")
+    )
+    batch = []
+    for detection, detection_locations in prepared:
+        key = (detection.detection_timestamp, detection.title)
+        if key in taken:
+            logger.warning(f"Detection '{detection.title}' at {detection.detection_timestamp} already exists")
+            continue
+        taken.add(key)
+        batch.append((detection, detection_locations))
 
-        # Add locations
-        location_ids = detection_data.get("locations", [])
-        if location_ids:
-            # Handle both Location objects and IDs
-            locations = []
-            for loc in location_ids:
-                if isinstance(loc, int):
-                    try:
-                        locations.append(Location.objects.get(id=loc))
-                    except Location.DoesNotExist:
-                        logger.warning(f"Location ID {loc} not found")
-                else:
-                    locations.append(loc)
-
-            detection.locations.add(*locations)
-
-        return detection
-
-    except Exception as e:
-        logger.error(f"Failed to create detection: {str(e)}")
+    try:
+        with transaction.atomic():
+            Detection.objects.bulk_create([detection for detection, _ in batch], batch_size=500)
+            links = [
+                Detection.locations.through(detection_id=detection.id, location_id=location.id) for detection, detection_locations in batch for location in detection_locations
+            ]
+            Detection.locations.through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+    except IntegrityError as e:
+        # A concurrent run created one of the detections; fall back to creating them one by one
+        logger.warning(f"Bulk detection creation failed, creating detections individually: {str(e)}")
+        created = []
+        for detection, detection_locations in batch:
+            detection.pk = None
+            try:
+                with transaction.atomic():
+                    detection.save()
+                    detection.locations.add(*detection_locations)
+                created.append((detection, detection_locations))
+            except IntegrityError as e:
+                logger.error(f"Failed to create detection: {str(e)}")
+        return created
+
+    return batch
+
+
+def _location_id(location) -> int | None:
+    """ID of a detection result location, given as a Location, a dict with an "id" or an ID."""
+    if isinstance(location, dict):
+        location = location.get("id")
+    elif hasattr(location, "pk"):
+        location = location.pk
+    try:
+        return int(location)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid location {location!r} in detection result")
         return None
 
 
@@ -1,7 +1,7 @@
 """Tests for detector implementations."""
 
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 import numpy as np
 import pandas as pd
@@ -10,9 +10,11 @@ from django.utils import timezone
 
 from alert_framework.base_detector import BaseDetector
 from alert_framework.detectors.passthrough_detector import PassThroughDetector
+from alert_framework.detectors.surge_detector import ConflictSurgeDetector
 from alert_framework.detectors.test_detector import TestDetector
 from alert_framework.detectors.zscore_detector import ZScoreDetector
-from alert_framework.models import Detector
+from alert_framework.models import Detector, RollingBaseline
+from alert_framework.orchestration import run_detectors
 from alerts.models import ShockType
 from data_pipeline.models import Source, Variable, VariableData
 from location.models import AdmLevel, Location
@@ -245,25 +247,19 @@ class ZScoreDetectorTest(TestCase):
 
         self.assertIn("start_date and end_date are required", str(context.exception))
 
-    def test_queryset_to_dataframe(self):
-        """Test conversion of Django QuerySet to pandas DataFrame."""
-        # Create test data
+    def test_aggregate_frame(self):
+        """Test aggregation of a variable frame into a daily time series."""
+        # Create test data (plus one unmatched record, which is skipped)
         base_date = datetime(2024, 1, 1)
-        test_data = []
-
-        for i in range(5):
-            record = Mock()
-            record.start_date = base_date + timedelta(days=i)
-            record.end_date = base_date + timedelta(days=i)
-            record.gid_id = self.location.id
-            record.value = 100 + i * 10
-            test_data.append(record)
-
-        # Mock queryset
-        mock_queryset = Mock()
-        mock_queryset.__iter__ = Mock(return_value=iter(test_data))
+        frame = pd.DataFrame(
+            {
+                "date": pd.to_datetime([base_date + timedelta(days=i) for i in range(6)]),
+                "gid_id": [self.location.id] * 5 + [None],
+                "value": [100 + i * 10 for i in range(6)],
+            }
+        )
 
-        df = self.detector._queryset_to_dataframe(mock_queryset)
+        df = self.detector._aggregate_frame(frame)
 
         # Verify DataFrame structure
         self.assertIsInstance(df, pd.DataFrame)
@@ -280,6 +276,97 @@ class ZScoreDetectorTest(TestCase):
         expected_values = [100, 110, 120, 130, 140]
         self.assertListEqual(df["value"].tolist(), expected_values)
 
+    def test_get_variable_frame(self):
+        """Test loading variable data as plain columns with raw_data keys extracted by the database."""
+        base_date = datetime(2024, 1, 1).date()
+        VariableData.objects.create(
+            variable=self.variable, gid=self.location, adm_level=self.admin_level, start_date=base_date, end_date=base_date, value=5, raw_data={"reason": {"primary": "Conflict"}}
+        )
+        next_date = base_date + timedelta(days=1)
+        VariableData.objects.create(variable=self.variable, adm_level=self.admin_level, start_date=next_date, end_date=next_date, value=None)
+
+        df = self.detector.get_variable_frame("displacement_count", start_date=base_date, end_date=next_date, fields=("text",), raw_data_fields=("reason__primary",))
+
+        self.assertListEqual(list(df.columns), ["id", "start_date", "end_date", "gid_id", "value", "text", "raw_data_reason__primary", "date"])
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df.iloc[0]["gid_id"], self.location.id)
+        self.assertEqual(df.iloc[0]["raw_data_reason__primary"], "Conflict")
+        self.assertTrue(np.isnan(df.iloc[1]["value"]))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+
+        matched = self.detector.get_variable_frame("displacement_count", start_date=base_date, end_date=base_date + timedelta(days=1), matched_only=True)
+        self.assertEqual(len(matched), 1)
+
+    def test_incremental_baseline_matches_full_history(self):
+        """Test that a run continuing the stored rolling state scores new data like a run over the full history."""
+        base_date = datetime(2024, 1, 1).date()
+        for i in range(40):
+            date = base_date + timedelta(days=i)
+            VariableData.objects.create(variable=self.variable, gid=self.location, adm_level=self.admin_level, start_date=date, end_date=date, value=100 + (i % 5))
+
+        self.detector.detect(timezone.make_aware(datetime(2024, 1, 1)), timezone.make_aware(datetime(2024, 2, 9)))
+        state = RollingBaseline.objects.get(detector=self.detector_config, location=self.location)
+        self.assertEqual(len(state.periods), 30)
+        self.assertEqual(state.through, base_date + timedelta(days=39))
+
+        for i, value in enumerate([101, 160, 250], start=40):
+            VariableData.objects.create(
+                variable=self.variable, gid=self.location, adm_level=self.admin_level, start_date=base_date + timedelta(days=i), end_date=base_date + timedelta(days=i), value=value
+            )
+        start_date, end_date = timezone.make_aware(datetime(2024, 2, 9)), timezone.make_aware(datetime(2024, 2, 12))
+
+        incremental = ZScoreDetector(self.detector_config).detect(start_date, end_date)
+        full = ZScoreDetector(Detector(class_name=self.detector_config.class_name, configuration={**self.detector_config.configuration, "incremental_baseline": False})).detect(
+            start_date, end_date
+        )
+
+        self.assertEqual(len(incremental), 2)
+        self.assertListEqual([d["detection_data"]["zscore"] for d in incremental], [d["detection_data"]["zscore"] for d in full])
+        state.refresh_from_db()
+        self.assertEqual(state.through, base_date + timedelta(days=42))
+        self.assertEqual(state.periods[-1], [(base_date + timedelta(days=41)).isoformat(), 160.0])
+
+    def test_incremental_run_scores_location_without_state(self):
+        """Test that a location without a rolling state is scored even if its records end before the other states' open periods."""
+        base_date = datetime(2024, 1, 1).date()
+        for i in range(40):
+            date = base_date + timedelta(days=i)
+            VariableData.objects.create(variable=self.variable, gid=self.location, adm_level=self.admin_level, start_date=date, end_date=date, value=100 + (i % 5))
+        self.detector.detect(timezone.make_aware(datetime(2024, 1, 1)), timezone.make_aware(datetime(2024, 2, 9)))
+
+        other = Location.objects.create(name="Other Location", geo_id="SD_002", admin_level=self.admin_level)
+        for i in range(37):
+            date = base_date + timedelta(days=i)
+            VariableData.objects.create(variable=self.variable, gid=other, adm_level=self.admin_level, start_date=date, end_date=date, value=250 if i >= 35 else 100 + (i % 5))
+        start_date, end_date = timezone.make_aware(datetime(2024, 2, 1)), timezone.make_aware(datetime(2024, 2, 12))
+
+        incremental = ZScoreDetector(self.detector_config).detect(start_date, end_date)
+        full = ZScoreDetector(Detector(class_name=self.detector_config.class_name, configuration={**self.detector_config.configuration, "incremental_baseline": False})).detect(
+            start_date, end_date
+        )
+
+        other_zscores = [d["detection_data"]["zscore"] for d in incremental if d["locations"][0]["id"] == other.id]
+        self.assertTrue(other_zscores)
+        self.assertListEqual(other_zscores, [d["detection_data"]["zscore"] for d in full if d["locations"][0]["id"] == other.id])
+        self.assertEqual(ZScoreDetector(self.detector_config).data_requirements(start_date, end_date)[0].start_date, base_date + timedelta(days=31))
+
+    def test_group_run_loads_records_since_rolling_state(self):
+        """Test that a group run with stored rolling states only loads the records of the open periods onward."""
+        base_date = datetime(2024, 1, 1).date()
+        for i in range(43):
+            date = base_date + timedelta(days=i)
+            VariableData.objects.create(variable=self.variable, gid=self.location, adm_level=self.admin_level, start_date=date, end_date=date, value=100 + (i % 5))
+        self.detector.detect(timezone.make_aware(datetime(2024, 1, 1)), timezone.make_aware(datetime(2024, 2, 9)))
+
+        detector = ZScoreDetector(self.detector_config)
+        run_detectors([detector], timezone.make_aware(datetime(2024, 2, 9)), timezone.make_aware(datetime(2024, 2, 12)), max_workers=1)
+
+        self.assertEqual(len(detector.frame_cache.frames), 1)
+        requirement, frame = next(iter(detector.frame_cache.frames.values()))
+        self.assertEqual(requirement.start_date, base_date + timedelta(days=39))
+        self.assertEqual(len(frame), 4)
+        self.assertEqual(frame["start_date"].min(), base_date + timedelta(days=39))
+
     def test_calculate_zscore_and_alerts(self):
         """Test Z-score calculation and alert generation."""
         # Create test DataFrame with baseline and anomaly
@@ -587,4 +674,54 @@ class TestDetectorTest(TestCase):
         mock_detection.confidence_score = 0.6
         mock_detection.detection_data = {"scenario": "Conflict Escalation"}
         severity = self.detector._calculate_severity(mock_detection)
-        self.assertEqual(severity, 4)  # Reduced by 1 for low confidence
\ No newline at end of file
+        self.assertEqual(severity, 4)  # Reduced by 1 for low confidence
+
+class ConflictSurgeDetectorTest(TestCase):
+    """Test cases for ConflictSurgeDetector."""
+
+    def setUp(self):
+        """Set up three localities with analysis and lookback period events."""
+        self.source = Source.objects.create(name="ACLED", type="api", class_name="test.TestSource")
+        self.variable = Variable.objects.create(code="acled_events", name="ACLED Events", source=self.source, type="quantitative", period="day", adm_level=2)
+        self.admin_level = AdmLevel.objects.create(name="Locality", code="2")
+        self.surging, self.steady, self.new = (
+            Location.objects.create(name=name, geo_id=f"SD_00{i}", admin_level=self.admin_level) for i, name in enumerate(["Surging", "Steady", "New"], start=1)
+        )
+
+        self.detector = ConflictSurgeDetector(
+            Detector.objects.create(
+                name="Test Surge Detector",
+                class_name="alert_framework.detectors.surge_detector.ConflictSurgeDetector",
+                active=True,
+                configuration={"variable_code": "acled_events", "threshold_multiplier": 2.0, "min_events": 5, "lookback_period_days": 28},
+            )
+        )
+
+        # Analysis period 2024-01-22..29; lookback period 2023-12-24..2024-01-21 (4 equivalent periods)
+        history = {self.surging: [5, 5, 5, 5], self.steady: [10, 10, 10, 10], self.new: []}
+        recent = {self.surging: [10, 10, 10], self.steady: [6, 6], self.new: [10]}
+        for location in history:
+            for i, value in enumerate(history[location]):
+                self._create_record(location, datetime(2024, 1, 1).date() + timedelta(days=i * 5), value)
+            for i, value in enumerate(recent[location]):
+                self._create_record(location, datetime(2024, 1, 23).date() + timedelta(days=i), value)
+
+    def _create_record(self, location, date, value):
+        """Create one daily event count."""
+        VariableData.objects.create(variable=self.variable, gid=location, adm_level=self.admin_level, start_date=date, end_date=date, value=value)
+
+    def test_detect_in_constant_queries(self):
+        """Test that surges are found for all locations with one data query and one location query."""
+        start_date = timezone.make_aware(datetime(2024, 1, 22))
+        end_date = timezone.make_aware(datetime(2024, 1, 29))
+
+        with self.assertNumQueries(2):
+            detections = self.detector.detect(start_date, end_date)
+
+        self.assertEqual(len(detections), 1)
+        detection = detections[0]
+        self.assertEqual(detection["locations"], [self.surging.id])
+        self.assertEqual(detection["detection_data"]["recent_count"], 30.0)
+        self.assertEqual(detection["detection_data"]["historical_average"], 5.0)
+        self.assertEqual(detection["detection_data"]["surge_factor"], 6.0)
+        self.assertEqual(detection["detection_data"]["events_analyzed"], 3)
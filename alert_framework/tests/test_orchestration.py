@@ -0,0 +1,58 @@
+"""Tests for running detectors together on shared variable data."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from django.db import connections
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from alert_framework.base_detector import BaseDetector
+from alert_framework.detectors.surge_detector import ConflictSurgeDetector
+from alert_framework.models import Detector
+from alert_framework.orchestration import run_detectors
+from data_pipeline.models import Source, Variable, VariableData
+from location.models import AdmLevel, Location
+
+
+class RunDetectorsTest(TransactionTestCase):
+    """Test cases for run_detectors.
+
+    A TransactionTestCase, so the worker threads' own database connections see the committed test data.
+    """
+
+    def setUp(self):
+        """Set up two surge detectors reading the same variable."""
+        source = Source.objects.create(name="ACLED", type="api", class_name="test.TestSource")
+        variable = Variable.objects.create(code="acled_events", name="ACLED Events", source=source, type="quantitative", period="day", adm_level=2)
+        admin_level = AdmLevel.objects.create(code="2", name="Locality")
+        self.location = Location.objects.create(name="Surging", geo_id="SD_001", admin_level=admin_level)
+
+        for day, value in [(1, 5), (6, 5), (11, 5), (16, 5), (23, 10), (24, 10), (25, 10)]:
+            date = datetime(2024, 1, 1).date() + timedelta(days=day - 1)
+            VariableData.objects.create(variable=variable, gid=self.location, adm_level=admin_level, start_date=date, end_date=date, value=value)
+
+        class_name = "alert_framework.detectors.surge_detector.ConflictSurgeDetector"
+        self.detectors = [
+            ConflictSurgeDetector(
+                Detector.objects.create(name=name, class_name=class_name, active=True, configuration={"variable_code": "acled_events", "lookback_period_days": days})
+            )
+            for name, days in [("Surge 28 days", 28), ("Surge 14 days", 14)]
+        ]
+
+    def test_threaded_run_shares_data_and_closes_connections(self):
+        """Test that detectors run in worker threads share one data load and close their connections."""
+        get_variable_data = BaseDetector.get_variable_data
+
+        with (
+            patch.object(BaseDetector, "get_variable_data", autospec=True, side_effect=get_variable_data) as mock_get_variable_data,
+            patch.object(connections, "close_all", wraps=connections.close_all) as mock_close_all,
+        ):
+            runs = run_detectors(self.detectors, timezone.make_aware(datetime(2024, 1, 22)), timezone.make_aware(datetime(2024, 1, 29)), max_workers=2)
+
+        self.assertEqual(mock_get_variable_data.call_count, 1)
+        self.assertEqual(mock_close_all.call_count, 2)
+        self.assertEqual([run.detector for run in runs], self.detectors)
+        for run in runs:
+            self.assertIsNone(run.error)
+            self.assertEqual([detection["locations"] for detection in run.detections], [[self.location.id]])
@@ -1,20 +1,23 @@
 """Tests for Celery tasks."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
+from alert_framework.base_detector import BaseDetector
 from alert_framework.models import AlertTemplate, Detection, Detector, PublishedAlert
 from alert_framework.tasks import (
     cancel_published_alert,
     monitor_published_alerts,
     publish_alert,
     run_detector,
+    run_detector_group,
     update_published_alert,
 )
 from alerts.models import ShockType
+from data_pipeline.models import Source, Variable, VariableData
 from location.models import AdmLevel, Location
 
 
@@ -67,7 +70,7 @@ class RunDetectorTaskTest(TestCase):
 
         # Mock deduplication checker
         with patch("alert_framework.tasks.duplication_checker") as mock_dedup:
-            mock_dedup.is_duplicate.return_value = False
+            mock_dedup.mark_duplicates.return_value = 0
 
             result = run_detector(detector_id=self.detector.id)
 
@@ -90,7 +93,7 @@ class RunDetectorTaskTest(TestCase):
 
         # Mock deduplication checker to return duplicate
         with patch("alert_framework.tasks.duplication_checker") as mock_dedup:
-            mock_dedup.is_duplicate.return_value = True
+            mock_dedup.mark_duplicates.return_value = 1
 
             result = run_detector(detector_id=self.detector.id)
 
@@ -98,6 +101,83 @@ class RunDetectorTaskTest(TestCase):
         self.assertEqual(result["detections_created"], 0)
         self.assertEqual(result["detections_duplicates"], 1)
 
+    @patch("alert_framework.tasks.process_pending_detections")
+    @patch("alert_framework.tasks.import_string")
+    @patch.object(run_detector, 'max_retries', 0)
+    def test_detections_created_in_bulk(self, mock_import_string, mock_process):
+        """Test that results are stored with their locations and deduplicated within the batch."""
+        ShockType.objects.create(name="Conflict")
+        other = Location.objects.create(name="Other Location", geo_id="SD_002", admin_level=self.admin_level)
+        timestamp = timezone.now()
+        mock_detector_instance = Mock()
+        mock_detector_instance.detect.return_value = [
+            {"title": "First", "detection_timestamp": timestamp, "shock_type_name": "Conflict", "locations": [self.location.id]},
+            {"title": "Same place", "detection_timestamp": timestamp + timedelta(hours=1), "shock_type_name": "Conflict", "locations": [{"id": self.location.id}]},
+            {"title": "Elsewhere", "detection_timestamp": timestamp, "shock_type_name": "Conflict", "locations": [other, 99999]},
+            {"title": "First", "detection_timestamp": timestamp, "locations": []},
+        ]
+        mock_import_string.return_value = Mock(return_value=mock_detector_instance)
+        mock_process.return_value = {"alerts_created": 2}
+
+        result = run_detector(detector_id=self.detector.id)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["detections_created"], 2)
+        self.assertEqual(result["detections_duplicates"], 1)
+
+        first = Detection.objects.get(title="First")
+        self.assertEqual(first.shock_type.name, "Conflict")
+        self.assertListEqual(list(first.locations.values_list("id", flat=True)), [self.location.id])
+        self.assertEqual(Detection.objects.get(title="Same place").duplicate_of, first)
+        self.assertListEqual(list(Detection.objects.get(title="Elsewhere").locations.values_list("id", flat=True)), [other.id])
+
+
+@override_settings(ALERT_DETECTOR_WORKERS=1)
+class RunDetectorGroupTaskTest(TestCase):
+    """Test cases for run_detector_group task."""
+
+    def setUp(self):
+        """Set up two surge detectors reading the same variable."""
+        source = Source.objects.create(name="ACLED", type="api", class_name="test.TestSource")
+        variable = Variable.objects.create(code="acled_events", name="ACLED Events", source=source, type="quantitative", period="day", adm_level=2)
+        admin_level = AdmLevel.objects.create(code="2", name="Locality")
+        self.location = Location.objects.create(name="Surging", geo_id="SD_001", admin_level=admin_level)
+
+        for day, value in [(1, 5), (6, 5), (11, 5), (16, 5), (23, 10), (24, 10), (25, 10)]:
+            date = datetime(2024, 1, day).date()
+            VariableData.objects.create(variable=variable, gid=self.location, adm_level=admin_level, start_date=date, end_date=date, value=value)
+
+        class_name = "alert_framework.detectors.surge_detector.ConflictSurgeDetector"
+        self.detectors = [
+            Detector.objects.create(name="Surge 28 days", class_name=class_name, active=True, configuration={"variable_code": "acled_events", "lookback_period_days": 28}),
+            Detector.objects.create(name="Surge 14 days", class_name=class_name, active=True, configuration={"variable_code": "acled_events", "lookback_period_days": 14}),
+        ]
+
+    @patch("alert_framework.tasks.process_pending_detections")
+    def test_detectors_share_one_data_load(self, mock_process):
+        """Test that detectors reading one variable load it once and their detections are processed together."""
+        mock_process.return_value = {"alerts_created": 2}
+        get_variable_data = BaseDetector.get_variable_data
+
+        with patch("alert_framework.tasks.duplication_checker") as mock_dedup, patch.object(
+            BaseDetector, "get_variable_data", autospec=True, side_effect=get_variable_data
+        ) as mock_get_variable_data:
+            mock_dedup.mark_duplicates.return_value = 0
+            start_date, end_date = timezone.make_aware(datetime(2024, 1, 22)), timezone.make_aware(datetime(2024, 1, 29))
+            result = run_detector_group([detector.id for detector in self.detectors], start_date=start_date.isoformat(), end_date=end_date.isoformat())
+
+        self.assertTrue(result["success"])
+        self.assertEqual(mock_get_variable_data.call_count, 1)
+        self.assertEqual(result["detections_created"], 2)
+        self.assertEqual([d["detections_created"] for d in result["detectors"]], [1, 1])
+        self.assertEqual(Detection.objects.filter(locations=self.location).count(), 2)
+        mock_process.assert_called_once()
+        self.assertEqual(result["alerts_created"], 2)
+
+        for detector in self.detectors:
+            detector.refresh_from_db()
+            self.assertEqual(detector.run_count, 1)
+
 
 class PublishAlertTaskTest(TestCase):
     """Test cases for publish_alert task."""
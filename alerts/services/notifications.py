@@ -9,6 +9,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from alerts.models import Alert, EmailTemplate, Subscription, UserAlert
+from location.models import Location
 from notifications.models import InternalNotification
 
 logger = logging.getLogger(__name__)
@@ -80,17 +81,12 @@ class NotificationService:
         """
         # Collect all locations including parent hierarchy
         # This allows state-level subscriptions to match city-level alerts
-        alert_location_ids = set()
+        alert_locations = list(alert.locations.all())
+        alert_location_ids = {loc.id for loc in alert_locations}
 
-        for loc in alert.locations.all():
-            # Add the location itself
-            alert_location_ids.add(loc.id)
-
-            # Add all parent locations up the hierarchy
-            parent = loc.parent
-            while parent:
-                alert_location_ids.add(parent.id)
-                parent = parent.parent
+        # Add all parent locations up the hierarchy in one query (materialised location paths)
+        if alert_locations:
+            alert_location_ids.update(Location.objects.ancestors_of(*alert_locations).values_list("id", flat=True))
 
         # Match subscriptions against location hierarchy
         return Subscription.objects.filter(
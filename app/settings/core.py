@@ -231,6 +231,24 @@ PIPELINE_API_BASE_URL = os.getenv("PIPELINE_API_BASE_URL", "http://localhost:800
 PIPELINE_API_UPDATE_ENDPOINT = os.getenv("PIPELINE_API_UPDATE_ENDPOINT", "update-locations/")
 PIPELINE_API_TIMEOUT = int(os.getenv("PIPELINE_API_TIMEOUT", "30"))  # seconds
 
+# Worker processes for CPU-bound source processing (shapefile overlays, zonal stats); 1 runs serially
+PIPELINE_PROCESS_WORKERS = int(os.getenv("PIPELINE_PROCESS_WORKERS", "1"))
+
+# Threads running the detectors triggered together by a source (sharing the variable data they read); 1 runs serially
+ALERT_DETECTOR_WORKERS = int(os.getenv("ALERT_DETECTOR_WORKERS", "4"))
+
+# GeoParquet cache of ADM boundary GeoDataFrames used by geospatial sources
+LOCATION_BOUNDARY_CACHE_DIR = os.getenv("LOCATION_BOUNDARY_CACHE_DIR", os.path.join("raw_data", "_boundaries"))
+
+# Rank fuzzy location candidates with pg_trgm on PostgreSQL (Python scoring is used otherwise)
+LOCATION_TRIGRAM_SEARCH = os.getenv("LOCATION_TRIGRAM_SEARCH", "True").lower() in ("true", "1", "yes")
+
+# Match source coordinates to boundaries before names: "memory" (STRtree over cached boundaries), "database" (spatial query) or "off"
+LOCATION_POINT_LOOKUP = os.getenv("LOCATION_POINT_LOOKUP", "memory")
+
+# Level of detail of the boundaries used by raster and polygon overlays ("full", or a SimplifiedBoundary level; simplified polygons may overlap)
+LOCATION_OVERLAY_DETAIL = os.getenv("LOCATION_OVERLAY_DETAIL", "full")
+
 # Site URL
 SITE_URL = os.getenv("SITE_URL", "http://localhost:8000")
 
@@ -8,6 +8,7 @@ from django.db.models.functions import Coalesce
 from django.views.generic import TemplateView
 
 from data_pipeline.models import VariableData
+from location.simplification import DEFAULT_MAP_DETAIL
 from .models import Theme
 
 
@@ -16,6 +17,9 @@ class DashboardMapView(LoginRequiredMixin, TemplateView):
 
     template_name = "dashboard/dashboard.html"
 
+    # Level of detail of the choropleth boundaries embedded in the page (see location.simplification)
+    MAP_DETAIL = DEFAULT_MAP_DETAIL
+
     def get_context_data(self, **kwargs):
         """Add choropleth data and themes to context."""
         context = super().get_context_data(**kwargs)
@@ -126,7 +130,7 @@ class DashboardMapView(LoginRequiredMixin, TemplateView):
         all_adm2_locations = Location.objects.filter(
             admin_level__code='2',
             boundary__isnull=False
-        )
+        ).with_boundary(self.MAP_DETAIL)
 
         # Build features based on source admin level
         features = []
@@ -150,7 +154,7 @@ class DashboardMapView(LoginRequiredMixin, TemplateView):
                         location.admin_level.code,
                         latest_date,
                         latest_date,
-                        location.boundary
+                        location.display_boundary
                     )
                 )
         else:
@@ -172,7 +176,7 @@ class DashboardMapView(LoginRequiredMixin, TemplateView):
                         location.admin_level.code,
                         latest_date,
                         latest_date,
-                        location.boundary
+                        location.display_boundary
                     )
                 )
 
@@ -4,7 +4,7 @@ from django.contrib import admin, messages
 from django.utils.html import format_html
 from modeltranslation.admin import TranslationAdmin
 
-from .models import Source, TaskStatistics, Variable, VariableData
+from .models import ProcessingWatermark, Source, TaskStatistics, Variable, VariableData
 
 
 @admin.register(Source)
@@ -236,6 +236,16 @@ class VariableDataAdmin(admin.ModelAdmin):
     remove_all_data_globally.short_description = "⚠️ Remove ALL data from entire system"
 
 
+@admin.register(ProcessingWatermark)
+class ProcessingWatermarkAdmin(admin.ModelAdmin):
+    """Admin interface for ProcessingWatermark model."""
+
+    list_display = ["variable", "raw_sequence", "last_record_date", "last_processed_at"]
+    list_filter = ["variable__source"]
+    search_fields = ["variable__code", "variable__name"]
+    readonly_fields = ["created_at", "updated_at"]
+
+
 @admin.register(TaskStatistics)
 class TaskStatisticsAdmin(admin.ModelAdmin):
     """Admin interface for TaskStatistics model."""
@@ -0,0 +1,61 @@
+"""Database aggregate functions used by source aggregation."""
+
+from django.db.models import Aggregate, TextField, Value
+from django.db.models.expressions import OrderByList
+from django.db.models.functions import NullIf
+
+# First SQLite version accepting ORDER BY inside aggregate calls
+SQLITE_AGGREGATE_ORDER_BY = (3, 44, 0)
+
+
+class JoinedText(Aggregate):
+    """Join the non-empty text values of a group with a separator.
+
+    Compiles to ``STRING_AGG`` on PostgreSQL and ``GROUP_CONCAT`` on SQLite.
+    Returns NULL for groups without any text. Values are joined in
+    ``order_by`` order, so unchanged groups join to the same text on every
+    run (SQLite before 3.44 has no ORDER BY in aggregates and joins values in
+    scan order).
+
+    Usage:
+        VariableData.objects.values("gid").annotate(text=JoinedText("text", order_by=("gid__path", "id")))
+    """
+
+    function = "STRING_AGG"
+    template = "%(function)s(%(distinct)s%(expressions)s%(order_by)s)"
+    output_field = TextField()
+
+    def __init__(self, expression, separator: str = " | ", order_by=(), **extra):
+        """Initialize aggregate.
+
+        Args:
+            expression: Text field or expression to join
+            separator: Separator placed between values
+            order_by: Fields or expressions ordering the joined values ("-" prefix for descending)
+            **extra: Extra Aggregate options
+        """
+        self.order_by = OrderByList(*order_by) if order_by else None
+        super().__init__(NullIf(expression, Value("")), Value(separator), **extra)
+
+    def get_source_expressions(self):
+        """Source expressions followed by the filter and the ordering."""
+        return [*super().get_source_expressions(), self.order_by]
+
+    def set_source_expressions(self, exprs):
+        """Set source expressions, the filter and the ordering."""
+        *exprs, self.order_by = exprs
+        return super().set_source_expressions(exprs)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Compile the aggregate with its ORDER BY clause."""
+        order_by_sql, order_by_params = "", ()
+        if self.order_by is not None and extra_context.pop("allows_order_by", True):
+            order_by_sql, order_by_params = compiler.compile(self.order_by)
+            order_by_sql = f" {order_by_sql}"
+        sql, params = super().as_sql(compiler, connection, order_by=order_by_sql, **extra_context)
+        return sql, (*params, *order_by_params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        """Compile to GROUP_CONCAT on SQLite."""
+        allows_order_by = connection.Database.sqlite_version_info >= SQLITE_AGGREGATE_ORDER_BY
+        return self.as_sql(compiler, connection, function="GROUP_CONCAT", allows_order_by=allows_order_by, **extra_context)
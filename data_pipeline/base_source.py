@@ -3,17 +3,29 @@
 import logging
 import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from django.db.models.lookups import StartsWith
 from django.urls import reverse
 from django.utils import timezone
 
-from location.models import Location
+from location.models import PATH_SEPARATOR, Location
 
-from .models import Variable, VariableData
+from .aggregates import JoinedText
+from .http_client import SourceHttpClient
+from .location_resolution import LocationResolver
+from .models import ProcessingWatermark, Variable, VariableData
+from .process_pool import SourceProcessPool
+from .raw_store import RawDataStore
+from .upsert import VariableDataWriter
 
 
 class Source(ABC):
@@ -23,10 +35,44 @@ class Source(ABC):
     standardized data retrieval, processing, and aggregation methods.
     """
 
+    # HTTP client settings, overridden by sources with API-specific limits
+    HTTP_MAX_WORKERS = 4
+    HTTP_RATE_LIMIT: tuple[int, float] | None = None  # (max_requests, period_seconds)
+    HTTP_TIMEOUT = 60
+
     def __init__(self, source_model: "Source"):
         """Initialize source with database model instance."""
         self.source_model = source_model
         self.logger = logging.getLogger(f"data_pipeline.{source_model.class_name}")
+        self._http_client: SourceHttpClient | None = None
+        self._location_resolver: LocationResolver | None = None
+        # Set by the pipeline tasks for --full runs: ignore watermarks and rewrite unchanged rows
+        self.full_reprocess = False
+
+    def __getstate__(self) -> dict:
+        """Pickle without per-run runtime state (used when sent to worker processes)."""
+        state = self.__dict__.copy()
+        state["_http_client"] = None
+        state["_location_resolver"] = None
+        return state
+
+    @property
+    def http(self) -> SourceHttpClient:
+        """Pooled HTTP client shared by all requests of this source instance.
+
+        Reuses keep-alive connections, retries transient failures with backoff
+        and enforces the source's ``HTTP_RATE_LIMIT`` budget, shared by all runs
+        of the source class.
+        """
+        if self._http_client is None:
+            self._http_client = SourceHttpClient(
+                max_workers=self.HTTP_MAX_WORKERS,
+                rate_limit=self.HTTP_RATE_LIMIT,
+                rate_limit_name=type(self).__name__,
+                timeout=self.HTTP_TIMEOUT,
+                logger=self.logger,
+            )
+        return self._http_client
 
     @abstractmethod
     def get(self, variable: Variable, **kwargs) -> bool:
@@ -107,9 +153,10 @@ class Source(ABC):
         variables = self.source_model.variables.all()
         success_count = 0
 
-        for variable in variables:
-            if self.process(variable, **kwargs):
-                success_count += 1
+        with self.location_resolution():
+            for variable in variables:
+                if self.process(variable, **kwargs):
+                    success_count += 1
 
         processing_successful = success_count > 0
 
@@ -170,53 +217,45 @@ class Source(ABC):
         source_data: models.QuerySet,
         target_adm_level: int,
     ) -> bool:
-        """Aggregate data to higher administrative level."""
-        # Get locations at target level
-        target_locations = Location.objects.filter(admin_level__code=str(target_adm_level))
-
-        aggregated_count = 0
-
-        for location in target_locations:
-            # Get child locations
-            child_locations = location.get_descendants()
-
-            # Aggregate data from child locations
-            location_data = source_data.filter(gid__in=child_locations)
+        """Aggregate data to higher administrative level.
 
-            if not location_data.exists():
-                continue
-
-            # Group by date period and sum values
-            date_groups = {}
-            for data in location_data:
-                key = (data.start_date, data.end_date, data.period)
-                if key not in date_groups:
-                    date_groups[key] = {"value": 0, "text_parts": []}
-
-                if data.value is not None:
-                    date_groups[key]["value"] += data.value
+        Source rows are grouped by their target-level ancestor (found through
+        the materialised location paths) and period in a single SQL query,
+        then written with the batched upsert. Each new aggregated record links
+        to its first source record as ``parent``; parent links of existing
+        aggregated records are left untouched.
+        """
+        targets = Location.objects.filter(admin_level__code=str(target_adm_level)).exclude(path="")
+        ancestor = targets.filter(StartsWith(OuterRef("gid__path"), Concat(F("path"), Value(PATH_SEPARATOR)))).values("id")[:1]
+
+        groups = (
+            source_data.filter(gid__isnull=False)
+            .annotate(target_id=Subquery(ancestor))
+            .filter(target_id__isnull=False)
+            .values("target_id", "start_date", "end_date", "period")
+            .annotate(total=models.Sum("value"), joined_text=JoinedText("text", order_by=("gid__path", "id")), first_record_id=models.Min("id"))
+            .order_by("target_id", "start_date", "end_date")
+        )
 
-                if data.text:
-                    date_groups[key]["text_parts"].append(data.text)
+        target_locations = targets.select_related("admin_level").in_bulk()
 
-            # Create aggregated records
-            for (start_date, end_date, period), aggregated in date_groups.items():
-                VariableData.objects.update_or_create(
-                    variable=variable,
-                    start_date=start_date,
-                    end_date=end_date,
+        with self.variable_data_writer() as writer:
+            for group in groups.iterator():
+                location = target_locations[group["target_id"]]
+                writer.add(
+                    variable,
+                    group["start_date"],
+                    group["end_date"],
                     gid=location,
-                    defaults={
-                        "period": period,
-                        "adm_level": location.admin_level,
-                        "value": aggregated["value"] if aggregated["value"] > 0 else None,
-                        "text": " | ".join(aggregated["text_parts"]) if aggregated["text_parts"] else "",
-                        "updated_at": timezone.now(),
-                    },
+                    adm_level=location.admin_level,
+                    period=group["period"],
+                    value=group["total"] if group["total"] and group["total"] > 0 else None,
+                    text=group["joined_text"] or "",
+                    parent=VariableData(pk=group["first_record_id"]),
                 )
-                aggregated_count += 1
 
-        self.logger.info(f"Created {aggregated_count} aggregated records")
+        aggregated_count = writer.written + writer.unchanged
+        self.logger.info(f"Created {aggregated_count} aggregated records ({writer.inserted} new, {writer.updated} updated, {writer.unchanged} unchanged)")
         return aggregated_count > 0
 
     def _aggregate_temporally(self, variable: Variable, source_data: models.QuerySet, target_period: str) -> bool:
@@ -365,6 +404,87 @@ class Source(ABC):
 
         self.logger.error(full_message)
 
+    def variable_data_writer(self, batch_size: int = VariableDataWriter.DEFAULT_BATCH_SIZE) -> VariableDataWriter:
+        """Get a batched VariableData writer for this source.
+
+        Use as a context manager so remaining rows are flushed on exit:
+
+            with self.variable_data_writer() as writer:
+                writer.add(variable, start_date, end_date, gid=location, value=value)
+
+        Rows whose content hash matches the stored row are skipped unless the
+        source is running a full reprocess.
+
+        Args:
+            batch_size: Number of rows buffered before each bulk write
+
+        Returns:
+            VariableDataWriter: Writer reporting inserted/updated counts
+        """
+        return VariableDataWriter(batch_size=batch_size, logger=self.logger, skip_unchanged=not self.full_reprocess)
+
+    def get_processing_watermark(self, variable: Variable) -> ProcessingWatermark:
+        """Get the processing watermark of a variable, creating an empty one if needed."""
+        watermark, _ = ProcessingWatermark.objects.get_or_create(variable=variable)
+        return watermark
+
+    def update_processing_watermark(self, variable: Variable, raw_sequence: int | None = None, last_record_date=None) -> ProcessingWatermark:
+        """Advance the processing watermark of a variable after a successful run.
+
+        Args:
+            variable: Processed variable
+            raw_sequence: Raw data store sequence number processed up to
+            last_record_date: Latest record date processed
+
+        Returns:
+            ProcessingWatermark: Updated watermark
+        """
+        watermark = self.get_processing_watermark(variable)
+        if raw_sequence is not None:
+            watermark.raw_sequence = raw_sequence
+        if last_record_date is not None and (self.full_reprocess or watermark.last_record_date is None or last_record_date > watermark.last_record_date):
+            watermark.last_record_date = last_record_date
+        watermark.last_processed_at = timezone.now()
+        watermark.save()
+        return watermark
+
+    def process_pool(self, max_workers: int | None = None) -> SourceProcessPool:
+        """Get a process pool for CPU-bound per-item processing.
+
+        Args:
+            max_workers: Number of worker processes (defaults to the PIPELINE_PROCESS_WORKERS setting)
+
+        Returns:
+            SourceProcessPool: Pool calling this source's methods in worker processes
+        """
+        if max_workers is None:
+            max_workers = getattr(settings, "PIPELINE_PROCESS_WORKERS", 1)
+        return SourceProcessPool(self, max_workers=max_workers, logger=self.logger)
+
+    @contextmanager
+    def location_resolution(self) -> Iterator[LocationResolver]:
+        """Share location resolution across a processing run.
+
+        While active, ``validate_location_match`` resolves each distinct location
+        name once and queues unmatched locations, which are recorded in bulk when
+        the block exits (or on ``resolver.flush()``). Nested calls reuse the
+        active resolver.
+
+        Yields:
+            LocationResolver: Resolver with memoised matches and AdmLevel lookups
+        """
+        if self._location_resolver is not None:
+            yield self._location_resolver
+            return
+
+        resolver = LocationResolver(self, logger=self.logger)
+        self._location_resolver = resolver
+        try:
+            yield resolver
+            resolver.flush()
+        finally:
+            self._location_resolver = None
+
     def get_raw_data_path(self, variable: Variable, suffix: str = "") -> str:
         """Get file path for storing raw data."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -373,10 +493,30 @@ class Source(ABC):
         os.makedirs(dir_path, exist_ok=True)
         return os.path.join(dir_path, filename)
 
+    def raw_data_store(self, dataset: str, granularity: str = "month") -> RawDataStore:
+        """Get the partitioned Parquet raw-data store for a dataset of this source.
+
+        Prefer this over ``get_raw_data_path`` for flat record streams: records are
+        partitioned by date, indexed by a manifest and read back memory-mapped, so
+        processing can load only the partitions added since its last run.
+
+        Args:
+            dataset: Dataset name (e.g. "events")
+            granularity: Partition granularity, "day" or "month"
+
+        Returns:
+            RawDataStore: Store rooted at ``raw_data/{source}/{dataset}``
+        """
+        return RawDataStore(self.source_model.name, dataset, granularity=granularity, logger=self.logger)
+
     def validate_location_match(self, location_name: str, source_name: str, context_data: dict = None) -> "Location | None":
         """Match location name to Location model using the LocationMatcher from the location app.
 
-        This method delegates to the location app's hierarchical matching system.
+        When the context carries ``latitude`` and ``longitude``, the point is first
+        matched to the ADM2 boundary containing it (``point_admin_level`` selects
+        another level); name matching is only used if that finds nothing.
+        Otherwise this method delegates to the location app's hierarchical
+        matching system.
 
         Args:
             location_name: Name of location to match
@@ -388,11 +528,24 @@ class Source(ABC):
         """
         from location.utils import location_matcher
 
+        context_data = context_data or {}
+
+        # Coordinates are matched to boundaries before any name matching
+        location = self._locate_from_coordinates(context_data)
+        if location:
+            self._last_unmatched_key = None
+            return location
+
         if not location_name or not location_name.strip():
             return None
 
         location_name = location_name.strip()
-        context_data = context_data or {}
+
+        # Within a processing run, reuse resolved locations and batch unmatched recording
+        if self._location_resolver is not None:
+            location = self._location_resolver.resolve(location_name, source_name, context_data)
+            self._last_unmatched_key = None if location else (source_name, location_name)
+            return location
 
         # Extract and normalize admin level from context
         admin_level = self._extract_admin_level_from_context(context_data)
@@ -407,6 +560,18 @@ class Source(ABC):
         self._record_unmatched_location(location_name, source_name, context_data)
         return None
 
+    def _locate_from_coordinates(self, context_data: dict) -> "Location | None":
+        """Match the coordinates in context data to the boundary containing them."""
+        if "latitude" not in context_data or "longitude" not in context_data:
+            return None
+
+        if self._location_resolver is not None:
+            return self._location_resolver.locate(context_data)
+
+        from location.spatial import point_locator
+
+        return point_locator.locate(context_data["latitude"], context_data["longitude"], context_data.get("point_admin_level"))
+
     def _extract_admin_level_from_context(self, context_data: dict) -> int | None:
         """Extract and normalize admin level from context data."""
         admin_level = context_data.get("expected_admin_level") or context_data.get("admin_level")
@@ -492,6 +657,8 @@ class Source(ABC):
         Returns:
             UnmatchedLocation or None: The unmatched location record if location matching failed
         """
+        if self._location_resolver is not None and getattr(self, "_last_unmatched_key", None):
+            return self._location_resolver.unmatched_location(*self._last_unmatched_key)
         return getattr(self, "_last_unmatched_location", None)
 
     def handle_unmatched_location(self, location_name: str, source_name: str, context_data: dict = None):
@@ -0,0 +1,261 @@
+"""Pooled HTTP client with retries, rate limiting and concurrent pagination for sources."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Sliding-window rate limiter sharing its budget through the Django cache.
+
+    Blocks callers until a request slot is available so that at most about
+    ``max_requests`` are issued in any ``period`` seconds by every thread,
+    source run and Celery worker using the same budget ``name``. Requests are
+    counted per fixed window in the default cache (Redis in production); the
+    previous window's count is weighted by its overlap with the sliding
+    window ending now (sliding-window counter). If the shared cache is
+    unavailable, the budget is enforced within this process only.
+    """
+
+    CACHE_PREFIX = "source_http_rate"
+
+    def __init__(self, max_requests: int, period: float, name: str = "default"):
+        """Initialize limiter with a request budget per period (seconds) shared under a name."""
+        self.max_requests = max_requests
+        self.period = period
+        self.name = name
+        self._timestamps: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until a request may be issued and record it."""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _window_key(self, window: int) -> str:
+        return f"{self.CACHE_PREFIX}:{self.name}:{self.period}:{window}"
+
+    def _try_acquire(self) -> float:
+        """Record a request if the shared budget allows it.
+
+        Returns:
+            float: 0 if the request was recorded, else seconds to wait before retrying
+        """
+        now = time.time()
+        window, elapsed = divmod(now, self.period)
+        key = self._window_key(int(window))
+        try:
+            cache.add(key, 0, timeout=int(2 * self.period) + 1)
+            count = cache.incr(key)
+            previous = cache.get(self._window_key(int(window) - 1)) or 0
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Shared rate limit budget '{self.name}' unavailable, limiting this process only: {e}")
+            return self._try_acquire_locally()
+
+        if previous * (1 - elapsed / self.period) + count <= self.max_requests:
+            return 0
+
+        # Give the slot back and wait for the current window to end, or for enough of the previous one to slide out
+        try:
+            cache.decr(key)
+        except Exception:
+            pass
+        if count > self.max_requests:
+            return self.period - elapsed
+        return max(self.period * (1 - (self.max_requests - count) / previous) - elapsed, 0.01)
+
+    def _try_acquire_locally(self) -> float:
+        """Process-local sliding window used when the shared cache fails."""
+        with self._lock:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] >= self.period:
+                self._timestamps.popleft()
+
+            if len(self._timestamps) < self.max_requests:
+                self._timestamps.append(now)
+                return 0
+            return max(self.period - (now - self._timestamps[0]), 0.01)
+
+
+class SourceHttpClient:
+    """HTTP client shared by the requests of one source run.
+
+    Provides:
+    - A ``requests.Session`` with a keep-alive connection pool sized to the worker count
+    - Automatic retries with exponential backoff on connection errors, 429 and 5xx
+    - An optional per-source rate-limit budget (e.g. Dataminr's 180 requests / 10 minutes), shared across runs and workers
+    - Conditional GETs (ETag / Last-Modified) with validators kept in the Django cache
+    - Bounded-concurrency helpers for page-numbered APIs and independent requests
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    VALIDATOR_CACHE_TIMEOUT = 30 * 24 * 3600  # 30 days
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        rate_limit: tuple[int, float] | None = None,
+        rate_limit_name: str = "default",
+        retries: int = 3,
+        backoff_factor: float = 1.0,
+        timeout: float = 60,
+        headers: dict[str, str] | None = None,
+        logger: logging.Logger | None = None,
+    ):
+        """Initialize client.
+
+        Args:
+            max_workers: Maximum number of concurrent requests
+            rate_limit: Optional (max_requests, period_seconds) budget
+            rate_limit_name: Name the budget is shared under (e.g. the source class)
+            retries: Number of retries for failed requests
+            backoff_factor: Exponential backoff factor between retries (seconds)
+            timeout: Default request timeout in seconds
+            headers: Default headers sent with every request
+            logger: Logger to report through
+        """
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(*rate_limit, name=rate_limit_name) if rate_limit else None
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.default_headers = headers or {}
+        self.logger = logger or logging.getLogger(__name__)
+        self.session = self.new_session()
+
+    def new_session(self) -> requests.Session:
+        """Replace the client session with a fresh pooled session (e.g. before re-authenticating)."""
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Return the last response so callers can inspect the status
+        )
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=retry)
+
+        session = requests.Session()
+        session.headers.update(self.default_headers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.session = session
+        return session
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None, conditional: bool = False, **kwargs) -> requests.Response:
+        """Issue a rate-limited GET request.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Extra headers for this request
+            conditional: Send stored ETag/Last-Modified validators; a 304 response means unchanged
+            **kwargs: Passed through to ``requests.Session.get``
+
+        Returns:
+            requests.Response: The response (status 304 if ``conditional`` and not modified)
+        """
+        headers = dict(headers or {})
+        validator_key = self._validator_cache_key(url, params) if conditional else None
+        if validator_key:
+            validators = cache.get(validator_key) or {}
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(url, params=params, headers=headers, **kwargs)
+
+        if validator_key and response.status_code == 200:
+            validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            validators = {name: value for name, value in validators.items() if isinstance(value, str)}
+            if validators:
+                cache.set(validator_key, validators, self.VALIDATOR_CACHE_TIMEOUT)
+
+        return response
+
+    def fetch_pages(self, fetch_page: Callable[[int], list[T]], page_size: int, first_page: int = 1) -> Iterator[list[T]]:
+        """Fetch a page-numbered collection with bounded concurrency.
+
+        Keeps up to ``max_workers`` page requests in flight and yields pages in
+        order. Fetching stops at the first empty page or page shorter than
+        ``page_size``; speculative requests beyond the end are cancelled or discarded.
+
+        Args:
+            fetch_page: Callable returning the items of a page number
+            page_size: Expected number of items in a full page
+            first_page: Number of the first page
+
+        Yields:
+            list: Items of each non-empty page
+        """
+        if self.max_workers == 1:
+            page = first_page
+            while True:
+                items = fetch_page(page)
+                if not items:
+                    return
+                yield items
+                if len(items) < page_size:
+                    return
+                page += 1
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="source-page")
+        try:
+            next_page = first_page
+            in_flight = deque()
+            for _ in range(self.max_workers):
+                in_flight.append(executor.submit(fetch_page, next_page))
+                next_page += 1
+
+            while in_flight:
+                items = in_flight.popleft().result()
+                if not items:
+                    return
+                yield items
+                if len(items) < page_size:
+                    return
+                in_flight.append(executor.submit(fetch_page, next_page))
+                next_page += 1
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def map(self, fn: Callable[[R], T], items: Iterable[R]) -> list[T]:
+        """Apply ``fn`` to independent items concurrently, preserving order."""
+        items = list(items)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="source-fetch") as executor:
+            return list(executor.map(fn, items))
+
+    @staticmethod
+    def _validator_cache_key(url: str, params: dict | None) -> str:
+        """Build cache key for conditional request validators."""
+        fingerprint = json.dumps([url, sorted((params or {}).items())], default=str)
+        return f"source_http_validators:{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
@@ -0,0 +1,233 @@
+"""Per-run location resolution context for source processing."""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from location.models import AdmLevel, Location, UnmatchedLocation
+
+    from .base_source import Source
+
+
+class LocationResolver:
+    """Resolve location names once per processing run.
+
+    Within a run every distinct (source, name, admin level) is matched against
+    the gazetteer once, AdmLevel lookups are memoised, and unmatched locations
+    are accumulated in memory and recorded in bulk, adding the run's
+    occurrence counts in the database. Records with coordinates are first matched to
+    the boundary containing them, located in bulk per run.
+
+    Usage:
+        with self.location_resolution() as resolver:
+            resolver.prefetch_points(coordinates)
+            resolver.prefetch(names, "ACLED")
+            location = self.validate_location_match(name, "ACLED", context_data)
+            ...
+            resolver.flush()
+            unmatched = resolver.unmatched_location(name, "ACLED")
+    """
+
+    def __init__(self, source: "Source", logger: logging.Logger | None = None):
+        """Initialize resolver with empty caches."""
+        self.source = source
+        self.logger = logger or logging.getLogger(__name__)
+        self._matches: dict[tuple, Location | None] = {}
+        self._points: dict[tuple, Location | None] = {}
+        self._adm_levels: dict[str, AdmLevel | None] = {}
+        self._unmatched: dict[tuple[str, str], UnmatchedLocation] = {}
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def prefetch(self, location_names, source_name: str, admin_level: int | None = None) -> None:
+        """Resolve distinct location names in bulk ahead of per-record lookups."""
+        from location.utils import location_matcher
+
+        names = {name.strip() for name in location_names if name and name.strip()}
+        names = sorted(name for name in names if (source_name, name, admin_level) not in self._matches)
+        if not names:
+            return
+
+        matches = location_matcher.bulk_match_locations(names, source=source_name, admin_level=admin_level)
+        for name in names:
+            self._matches[(source_name, name, admin_level)] = matches.get(name)
+
+    def prefetch_points(self, points, admin_level: str | None = None) -> None:
+        """Locate distinct (latitude, longitude) points in bulk ahead of per-record lookups."""
+        from location.spatial import point_locator
+
+        code = str(admin_level or point_locator.DEFAULT_ADMIN_LEVEL)
+        keys = {point_locator.coordinates(*point) for point in points}
+        keys = sorted(key for key in keys if key is not None and (key, code) not in self._points)
+        if not keys:
+            return
+
+        for key, location in zip(keys, point_locator.locate_many(keys, code), strict=True):
+            self._points[(key, code)] = location
+
+    def locate(self, context_data: dict | None) -> "Location | None":
+        """Match the ``latitude``/``longitude`` of context data to the boundary containing them.
+
+        The admin level searched is ``point_admin_level`` from the context, ADM2 by default.
+        """
+        from location.spatial import point_locator
+
+        context_data = context_data or {}
+        point = point_locator.coordinates(context_data.get("latitude"), context_data.get("longitude"))
+        if point is None:
+            return None
+
+        code = str(context_data.get("point_admin_level") or point_locator.DEFAULT_ADMIN_LEVEL)
+        if (point, code) not in self._points:
+            self.prefetch_points([point], code)
+        return self._points.get((point, code))
+
+    def resolve(self, location_name: str, source_name: str, context_data: dict | None = None) -> "Location | None":
+        """Match a location name, queueing it as unmatched if no match is found."""
+        from location.utils import location_matcher
+
+        if not location_name or not location_name.strip():
+            return None
+
+        location_name = location_name.strip()
+        context_data = context_data or {}
+        admin_level = self.source._extract_admin_level_from_context(context_data)
+
+        key = (source_name, location_name, admin_level)
+        if key not in self._matches:
+            self._matches[key] = location_matcher.match_location(location_name=location_name, source=source_name, admin_level=admin_level, context_data=context_data)
+
+        location = self._matches[key]
+        if location is None:
+            self._queue_unmatched(location_name, source_name, context_data)
+        return location
+
+    def adm_level(self, code: str, fallback: bool = True) -> "AdmLevel | None":
+        """Get AdmLevel by code, memoised for the run.
+
+        Args:
+            code: Admin level code (e.g. "2")
+            fallback: Return any AdmLevel if the code does not exist
+        """
+        from location.models import AdmLevel
+
+        code = str(code)
+        if code not in self._adm_levels:
+            self._adm_levels[code] = AdmLevel.objects.filter(code=code).first()
+
+        adm_level = self._adm_levels[code]
+        if adm_level is None and fallback:
+            if "" not in self._adm_levels:
+                self._adm_levels[""] = AdmLevel.objects.first()
+            adm_level = self._adm_levels[""]
+        return adm_level
+
+    def unmatched_location(self, location_name: str, source_name: str) -> "UnmatchedLocation | None":
+        """Get the UnmatchedLocation record for a name, recording pending ones first."""
+        key = (source_name, (location_name or "").strip())
+        if key in self._pending:
+            self.flush()
+        return self._unmatched.get(key)
+
+    def _queue_unmatched(self, location_name: str, source_name: str, context_data: dict) -> None:
+        """Count an unmatched occurrence to be recorded on the next flush."""
+        key = (source_name, location_name)
+        entry = self._pending.get(key)
+        if entry is None:
+            if key not in self._unmatched:
+                self.logger.warning(f"No location match found for: {location_name}")
+            entry = self._pending[key] = {
+                "count": 0,
+                "context": self.source._build_context_string(context_data),
+                "admin_level": self.source._determine_admin_level_for_record(location_name, context_data),
+                "detected_admin_level": None,
+            }
+
+        entry["count"] += 1
+        if context_data.get("detected_admin_level") is not None:
+            entry["detected_admin_level"] = str(context_data["detected_admin_level"])
+
+    def flush(self) -> None:
+        """Record queued unmatched locations with one bulk insert and a few set-based updates.
+
+        Occurrence counts are incremented in the database (``F`` expressions,
+        one UPDATE per distinct count), so concurrent runs recording the same
+        names add up instead of overwriting each other. New records are
+        inserted with a zero count and incremented like existing ones, which
+        also covers records another run inserts in between.
+        """
+        from location.models import UnmatchedLocation
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        created = {}
+
+        try:
+            with transaction.atomic():
+                lookup = [key for key in pending if key not in self._unmatched]
+                if lookup:
+                    self._unmatched.update(self._fetch_unmatched(lookup))
+
+                new_keys = [key for key in lookup if key not in self._unmatched]
+                if new_keys:
+                    UnmatchedLocation.objects.bulk_create(
+                        [
+                            UnmatchedLocation(
+                                name=name,
+                                source=source_name,
+                                context=pending[(source_name, name)]["context"],
+                                admin_level=pending[(source_name, name)]["detected_admin_level"] or pending[(source_name, name)]["admin_level"],
+                                occurrence_count=0,
+                            )
+                            for source_name, name in new_keys
+                        ],
+                        ignore_conflicts=True,
+                    )
+                    created = self._fetch_unmatched(new_keys)
+                    self._unmatched.update(created)
+
+                now = timezone.now()
+                ids_by_count: dict[int, list[int]] = {}
+                ids_by_admin_level: dict[str, list[int]] = {}
+                for key, entry in pending.items():
+                    record = self._unmatched.get(key)
+                    if record is None:
+                        continue
+                    record.occurrence_count += entry["count"]
+                    record.last_seen = now
+                    ids_by_count.setdefault(entry["count"], []).append(record.pk)
+                    if entry["detected_admin_level"] and record.admin_level != entry["detected_admin_level"]:
+                        record.admin_level = entry["detected_admin_level"]
+                        ids_by_admin_level.setdefault(record.admin_level, []).append(record.pk)
+
+                for count, ids in ids_by_count.items():
+                    UnmatchedLocation.objects.filter(pk__in=ids).update(occurrence_count=F("occurrence_count") + count, last_seen=now)
+                for admin_level, ids in ids_by_admin_level.items():
+                    UnmatchedLocation.objects.filter(pk__in=ids).update(admin_level=admin_level)
+
+            # bulk_create bypasses save(), so trigger match computation for new records explicitly
+            for record in created.values():
+                record.trigger_match_computation()
+
+        except Exception as e:
+            self.logger.error(f"Failed to record unmatched locations: {str(e)}")
+
+    def _fetch_unmatched(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], "UnmatchedLocation"]:
+        """Load existing UnmatchedLocation records for (source, name) keys in one query."""
+        from location.models import UnmatchedLocation
+
+        names_by_source: dict[str, set[str]] = {}
+        for source_name, name in keys:
+            names_by_source.setdefault(source_name, set()).add(name)
+
+        query = Q()
+        for source_name, names in names_by_source.items():
+            query |= Q(source=source_name, name__in=names)
+
+        wanted = set(keys)
+        return {(record.source, record.name): record for record in UnmatchedLocation.objects.filter(query) if (record.source, record.name) in wanted}
@@ -29,6 +29,8 @@ class Command(BaseCommand):
 
         parser.add_argument("--end-date", type=str, help="End date for data retrieval (format: YYYY-MM-DD)")
 
+        parser.add_argument("--full", action="store_true", help="Reprocess all raw data, ignoring processing watermarks and rewriting unchanged rows")
+
     def handle(self, *args, **options):
         """Handle command execution."""
         if options["list_sources"]:
@@ -48,6 +50,8 @@ class Command(BaseCommand):
             task_kwargs["start_date"] = start_date
         if end_date:
             task_kwargs["end_date"] = end_date
+        if options.get("full"):
+            task_kwargs["full_reprocess"] = True
 
         if source_name and source_name.lower() == "idmc" and not os.getenv("IDMC_API_KEY"):
             raise CommandError("IDMC_API_KEY environment variable not set. Please set it before running the pipeline for the IDMC source.")
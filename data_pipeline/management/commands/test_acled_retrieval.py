@@ -130,20 +130,23 @@ class Command(BaseCommand):
             if success:
                 self.stdout.write(self.style.SUCCESS("✓ Data retrieval successful"))
                 
-                # Show some stats about retrieved data
-                latest_file = acled._get_latest_raw_data_file(variable)
-                if latest_file:
-                    import json
-                    with open(latest_file, 'r') as f:
-                        raw_data = json.load(f)
-                    events = raw_data.get('events', [])
-                    self.stdout.write(f"  - Retrieved {len(events)} events")
-                    self.stdout.write(f"  - Raw data saved to: {latest_file}")
+                # Show some stats about the retrieved run
+                store = acled.raw_data_store(acled.EVENTS_DATASET)
+                run_entries = store.partitions(since=store.latest_sequence - 1)
+                if run_entries:
+                    event_count = sum(entry["rows"] for entry in run_entries)
+                    sample_events = []
+                    for event in store.iter_records(run_entries):
+                        sample_events.append(event)
+                        if len(sample_events) >= 3:
+                            break
+                    self.stdout.write(f"  - Retrieved {event_count} events")
+                    self.stdout.write(f"  - Raw data saved to: {store.path} ({len(run_entries)} partition files)")
                     
                     # Show sample events
-                    if events:
+                    if sample_events:
                         self.stdout.write("\n  Sample events:")
-                        for i, event in enumerate(events[:3], 1):
+                        for i, event in enumerate(sample_events, 1):
                             location = event.get('admin1', 'Unknown')
                             date = event.get('event_date', 'Unknown')
                             event_type = event.get('event_type', 'Unknown')
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pipeline', '0013_variabledata_raw_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='variabledata',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the record payload, used to skip unchanged rows on reprocessing', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='ProcessingWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('raw_sequence', models.PositiveIntegerField(default=0, help_text='Last raw data store sequence number processed')),
+                ('last_record_date', models.DateField(blank=True, help_text='Latest record date processed', null=True)),
+                ('last_processed_at', models.DateTimeField(blank=True, help_text='When the variable was last processed', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('variable', models.OneToOneField(help_text='Variable this watermark belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='processing_watermark', to='data_pipeline.variable')),
+            ],
+            options={
+                'ordering': ['variable__source__name', 'variable__code'],
+            },
+        ),
+    ]
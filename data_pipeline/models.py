@@ -109,6 +109,7 @@ class VariableData(models.Model):
     value = models.FloatField(null=True, blank=True, help_text="Numeric value (for quantitative data)")
     text = models.TextField(blank=True, help_text="Text content (for qualitative/textual data)")
     raw_data = models.JSONField(null=True, blank=True, help_text="Original raw data from source (complete JSON record)")
+    content_hash = models.CharField(max_length=64, blank=True, default="", help_text="SHA-256 of the record payload, used to skip unchanged rows on reprocessing")
     parent = models.ForeignKey(
         "self", 
         null=True, 
@@ -174,6 +175,31 @@ class VariableData(models.Model):
         return current
 
 
+class ProcessingWatermark(models.Model):
+    """Incremental processing position of a variable.
+
+    Records which raw data a variable has already been processed from, so
+    subsequent runs only handle records retrieved since. Sources with a
+    partitioned raw data store track the store's commit sequence number.
+    """
+
+    variable = models.OneToOneField(Variable, on_delete=models.CASCADE, related_name="processing_watermark", help_text="Variable this watermark belongs to")
+    raw_sequence = models.PositiveIntegerField(default=0, help_text="Last raw data store sequence number processed")
+    last_record_date = models.DateField(null=True, blank=True, help_text="Latest record date processed")
+    last_processed_at = models.DateTimeField(null=True, blank=True, help_text="When the variable was last processed")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta configuration for ProcessingWatermark model."""
+
+        ordering = ["variable__source__name", "variable__code"]
+
+    def __str__(self):
+        return f"Watermark - {self.variable} (sequence {self.raw_sequence})"
+
+
 class TaskStatistics(models.Model):
     """Statistics for task execution performance."""
 
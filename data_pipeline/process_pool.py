@@ -0,0 +1,80 @@
+"""Process pool for CPU-bound source processing."""
+
+import logging
+import multiprocessing
+import pickle
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+# Read-only state of the current worker process, set once by _init_worker
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(payload: bytes) -> None:
+    """Set up Django and unpickle the shared state once per worker process."""
+    import django
+
+    django.setup()
+    _worker_state.update(pickle.loads(payload))
+
+
+def _run_task(method_name: str, args: tuple) -> Any:
+    """Call the source method with one argument tuple and the shared keyword arguments."""
+    return getattr(_worker_state["source"], method_name)(*args, **_worker_state["shared"])
+
+
+class SourceProcessPool:
+    """Fan CPU-bound per-item work out across worker processes.
+
+    The source instance and the shared arguments (e.g. ADM boundary
+    GeoDataFrames, raster paths) are pickled once and unpickled once per
+    worker through the pool initializer, so each task only sends its own
+    arguments and returns its result. Results come back in input order, ready to be
+    merged before the database write in the parent process.
+
+    Workers are started with ``spawn`` so they never inherit the parent's
+    database connections; methods run in workers must not query the
+    database.
+
+    With ``max_workers`` of 1 (or a single item) everything runs serially
+    in the current process.
+
+    Usage:
+        pool = self.process_pool(max_workers)
+        results = pool.starmap("_process_shapefile", [(zip_path, date_str), ...], adm_gdf=adm_gdf)
+    """
+
+    def __init__(self, source, max_workers: int = 1, logger: logging.Logger | None = None):
+        """Initialize pool.
+
+        Args:
+            source: Source instance whose methods are called in the workers
+            max_workers: Number of worker processes
+            logger: Logger to report through
+        """
+        self.source = source
+        self.max_workers = max(1, int(max_workers or 1))
+        self.logger = logger or logging.getLogger(__name__)
+
+    def starmap(self, method_name: str, arg_tuples: Iterable[tuple], **shared) -> list[Any]:
+        """Call ``source.<method_name>(*args, **shared)`` for every argument tuple.
+
+        Args:
+            method_name: Name of the source method to call
+            arg_tuples: Positional arguments of each call (must be picklable)
+            **shared: Read-only keyword arguments shared by all calls
+
+        Returns:
+            list: Results in input order
+        """
+        items = [tuple(args) for args in arg_tuples]
+        method = getattr(self.source, method_name)
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [method(*args, **shared) for args in items]
+
+        self.logger.info(f"Processing {len(items)} items across {workers} worker processes")
+        payload = pickle.dumps({"source": self.source, "shared": shared}, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker, initargs=(payload,)) as executor:
+            return list(executor.map(_run_task, [method_name] * len(items), items))
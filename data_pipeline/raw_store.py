@@ -0,0 +1,234 @@
+"""Partitioned Parquet storage for raw source records."""
+
+import json
+import logging
+import os
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.utils import timezone
+
+
+class RawDataStore:
+    """Columnar raw-data store partitioned by record date.
+
+    Records are written as Parquet files under
+    ``raw_data/{source}/{dataset}/date={partition}/`` and indexed by a JSON
+    manifest (``_manifest.json``). Each retrieval run appends its files to the
+    manifest with a monotonically increasing sequence number once all of them
+    are complete, so a failed run never exposes partial data. Processing can
+    then ask for the partitions added since a sequence number (e.g. its
+    processing watermark) instead of rescanning the directory or the full
+    history, and reads use memory-mapped Parquet files.
+
+    Usage:
+        store = self.raw_data_store("events")
+        store.write(events, date_field="event_date", metadata={"start_date": "2025-01-01"})
+
+        entries = store.partitions(since=watermark.raw_sequence)
+        for record in store.iter_records(entries):
+            ...
+        watermark.raw_sequence = store.latest_sequence
+    """
+
+    MANIFEST_NAME = "_manifest.json"
+    UNKNOWN_PARTITION = "unknown"
+    DEFAULT_BATCH_ROWS = 50_000
+
+    def __init__(self, source_name: str, dataset: str, root: str = "raw_data", granularity: str = "month", logger: logging.Logger | None = None):
+        """Initialize store.
+
+        Args:
+            source_name: Source name (first directory level)
+            dataset: Dataset name within the source (e.g. "events")
+            root: Root raw data directory
+            granularity: Partition granularity, "day" or "month"
+            logger: Logger to report through
+        """
+        if granularity not in ("day", "month"):
+            raise ValueError(f"Unsupported partition granularity: {granularity}")
+
+        self.path = os.path.join(root, source_name, dataset)
+        self.granularity = granularity
+        self.logger = logger or logging.getLogger(__name__)
+
+    @property
+    def manifest_path(self) -> str:
+        """Path of the manifest file."""
+        return os.path.join(self.path, self.MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        """Whether any run has been committed to the store."""
+        return os.path.exists(self.manifest_path)
+
+    @property
+    def latest_sequence(self) -> int:
+        """Sequence number of the most recent committed run (0 if none)."""
+        return self._load_manifest()["sequence"]
+
+    def write(self, records: Iterable[dict[str, Any]], date_field: str, metadata: dict | None = None, batch_rows: int = DEFAULT_BATCH_ROWS) -> int:
+        """Write records into date partitions and commit them as one run.
+
+        Records are buffered per partition. Whenever the buffers of all
+        partitions together reach ``batch_rows``, the largest buffer is flushed
+        to a new Parquet file, so memory stays bounded for large retrievals
+        however many partitions they span.
+
+        Args:
+            records: Records to store (flat dicts)
+            date_field: Record field holding an ISO date used for partitioning
+            metadata: Run metadata stored in the manifest (e.g. query parameters)
+            batch_rows: Maximum rows buffered across all partitions
+
+        Returns:
+            int: Number of records written
+        """
+        run_id = f"{timezone.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+        buffers: dict[str, list[dict[str, Any]]] = {}
+        files: list[dict[str, Any]] = []
+        total = 0
+        buffered = 0
+
+        try:
+            for record in records:
+                partition = self._partition_key(record.get(date_field))
+                buffers.setdefault(partition, []).append(record)
+                total += 1
+                buffered += 1
+                if buffered >= batch_rows:
+                    largest = max(buffers, key=lambda key: len(buffers[key]))
+                    files.append(self._write_file(largest, buffers[largest], date_field, run_id))
+                    buffered -= len(buffers[largest])
+                    buffers[largest] = []
+
+            for partition, buffer in buffers.items():
+                if buffer:
+                    files.append(self._write_file(partition, buffer, date_field, run_id))
+        except BaseException:
+            # Remove files of the incomplete run; they were never added to the manifest
+            for entry in files:
+                path = os.path.join(self.path, entry["path"])
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+
+        self._commit(run_id, files, total, metadata)
+        return total
+
+    def partitions(self, since: int | None = None, keys: Iterable[str] | None = None, start_date: str | None = None, end_date: str | None = None) -> list[dict[str, Any]]:
+        """List manifest file entries, oldest first.
+
+        Args:
+            since: Only entries committed after this sequence number
+            keys: Only entries of these partition keys
+            start_date: Only partitions that may contain records on or after this ISO date
+            end_date: Only partitions that may contain records on or before this ISO date
+
+        Returns:
+            list: Manifest entries with path, partition, rows and sequence
+        """
+        keys = set(keys) if keys is not None else None
+        start_key = self._partition_key(start_date) if start_date else None
+        end_key = self._partition_key(end_date) if end_date else None
+
+        entries = []
+        for entry in self._load_manifest()["files"]:
+            partition = entry["partition"]
+            if since is not None and entry["sequence"] <= since:
+                continue
+            if keys is not None and partition not in keys:
+                continue
+            if partition != self.UNKNOWN_PARTITION and ((start_key and partition < start_key) or (end_key and partition > end_key)):
+                continue
+            entries.append(entry)
+        return entries
+
+    def read_table(self, entries: list[dict[str, Any]], columns: list[str] | None = None) -> pa.Table:
+        """Read manifest entries into a single Arrow table using memory-mapped files."""
+        tables = [pq.read_table(os.path.join(self.path, entry["path"]), columns=columns, memory_map=True) for entry in entries]
+        if not tables:
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def iter_records(self, entries: list[dict[str, Any]], columns: list[str] | None = None) -> Iterator[dict[str, Any]]:
+        """Iterate records of manifest entries one file and record batch at a time."""
+        for entry in entries:
+            table = pq.read_table(os.path.join(self.path, entry["path"]), columns=columns, memory_map=True)
+            for batch in table.to_batches():
+                yield from batch.to_pylist()
+
+    def _partition_key(self, value: Any) -> str:
+        """Build the partition key of a record date value."""
+        if not value:
+            return self.UNKNOWN_PARTITION
+        try:
+            parsed = datetime.fromisoformat(str(value)[:10])
+        except ValueError:
+            return self.UNKNOWN_PARTITION
+        return parsed.strftime("%Y-%m-%d" if self.granularity == "day" else "%Y-%m")
+
+    def _write_file(self, partition: str, records: list[dict[str, Any]], date_field: str, run_id: str) -> dict[str, Any]:
+        """Write one Parquet file for a partition and return its manifest entry."""
+        relative_path = os.path.join(f"date={partition}", f"part-{run_id}-{uuid.uuid4().hex[:8]}.parquet")
+        path = os.path.join(self.path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        table = self._to_table(records)
+        tmp_path = f"{path}.part"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
+        dates = sorted(str(record.get(date_field))[:10] for record in records if record.get(date_field))
+        return {
+            "path": relative_path,
+            "partition": partition,
+            "rows": len(records),
+            "min_date": dates[0] if dates else None,
+            "max_date": dates[-1] if dates else None,
+        }
+
+    @staticmethod
+    def _to_table(records: list[dict[str, Any]]) -> pa.Table:
+        """Build an Arrow table from records with the union of their fields.
+
+        Columns whose values have inconsistent types are stored as strings
+        (JSON for nested values) rather than failing the write.
+        """
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        arrays = {}
+        for column in columns:
+            values = [record.get(column) for record in records]
+            try:
+                arrays[column] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrays[column] = pa.array([None if v is None else v if isinstance(v, str) else json.dumps(v, default=str) for v in values], type=pa.string())
+        return pa.table(arrays)
+
+    def _commit(self, run_id: str, files: list[dict[str, Any]], total: int, metadata: dict | None) -> None:
+        """Append a completed run's files to the manifest."""
+        manifest = self._load_manifest()
+        sequence = manifest["sequence"] + 1
+        manifest["sequence"] = sequence
+        manifest["runs"].append({"run_id": run_id, "sequence": sequence, "rows": total, "written_at": timezone.now().isoformat(), "metadata": metadata or {}})
+        manifest["files"].extend({**entry, "sequence": sequence, "run_id": run_id} for entry in files)
+        self._save_manifest(manifest)
+        self.logger.info(f"Committed {total} records in {len(files)} files to {self.path} (run {sequence})")
+
+    def _load_manifest(self) -> dict[str, Any]:
+        """Load the manifest, or an empty one if the store has no runs."""
+        if not os.path.exists(self.manifest_path):
+            return {"sequence": 0, "runs": [], "files": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict[str, Any]) -> None:
+        """Atomically replace the manifest."""
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
@@ -1,15 +1,17 @@
 """ACLED data source implementation."""
 
+import gzip
 import json
 import os
-from datetime import datetime
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+import pandas as pd
 import requests
-from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
+from ..raw_store import RawDataStore
 
 
 class ACLED(Source):
@@ -37,11 +39,26 @@ class ACLED(Source):
     BASE_URL = "https://acleddata.com"
     API_ENDPOINT = f"{BASE_URL}/api/acled/read"
     LOGIN_ENDPOINT = f"{BASE_URL}/user/login"
+    PAGE_LIMIT = 5000  # ACLED max limit
+    EVENTS_DATASET = "events"  # Raw data store dataset shared by all ACLED variables
+    EVENTS_FILE_SUFFIX = ".ndjson.gz"  # Legacy shared raw file format
+
+    # Event fields used to compute variables
+    EVENT_FIELDS = ["event_id_cnty", "event_date", "admin1", "admin2", "location", "latitude", "longitude", "event_type", "disorder_type", "fatalities", "notes"]
+
+    # Event count variables: (event field, matching value)
+    EVENT_TYPE_VARIABLES = {
+        "acled_battles": ("event_type", "Battles"),
+        "acled_violence_civilians": ("disorder_type", "Violence against civilians"),
+        "acled_explosions": ("event_type", "Explosions/Remote violence"),
+        "acled_riots": ("disorder_type", "Demonstrations"),
+        "acled_strategic_developments": ("disorder_type", "Strategic developments"),
+    }
 
     def __init__(self, source_model):
         """Initialize ACLED source with metadata."""
         super().__init__(source_model)
-        self.session = requests.Session()
+        self.session = self.http.session
 
     def get_required_env_vars(self) -> list[str]:
         """ACLED requires username and API key."""
@@ -103,8 +120,8 @@ class ACLED(Source):
 
             self.log_info("Authenticating with ACLED API")
 
-            # Create fresh session
-            self.session = requests.Session()
+            # Create fresh pooled session (shared with page requests)
+            self.session = self.http.new_session()
 
             # First, get initial session cookies
             initial_response = self.session.get(self.BASE_URL)
@@ -235,7 +252,21 @@ class ACLED(Source):
             return {"base_url_accessible": False, "credentials_valid": False, "api_accessible": False, "blocked": False, "error_message": f"Connection error: {str(e)}"}
 
     def _fetch_sudan_data(self, start_date: str = None, end_date: str = None, **kwargs) -> list[dict[str, Any]]:
-        """Fetch Sudan conflict data from ACLED API."""
+        """Fetch Sudan conflict data from ACLED API as a single list.
+
+        Prefer _iter_sudan_pages() for large date ranges, which keeps only one page in memory.
+        """
+        all_events = []
+        for events in self._iter_sudan_pages(start_date=start_date, end_date=end_date, **kwargs):
+            all_events.extend(events)
+        return all_events
+
+    def _iter_sudan_pages(self, start_date: str = None, end_date: str = None, **kwargs) -> Iterator[list[dict[str, Any]]]:
+        """Fetch Sudan conflict data from ACLED API one page at a time.
+
+        Yields:
+            list: Events of each non-empty page, in API order
+        """
         if not self._authenticate():
             raise Exception("Failed to authenticate with ACLED API")
 
@@ -245,7 +276,7 @@ class ACLED(Source):
         params = {
             "country": "Sudan",
             "_format": "json",
-            "limit": 5000,  # ACLED max limit
+            "limit": self.PAGE_LIMIT,
         }
 
         if start_date and end_date:
@@ -260,83 +291,45 @@ class ACLED(Source):
         else:
             self.log_info("No date filter specified - will get recent data")
             
-        # Test basic API connectivity first with a recent date range
-        test_params = {
-            "country": "Sudan", 
-            "_format": "json", 
-            "limit": 1,
-            "event_date": "2024-01-01|2024-01-31",
-            "event_date_where": "BETWEEN"
-        }
-        self.log_info(f"Testing API with basic params: {test_params}")
-        test_response = self.session.get(self.API_ENDPOINT, params=test_params)
-        self.log_info(f"Test response status: {test_response.status_code}")
-        if test_response.status_code == 200:
-            test_data = test_response.json()
-            if isinstance(test_data, list):
-                self.log_info(f"Test returned {len(test_data)} events (direct list)")
-            elif isinstance(test_data, dict):
-                test_events = test_data.get("data", [])
-                self.log_info(f"Test returned {len(test_events)} events (wrapped), keys: {list(test_data.keys())}")
-        else:
-            self.log_error(f"API test failed: {test_response.text}")
-            raise Exception(f"ACLED API test failed with status {test_response.status_code}")
-
-        all_events = []
-        page = 0
-
-        while True:
-            page += 1
+        def fetch_page(page: int) -> list[dict[str, Any]]:
             current_params = {**params, "page": page}
-
             self.log_info(f"Fetching ACLED data page {page}", params=str(current_params))
 
-            response = self.session.get(self.API_ENDPOINT, params=current_params)
+            response = self.http.get(self.API_ENDPOINT, params=current_params)
 
             if response.status_code != 200:
                 raise Exception(f"ACLED API request failed with status {response.status_code}: {response.text}")
 
-            # Debug: log response info
-            self.log_info(f"Response status: {response.status_code}, Content-Type: {response.headers.get('content-type')}")
-            if len(response.text) < 500:
-                self.log_info(f"Full response: {response.text}")
-            else:
-                self.log_info(f"Response size: {len(response.text)} chars, first 300 chars: {response.text[:300]}")
-
             data = response.json()
 
             # Handle different ACLED API response formats
             if isinstance(data, list):
                 # Direct list of events
                 events = data
-                self.log_info(f"Got direct list response with {len(events)} events")
             elif isinstance(data, dict):
                 # Wrapped response format
                 if not data.get("success"):
                     raise Exception(f"ACLED API returned error: {data.get('error', 'Unknown error')}")
                 events = data.get("data", [])
-                self.log_info(f"Got wrapped response: success={data.get('success')}, data_count={len(events)}, keys={list(data.keys())}")
-                
-                # Debug: check if there's additional info in the response
+
                 if not events and "count" in data:
                     self.log_info(f"API reports total count: {data.get('count')}")
                 if "messages" in data:
                     self.log_info(f"API messages: {data.get('messages')}")
             else:
                 raise Exception(f"Unexpected ACLED API response format: {type(data)}")
-            
-            self.log_info(f"Page {page} returned {len(events)} events")
-            if not events:
-                break
 
-            all_events.extend(events)
+            self.log_info(f"Page {page} returned {len(events)} events")
+            return events
 
-            # Check if we've reached the end
-            if len(events) < params["limit"]:
-                break
+        # Pages are requested concurrently over the pooled session and yielded in order,
+        # stopping at the first empty or short page
+        total_events = 0
+        for events in self.http.fetch_pages(fetch_page, page_size=params["limit"]):
+            total_events += len(events)
+            yield events
 
-        self.log_info(f"Retrieved {len(all_events)} ACLED events for Sudan")
-        return all_events
+        self.log_info(f"Retrieved {total_events} ACLED events for Sudan")
 
     def get_all_variables(self, **kwargs) -> bool:
         """Retrieve raw ACLED data for all variables (single API call)."""
@@ -357,26 +350,14 @@ class ACLED(Source):
                     kwargs["end_date"] = date_params["end_date"]
                     self.log_info("No existing ACLED data found - downloading from 2020-01-01 to present")
 
-            # Fetch all Sudan data in one query
-            events = self._fetch_sudan_data(**kwargs)
+            # Stream all Sudan data into the partitioned raw data store shared by every ACLED variable
+            store = self.raw_data_store(self.EVENTS_DATASET)
+            events = (event for page in self._iter_sudan_pages(**kwargs) for event in page)
+            total_events = store.write(events, date_field="event_date", metadata=kwargs)
 
-            # Save raw data for all variables (they all use the same raw data)
-            variables = self.source_model.variables.all()
-            saved_count = 0
-
-            for variable in variables:
-                try:
-                    raw_data_path = self.get_raw_data_path(variable, suffix=".json")
-                    with open(raw_data_path, "w", encoding="utf-8") as f:
-                        json.dump(
-                            {"retrieved_at": timezone.now().isoformat(), "total_events": len(events), "query_params": kwargs, "events": events}, f, indent=2, ensure_ascii=False
-                        )
-                    saved_count += 1
-                except Exception as e:
-                    self.log_error(f"Failed to save raw data for {variable.code}", error=e)
-
-            self.log_info(f"Saved {len(events)} events to {saved_count} variable files")
-            return saved_count > 0
+            variable_count = self.source_model.variables.count()
+            self.log_info(f"Saved {total_events} events to {store.path} (shared by {variable_count} variables)")
+            return True
 
         except Exception as e:
             self.log_error("ACLED data retrieval failed for all variables", error=e)
@@ -399,83 +380,67 @@ class ACLED(Source):
                 self.log_error("No variables found for ACLED source")
                 return False
 
-            # Find most recent raw data file from first variable
-            raw_data_path = self._get_latest_raw_data_file(variables[0])
-            if not raw_data_path:
-                self.log_error("No raw data file found for processing")
-                return False
-
-            # Load raw data
-            with open(raw_data_path, encoding="utf-8") as f:
-                raw_data = json.load(f)
-
-            events = raw_data.get("events", [])
-            if not events:
+            store = self.raw_data_store(self.EVENTS_DATASET)
+            if store.exists():
+                # Resume from the least advanced variable watermark; --full runs reprocess everything
+                since = 0 if self.full_reprocess else min(self.get_processing_watermark(variable).raw_sequence for variable in variables)
+                event_batches, processed_sequence = self._load_unprocessed_events(store, since)
+            else:
+                # Fall back to the most recent legacy raw file
+                raw_data_path = self._get_latest_raw_data_file(variables[0])
+                if not raw_data_path:
+                    self.log_error("No raw data file found for processing")
+                    return False
+                event_batches, processed_sequence = [self._iter_raw_events(raw_data_path)], None
+
+            # Compute all variables one batch of events at a time, reading events lazily
+            results = self._compute_variables_in_batches(event_batches)
+            if not any(results.values()):
                 self.log_info("No events to process")
+                if processed_sequence is not None:
+                    for variable in variables:
+                        self.update_processing_watermark(variable, raw_sequence=processed_sequence)
                 return True
 
-            # Compute all variables from events in one pass
-            results = self._compute_variables(events)
-
-            # Save processed data for each variable
-            total_saved = 0
-            for var_code, data_points in results.items():
-                var_instance = Variable.objects.filter(source=self.source_model, code=var_code).first()
-
-                if not var_instance:
+            variables_by_code = {variable.code: variable for variable in variables}
+            for var_code in results:
+                if var_code not in variables_by_code:
                     self.log_info(f"Skipping {var_code} - variable not found")
-                    continue
 
-                saved_count = 0
-                for data_point in data_points:
-                    location = self.validate_location_match(
-                        data_point["location_name"],
+            with self.location_resolution() as resolver:
+                # Resolve each distinct location once, then record all unmatched locations in one bulk upsert
+                # Event coordinates are located in one STRtree query per admin level; only the remaining names are matched
+                data_points = [(var_code, point) for var_code, points in results.items() if var_code in variables_by_code for point in points]
+                for code in ("1", "2"):
+                    resolver.prefetch_points(((point.get("latitude"), point.get("longitude")) for _, point in data_points if point.get("point_admin_level") == code), code)
+                resolver.prefetch({point["location_name"] for _, point in data_points if resolver.locate(point) is None}, "ACLED")
+                locations = [
+                    self.validate_location_match(
+                        point["location_name"],
                         "ACLED",
                         context_data={
-                            "original_location": data_point.get("original_location"),
-                            "record_id": data_point.get("event_id"),
-                            "admin1": data_point.get("admin1"),
-                            "admin2": data_point.get("admin2"),
+                            "original_location": point.get("original_location"),
+                            "record_id": point.get("event_id"),
+                            "admin1": point.get("admin1"),
+                            "admin2": point.get("admin2"),
+                            "latitude": point.get("latitude"),
+                            "longitude": point.get("longitude"),
+                            "point_admin_level": point.get("point_admin_level"),
                         },
                     )
+                    for _, point in data_points
+                ]
+                resolver.flush()
 
-                    # Handle unmatched locations
-                    unmatched_location_record = None
-                    if not location:
-                        from location.models import UnmatchedLocation
-
-                        try:
-                            # Build full location hierarchy for context
-                            admin1 = data_point.get("admin1", "")
-                            admin2 = data_point.get("admin2", "")
-                            context_hierarchy = f"Sudan > {admin1} > {admin2}" if admin2 else f"Sudan > {admin1}" if admin1 else data_point["location_name"]
-                            
-                            unmatched_location_record, created = UnmatchedLocation.objects.get_or_create(
-                                name=data_point["location_name"],
-                                source="ACLED",
-                                defaults={
-                                    "context": context_hierarchy,
-                                    "admin_level": "2",  # ACLED data is typically locality level
-                                    "code": data_point.get("event_id", ""),
-                                },
-                            )
-                            if not created:
-                                unmatched_location_record.increment_occurrence()
-                        except Exception as e:
-                            self.log_error(f"Failed to record unmatched location: {str(e)}")
-                            unmatched_location_record = None
-
-                    # Determine admin level
-                    if location:
-                        admin_level = location.admin_level
-                    else:
-                        # Default to admin level 2 for ACLED data (locality level)
-                        from location.models import AdmLevel
+                # Default to admin level 2 for unmatched ACLED data (locality level)
+                default_admin_level = resolver.adm_level("2")
 
-                        try:
-                            admin_level = AdmLevel.objects.get(code="2")  # Locality level
-                        except AdmLevel.DoesNotExist:
-                            admin_level = AdmLevel.objects.first()  # Fallback to any level
+                # Save processed data for each variable
+                saved_counts = dict.fromkeys(results, 0)
+                last_dates = {}
+                writer = self.variable_data_writer()
+                for (var_code, data_point), location in zip(data_points, locations, strict=True):
+                    unmatched_location_record = None if location else resolver.unmatched_location(data_point["location_name"], "ACLED")
 
                     # Prepare raw data based on variable type
                     raw_data = {
@@ -487,32 +452,40 @@ class ACLED(Source):
                             "location_name": data_point["location_name"],
                             "original_location": data_point.get("original_location")
                         },
-                        "events": data_point.get("specific_events", data_point.get("events", []))  # Store relevant event records
+                        "event_ids": data_point.get("event_ids", []),  # ACLED event_id_cnty of contributing events
                     }
 
                     # Save data regardless of whether location was matched
-                    VariableData.objects.update_or_create(
-                        variable=var_instance,
-                        start_date=data_point["start_date"],
-                        end_date=data_point["end_date"],
+                    writer.add(
+                        variables_by_code[var_code],
+                        data_point["start_date"],
+                        data_point["end_date"],
                         gid=location,  # Can be None for unmatched locations
+                        adm_level=location.admin_level if location else default_admin_level,
+                        period=data_point["period"],
+                        value=data_point["value"],
+                        text=data_point.get("text", ""),
+                        raw_data=raw_data,  # Aggregation context and contributing event IDs
                         original_location_text=data_point.get("original_location", data_point["location_name"]),
-                        defaults={
-                            "period": data_point["period"],
-                            "adm_level": admin_level,
-                            "value": data_point["value"],
-                            "text": data_point.get("text", ""),
-                            "raw_data": raw_data,  # Store complete event data
-                            "unmatched_location": unmatched_location_record,
-                            "updated_at": timezone.now(),
-                        },
+                        unmatched_location=unmatched_location_record,
                     )
-                    saved_count += 1
+                    saved_counts[var_code] += 1
+                    last_dates[var_code] = max(last_dates.get(var_code, data_point["end_date"]), data_point["end_date"])
+
+                writer.flush()
+
+            for var_code in variables_by_code:
+                if var_code in saved_counts:
+                    self.log_info(f"Processed {var_code}: {saved_counts[var_code]} data points")
 
-                self.log_info(f"Processed {var_code}: {saved_count} data points")
-                total_saved += saved_count
+            total_saved = sum(saved_counts.values())
+            self.log_info(
+                f"Total processed and saved: {total_saved} data points across all variables", inserted=writer.inserted, updated=writer.updated, unchanged=writer.unchanged
+            )
 
-            self.log_info(f"Total processed and saved: {total_saved} data points across all variables")
+            if total_saved > 0:
+                for variable in variables:
+                    self.update_processing_watermark(variable, raw_sequence=processed_sequence, last_record_date=last_dates.get(variable.code))
             return total_saved > 0
 
         except Exception as e:
@@ -525,113 +498,163 @@ class ACLED(Source):
         # since ACLED processes all variables from the same raw data
         return self.process_all_variables(**kwargs)
 
-    def _compute_variables(self, events: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
-        """Compute all ACLED variables from events data."""
-        # Group events by location and date
-        location_groups = {}
-
-        for event in events:
-            # Use admin2 (locality) as primary location, fallback to admin1
-            location_name = event.get("admin2") or event.get("admin1") or event.get("location")
-            if not location_name:
-                continue
-
-            date_str = event.get("event_date")
-            if not date_str:
-                continue
-
-            # Create location-date key
-            key = (location_name, date_str)
-
-            if key not in location_groups:
-                location_groups[key] = {"location_name": location_name, "date": date_str, "admin1": event.get("admin1"), "admin2": event.get("admin2"), "events": []}
-
-            location_groups[key]["events"].append(event)
-
-        # Compute variables for each location-date group
-        results = {
-            "acled_total_events": [],
-            "acled_fatalities": [],
-            "acled_battles": [],
-            "acled_violence_civilians": [],
-            "acled_explosions": [],
-            "acled_riots": [],
-            "acled_strategic_developments": [],
+    def _compute_variables(self, events: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """Compute all ACLED variables from events data (consumed in a single pass).
+
+        Only the fields needed for aggregation are loaded into a DataFrame, which is
+        grouped once by (location, event date). Per-variable counts come from boolean
+        masks, and each data point keeps the IDs of its contributing events rather
+        than copies of the events themselves.
+        """
+        results = {code: [] for code in ["acled_total_events", "acled_fatalities", *self.EVENT_TYPE_VARIABLES]}
+
+        frame = pd.DataFrame.from_records(([event.get(field) for field in self.EVENT_FIELDS] for event in events), columns=self.EVENT_FIELDS)
+        if frame.empty:
+            return results
+
+        # Use admin2 (locality) as primary location, fallback to admin1, then location
+        names = frame[["admin2", "admin1", "location"]].fillna("").astype(str)
+        frame["location_name"] = names["admin2"].where(names["admin2"] != "", names["admin1"].where(names["admin1"] != "", names["location"]))
+        frame["date"] = pd.to_datetime(frame["event_date"], format="%Y-%m-%d", errors="coerce").dt.date
+        frame = frame[(frame["location_name"] != "") & frame["date"].notna()].copy()
+        if frame.empty:
+            return results
+
+        frame["fatalities"] = pd.to_numeric(frame["fatalities"], errors="coerce").fillna(0).astype(int)
+        masks = {"acled_total_events": pd.Series(True, index=frame.index), "acled_fatalities": frame["fatalities"] > 0}
+        for var_code, (field, value) in self.EVENT_TYPE_VARIABLES.items():
+            masks[var_code] = frame[field] == value
+        for var_code, mask in masks.items():
+            frame[var_code] = mask
+
+        keys = ["location_name", "event_date"]
+        grouped = frame.groupby(keys, sort=False)
+        summary = grouped[list(masks)].sum()
+        summary["acled_fatalities"] = grouped["fatalities"].sum()
+        values = summary.to_dict("index")
+
+        # Group attributes come from the first event of each location-date group
+        first_rows = frame.drop_duplicates(keys).set_index(keys)
+        notes = frame[frame["notes"].fillna("") != ""]
+        combined_notes = notes.groupby(keys, sort=False)["notes"].agg(" | ".join).to_dict()
+        event_ids = {
+            var_code: frame[mask & frame["event_id_cnty"].notna()].groupby(keys, sort=False)["event_id_cnty"].agg(list).to_dict()
+            for var_code, mask in masks.items()
         }
 
-        for (location_name, date_str), group in location_groups.items():
-            events_list = group["events"]
+        for first in first_rows.itertuples():
+            key = first.Index
+            location_name, date_str = key
+            admin1 = None if pd.isna(first.admin1) else first.admin1
+            admin2 = None if pd.isna(first.admin2) else first.admin2
+
+            # Coordinates are matched at the admin level the group is keyed on; groups keyed on the
+            # free-text location have no boundary level, so their name is matched instead
+            point_admin_level = "2" if location_name == str(admin2 or "") else "1" if location_name == str(admin1 or "") else None
+            has_point = point_admin_level is not None and not pd.isna(first.latitude) and not pd.isna(first.longitude)
 
-            # Parse date
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-            except ValueError:
-                continue
-
-            # Count events by type
-            total_events = len(events_list)
-            total_fatalities = sum(int(e.get("fatalities", 0)) for e in events_list)
-
-            battles = sum(1 for e in events_list if e.get("event_type") == "Battles")
-            violence_civilians = sum(1 for e in events_list if e.get("disorder_type") == "Violence against civilians")
-            explosions = sum(1 for e in events_list if e.get("event_type") == "Explosions/Remote violence")
-            riots = sum(1 for e in events_list if e.get("disorder_type") == "Demonstrations")
-            strategic = sum(1 for e in events_list if e.get("disorder_type") == "Strategic developments")
-
-            # Collect all notes from events for this location/date
-            notes_list = [event.get("notes", "") for event in events_list if event.get("notes")]
-            combined_notes = " | ".join(notes_list) if notes_list else f"ACLED conflict events for {date_str}"
-            
-            # Create data points
             base_data = {
                 "location_name": location_name,
-                "original_location": f"{group['admin1']} / {group['admin2']}" if group.get("admin2") else group["admin1"],
-                "admin1": group.get("admin1"),
-                "admin2": group.get("admin2"),
-                "start_date": date_obj,
-                "end_date": date_obj,
+                "original_location": f"{admin1} / {admin2}" if admin2 else admin1,
+                "admin1": admin1,
+                "admin2": admin2,
+                # Coordinates of the group's first event, matched to boundaries before the name
+                "latitude": first.latitude if has_point else None,
+                "longitude": first.longitude if has_point else None,
+                "point_admin_level": point_admin_level,
+                "start_date": first.date,
+                "end_date": first.date,
                 "period": "day",
-                "text": combined_notes,
-                "events": events_list,  # Store the events for this location/date
+                "text": combined_notes.get(key, f"ACLED conflict events for {date_str}"),
             }
 
-            # Add to results with specific events for each variable type
-            if total_events > 0:
-                results["acled_total_events"].append({**base_data, "value": total_events, "specific_events": events_list})
-
-            if total_fatalities > 0:
-                fatality_events = [e for e in events_list if int(e.get("fatalities", 0)) > 0]
-                results["acled_fatalities"].append({**base_data, "value": total_fatalities, "specific_events": fatality_events})
-
-            if battles > 0:
-                battle_events = [e for e in events_list if e.get("event_type") == "Battles"]
-                results["acled_battles"].append({**base_data, "value": battles, "specific_events": battle_events})
+            for var_code in masks:
+                value = int(values[key][var_code])
+                if value > 0:
+                    results[var_code].append({**base_data, "value": value, "event_ids": event_ids[var_code].get(key, [])})
 
-            if violence_civilians > 0:
-                violence_events = [e for e in events_list if e.get("disorder_type") == "Violence against civilians"]
-                results["acled_violence_civilians"].append({**base_data, "value": violence_civilians, "specific_events": violence_events})
-
-            if explosions > 0:
-                explosion_events = [e for e in events_list if e.get("event_type") == "Explosions/Remote violence"]
-                results["acled_explosions"].append({**base_data, "value": explosions, "specific_events": explosion_events})
-
-            if riots > 0:
-                riot_events = [e for e in events_list if e.get("disorder_type") == "Demonstrations"]
-                results["acled_riots"].append({**base_data, "value": riots, "specific_events": riot_events})
+        return results
 
-            if strategic > 0:
-                strategic_events = [e for e in events_list if e.get("disorder_type") == "Strategic developments"]
-                results["acled_strategic_developments"].append({**base_data, "value": strategic, "specific_events": strategic_events})
+    def _compute_variables_in_batches(self, event_batches: Iterable[Iterable[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+        """Compute all ACLED variables one batch of events at a time.
 
+        Batches must not split a location-date group (e.g. one batch per date
+        partition), so only one batch of events is held in memory.
+        """
+        results = {}
+        for events in event_batches:
+            for var_code, points in self._compute_variables(events).items():
+                results.setdefault(var_code, []).extend(points)
         return results
 
+    def _load_unprocessed_events(self, store: RawDataStore, since: int) -> tuple[Iterator[list[dict[str, Any]]], int]:
+        """Load events of the partitions touched since the last processing run, one partition at a time.
+
+        Whole partitions are reloaded so that location-date aggregates stay complete
+        when a run re-fetches part of a month. Events repeated across runs are
+        deduplicated by ``event_id_cnty``, keeping the most recently retrieved copy.
+
+        Args:
+            store: ACLED events store
+            since: Store sequence number already processed (0 to load everything)
+
+        Returns:
+            tuple: (lazy batches of the events of each partition, sequence number to record once processing succeeds)
+        """
+        latest_sequence = store.latest_sequence
+        partition_keys = {entry["partition"] for entry in store.partitions(since=since)}
+        entries_by_partition = {}
+        if partition_keys:
+            for entry in store.partitions(keys=partition_keys):
+                entries_by_partition.setdefault(entry["partition"], []).append(entry)
+            self.log_info(f"Loading {sum(map(len, entries_by_partition.values()))} raw files from {len(partition_keys)} partitions with new data")
+        return self._iter_partition_events(store, entries_by_partition), latest_sequence
+
+    def _iter_partition_events(self, store: RawDataStore, entries_by_partition: dict[str, list[dict[str, Any]]]) -> Iterator[list[dict[str, Any]]]:
+        """Yield the deduplicated events of each partition."""
+        for entries in entries_by_partition.values():
+            events_by_id = {}
+            events_without_id = []
+            for event in store.iter_records(entries):
+                event_id = event.get("event_id_cnty")
+                if event_id:
+                    events_by_id[event_id] = event
+                else:
+                    events_without_id.append(event)
+            yield [*events_by_id.values(), *events_without_id]
+
+    def _iter_raw_events(self, path: str) -> Iterator[dict[str, Any]]:
+        """Iterate events from a legacy raw file without loading the whole file.
+
+        Supports the shared NDJSON format and per-variable JSON dumps written before
+        the partitioned raw data store.
+        """
+        if path.endswith(self.EVENTS_FILE_SUFFIX):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if "_header" in record:
+                        continue
+                    yield record
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield from json.load(f).get("events", [])
+
     def _get_latest_raw_data_file(self, variable: Variable) -> str:
-        """Find the most recent raw data file."""
+        """Find the most recent raw data file (shared events file or legacy per-variable dump)."""
         dir_path = f"raw_data/{self.source_model.name}"
         if not os.path.exists(dir_path):
             return None
 
-        files = [f for f in os.listdir(dir_path) if f.startswith(f"{self.source_model.name}_{variable.code}") and f.endswith(".json")]
+        events_prefix = f"{self.source_model.name}_events_"
+        legacy_prefix = f"{self.source_model.name}_{variable.code}"
+        files = [
+            f
+            for f in os.listdir(dir_path)
+            if (f.startswith(events_prefix) and f.endswith(self.EVENTS_FILE_SUFFIX)) or (f.startswith(legacy_prefix) and f.endswith(".json"))
+        ]
 
         if not files:
             return None
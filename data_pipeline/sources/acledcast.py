@@ -7,11 +7,10 @@ from typing import Any
 
 import pandas as pd
 import requests
-from django.db import transaction
 from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
 
 
 class ACLEDCAST(Source):
@@ -508,21 +507,19 @@ class ACLEDCAST(Source):
             variable: Variable instance
             data: List of dictionaries with processed data
         """
-        with transaction.atomic():
+        with self.variable_data_writer() as writer:
             for record in data:
                 location = record["location"]
-                VariableData.objects.update_or_create(
-                    variable=variable,
+                writer.add(
+                    variable,
+                    record["start_date"],
+                    record["end_date"],
                     gid=location,
-                    start_date=record["start_date"],
-                    end_date=record["end_date"],
-                    defaults={
-                        "adm_level": location.admin_level,
-                        "period": record["period"],
-                        "value": record["value"],
-                        "text": record["text"],
-                        "raw_data": record["raw_data"],
-                        "created_at": timezone.now(),
-                    },
+                    adm_level=location.admin_level,
+                    period=record["period"],
+                    value=record["value"],
+                    text=record["text"],
+                    raw_data=record["raw_data"],
                 )
 
+        self.log_info(f"Saved {writer.written} records (inserted: {writer.inserted}, updated: {writer.updated})")
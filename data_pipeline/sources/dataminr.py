@@ -9,7 +9,8 @@ import requests
 from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
+from ..upsert import VariableDataWriter
 
 
 class Dataminr(Source):
@@ -28,6 +29,10 @@ class Dataminr(Source):
     - dataminr_alerts: Real-time alerts with geographic location data
     """
 
+    # Alerts are cursor-paginated, so pages are fetched sequentially within the API budget
+    HTTP_MAX_WORKERS = 1
+    HTTP_RATE_LIMIT = (180, 600)  # 180 requests per 10 minutes
+
     def __init__(self, source_model):
         """Initialize Dataminr source with metadata."""
         super().__init__(source_model)
@@ -189,7 +194,7 @@ class Dataminr(Source):
                 }
 
                 self.log_info(f"Request {total_requests}: {alerts_url}")
-                response = requests.get(alerts_url, params=params, headers=headers, timeout=60)
+                response = self.http.get(alerts_url, params=params, headers=headers, timeout=60)
                 response.raise_for_status()
 
                 # Parse response
@@ -303,18 +308,19 @@ class Dataminr(Source):
 
             # Process each alert
             processed_count = 0
-            for alert in alerts:
-                if self._process_single_alert(variable, alert, raw_file_path):
-                    processed_count += 1
+            with self.variable_data_writer() as writer:
+                for alert in alerts:
+                    if self._process_single_alert(variable, alert, raw_file_path, writer):
+                        processed_count += 1
 
-            self.log_info(f"Successfully processed {processed_count} out of {len(alerts)} alerts")
+            self.log_info(f"Successfully processed {processed_count} out of {len(alerts)} alerts", inserted=writer.inserted, updated=writer.updated)
             return processed_count > 0
 
         except Exception as e:
             self.log_error("Processing failed", error=e)
             return False
 
-    def _process_single_alert(self, variable: Variable, alert: dict[str, Any], _raw_file_path: str) -> bool:
+    def _process_single_alert(self, variable: Variable, alert: dict[str, Any], _raw_file_path: str, writer: VariableDataWriter) -> bool:
         """Process a single alert record with complete field extraction per API spec."""
         try:
             # Extract basic alert information
@@ -412,7 +418,9 @@ class Dataminr(Source):
                 "original_location": location_name,
                 "event_name": f"Dataminr Alert {alert_id}",
                 "record_id": alert_id,
-                "additional_info": f"Category: {primary_category}, Topics: {', '.join(topics)}, Criticality: {alert_criticality}"
+                "additional_info": f"Category: {primary_category}, Topics: {', '.join(topics)}, Criticality: {alert_criticality}",
+                "latitude": latitude,
+                "longitude": longitude,
             }
 
             matched_location, unmatched_location_record = self.handle_unmatched_location(
@@ -492,46 +500,24 @@ class Dataminr(Source):
                 except AdmLevel.DoesNotExist:
                     adm_level = AdmLevel.objects.first()  # Fallback to any level
 
-            # Create VariableData record
-            variable_data = {
-                "variable": variable,
-                "gid": matched_location,  # Can be None for unmatched locations
-                "original_location_text": location_name,
-                "start_date": event_datetime.date(),
-                "end_date": event_datetime.date(),
-                "period": "day",
-                "adm_level": adm_level,
-                "value": None,
-                "text": text_content,
-                "raw_data": enhanced_raw_data,  # Store complete alert JSON with extracted fields
-                "unmatched_location": unmatched_location_record,  # Link to unmatched location record
-                "updated_at": timezone.now(),
-            }
-
-            # Create or update the record
-            # Note: For unmatched locations (gid=None), we use original_location_text as part of the unique key
-            if matched_location:
-                _obj, created = VariableData.objects.update_or_create(
-                    variable=variable,
-                    gid=matched_location,
-                    start_date=event_datetime.date(),
-                    end_date=event_datetime.date(),
-                    defaults=variable_data
-                )
-            else:
-                # For unmatched locations, use original_location_text to avoid duplicates
-                _obj, created = VariableData.objects.update_or_create(
-                    variable=variable,
-                    gid=None,
-                    original_location_text=location_name,
-                    start_date=event_datetime.date(),
-                    end_date=event_datetime.date(),
-                    defaults=variable_data
-                )
+            # Queue VariableData record for batched upsert
+            # Note: For unmatched locations (gid=None), original_location_text is part of the unique key
+            writer.add(
+                variable,
+                event_datetime.date(),
+                event_datetime.date(),
+                gid=matched_location,  # Can be None for unmatched locations
+                adm_level=adm_level,
+                period="day",
+                value=None,
+                text=text_content,
+                raw_data=enhanced_raw_data,  # Store complete alert JSON with extracted fields
+                original_location_text=location_name,
+                unmatched_location=unmatched_location_record,  # Link to unmatched location record
+            )
 
-            action = "Created" if created else "Updated"
             match_status = "matched" if matched_location else "unmatched"
-            self.log_info(f"{action} VariableData for alert {alert_id} ({alert_criticality}) at {location_name} ({match_status})")
+            self.log_info(f"Queued VariableData for alert {alert_id} ({alert_criticality}) at {location_name} ({match_status})")
             return True
 
         except Exception as e:
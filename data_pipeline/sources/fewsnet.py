@@ -10,14 +10,14 @@ import geopandas as gpd
 import numpy as np
 import pandas as pd
 import requests
-from django.db import transaction
+from django.conf import settings
 from django.utils import timezone
-from shapely import wkt
 
+from location.boundaries import boundary_provider
 from location.models import Location
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
 
 
 class FEWSNET(Source):
@@ -165,7 +165,8 @@ class FEWSNET(Source):
 
         Args:
             variable: Variable instance to process data for
-            **kwargs: Additional processing parameters
+            **kwargs: Additional processing parameters (max_workers: worker processes
+                for shapefile processing, defaults to PIPELINE_PROCESS_WORKERS)
 
         Returns:
             bool: True if processing was successful
@@ -202,37 +203,30 @@ class FEWSNET(Source):
 
             self.log_info(f"Found {len(zip_files)} shapefiles to process")
 
-            # Load ADM1 and ADM2 boundaries from database
+            # Load ADM1 and ADM2 boundaries (cached GeoDataFrames shared by geospatial sources, simplified for overlays)
             # Note: admin_level.code represents the hierarchical level (1=state, 2=locality, etc.)
-            adm1_locations = Location.objects.filter(admin_level__code="1")
-            adm2_locations = Location.objects.filter(admin_level__code="2")
-
-            if not adm1_locations.exists():
-                self.log_error("No ADM1 locations found in database (admin_level.code='1')")
+            adm1_gdf = boundary_provider.get("1", detail=settings.LOCATION_OVERLAY_DETAIL)
+            if adm1_gdf.empty:
+                self.log_error("No ADM1 locations with boundaries found in database (admin_level.code='1')")
                 return False
 
-            # Create GeoDataFrame for ADM1 locations (code='1')
-            # Pass the code value for consistency in logs and raw_data
-            adm1_gdf = self._create_adm_geodataframe(adm1_locations, admin_level_code="1")
-
-            # Create GeoDataFrame for ADM2 locations (code='2') if any exist
-            adm2_gdf = None
-            if adm2_locations.exists():
-                adm2_gdf = self._create_adm_geodataframe(adm2_locations, admin_level_code="2")
+            adm2_gdf = boundary_provider.get("2", detail=settings.LOCATION_OVERLAY_DETAIL)
+            if not adm2_gdf.empty:
                 self.log_info(f"Will process both ADM1 ({len(adm1_gdf)}) and ADM2 ({len(adm2_gdf)}) locations")
             else:
+                adm2_gdf = None
                 self.log_info(f"Will process ADM1 ({len(adm1_gdf)}) locations only - no ADM2 boundaries found")
 
-            # Process each shapefile
-            all_data = []
-            for zip_file in zip_files:
-                zip_path = os.path.join(raw_data_dir, zip_file)
+            # Process shapefiles, in parallel worker processes if configured
+            jobs = []
+            for zip_file in sorted(zip_files):
                 period = self._extract_period_from_filename(zip_file)
-
                 if period:
-                    processed_data = self._process_shapefile(zip_path, period, adm1_gdf, adm2_gdf)
-                    if processed_data:
-                        all_data.extend(processed_data)
+                    jobs.append((os.path.join(raw_data_dir, zip_file), period))
+
+            pool = self.process_pool(kwargs.get("max_workers"))
+            results = pool.starmap("_process_shapefile", jobs, adm1_gdf=adm1_gdf, adm2_gdf=adm2_gdf)
+            all_data = [record for processed_data in results if processed_data for record in processed_data]
 
             if not all_data:
                 self.log_warning("No data was successfully processed")
@@ -248,41 +242,6 @@ class FEWSNET(Source):
             self.log_error(f"Failed to process FEWSNET data: {e}")
             return False
 
-    def _create_adm_geodataframe(self, locations, admin_level_code: str) -> gpd.GeoDataFrame:
-        """Create GeoDataFrame from Location objects at any admin level.
-
-        Args:
-            locations: QuerySet of Location objects
-            admin_level_code: Admin level code as string ('1', '2', etc.)
-
-        Returns:
-            GeoDataFrame with administrative boundaries
-        """
-        data = []
-        for loc in locations:
-            if loc.boundary is not None:
-                # Convert Django GEOS geometry to Shapely geometry
-                # Use WKT to ensure proper conversion
-                shapely_geom = wkt.loads(loc.boundary.wkt)
-
-                data.append(
-                    {
-                        "location_id": loc.id,
-                        "pcode": loc.geo_id,
-                        "name": loc.name,
-                        "admin_level_code": admin_level_code,
-                        "geometry": shapely_geom,
-                    }
-                )
-
-        if not data:
-            self.log_error(f"No ADM{admin_level_code} locations with valid boundaries found")
-            return gpd.GeoDataFrame()
-
-        gdf = gpd.GeoDataFrame(data, crs="EPSG:4326", geometry="geometry")
-        self.log_info(f"Created GeoDataFrame with {len(gdf)} ADM{admin_level_code} boundaries")
-        return gdf
-
     def _extract_period_from_filename(self, filename: str) -> pd.Period | None:
         """Extract period from filename (e.g., 'SD_2024-01.zip' -> Period('2024-01', 'M')).
 
@@ -455,37 +414,29 @@ class FEWSNET(Source):
             # Calculate area-weighted average
             aggregated["value"] = aggregated["weighted_value"] / aggregated["area"]
 
-            # Prepare output
+            # Prepare output (locations are resolved when saving, so this runs without database access)
+            start_date = period.to_timestamp().date()
+            end_date = (period + 1).to_timestamp().date()
+
             result = []
             for _, row in aggregated.iterrows():
-                # Get Location object
-                try:
-                    location = Location.objects.get(id=row["location_id"])
-
-                    # Convert period to dates
-                    start_date = period.to_timestamp().date()
-                    end_date = (period + 1).to_timestamp().date()
-
-                    result.append(
-                        {
-                            "location": location,
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "period": "month",
-                            "value": round(row["value"], 2),
-                            "text": f"Food insecurity (IPC {round(row['value'], 1)}) in {row['name']} ({period})",
-                            "raw_data": {
-                                "period": str(period),
-                                "pcode": row["pcode"],
-                                "location_name": row["name"],
-                                "area_km2": round(row["area"] / 1e6, 2),  # Convert to km²
-                                "admin_level_code": str(row["admin_level_code"]),
-                            },
-                        }
-                    )
-                except Location.DoesNotExist:
-                    self.log_warning(f"Location {row['location_id']} not found")
-                    continue
+                result.append(
+                    {
+                        "location_id": int(row["location_id"]),
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "period": "month",
+                        "value": round(row["value"], 2),
+                        "text": f"Food insecurity (IPC {round(row['value'], 1)}) in {row['name']} ({period})",
+                        "raw_data": {
+                            "period": str(period),
+                            "pcode": row["pcode"],
+                            "location_name": row["name"],
+                            "area_km2": round(row["area"] / 1e6, 2),  # Convert to km²
+                            "admin_level_code": str(row["admin_level_code"]),
+                        },
+                    }
+                )
 
             self.log_info(f" -> Aggregated to {len(result)} ADM{admin_level_code} locations")
             return result
@@ -501,28 +452,29 @@ class FEWSNET(Source):
             variable: Variable instance
             data: List of dictionaries with processed data
         """
-        with transaction.atomic():
-            # Delete existing data for this variable (optional - depends on update strategy)
-            # VariableData.objects.filter(variable=variable).delete()
+        locations = Location.objects.select_related("admin_level").in_bulk({record["location_id"] for record in data})
 
-            # Create new records
+        with self.variable_data_writer() as writer:
             for record in data:
-                location = record["location"]
-                VariableData.objects.update_or_create(
-                    variable=variable,
+                location = locations.get(record["location_id"])
+                if location is None:
+                    self.log_warning(f"Location {record['location_id']} not found")
+                    continue
+
+                writer.add(
+                    variable,
+                    record["start_date"],
+                    record["end_date"],
                     gid=location,
-                    start_date=record["start_date"],
-                    end_date=record["end_date"],
-                    defaults={
-                        "adm_level": location.admin_level,
-                        "period": record["period"],
-                        "value": record["value"],
-                        "text": record["text"],
-                        "raw_data": record["raw_data"],
-                        "created_at": timezone.now(),
-                    },
+                    adm_level=location.admin_level,
+                    period=record["period"],
+                    value=record["value"],
+                    text=record["text"],
+                    raw_data=record["raw_data"],
                 )
 
+        self.log_info(f"Saved {writer.written} records (inserted: {writer.inserted}, updated: {writer.updated})")
+
     # Logging helper methods
     def log_info(self, message: str):
         """Log info message."""
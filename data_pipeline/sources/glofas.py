@@ -12,15 +12,15 @@ from datetime import datetime
 import geopandas as gpd
 import pandas as pd
 import requests
-from django.db import transaction
+from django.conf import settings
 from django.utils import timezone
-from rasterstats import zonal_stats
-from shapely import wkt
 
+from location.boundaries import boundary_provider
 from location.models import Location
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
+from ..zonal import RasterZonalStats
 
 
 class GloFAS(Source):
@@ -39,7 +39,8 @@ class GloFAS(Source):
     Notes:
         - Downloads daily flood extent shapefiles from Rapid Flood Mapping product
         - Uses spatial overlay to split flood geometries by ADM2 boundaries
-        - Calculates population affected using GHSL population raster via zonal statistics
+        - Calculates population affected using GHSL population raster via windowed zonal statistics
+          (the raster is converted once to a tiled COG next to the original)
         - Requires GHSL population raster at raw_data/GHSL - Population/GHS_POP_E2025.tif
     """
 
@@ -168,7 +169,8 @@ class GloFAS(Source):
 
         Args:
             variable: Variable instance to process data for
-            **kwargs: Additional processing parameters
+            **kwargs: Additional processing parameters (max_workers: worker processes
+                for shapefile processing, defaults to PIPELINE_PROCESS_WORKERS)
 
         Returns:
             bool: True if processing was successful
@@ -205,14 +207,11 @@ class GloFAS(Source):
 
             self.log_info(f"Found {len(zip_files)} shapefiles to process")
 
-            # Load ADM2 boundaries from database
-            adm2_locations = Location.objects.filter(admin_level__code="2")
-            if not adm2_locations.exists():
-                self.log_error("No ADM2 locations found in database (admin_level.code='2')")
+            # Load ADM2 boundaries (cached GeoDataFrame shared by geospatial sources, simplified for overlays)
+            adm2_gdf = boundary_provider.get("2", detail=settings.LOCATION_OVERLAY_DETAIL)
+            if adm2_gdf.empty:
+                self.log_error("No ADM2 locations with boundaries found in database (admin_level.code='2')")
                 return False
-
-            # Create GeoDataFrame for ADM2 locations
-            adm2_gdf = self._create_adm_geodataframe(adm2_locations)
             self.log_info(f"Loaded {len(adm2_gdf)} ADM2 boundaries")
 
             # Load population raster path
@@ -221,18 +220,19 @@ class GloFAS(Source):
                 self.log_error(f"Population raster not found: {population_raster}")
                 return False
 
-            # Process each shapefile
-            all_data = []
-            for zip_file in zip_files:
-                zip_path = os.path.join(raw_data_dir, zip_file)
-                date_str = self._extract_date_from_filename(zip_file)
+            # Convert the raster to a tiled COG once, before any worker processes read it
+            population_raster = RasterZonalStats(population_raster, logger=self.logger).path
 
+            # Process shapefiles, in parallel worker processes if configured
+            jobs = []
+            for zip_file in sorted(zip_files):
+                date_str = self._extract_date_from_filename(zip_file)
                 if date_str:
-                    processed_data = self._process_shapefile(
-                        zip_path, date_str, adm2_gdf, population_raster
-                    )
-                    if processed_data:
-                        all_data.extend(processed_data)
+                    jobs.append((os.path.join(raw_data_dir, zip_file), date_str))
+
+            pool = self.process_pool(kwargs.get("max_workers"))
+            results = pool.starmap("_process_shapefile", jobs, adm2_gdf=adm2_gdf, population_raster=population_raster)
+            all_data = [record for processed_data in results if processed_data for record in processed_data]
 
             if not all_data:
                 self.log_warning("No data was successfully processed")
@@ -250,38 +250,6 @@ class GloFAS(Source):
             self.log_error(traceback.format_exc())
             return False
 
-    def _create_adm_geodataframe(self, locations) -> gpd.GeoDataFrame:
-        """Create GeoDataFrame from Location objects.
-
-        Args:
-            locations: QuerySet of Location objects
-
-        Returns:
-            GeoDataFrame with administrative boundaries
-        """
-        data = []
-        for loc in locations:
-            if loc.boundary is not None:
-                # Convert Django GEOS geometry to Shapely geometry
-                shapely_geom = wkt.loads(loc.boundary.wkt)
-
-                data.append(
-                    {
-                        "location_id": loc.id,
-                        "pcode": loc.geo_id,
-                        "name": loc.name,
-                        "geometry": shapely_geom,
-                    }
-                )
-
-        if not data:
-            self.log_error("No ADM2 locations with valid boundaries found")
-            return gpd.GeoDataFrame()
-
-        gdf = gpd.GeoDataFrame(data, crs="EPSG:4326", geometry="geometry")
-        self.log_info(f"Created GeoDataFrame with {len(gdf)} ADM2 boundaries")
-        return gdf
-
     def _get_population_raster_path(self) -> str:
         """Get path to GHSL population raster.
 
@@ -391,18 +359,8 @@ class GloFAS(Source):
 
                 # Calculate population affected using zonal statistics
                 self.log_info(" -> Calculating affected population...")
-                pop_stats = zonal_stats(
-                    floods_with_admin,
-                    population_raster,
-                    stats=['sum'],
-                    nodata=0
-                )
-
-                # Add population to GeoDataFrame
-                floods_with_admin['pop_affected'] = [
-                    stat['sum'] if stat['sum'] is not None else 0
-                    for stat in pop_stats
-                ]
+                zonal = RasterZonalStats(population_raster, logger=self.logger)
+                floods_with_admin['pop_affected'] = zonal.sums(floods_with_admin.geometry, nodata=0)
 
                 # Save the floods with admin dataframe
                 export_dir = os.path.dirname(zip_path)
@@ -449,35 +407,34 @@ class GloFAS(Source):
             variable: Variable instance
             data: List of dictionaries with processed data
         """
-        with transaction.atomic():
+        locations = Location.objects.select_related("admin_level").in_bulk({record["location_id"] for record in data})
+
+        with self.variable_data_writer() as writer:
             for record in data:
-                # Get Location object
-                try:
-                    location = Location.objects.get(id=record["location_id"])
-                except Location.DoesNotExist:
+                location = locations.get(record["location_id"])
+                if location is None:
                     self.log_warning(f"Location {record['location_id']} not found")
                     continue
 
-                VariableData.objects.update_or_create(
-                    variable=variable,
+                writer.add(
+                    variable,
+                    record["date"],
+                    record["date"],
                     gid=location,
-                    start_date=record["date"],
-                    end_date=record["date"],
-                    defaults={
-                        "adm_level": location.admin_level,
-                        "period": "day",
-                        "value": record["value"],
-                        "text": f"GloFAS - Population Affected: {record['value']:.0f} people affected in {record['location_name']} ({record['date']})",
-                        "raw_data": {
-                            "date": str(record["date"]),
-                            "pcode": record["pcode"],
-                            "location_name": record["location_name"],
-                            "admin_level_code": "2",
-                        },
-                        "created_at": timezone.now(),
+                    adm_level=location.admin_level,
+                    period="day",
+                    value=record["value"],
+                    text=f"GloFAS - Population Affected: {record['value']:.0f} people affected in {record['location_name']} ({record['date']})",
+                    raw_data={
+                        "date": str(record["date"]),
+                        "pcode": record["pcode"],
+                        "location_name": record["location_name"],
+                        "admin_level_code": "2",
                     },
                 )
 
+        self.log_info(f"Saved {writer.written} records (inserted: {writer.inserted}, updated: {writer.updated})")
+
     # Logging helper methods (inherited from base Source class, but explicitly defined for clarity)
     def log_info(self, message: str):
         """Log info message."""
@@ -6,10 +6,10 @@ from datetime import datetime
 from typing import Any
 
 import requests
-from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
+from ..upsert import VariableDataWriter
 
 
 class IDMC(Source):
@@ -93,7 +93,7 @@ class IDMC(Source):
 
             # Make API request
             self.log_info(f"Requesting URL: {url}")
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.http.get(url, params=params, headers=headers, timeout=30)
             self.log_info(f"Response status code: {response.status_code}")
             response.raise_for_status()
 
@@ -118,7 +118,7 @@ class IDMC(Source):
                 next_url = data.get("next")
                 while next_url:
                     self.log_info(f"Requesting next page: {next_url}")
-                    response = requests.get(next_url, headers=headers, timeout=30)
+                    response = self.http.get(next_url, headers=headers, timeout=30)
                     response.raise_for_status()
 
                     data = response.json()
@@ -171,24 +171,32 @@ class IDMC(Source):
 
             processed_count = 0
 
-            for record in records:
-                try:
-                    # Process based on dataset type
-                    if variable.code.startswith("idmc_gidd_"):
-                        success = self._process_gidd_record(variable, record)
-                    elif variable.code.startswith("idmc_idu_"):
-                        success = self._process_idu_record(variable, record)
-                    else:
+            with self.variable_data_writer() as writer:
+                for record in records:
+                    try:
+                        # Process based on dataset type
+                        if variable.code.startswith("idmc_gidd_"):
+                            success = self._process_gidd_record(variable, record, writer)
+                        elif variable.code.startswith("idmc_idu_"):
+                            success = self._process_idu_record(variable, record, writer)
+                        else:
+                            continue
+
+                        if success:
+                            processed_count += 1
+
+                    except Exception as e:
+                        self.log_error("Failed to process IDMC record", error=e, record_id=record.get("id"))
                         continue
 
-                    if success:
-                        processed_count += 1
-
-                except Exception as e:
-                    self.log_error("Failed to process IDMC record", error=e, record_id=record.get("id"))
-                    continue
-
-            self.log_info("Successfully processed IDMC data", variable=variable.code, total_records=len(records), processed_count=processed_count)
+            self.log_info(
+                "Successfully processed IDMC data",
+                variable=variable.code,
+                total_records=len(records),
+                processed_count=processed_count,
+                inserted=writer.inserted,
+                updated=writer.updated,
+            )
 
             return processed_count > 0
 
@@ -196,7 +204,7 @@ class IDMC(Source):
             self.log_error("Failed to process IDMC data", error=e, variable=variable.code)
             return False
 
-    def _process_gidd_record(self, variable: Variable, record: dict[str, Any]) -> bool:
+    def _process_gidd_record(self, variable: Variable, record: dict[str, Any], writer: VariableDataWriter) -> bool:
         """Process a GIDD (Global Internal Displacement Database) record from geojson format."""
         try:
             # Handle geojson feature format - data is in properties
@@ -332,20 +340,17 @@ class IDMC(Source):
                 # Get the unmatched location record that was created during validation
                 unmatched_location_ref = self.get_last_unmatched_location()
 
-            VariableData.objects.update_or_create(
-                variable=variable,
-                start_date=start_date,
-                end_date=end_date,
+            writer.add(
+                variable,
+                start_date,
+                end_date,
                 gid=location,  # Can be None for unmatched locations
-                defaults={
-                    "period": period,
-                    "adm_level": admin_level,
-                    "value": value,
-                    "text": text,
-                    "original_location_text": location_string,  # Store the original location string
-                    "unmatched_location": unmatched_location_ref,  # Link to unmatched location record
-                    "updated_at": timezone.now(),
-                },
+                adm_level=admin_level,
+                period=period,
+                value=value,
+                text=text,
+                original_location_text=location_string,  # Store the original location string
+                unmatched_location=unmatched_location_ref,  # Link to unmatched location record
             )
 
             return True
@@ -356,7 +361,7 @@ class IDMC(Source):
             )
             return False
 
-    def _process_idu_record(self, variable: Variable, record: dict[str, Any]) -> bool:
+    def _process_idu_record(self, variable: Variable, record: dict[str, Any], writer: VariableDataWriter) -> bool:
         """Process an IDU (Internal Displacement Updates) record."""
         try:
             # Filter for Sudan records only (since API doesn't filter properly)
@@ -459,20 +464,17 @@ class IDMC(Source):
                 # Get the unmatched location record that was created during validation
                 unmatched_location_ref = self.get_last_unmatched_location()
 
-            VariableData.objects.update_or_create(
-                variable=variable,
-                start_date=start_date,
-                end_date=end_date,
+            writer.add(
+                variable,
+                start_date,
+                end_date,
                 gid=location,  # Can be None for unmatched locations
-                defaults={
-                    "period": period,
-                    "adm_level": admin_level,
-                    "value": value,
-                    "text": text,
-                    "original_location_text": locations_name,  # Store the original location string (IDU uses locations_name)
-                    "unmatched_location": unmatched_location_ref,  # Link to unmatched location record
-                    "updated_at": timezone.now(),
-                },
+                adm_level=admin_level,
+                period=period,
+                value=value,
+                text=text,
+                original_location_text=locations_name,  # Store the original location string (IDU uses locations_name)
+                unmatched_location=unmatched_location_ref,  # Link to unmatched location record
             )
 
             return True
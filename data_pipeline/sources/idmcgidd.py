@@ -9,7 +9,7 @@ import requests
 from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
 
 
 class IDMCGIDD(Source):
@@ -188,6 +188,7 @@ class IDMCGIDD(Source):
                 variable_results[variable.code] = self._process_variable_data(variable, features)
 
             # Save processed data for each variable
+            writer = self.variable_data_writer()
             for variable in variables:
                 data_points = variable_results.get(variable.code, [])
                 saved_count = 0
@@ -238,27 +239,25 @@ class IDMCGIDD(Source):
                             admin_level = AdmLevel.objects.first()  # Fallback to any level
 
                     # Save data regardless of whether location was matched
-                    VariableData.objects.update_or_create(
-                        variable=variable,
-                        start_date=data_point["start_date"],
-                        end_date=data_point["end_date"],
+                    writer.add(
+                        variable,
+                        data_point["start_date"],
+                        data_point["end_date"],
                         gid=location,  # Can be None for unmatched locations
+                        adm_level=admin_level,
+                        period=data_point["period"],
+                        value=data_point["value"],
+                        text=data_point.get("text", ""),
                         original_location_text=data_point.get("original_location", data_point["location_name"]),
-                        defaults={
-                            "period": data_point["period"],
-                            "adm_level": admin_level,
-                            "value": data_point["value"],
-                            "text": data_point.get("text", ""),
-                            "unmatched_location": unmatched_location_record,
-                            "updated_at": timezone.now(),
-                        },
+                        unmatched_location=unmatched_location_record,
                     )
                     saved_count += 1
 
                 self.log_info(f"Processed {variable.code}: {saved_count} data points")
                 total_saved += saved_count
 
-            self.log_info(f"Total GIDD processing: {total_saved} data points across all variables")
+            writer.flush()
+            self.log_info(f"Total GIDD processing: {total_saved} data points across all variables", inserted=writer.inserted, updated=writer.updated)
             return total_saved > 0
 
         except Exception as e:
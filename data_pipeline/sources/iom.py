@@ -5,13 +5,11 @@ import os
 from datetime import datetime, timedelta
 
 import pandas as pd
-from django.db import transaction
-from django.utils import timezone
 
-from location.models import AdmLevel, Gazetteer, Location
+from location.models import AdmLevel, Location
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
 
 
 class IOM(Source):
@@ -48,37 +46,21 @@ class IOM(Source):
         return {"admin2_pcode": "SD04111"}  # Beida, West Darfur
 
     def _build_location_cache(self):
-        """Build in-memory cache of locations for fast lookup.
+        """Get the IOM_DTM location lookup table for fast lookup.
 
-        Creates a dictionary mapping pcodes and names to Location objects.
-        This eliminates per-record database queries during processing.
+        Maps gazetteer pcodes, lowercase gazetteer names and ADM2 geo_ids to
+        Location objects. The table comes from the process-wide location
+        matcher, so it is built once per worker and gazetteer generation
+        rather than once per task. This eliminates per-record database
+        queries during processing.
         """
         if self._location_cache is not None:
-            return  # Cache already built
+            return  # Cache already loaded for this run
 
-        self.log_info("Building location cache for IOM processing")
-        self._location_cache = {}
+        from location.utils import location_matcher
 
-        # Cache all gazetteer entries for IOM_DTM
-        gazetteer_entries = Gazetteer.objects.filter(source="IOM_DTM").select_related("location", "location__admin_level")
-
-        for entry in gazetteer_entries:
-            # Cache by code (pcode)
-            if entry.code:
-                self._location_cache[entry.code] = entry.location
-            # Cache by name (lowercase for case-insensitive matching)
-            if entry.name:
-                self._location_cache[entry.name.lower()] = entry.location
-
-        # Also cache direct Location lookups by geo_id
-        adm2_level = AdmLevel.objects.get(code="2")
-        locations = Location.objects.filter(admin_level=adm2_level).select_related("admin_level")
-
-        for location in locations:
-            if location.geo_id:
-                self._location_cache[f"geo_{location.geo_id}"] = location
-
-        self.log_info(f"Location cache built with {len(self._location_cache)} entries")
+        self._location_cache = location_matcher.get_code_table("IOM_DTM", admin_level="2")
+        self.log_info(f"Location cache ready with {len(self._location_cache)} entries")
 
     def _lookup_location(self, admin2_pcode: str) -> Location | None:
         """Fast location lookup using cache.
@@ -323,27 +305,7 @@ class IOM(Source):
 
             self.log_info(f"Aggregated to {len(df_aggregated)} unique records (date + location)")
 
-            # Prepare bulk data
-            records_to_create = []
-            records_to_update = {}
-            existing_records = {}
-
-            # Get all existing records for this variable, including text field for unique key
-            existing_qs = VariableData.objects.filter(variable=variable).values("start_date", "gid_id", "original_location_text", "text").distinct()
-
-            for record in existing_qs:
-                # Build key that matches the new record_key format (date + location + text)
-                text_val = record.get("text", "")
-                if record["gid_id"]:
-                    # For matched locations, use date + location_id + text
-                    key = (record["start_date"], record["gid_id"], text_val)
-                else:
-                    # For unmatched locations, use date + location_text + text
-                    location_text = record.get("original_location_text", "")
-                    key = (record["start_date"], f"unmatched_{location_text}", text_val)
-                existing_records[key] = True
-
-            self.log_info(f"Found {len(existing_records)} existing unique (date, location, displacement reason) combinations")
+            writer = self.variable_data_writer()
 
             processed_count = 0
             skipped_count = 0
@@ -439,14 +401,6 @@ class IOM(Source):
                     # Store displacement reason in text field
                     text_value = str(displacement_reason) if displacement_reason else "Unknown"
 
-                    # Check if record exists - use date + location + displacement reason for unique key
-                    # This allows multiple displacement reasons per location per date
-                    if location:
-                        record_key = (reporting_date.date(), location.id, text_value)
-                    else:
-                        # For unmatched locations, use the full location text as part of the key
-                        record_key = (reporting_date.date(), f"unmatched_{original_location_text}", text_value)
-
                     # Determine admin level - use location's level if available, otherwise use cached level
                     if location:
                         admin_level = location.admin_level
@@ -461,27 +415,20 @@ class IOM(Source):
                         if pd.isna(val):
                             raw_record[key] = None
 
-                    record_data = {
-                        "variable": variable,
-                        "start_date": reporting_date.date(),
-                        "end_date": reporting_date.date(),
-                        "gid": location,  # Can be None for unmatched locations
-                        "period": "day",
-                        "adm_level": admin_level,
-                        "value": value,  # Numeric value (None for textual variables)
-                        "text": text_value,  # Text value (empty for numeric variables)
-                        "raw_data": raw_record,  # Store complete IOM DTM record
-                        "original_location_text": original_location_text,  # Store the full hierarchy
-                        "unmatched_location": unmatched_location_record,  # Link to unmatched location record
-                        "updated_at": timezone.now(),
-                    }
-
-                    if record_key not in existing_records:
-                        # New record - add to create list
-                        records_to_create.append(VariableData(**record_data))
-                    else:
-                        # Existing record - add to update dict
-                        records_to_update[record_key] = record_data
+                    # Unmatched locations are keyed on the full hierarchy text by the writer
+                    writer.add(
+                        variable,
+                        reporting_date.date(),
+                        reporting_date.date(),
+                        gid=location,  # Can be None for unmatched locations
+                        adm_level=admin_level,
+                        period="day",
+                        value=value,
+                        text=text_value,  # Displacement reason
+                        raw_data=raw_record,  # Store complete IOM DTM record
+                        original_location_text=original_location_text,  # Store the full hierarchy
+                        unmatched_location=unmatched_location_record,
+                    )
 
                     processed_count += 1
 
@@ -491,69 +438,13 @@ class IOM(Source):
                     skipped_count += 1
                     continue
 
-            # Perform bulk database operations within transaction
-            with transaction.atomic():
-                # Bulk create new records
-                if records_to_create:
-                    batch_size = 1000  # Process in batches to avoid memory issues
-                    for i in range(0, len(records_to_create), batch_size):
-                        batch = records_to_create[i : i + batch_size]
-                        VariableData.objects.bulk_create(batch, ignore_conflicts=True)
-                        self.log_info(f"Bulk created batch {i // batch_size + 1} ({len(batch)} records)")
-
-                # Bulk update existing records
-                if records_to_update:
-                    # For updates, we need to do this more carefully
-                    # Django doesn't have a direct bulk_update for our use case
-                    # So we'll use update_or_create but in batches
-                    update_count = 0
-                    for (start_date, key_id, text_value), record_data in records_to_update.items():
-                        # Handle both matched and unmatched locations
-                        if isinstance(key_id, str) and key_id.startswith("unmatched_"):
-                            # For unmatched locations, use original_location_text to find records
-                            original_text = record_data["original_location_text"]
-                            VariableData.objects.filter(
-                                variable=variable,
-                                start_date=start_date,
-                                original_location_text=original_text,
-                                text=text_value,
-                                gid__isnull=True,  # Ensure we're updating unmatched records
-                            ).update(
-                                end_date=record_data["end_date"],
-                                period=record_data["period"],
-                                adm_level=record_data["adm_level"],
-                                value=record_data["value"],
-                                text=record_data["text"],
-                                raw_data=record_data["raw_data"],
-                                unmatched_location=record_data["unmatched_location"],
-                                updated_at=record_data["updated_at"],
-                            )
-                        else:
-                            # For matched locations, use the gid and displacement reason
-                            VariableData.objects.filter(
-                                variable=variable,
-                                start_date=start_date,
-                                gid_id=key_id,
-                                text=text_value,
-                            ).update(
-                                end_date=record_data["end_date"],
-                                period=record_data["period"],
-                                adm_level=record_data["adm_level"],
-                                value=record_data["value"],
-                                raw_data=record_data["raw_data"],
-                                original_location_text=record_data["original_location_text"],
-                                unmatched_location=record_data["unmatched_location"],
-                                updated_at=record_data["updated_at"],
-                            )
-                        update_count += 1
-                        if update_count % 1000 == 0:
-                            self.log_info(f"Updated {update_count} records")
+            writer.flush()
 
             # Determine success - either we processed records OR there were no records to process (both are success cases)
-            total_records_handled = len(records_to_create) + len(records_to_update)
+            total_records_handled = writer.written
 
             if total_records_handled > 0:
-                self.log_info(f"Processing complete. Created: {len(records_to_create)}, Updated: {len(records_to_update)}, Skipped: {skipped_count}")
+                self.log_info(f"Processing complete. Created: {writer.inserted}, Updated: {writer.updated}, Skipped: {skipped_count}")
                 return True
             elif len(results) == 0:
                 self.log_info("Processing complete. No records to process after filtering (this is normal for incremental updates)")
@@ -4,10 +4,9 @@ import json
 import os
 
 import requests
-from django.utils import timezone
 
 from ..base_source import Source
-from ..models import Variable, VariableData
+from ..models import Variable
 
 
 class ReliefWeb(Source):
@@ -36,6 +35,10 @@ class ReliefWeb(Source):
     Rate limits:
         - Max 1000 entries per call
         - Max 1000 API calls per day
+
+    Disaster list requests are conditional (ETag / Last-Modified), so an
+    unchanged list is not downloaded again. Disaster details are fetched
+    concurrently over the shared connection pool, once per disaster.
     """
 
     def __init__(self, source_model):
@@ -66,7 +69,7 @@ class ReliefWeb(Source):
             params = {"appname": self.app_name}
             headers = {"Accept": "application/json", "User-Agent": f"{self.app_name}/1.0"}
 
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = self.http.get(url, params=params, headers=headers, timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 # Extract the fields from the response
@@ -116,10 +119,15 @@ class ReliefWeb(Source):
             # Make API request
             headers = {"Accept": "application/json", "User-Agent": f"{self.app_name}/1.0"}
 
-            response = requests.get(endpoint, params=params, headers=headers, timeout=30)
+            # Only revalidate when the previous download is still on disk to fall back on
+            response = self.http.get(endpoint, params=params, headers=headers, timeout=30, conditional=self._get_latest_raw_file(variable) is not None)
             self.log_info(f"Response status code: {response.status_code}")
             response.raise_for_status()
 
+            if response.status_code == 304:
+                self.log_info(f"Disaster list unchanged since last retrieval for {variable.code}, keeping existing raw data")
+                return True
+
             data = response.json()
 
             # Log response metadata
@@ -144,24 +152,32 @@ class ReliefWeb(Source):
             self.log_error(f"Unexpected error retrieving data for {variable.code}", error=e)
             return False
 
+    def _get_latest_raw_file(self, variable: Variable) -> str | None:
+        """Get path of the most recent raw data file for a variable, if any."""
+        raw_data_dir = f"raw_data/{self.source_model.name}"
+        try:
+            file_names = os.listdir(raw_data_dir)
+        except FileNotFoundError:
+            return None
+
+        raw_files = [f for f in file_names if f.startswith(f"{self.source_model.name}_{variable.code}_") and f.endswith(".json")]
+        if not raw_files:
+            return None
+
+        return os.path.join(raw_data_dir, sorted(raw_files)[-1])
+
     def process(self, variable: Variable, **kwargs) -> bool:
         """Process raw ReliefWeb disasters data into standardized format with full details."""
         try:
             self.log_info(f"Starting ReliefWeb data processing for {variable.code}")
 
             # Find the most recent raw data file
-            raw_data_dir = f"raw_data/{self.source_model.name}"
-            raw_files = [f for f in os.listdir(raw_data_dir) if f.startswith(f"{self.source_model.name}_{variable.code}_") and f.endswith(".json")]
+            raw_data_path = self._get_latest_raw_file(variable)
 
-            if not raw_files:
+            if not raw_data_path:
                 self.log_error(f"No raw data files found for {variable.code}")
                 return False
 
-            # Get the most recent file
-            raw_files.sort()
-            latest_file = raw_files[-1]
-            raw_data_path = os.path.join(raw_data_dir, latest_file)
-
             self.log_info(f"Processing raw data from: {raw_data_path}")
 
             # Load raw data
@@ -213,14 +229,15 @@ class ReliefWeb(Source):
                 self.log_error(f"Unknown variable code: {variable.code}")
                 return False
 
-            # Fetch detailed information for each disaster
+            # Fetch detailed information for each disaster concurrently, once per disaster
             self.log_info(f"Fetching details for {len(target_disasters)} disasters...")
+            disaster_ids = list(dict.fromkeys(d.get("id") for d in target_disasters if d.get("id")))
+            details_by_id = dict(zip(disaster_ids, self.http.map(self._fetch_disaster_details, disaster_ids), strict=True))
 
             for disaster in target_disasters:
                 disaster_id = disaster.get("id")
                 if disaster_id:
-                    # Try to fetch detailed information
-                    detailed_info = self._fetch_disaster_details(disaster_id)
+                    detailed_info = details_by_id.get(disaster_id)
 
                     if detailed_info:
                         # Use the detailed information
@@ -259,14 +276,15 @@ class ReliefWeb(Source):
 
             # Process each disaster individually by fetching full details
             saved_count = 0
+            writer = self.variable_data_writer()
 
             for disaster in target_disasters:
                 disaster_id = disaster.get("id")
                 if not disaster_id:
                     continue
 
-                # Fetch full disaster details from API
-                detailed_info = self._fetch_disaster_details(disaster_id)
+                # Reuse the full disaster details fetched above
+                detailed_info = details_by_id.get(disaster_id)
                 if not detailed_info:
                     self.log_info(f"Could not fetch details for disaster {disaster_id}, using basic info")
                     detailed_info = disaster.get("fields", {})
@@ -334,21 +352,18 @@ class ReliefWeb(Source):
                     description = detailed_info.get("name", "")
 
                 # Save individual disaster record
-                VariableData.objects.update_or_create(
-                    variable=variable,
-                    start_date=disaster_date,
-                    end_date=disaster_date,
+                writer.add(
+                    variable,
+                    disaster_date,
+                    disaster_date,
                     gid=location,  # Can be None for unmatched locations
+                    adm_level=adm0_level,
+                    period="day",
+                    value=1.0,  # Each disaster is one event
+                    text=description,  # Description from disaster details
+                    raw_data=detailed_info,  # Complete disaster details as JSON
                     original_location_text=location_name,
-                    defaults={
-                        "period": "day",
-                        "adm_level": adm0_level,
-                        "value": 1.0,  # Each disaster is one event
-                        "text": description,  # Description from disaster details
-                        "raw_data": detailed_info,  # Complete disaster details as JSON
-                        "unmatched_location": unmatched_location_record,
-                        "updated_at": timezone.now(),
-                    },
+                    unmatched_location=unmatched_location_record,
                 )
                 saved_count += 1
 
@@ -356,7 +371,8 @@ class ReliefWeb(Source):
                 if saved_count <= 3:
                     self.log_info(f"Processed disaster: {detailed_info.get('name', 'Unknown')} in {location_name}")
 
-            self.log_info(f"Processed {variable.code}: {saved_count} disaster records saved")
+            writer.flush()
+            self.log_info(f"Processed {variable.code}: {saved_count} disaster records saved", inserted=writer.inserted, updated=writer.updated)
 
             return True
 
@@ -115,6 +115,8 @@ class TestSource(Source):
 
             # Generate data points based on test_data in scenario
             success_count = 0
+            writer = self.variable_data_writer()
+            queued_location_ids = set()
             for i, test_point in enumerate(scenario["test_data"]):
                 location_name = test_point["location"]
 
@@ -170,36 +172,30 @@ class TestSource(Source):
                     end_date=today
                 ).exists()
 
-                if existing:
+                if existing or location.id in queued_location_ids:
                     self.logger.info(f"Skipping duplicate location {location.name} - already has data for today")
                     continue
+                queued_location_ids.add(location.id)
 
-                # Use update_or_create to avoid duplicate key errors
-                _, created = VariableData.objects.update_or_create(
-                    variable=variable,
+                writer.add(
+                    variable,
+                    today,
+                    today,
                     gid=location,
-                    start_date=today,
-                    end_date=today,
-                    defaults={
-                        "period": variable.period,
-                        "adm_level": location.admin_level,
-                        "original_location_text": location.name,
-                        "value": value,
-                        "text": text,
-                        "raw_data": metadata,
-                    },
+                    adm_level=location.admin_level,
+                    period=variable.period,
+                    value=value,
+                    text=text,
+                    raw_data=metadata,
+                    original_location_text=location.name,
                 )
 
-                if created:
-                    action = "Created"
-                else:
-                    action = "Updated"
-
                 self.logger.info(
-                    f"{action} test data point: {scenario['name']} in {location.name} (value: {value}, should alert: {should_alert}, confidence target: {confidence_target})"
+                    f"Queued test data point: {scenario['name']} in {location.name} (value: {value}, should alert: {should_alert}, confidence target: {confidence_target})"
                 )
                 success_count += 1
 
+            writer.flush()
             self.logger.info(f"Generated {success_count}/{len(scenario['test_data'])} predictable test data points for {variable.code}")
             return success_count > 0
 
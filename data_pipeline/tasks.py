@@ -75,6 +75,7 @@ def retrieve_data(self, source_id: int, variable_id: int = None, _skip_task_trac
 
     try:
         source_instance = get_source_class(source)
+        kwargs.pop("full_reprocess", None)  # Only affects processing
 
         if variable_id:
             # Retrieve data for specific variable
@@ -167,6 +168,7 @@ def process_data(self, source_id: int, variable_id: int = None, _skip_task_track
 
     try:
         source_instance = get_source_class(source)
+        source_instance.full_reprocess = kwargs.pop("full_reprocess", False)
 
         if variable_id:
             variables = [Variable.objects.get(id=variable_id, source=source)]
@@ -385,6 +387,7 @@ def retrieve_all_source_data(self, source_id: int, **kwargs) -> dict[str, Any]:
 
     try:
         source_instance = get_source_class(source)
+        kwargs.pop("full_reprocess", None)  # Only affects processing
         variables = list(source.variables.all())
 
         logger.info(f"Starting data retrieval for {source.name} ({len(variables)} variables)")
@@ -425,6 +428,7 @@ def process_all_source_data(self, source_id: int, **kwargs) -> dict[str, Any]:
 
     try:
         source_instance = get_source_class(source)
+        source_instance.full_reprocess = kwargs.pop("full_reprocess", False)
         variables = list(source.variables.all())
 
         logger.info(f"Starting optimized processing for {source.name} ({len(variables)} variables)")
@@ -489,6 +493,7 @@ def full_source_pipeline(self, source_id: int, **kwargs) -> dict[str, Any]:
 
     try:
         source_instance = get_source_class(source)
+        source_instance.full_reprocess = kwargs.pop("full_reprocess", False)
         variables = list(source.variables.all())
 
         logger.info(f"Starting full optimized pipeline for {source.name} ({len(variables)} variables)")
@@ -0,0 +1,110 @@
+"""
+Unit tests for set-based geographic aggregation.
+
+Tests cover:
+- Grouping source rows by target-level ancestor and period in one query
+- Value sums, joined text and parent links of aggregated records
+- Joined text ordered by location path and record ID
+- Re-running aggregation as an upsert
+"""
+
+from datetime import date
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from data_pipeline.aggregates import SQLITE_AGGREGATE_ORDER_BY
+from data_pipeline.models import Source, Variable, VariableData
+from data_pipeline.sources.testsource import TestSource
+from location.models import AdmLevel, Location
+
+
+class GeographicAggregationTest(TestCase):
+    """Test Source._aggregate_geographically."""
+
+    def setUp(self):
+        """Create a two-state hierarchy with ADM2 data."""
+        self.source = Source.objects.create(name="Aggregation Source", type="api", class_name="TestSource")
+        self.variable = Variable.objects.create(source=self.source, code="agg_var", name="Aggregation Variable", period="day", adm_level=2, type="quantitative")
+        self.adm0 = AdmLevel.objects.create(code="0", name="Country")
+        self.adm1 = AdmLevel.objects.create(code="1", name="State")
+        self.adm2 = AdmLevel.objects.create(code="2", name="Locality")
+
+        self.country = Location.objects.create(geo_id="SD", name="Sudan", admin_level=self.adm0)
+        self.state_a = Location.objects.create(geo_id="SD_001", name="State A", admin_level=self.adm1, parent=self.country)
+        self.state_b = Location.objects.create(geo_id="SD_002", name="State B", admin_level=self.adm1, parent=self.country)
+        self.locality_a1 = Location.objects.create(geo_id="SD_001_001", name="A1", admin_level=self.adm2, parent=self.state_a)
+        self.locality_a2 = Location.objects.create(geo_id="SD_001_002", name="A2", admin_level=self.adm2, parent=self.state_a)
+        self.locality_b1 = Location.objects.create(geo_id="SD_002_001", name="B1", admin_level=self.adm2, parent=self.state_b)
+
+        self.day1 = date(2025, 3, 1)
+        self.day2 = date(2025, 3, 2)
+        self.first = self._add(self.locality_a1, self.day1, 10, "clashes")
+        self._add(self.locality_a2, self.day1, 5, "")
+        self._add(self.locality_a1, self.day2, None, "quiet")
+        self._add(self.locality_b1, self.day1, 7, "")
+
+        self.source_instance = TestSource(self.source)
+
+    def _add(self, location, day, value, text):
+        """Create an ADM2 data record."""
+        return VariableData.objects.create(variable=self.variable, start_date=day, end_date=day, period="day", adm_level=self.adm2, gid=location, value=value, text=text)
+
+    def test_aggregates_to_target_level(self):
+        """Test that child rows are summed per state and day."""
+        self.assertTrue(self.source_instance.aggregate(self.variable, target_adm_level=1))
+
+        state_a_day1 = VariableData.objects.get(variable=self.variable, gid=self.state_a, start_date=self.day1)
+        self.assertEqual(state_a_day1.value, 15)
+        self.assertEqual(state_a_day1.text, "clashes")
+        self.assertEqual(state_a_day1.adm_level, self.adm1)
+        self.assertEqual(state_a_day1.parent, self.first)
+
+        state_a_day2 = VariableData.objects.get(variable=self.variable, gid=self.state_a, start_date=self.day2)
+        self.assertIsNone(state_a_day2.value)
+        self.assertEqual(state_a_day2.text, "quiet")
+
+        self.assertEqual(VariableData.objects.get(variable=self.variable, gid=self.state_b).value, 7)
+        self.assertFalse(VariableData.objects.filter(gid=self.country).exists())
+
+    @skipIf(connection.vendor == "sqlite" and connection.Database.sqlite_version_info < SQLITE_AGGREGATE_ORDER_BY, "SQLite before 3.44 cannot order aggregated values")
+    def test_joined_text_ordered_by_location_path(self):
+        """Test that texts are joined by location path and record ID, not insertion order."""
+        day3 = date(2025, 3, 3)
+        self._add(self.locality_a2, day3, 1, "burning")
+        self._add(self.locality_a1, day3, 1, "looting")
+        self._add(self.locality_a1, day3, 1, "shelling")
+
+        self.source_instance.aggregate(self.variable, target_adm_level=1)
+
+        self.assertEqual(VariableData.objects.get(variable=self.variable, gid=self.state_a, start_date=day3).text, "looting | shelling | burning")
+
+    def test_grouped_in_constant_queries(self):
+        """Test that the number of queries does not depend on the number of targets or rows."""
+        with CaptureQueriesContext(connection) as small:
+            self.source_instance.aggregate(self.variable, target_adm_level=1)
+
+        for number in range(3, 8):
+            state = Location.objects.create(geo_id=f"SD_{number:03d}", name=f"State {number}", admin_level=self.adm1, parent=self.country)
+            locality = Location.objects.create(geo_id=f"SD_{number:03d}_001", name=f"L{number}", admin_level=self.adm2, parent=state)
+            self._add(locality, self.day1, number, "")
+            self._add(locality, self.day2, number, "")
+        VariableData.objects.filter(adm_level=self.adm1).delete()
+
+        with CaptureQueriesContext(connection) as large:
+            self.source_instance.aggregate(self.variable, target_adm_level=1)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(VariableData.objects.filter(adm_level=self.adm1).count(), 13)
+
+    def test_rerun_updates_in_place(self):
+        """Test that aggregating again upserts instead of duplicating."""
+        self.source_instance.aggregate(self.variable, target_adm_level=1)
+        VariableData.objects.filter(gid=self.locality_b1).update(value=9)
+
+        self.assertTrue(self.source_instance.aggregate(self.variable, target_adm_level=1))
+
+        self.assertEqual(VariableData.objects.filter(variable=self.variable, adm_level=self.adm1).count(), 3)
+        self.assertEqual(VariableData.objects.get(variable=self.variable, gid=self.state_b).value, 9)
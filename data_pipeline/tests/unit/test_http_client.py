@@ -0,0 +1,109 @@
+"""
+Unit tests for the pooled source HTTP client.
+
+Tests cover:
+- Ordered concurrent page fetching
+- Stopping at the first short or empty page
+- Sliding-window rate limiting shared through the cache
+- Conditional request validators
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from data_pipeline.http_client import RateLimiter, SourceHttpClient
+
+
+class SourceHttpClientTest(TestCase):
+    """Test SourceHttpClient pagination and request helpers."""
+
+    def setUp(self):
+        """Clear cached validators between tests."""
+        cache.clear()
+
+    def test_fetch_pages_yields_in_order(self):
+        """Test that concurrently fetched pages are yielded in page order."""
+        client = SourceHttpClient(max_workers=3)
+        pages = {1: [1, 2], 2: [3, 4], 3: [5, 6], 4: [7]}
+
+        result = list(client.fetch_pages(lambda page: pages.get(page, []), page_size=2))
+
+        self.assertEqual(result, [[1, 2], [3, 4], [5, 6], [7]])
+
+    def test_fetch_pages_stops_at_short_page(self):
+        """Test that no pages are yielded after a short page."""
+        client = SourceHttpClient(max_workers=4)
+        requested = []
+        lock = threading.Lock()
+
+        def fetch_page(page):
+            with lock:
+                requested.append(page)
+            return ["a", "b"] if page == 1 else ["c"] if page == 2 else ["unexpected", "page"]
+
+        result = list(client.fetch_pages(fetch_page, page_size=2))
+
+        self.assertEqual(result, [["a", "b"], ["c"]])
+        # Speculative requests stay bounded by the worker count
+        self.assertLessEqual(max(requested), 1 + 4)
+
+    def test_fetch_pages_sequential(self):
+        """Test that a single worker requests pages strictly one after another."""
+        client = SourceHttpClient(max_workers=1)
+        requested = []
+
+        def fetch_page(page):
+            requested.append(page)
+            return [page] if page < 3 else []
+
+        result = list(client.fetch_pages(fetch_page, page_size=1))
+
+        self.assertEqual(result, [[1], [2]])
+        self.assertEqual(requested, [1, 2, 3])
+
+    def test_map_preserves_order(self):
+        """Test that map returns results in input order."""
+        client = SourceHttpClient(max_workers=4)
+        self.assertEqual(client.map(lambda x: x * 2, [3, 1, 2]), [6, 2, 4])
+
+    def test_conditional_request_sends_stored_validators(self):
+        """Test that ETag validators are stored and replayed on the next request."""
+        client = SourceHttpClient(max_workers=1)
+        first = Mock(status_code=200, headers={"ETag": '"abc"'})
+        second = Mock(status_code=304, headers={})
+
+        with patch.object(client.session, "get", side_effect=[first, second]) as mock_get:
+            client.get("https://example.org/list", params={"q": "flood"}, conditional=True)
+            response = client.get("https://example.org/list", params={"q": "flood"}, conditional=True)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("If-None-Match", mock_get.call_args_list[0].kwargs["headers"])
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"]["If-None-Match"], '"abc"')
+
+
+class RateLimiterTest(TestCase):
+    """Test RateLimiter budget enforcement."""
+
+    def setUp(self):
+        """Start from an empty shared budget."""
+        cache.clear()
+
+    @patch("data_pipeline.http_client.time.sleep")
+    @patch("data_pipeline.http_client.time.time")
+    def test_budget_shared_through_cache(self, mock_time, mock_sleep):
+        """Test that limiters with the same name share one budget and wait until requests slide out of the window."""
+        clock = {"now": 100.0}
+        mock_time.side_effect = lambda: clock["now"]
+        mock_sleep.side_effect = lambda seconds: clock.update(now=clock["now"] + seconds)
+
+        RateLimiter(max_requests=2, period=10, name="Dataminr").acquire()
+        RateLimiter(max_requests=2, period=10, name="Dataminr").acquire()
+        RateLimiter(max_requests=2, period=10, name="ACLED").acquire()
+        mock_sleep.assert_not_called()
+
+        # A new limiter (e.g. the next run) sees the exhausted budget
+        RateLimiter(max_requests=2, period=10, name="Dataminr").acquire()
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [10, 5])
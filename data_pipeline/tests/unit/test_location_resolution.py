@@ -0,0 +1,109 @@
+"""
+Unit tests for per-run location resolution.
+
+Tests cover:
+- One matcher call per distinct location name within a run
+- Unmatched locations recorded in bulk with occurrence counts
+- Occurrence counts of overlapping runs adding up
+- Memoised AdmLevel lookups
+- Coordinates located in bulk before name matching
+"""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from data_pipeline.models import Source
+from data_pipeline.sources.testsource import TestSource
+from location.models import AdmLevel, Location, UnmatchedLocation
+
+
+class LocationResolverTest(TestCase):
+    """Test Source.location_resolution() and LocationResolver."""
+
+    def setUp(self):
+        """Create source instance and a location."""
+        self.source_model = Source.objects.create(name="Resolver Source", type="api", class_name="TestSource")
+        self.source = TestSource(self.source_model)
+        self.adm2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.location = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.adm2)
+
+    @patch("location.utils.location_matcher.match_location")
+    def test_each_name_matched_once_per_run(self, mock_match):
+        """Test that repeated names reuse the first match result."""
+        mock_match.side_effect = lambda location_name, **kwargs: self.location if location_name == "Nyala" else None
+
+        with self.source.location_resolution():
+            for _ in range(5):
+                self.assertEqual(self.source.validate_location_match("Nyala", "ACLED"), self.location)
+                self.assertIsNone(self.source.validate_location_match("Atlantis", "ACLED"))
+
+        self.assertEqual(mock_match.call_count, 2)
+
+    @patch("location.utils.location_matcher.match_location", return_value=None)
+    def test_unmatched_recorded_in_bulk_with_counts(self, _mock_match):
+        """Test that unmatched occurrences are counted and upserted on flush."""
+        UnmatchedLocation.objects.create(name="Atlantis", source="ACLED", occurrence_count=2)
+
+        with self.source.location_resolution() as resolver:
+            for _ in range(3):
+                self.source.validate_location_match("Atlantis", "ACLED")
+                self.source.validate_location_match("El Dorado", "ACLED")
+            self.assertEqual(UnmatchedLocation.objects.filter(name="El Dorado").count(), 0)
+
+            resolver.flush()
+            unmatched = resolver.unmatched_location("El Dorado", "ACLED")
+
+        self.assertEqual(unmatched.occurrence_count, 3)
+        self.assertEqual(UnmatchedLocation.objects.get(name="Atlantis", source="ACLED").occurrence_count, 5)
+
+    @patch("location.utils.location_matcher.match_location", return_value=None)
+    def test_overlapping_runs_add_occurrence_counts(self, _mock_match):
+        """Test that counts recorded by another run in between are kept."""
+        with self.source.location_resolution() as resolver:
+            self.source.validate_location_match("Atlantis", "ACLED")
+            resolver.flush()
+
+            # Another run records the same name after this run loaded the record
+            other = TestSource(self.source_model)
+            with other.location_resolution():
+                for _ in range(4):
+                    other.validate_location_match("Atlantis", "ACLED")
+
+            for _ in range(2):
+                self.source.validate_location_match("Atlantis", "ACLED")
+
+        self.assertEqual(UnmatchedLocation.objects.get(name="Atlantis", source="ACLED").occurrence_count, 7)
+
+    @patch("location.utils.location_matcher.match_location", return_value=None)
+    def test_last_unmatched_location_available_in_run(self, _mock_match):
+        """Test that handle_unmatched_location still returns the record inside a run."""
+        with self.source.location_resolution():
+            location, unmatched = self.source.handle_unmatched_location("Atlantis", "Dataminr")
+
+        self.assertIsNone(location)
+        self.assertEqual(unmatched.name, "Atlantis")
+        self.assertEqual(unmatched.occurrence_count, 1)
+
+    def test_adm_level_memoised(self):
+        """Test that AdmLevel lookups hit the database once per code."""
+        with self.source.location_resolution() as resolver:
+            self.assertEqual(resolver.adm_level("2"), self.adm2)
+            with self.assertNumQueries(0):
+                self.assertEqual(resolver.adm_level("2"), self.adm2)
+
+    @patch("location.utils.location_matcher.match_location", return_value=None)
+    @patch("location.spatial.point_locator.locate_many")
+    def test_coordinates_matched_before_names(self, mock_locate, mock_match):
+        """Test that points are located in bulk and skip name matching."""
+        mock_locate.side_effect = lambda points, admin_level_code=None: [self.location if point == (12.05, 24.88) else None for point in points]
+
+        with self.source.location_resolution() as resolver:
+            resolver.prefetch_points([(12.05, 24.88), ("12.05", "24.88"), (1.0, 1.0), (None, None)])
+            context = {"latitude": 12.05, "longitude": 24.88}
+            self.assertEqual(self.source.validate_location_match("Unknown Town", "ACLED", context), self.location)
+            self.assertIsNone(self.source.validate_location_match("Atlantis", "ACLED", {"latitude": 1.0, "longitude": 1.0}))
+
+        self.assertEqual(mock_locate.call_count, 1)
+        mock_match.assert_called_once()
+        self.assertFalse(UnmatchedLocation.objects.filter(name="Unknown Town").exists())
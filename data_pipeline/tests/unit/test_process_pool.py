@@ -0,0 +1,52 @@
+"""
+Unit tests for the source process pool.
+
+Tests cover:
+- Serial execution with a single worker
+- Parallel execution preserving input order
+- Sources pickled without per-run runtime state
+"""
+
+import pickle
+
+from django.test import TestCase
+
+from data_pipeline.models import Source
+from data_pipeline.sources.testsource import TestSource
+
+
+class PoolTestSource(TestSource):
+    """Test source with a picklable CPU-bound method."""
+
+    def _scale(self, value, offset, factor=1):
+        """Return a value scaled by the shared factor."""
+        return (value + offset) * factor
+
+
+class SourceProcessPoolTest(TestCase):
+    """Test Source.process_pool() and SourceProcessPool."""
+
+    def setUp(self):
+        """Create source instance."""
+        self.source_model = Source.objects.create(name="Pool Source", type="api", class_name="TestSource")
+        self.source = PoolTestSource(self.source_model)
+
+    def test_single_worker_runs_serially(self):
+        """Test that one worker calls the method in-process with shared arguments."""
+        pool = self.source.process_pool(max_workers=1)
+        self.assertEqual(pool.starmap("_scale", [(1, 0), (2, 1)], factor=10), [10, 30])
+
+    def test_workers_preserve_input_order(self):
+        """Test that results from worker processes come back in input order."""
+        pool = self.source.process_pool(max_workers=2)
+        self.assertEqual(pool.starmap("_scale", [(value, 0) for value in range(6)], factor=2), [0, 2, 4, 6, 8, 10])
+
+    def test_source_pickled_without_runtime_state(self):
+        """Test that HTTP clients and location resolvers are not sent to workers."""
+        self.assertIsNotNone(self.source.http)
+        with self.source.location_resolution():
+            copy = pickle.loads(pickle.dumps(self.source))
+
+        self.assertIsNone(copy._http_client)
+        self.assertIsNone(copy._location_resolver)
+        self.assertEqual(copy.source_model.name, "Pool Source")
@@ -0,0 +1,79 @@
+"""
+Unit tests for the partitioned Parquet raw data store.
+
+Tests cover:
+- Date partitioning and manifest entries
+- Reading partitions added since a sequence number
+- Buffered rows bounded across partitions
+- Failed runs leaving nothing behind
+"""
+
+import os
+import tempfile
+
+from django.test import TestCase
+
+from data_pipeline.raw_store import RawDataStore
+
+
+class RawDataStoreTest(TestCase):
+    """Test RawDataStore writes, manifest and reads."""
+
+    def setUp(self):
+        """Create a temporary store root."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = RawDataStore("TestSource", "events", root=self.tmp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary store root."""
+        self.tmp_dir.cleanup()
+
+    def test_records_partitioned_by_month(self):
+        """Test that records are split into month partitions listed in the manifest."""
+        records = [
+            {"id": "a", "event_date": "2025-01-31", "value": 1},
+            {"id": "b", "event_date": "2025-02-01", "value": 2},
+            {"id": "c", "event_date": None, "value": 3},
+        ]
+
+        self.assertEqual(self.store.write(records, date_field="event_date"), 3)
+
+        entries = self.store.partitions()
+        self.assertEqual(sorted(entry["partition"] for entry in entries), ["2025-01", "2025-02", "unknown"])
+        self.assertTrue(all(entry["sequence"] == 1 for entry in entries))
+        self.assertEqual(sorted(r["id"] for r in self.store.iter_records(entries)), ["a", "b", "c"])
+
+    def test_partitions_since_sequence_and_date_range(self):
+        """Test filtering entries by commit sequence and date range."""
+        self.store.write([{"event_date": "2025-01-10"}], date_field="event_date")
+        self.store.write([{"event_date": "2025-03-10"}], date_field="event_date")
+
+        self.assertEqual([e["partition"] for e in self.store.partitions(since=1)], ["2025-03"])
+        self.assertEqual([e["partition"] for e in self.store.partitions(start_date="2025-02-01")], ["2025-03"])
+        self.assertEqual([e["partition"] for e in self.store.partitions(end_date="2025-02-28")], ["2025-01"])
+        self.assertEqual(self.store.read_table(self.store.partitions()).num_rows, 2)
+
+    def test_buffer_bounded_across_partitions(self):
+        """Test that the largest partition buffer is flushed once all buffers together reach the batch size."""
+        records = [{"id": i, "event_date": f"2025-{i % 4 + 1:02d}-10"} for i in range(10)]
+
+        self.assertEqual(self.store.write(records, date_field="event_date", batch_rows=4), 10)
+
+        entries = self.store.partitions()
+        self.assertTrue(all(entry["rows"] <= 4 for entry in entries))
+        self.assertGreater(len(entries), 4)
+        self.assertEqual(sorted(r["id"] for r in self.store.iter_records(entries)), list(range(10)))
+
+    def test_failed_run_not_committed(self):
+        """Test that an interrupted write leaves no files or manifest entries."""
+
+        def failing_records():
+            yield {"event_date": "2025-01-10"}
+            raise Exception("API request failed")
+
+        with self.assertRaises(Exception):
+            self.store.write(failing_records(), date_field="event_date", batch_rows=1)
+
+        self.assertFalse(self.store.exists())
+        parquet_files = [f for _, _, files in os.walk(self.store.path) for f in files if f.endswith(".parquet")]
+        self.assertEqual(parquet_files, [])
@@ -5,14 +5,19 @@ Tests cover:
 - Response format handling (list vs dict)
 - Field mapping for events, fatalities, and actor data
 - Data processing and transformation logic
+- Event ID references per data point
+- Coordinates matched at the admin level a group is keyed on
+- Loading unprocessed raw data store partitions
 """
 
+import tempfile
 from datetime import date
 from unittest.mock import Mock, patch
 
 from django.test import TestCase
 
 from data_pipeline.models import Source, Variable
+from data_pipeline.raw_store import RawDataStore
 from data_pipeline.sources.acled import ACLED
 
 
@@ -208,6 +213,22 @@ class ACLEDSourceTest(TestCase):
         self.assertIn("River Nile", location_names)  # admin1 used
         self.assertIn("Remote Village", location_names)  # location used
 
+    def test_coordinates_follow_group_admin_level(self):
+        """Test that groups without admin2 locate their coordinates at ADM1, or not at all without admin1."""
+        base_event = {"event_date": "2025-02-20", "latitude": 13.45, "longitude": 22.44, "fatalities": 0, "event_type": "Battles"}
+        api_events = [
+            {**base_event, "admin1": "West Darfur", "admin2": "El Geneina"},
+            {**base_event, "admin1": "River Nile", "admin2": "", "location": "Atbara"},
+            {**base_event, "location": "Remote Village"},
+        ]
+
+        points = {point["location_name"]: point for point in self.acled_source._compute_variables(api_events)["acled_total_events"]}
+
+        self.assertEqual((points["El Geneina"]["point_admin_level"], points["El Geneina"]["latitude"]), ("2", 13.45))
+        self.assertEqual((points["River Nile"]["point_admin_level"], points["River Nile"]["latitude"]), ("1", 13.45))
+        self.assertIsNone(points["Remote Village"]["point_admin_level"])
+        self.assertIsNone(points["Remote Village"]["latitude"])
+
     def test_text_field_contains_event_summary(self):
         """Test that text field contains meaningful event information."""
         api_events = [
@@ -259,4 +280,54 @@ class ACLEDSourceTest(TestCase):
         self.assertEqual(events_points[0]["value"], 1)
         
         # Should NOT create fatalities data point (0 fatalities)
-        self.assertEqual(len(fatalities_points), 0)
\ No newline at end of file
+        self.assertEqual(len(fatalities_points), 0)
+
+    def test_event_ids_stored_per_variable(self):
+        """Test that data points reference contributing event IDs instead of event copies."""
+        api_events = [
+            {"event_id_cnty": "SDN1", "event_date": "2025-03-01", "admin2": "Nyala", "fatalities": "2", "event_type": "Battles"},
+            {"event_id_cnty": "SDN2", "event_date": "2025-03-01", "admin2": "Nyala", "fatalities": "0", "event_type": "Protests", "disorder_type": "Demonstrations"},
+            {"event_id_cnty": "SDN3", "event_date": "2025-03-02", "admin2": "Nyala", "fatalities": "1", "event_type": "Battles"},
+        ]
+
+        results = self.acled_source._compute_variables(iter(api_events))
+
+        self.assertEqual([p["event_ids"] for p in results["acled_total_events"]], [["SDN1", "SDN2"], ["SDN3"]])
+        self.assertEqual([p["event_ids"] for p in results["acled_fatalities"]], [["SDN1"], ["SDN3"]])
+        self.assertEqual([p["value"] for p in results["acled_battles"]], [1, 1])
+        self.assertEqual(results["acled_riots"][0]["event_ids"], ["SDN2"])
+        self.assertNotIn("events", results["acled_total_events"][0])
+
+    def test_unprocessed_events_reload_touched_partitions(self):
+        """Test that processing reloads partitions with new data and deduplicates events."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RawDataStore("ACLED", ACLED.EVENTS_DATASET, root=tmp_dir)
+            store.write(
+                [
+                    {"event_id_cnty": "SDN1", "event_date": "2025-01-20", "fatalities": 1},
+                    {"event_id_cnty": "SDN2", "event_date": "2025-02-05", "fatalities": 1},
+                ],
+                date_field="event_date",
+            )
+            first_sequence = store.latest_sequence
+
+            # Second run re-fetches SDN2 and adds a new February event
+            store.write(
+                [
+                    {"event_id_cnty": "SDN2", "event_date": "2025-02-05", "fatalities": 4},
+                    {"event_id_cnty": "SDN3", "event_date": "2025-02-06", "fatalities": 0},
+                ],
+                date_field="event_date",
+            )
+
+            batches, sequence = self.acled_source._load_unprocessed_events(store, first_sequence)
+            batches = list(batches)
+
+            self.assertEqual(sequence, 2)
+            self.assertEqual(len(batches), 1)
+            self.assertEqual(sorted(e["event_id_cnty"] for e in batches[0]), ["SDN2", "SDN3"])
+            self.assertEqual(next(e for e in batches[0] if e["event_id_cnty"] == "SDN2")["fatalities"], 4)
+
+            batches, sequence = self.acled_source._load_unprocessed_events(store, sequence)
+            self.assertEqual((list(batches), sequence), ([], 2))
+            self.assertEqual([len(batch) for batch in self.acled_source._load_unprocessed_events(store, 0)[0]], [1, 2])
@@ -117,6 +117,22 @@ class IOMSourceTest(TestCase):
         self.iom_source._build_location_cache()
         self.assertIs(self.iom_source._location_cache, first_cache)
 
+    def test_location_cache_shared_across_instances_until_gazetteer_changes(self):
+        """Test that a warm worker reuses the cache and rebuilds it after gazetteer changes."""
+        self.iom_source._build_location_cache()
+
+        # A new source instance (next task in the same worker) needs no queries
+        next_run = IOM(self.source)
+        with self.assertNumQueries(0):
+            next_run._build_location_cache()
+        self.assertIs(next_run._location_cache, self.iom_source._location_cache)
+
+        # Adding a gazetteer entry starts a new generation
+        Gazetteer.objects.create(source="IOM_DTM", name="New Town", code="NEW001", location=self.location2)
+
+        after_change = IOM(self.source)
+        self.assertEqual(after_change._lookup_location("NEW001"), self.location2)
+
     def test_location_lookup_direct_pcode(self):
         """Test location lookup by direct pcode."""
         # Setup cache with test data
@@ -62,7 +62,7 @@ class ReliefWebSourceTest(TestCase):
         self.assertEqual(self.reliefweb_source.base_url, "https://api.reliefweb.int/v2")
         self.assertEqual(self.reliefweb_source.app_name, "nrc-ewas-sudan")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_fetch_disaster_details_success(self, mock_get):
         """Test successful disaster detail fetching."""
         # Mock successful API response
@@ -100,7 +100,7 @@ class ReliefWebSourceTest(TestCase):
             timeout=30,
         )
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_fetch_disaster_details_failure(self, mock_get):
         """Test disaster detail fetching with API failure."""
         # Mock failed API response
@@ -114,7 +114,7 @@ class ReliefWebSourceTest(TestCase):
         # Should return None
         self.assertIsNone(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_fetch_disaster_details_empty_data(self, mock_get):
         """Test disaster detail fetching with empty response data."""
         # Mock response with empty data
@@ -129,7 +129,7 @@ class ReliefWebSourceTest(TestCase):
         # Should return None
         self.assertIsNone(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_fetch_disaster_details_exception_handling(self, mock_get):
         """Test disaster detail fetching with request exception."""
         # Mock request exception
@@ -141,7 +141,7 @@ class ReliefWebSourceTest(TestCase):
         # Should return None and handle exception gracefully
         self.assertIsNone(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open")
     def test_get_method_flood_variable(self, mock_open, mock_get):
         """Test API data retrieval for flood variable."""
@@ -171,7 +171,7 @@ class ReliefWebSourceTest(TestCase):
             self.assertIn("query[value]", kwargs["params"])
             self.assertEqual(kwargs["params"]["query[value]"], "flood")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open")
     def test_get_method_drought_variable(self, mock_open, mock_get):
         """Test API data retrieval for drought variable."""
@@ -201,7 +201,7 @@ class ReliefWebSourceTest(TestCase):
             self.assertIn("query[value]", kwargs["params"])
             self.assertEqual(kwargs["params"]["query[value]"], "drought")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open")
     def test_get_method_conflict_variable(self, mock_open, mock_get):
         """Test API data retrieval for conflict variable."""
@@ -231,7 +231,7 @@ class ReliefWebSourceTest(TestCase):
             self.assertIn("query[value]", kwargs["params"])
             self.assertEqual(kwargs["params"]["query[value]"], "conflict OR violence OR displacement")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_method_api_failure(self, mock_get):
         """Test API data retrieval with request failure."""
         # Mock failed API response
@@ -243,7 +243,7 @@ class ReliefWebSourceTest(TestCase):
         # Should fail gracefully
         self.assertFalse(result)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_disaster_detail_fetching_with_invalid_input(self, mock_get):
         """Test that _fetch_disaster_details method handles invalid input gracefully."""
         # Test with None input - will make API call but should handle gracefully
@@ -348,7 +348,7 @@ class ReliefWebSourceTest(TestCase):
         # Test conflict variable
         self.assertIn("conflict", self.conflict_var.code)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open")
     def test_api_parameter_construction(self, mock_open, mock_get):
         """Test that API parameters are constructed correctly."""
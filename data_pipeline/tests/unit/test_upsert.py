@@ -0,0 +1,143 @@
+"""
+Unit tests for the batched VariableData writer.
+
+Tests cover:
+- Insert and update counting across flushes
+- Upserts on the (variable, start_date, end_date, gid) unique key
+- Unmatched rows keyed on original location text
+- Last-write-wins deduplication within a batch
+- Skipping rows with unchanged content hashes
+- Processing watermarks
+"""
+
+from datetime import date
+
+from django.test import TestCase
+
+from data_pipeline.models import ProcessingWatermark, Source, Variable, VariableData
+from data_pipeline.sources.testsource import TestSource
+from data_pipeline.upsert import VariableDataWriter
+from location.models import AdmLevel, Location
+
+
+class VariableDataWriterTest(TestCase):
+    """Test VariableDataWriter batching and upsert behaviour."""
+
+    def setUp(self):
+        """Create source, variable and locations."""
+        self.source = Source.objects.create(name="Writer Source", type="api", class_name="TestSource")
+        self.variable = Variable.objects.create(
+            source=self.source,
+            code="writer_var",
+            name="Writer Variable",
+            period="day",
+            adm_level=2,
+            type="quantitative",
+        )
+        self.adm2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.location_a = Location.objects.create(geo_id="SD_001_001", name="Locality A", admin_level=self.adm2)
+        self.location_b = Location.objects.create(geo_id="SD_001_002", name="Locality B", admin_level=self.adm2)
+        self.day = date(2025, 3, 1)
+
+    def test_inserts_then_updates_matched_rows(self):
+        """Test that re-writing the same key updates instead of duplicating."""
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+            writer.add(self.variable, self.day, self.day, gid=self.location_b, value=2)
+
+        self.assertEqual(writer.stats(), {"inserted": 2, "updated": 0})
+
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=10, text="updated")
+
+        self.assertEqual(writer.stats(), {"inserted": 0, "updated": 1})
+        self.assertEqual(VariableData.objects.count(), 2)
+        record = VariableData.objects.get(gid=self.location_a)
+        self.assertEqual(record.value, 10)
+        self.assertEqual(record.text, "updated")
+        self.assertEqual(record.adm_level, self.adm2)
+
+    def test_unmatched_rows_keyed_on_location_text(self):
+        """Test that unmatched rows are distinguished by original location text."""
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, adm_level=self.adm2, value=1, original_location_text="Unknown A")
+            writer.add(self.variable, self.day, self.day, adm_level=self.adm2, value=2, original_location_text="Unknown B")
+
+        self.assertEqual(writer.inserted, 2)
+
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, adm_level=self.adm2, value=5, original_location_text="Unknown A")
+
+        self.assertEqual(writer.stats(), {"inserted": 0, "updated": 1})
+        self.assertEqual(VariableData.objects.filter(gid__isnull=True).count(), 2)
+        self.assertEqual(VariableData.objects.get(original_location_text="Unknown A").value, 5)
+
+    def test_duplicate_keys_in_batch_last_write_wins(self):
+        """Test that duplicate keys within a batch collapse to the last row."""
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=3)
+
+        self.assertEqual(writer.written, 1)
+        self.assertEqual(VariableData.objects.get(gid=self.location_a).value, 3)
+
+    def test_flushes_when_batch_is_full(self):
+        """Test that rows are written as soon as the batch size is reached."""
+        writer = VariableDataWriter(batch_size=2)
+        writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+        self.assertEqual(writer.pending, 1)
+        self.assertEqual(VariableData.objects.count(), 0)
+
+        writer.add(self.variable, self.day, self.day, gid=self.location_b, value=2)
+        self.assertEqual(writer.pending, 0)
+        self.assertEqual(VariableData.objects.count(), 2)
+
+    def test_nothing_written_on_exception(self):
+        """Test that buffered rows are discarded when the block raises."""
+        with self.assertRaises(ValueError):
+            with VariableDataWriter() as writer:
+                writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+                raise ValueError("boom")
+
+        self.assertEqual(VariableData.objects.count(), 0)
+
+    def test_unchanged_rows_skipped(self):
+        """Test that rows with an identical payload are not rewritten."""
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1, raw_data={"ids": [1]})
+            writer.add(self.variable, self.day, self.day, adm_level=self.adm2, value=2, original_location_text="Unknown A")
+
+        updated_at = VariableData.objects.get(gid=self.location_a).updated_at
+
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1, raw_data={"ids": [1]})
+            writer.add(self.variable, self.day, self.day, adm_level=self.adm2, value=2, original_location_text="Unknown A")
+            writer.add(self.variable, self.day, self.day, gid=self.location_b, value=3)
+
+        self.assertEqual(writer.stats(), {"inserted": 1, "updated": 0})
+        self.assertEqual(writer.unchanged, 2)
+        self.assertEqual(VariableData.objects.get(gid=self.location_a).updated_at, updated_at)
+
+    def test_full_reprocess_rewrites_unchanged_rows(self):
+        """Test that skip_unchanged=False rewrites identical rows."""
+        with VariableDataWriter() as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+
+        with VariableDataWriter(skip_unchanged=False) as writer:
+            writer.add(self.variable, self.day, self.day, gid=self.location_a, value=1)
+
+        self.assertEqual(writer.stats(), {"inserted": 0, "updated": 1})
+        self.assertEqual(writer.unchanged, 0)
+
+    def test_processing_watermark_advances(self):
+        """Test that watermarks are created on demand and only move forward in date."""
+        source = TestSource(self.source)
+        self.assertEqual(source.get_processing_watermark(self.variable).raw_sequence, 0)
+
+        source.update_processing_watermark(self.variable, raw_sequence=3, last_record_date=self.day)
+        source.update_processing_watermark(self.variable, last_record_date=date(2025, 1, 1))
+
+        watermark = ProcessingWatermark.objects.get(variable=self.variable)
+        self.assertEqual(watermark.raw_sequence, 3)
+        self.assertEqual(watermark.last_record_date, self.day)
+        self.assertIsNotNone(watermark.last_processed_at)
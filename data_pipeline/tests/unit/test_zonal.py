@@ -0,0 +1,81 @@
+"""
+Unit tests for windowed zonal statistics.
+
+Tests cover:
+- Sums per polygon using pixel centres
+- Chunked reads giving the same result as a single window
+- Nodata handling and polygons outside the raster
+- Overlapping polygons each counting their shared pixels
+- One-off COG conversion
+"""
+
+import os
+import tempfile
+
+import geopandas as gpd
+import numpy as np
+import rasterio
+from django.test import TestCase
+from rasterio.transform import from_origin
+from shapely.geometry import box
+
+from data_pipeline.zonal import RasterZonalStats
+
+
+class RasterZonalStatsTest(TestCase):
+    """Test RasterZonalStats sums and COG conversion."""
+
+    def setUp(self):
+        """Write a 10x10 raster of ones with one nodata pixel."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.raster_path = os.path.join(self.tmp_dir.name, "population.tif")
+
+        data = np.ones((10, 10), dtype="float32")
+        data[0, 0] = -1  # Top-left pixel, covering x 0-1 / y 9-10
+        with rasterio.open(
+            self.raster_path, "w", driver="GTiff", width=10, height=10, count=1, dtype="float32", crs="EPSG:4326", transform=from_origin(0, 10, 1, 1), nodata=-1
+        ) as dst:
+            dst.write(data, 1)
+
+        self.polygons = gpd.GeoSeries([box(0, 0, 2, 2), box(3, 3, 6, 5), box(0, 8, 2, 10), box(20, 20, 21, 21)], crs="EPSG:4326")
+
+    def tearDown(self):
+        """Remove the temporary raster."""
+        self.tmp_dir.cleanup()
+
+    def test_sums_per_polygon(self):
+        """Test that each polygon sums the pixels whose centres it contains."""
+        sums = RasterZonalStats(self.raster_path).sums(self.polygons)
+
+        np.testing.assert_array_equal(sums, [4, 6, 3, 0])
+
+    def test_chunked_reads_match(self):
+        """Test that small windows give the same totals."""
+        sums = RasterZonalStats(self.raster_path, max_window_pixels=10).sums(self.polygons)
+
+        np.testing.assert_array_equal(sums, [4, 6, 3, 0])
+
+    def test_overlapping_polygons_count_shared_pixels(self):
+        """Test that pixels inside several polygons are counted for each of them."""
+        polygons = gpd.GeoSeries([box(2, 2, 6, 4), box(4, 2, 8, 4), box(5, 3, 7, 6)], crs="EPSG:4326")
+
+        for max_window_pixels in (RasterZonalStats.DEFAULT_MAX_WINDOW_PIXELS, 10):
+            sums = RasterZonalStats(self.raster_path, max_window_pixels=max_window_pixels).sums(polygons)
+
+            np.testing.assert_array_equal(sums, [8, 8, 6])
+
+    def test_extra_nodata_value(self):
+        """Test that an extra nodata value is excluded from sums."""
+        sums = RasterZonalStats(self.raster_path).sums(self.polygons, nodata=1)
+
+        np.testing.assert_array_equal(sums, [0, 0, 0, 0])
+
+    def test_cog_created_once(self):
+        """Test that the raster is converted to a COG and reused."""
+        zonal = RasterZonalStats(self.raster_path)
+        cog_path = zonal.path
+
+        self.assertTrue(cog_path.endswith(RasterZonalStats.COG_SUFFIX))
+        self.assertTrue(os.path.exists(cog_path))
+        self.assertEqual(RasterZonalStats(cog_path).path, cog_path)
+        self.assertEqual(RasterZonalStats(self.raster_path).ensure_cog(self.raster_path), cog_path)
@@ -0,0 +1,219 @@
+"""Batched upsert of VariableData rows for source processing."""
+
+import hashlib
+import json
+import logging
+from datetime import date
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Variable, VariableData
+
+
+class VariableDataWriter:
+    """Collect VariableData rows and write them in batches.
+
+    Rows are keyed on the ``VariableData`` unique constraint
+    ``(variable, start_date, end_date, gid)``. Matched rows are written with a
+    single ``INSERT ... ON CONFLICT DO UPDATE`` per batch. Unmatched rows
+    (``gid`` is NULL) never conflict in the database, so they are additionally
+    keyed on ``original_location_text`` and resolved against existing rows
+    before being bulk created or bulk updated.
+
+    Each row carries a ``content_hash`` of its payload. With ``skip_unchanged``
+    (the default), rows whose stored hash matches are not written at all, so
+    reprocessing unchanged source data only touches the rows that differ.
+
+    Usage:
+        with self.variable_data_writer() as writer:
+            for point in data_points:
+                writer.add(variable, start_date, end_date, gid=location, ...)
+        self.log_info(f"Inserted {writer.inserted}, updated {writer.updated}")
+    """
+
+    UNIQUE_FIELDS = ["variable", "start_date", "end_date", "gid"]
+    UPDATE_FIELDS = ["period", "adm_level", "value", "text", "raw_data", "original_location_text", "unmatched_location", "content_hash", "updated_at"]
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, logger: logging.Logger | None = None, skip_unchanged: bool = True):
+        """Initialize writer with an empty buffer.
+
+        Args:
+            batch_size: Number of rows buffered before each bulk write
+            logger: Logger to report through
+            skip_unchanged: Skip rows whose stored content hash is identical
+        """
+        self.batch_size = batch_size
+        self.logger = logger or logging.getLogger(__name__)
+        self.skip_unchanged = skip_unchanged
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self._buffer: dict[tuple, VariableData] = {}
+
+    def __enter__(self) -> "VariableDataWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Only persist the remaining buffer if the caller finished cleanly
+        if exc_type is None:
+            self.flush()
+
+    @property
+    def written(self) -> int:
+        """Total number of rows inserted or updated so far."""
+        return self.inserted + self.updated
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet written."""
+        return len(self._buffer)
+
+    def add(
+        self,
+        variable: Variable,
+        start_date: date,
+        end_date: date,
+        gid=None,
+        adm_level=None,
+        period: str = "day",
+        value: float | None = None,
+        text: str = "",
+        raw_data: Any = None,
+        original_location_text: str = "",
+        unmatched_location=None,
+        parent: VariableData | None = None,
+    ) -> None:
+        """Buffer a row for writing, flushing when the batch is full.
+
+        A later row with the same key replaces an earlier buffered one, matching
+        the last-write-wins behaviour of repeated ``update_or_create`` calls.
+        """
+        if adm_level is None and gid is not None:
+            adm_level = gid.admin_level
+
+        row = VariableData(
+            variable=variable,
+            start_date=start_date,
+            end_date=end_date,
+            gid=gid,
+            adm_level=adm_level,
+            period=period,
+            value=value,
+            text=text or "",
+            raw_data=raw_data,
+            original_location_text=original_location_text or "",
+            unmatched_location=unmatched_location,
+            parent=parent,
+            updated_at=timezone.now(),
+        )
+        row.content_hash = self.content_hash(row)
+        self._buffer[self._row_key(row)] = row
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> dict[str, int]:
+        """Write all buffered rows and return cumulative counts."""
+        if not self._buffer:
+            return self.stats()
+
+        rows = list(self._buffer.values())
+        self._buffer.clear()
+
+        existing = self._fetch_existing_keys(rows)
+
+        # Drop rows whose stored payload is identical
+        if self.skip_unchanged:
+            changed = [row for row in rows if self._row_key(row) not in existing or existing[self._row_key(row)][1] != row.content_hash]
+            self.unchanged += len(rows) - len(changed)
+            rows = changed
+            if not rows:
+                return self.stats()
+
+        matched = [row for row in rows if row.gid_id is not None]
+        unmatched_new = []
+        unmatched_existing = []
+        for row in rows:
+            if row.gid_id is not None:
+                continue
+            if self._row_key(row) not in existing:
+                unmatched_new.append(row)
+            else:
+                row.pk = existing[self._row_key(row)][0]
+                unmatched_existing.append(row)
+
+        with transaction.atomic():
+            if matched:
+                VariableData.objects.bulk_create(
+                    matched,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=self.UNIQUE_FIELDS,
+                    update_fields=self.UPDATE_FIELDS,
+                )
+            if unmatched_new:
+                VariableData.objects.bulk_create(unmatched_new, batch_size=self.batch_size)
+            if unmatched_existing:
+                VariableData.objects.bulk_update(unmatched_existing, self.UPDATE_FIELDS, batch_size=self.batch_size)
+
+        batch_updated = sum(1 for row in rows if self._row_key(row) in existing)
+        self.updated += batch_updated
+        self.inserted += len(rows) - batch_updated
+
+        self.logger.debug(f"Flushed {len(rows)} VariableData rows ({len(rows) - batch_updated} inserted, {batch_updated} updated)")
+        return self.stats()
+
+    def stats(self) -> dict[str, int]:
+        """Return cumulative inserted/updated counts."""
+        return {"inserted": self.inserted, "updated": self.updated}
+
+    @staticmethod
+    def content_hash(row: VariableData) -> str:
+        """Hash the payload fields of a row (everything written on update except timestamps)."""
+        payload = [
+            row.period,
+            row.adm_level_id,
+            row.value,
+            row.text,
+            row.raw_data,
+            row.original_location_text,
+            row.unmatched_location_id,
+        ]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _row_key(row: VariableData) -> tuple:
+        """Build the identity key of a row (location text only disambiguates unmatched rows)."""
+        location_text = row.original_location_text if row.gid_id is None else ""
+        return (row.variable_id, row.start_date, row.end_date, row.gid_id, location_text)
+
+    def _fetch_existing_keys(self, rows: list[VariableData]) -> dict[tuple, tuple[int, str]]:
+        """Look up which buffered rows already exist, with their content hash, in a single query."""
+        variable_ids = {row.variable_id for row in rows}
+        gid_ids = {row.gid_id for row in rows if row.gid_id is not None}
+        location_texts = {row.original_location_text for row in rows if row.gid_id is None}
+
+        location_filter = Q()
+        if gid_ids:
+            location_filter |= Q(gid_id__in=gid_ids)
+        if location_texts:
+            location_filter |= Q(gid__isnull=True, original_location_text__in=location_texts)
+
+        existing_qs = VariableData.objects.filter(
+            location_filter,
+            variable_id__in=variable_ids,
+            start_date__gte=min(row.start_date for row in rows),
+            start_date__lte=max(row.start_date for row in rows),
+        ).values_list("pk", "variable_id", "start_date", "end_date", "gid_id", "original_location_text", "content_hash")
+
+        keys = {self._row_key(row) for row in rows}
+        existing = {}
+        for pk, variable_id, start_date, end_date, gid_id, location_text, content_hash in existing_qs.iterator():
+            key = (variable_id, start_date, end_date, gid_id, location_text if gid_id is None else "")
+            if key in keys:
+                existing.setdefault(key, (pk, content_hash))
+        return existing
@@ -8,3 +8,25 @@ class LocationConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "location"
+
+    def ready(self):
+        """Connect boundary cache, simplified boundary, gazetteer generation and name variation signals."""
+        from django.db.models.signals import post_delete, post_save
+
+        from location.boundaries import invalidate_boundaries_signal_handler
+        from location.cache import bump_gazetteer_generation_signal_handler
+        from location.models import Gazetteer, Location
+        from location.simplification import refresh_simplified_boundaries_signal_handler
+        from location.variations import delete_name_variations_signal_handler, update_name_variations_signal_handler
+
+        post_save.connect(invalidate_boundaries_signal_handler, sender=Location)
+        post_delete.connect(invalidate_boundaries_signal_handler, sender=Location)
+        post_save.connect(refresh_simplified_boundaries_signal_handler, sender=Location)
+
+        for model in (Gazetteer, Location):
+            post_save.connect(bump_gazetteer_generation_signal_handler, sender=model)
+            post_delete.connect(bump_gazetteer_generation_signal_handler, sender=model)
+
+        post_save.connect(update_name_variations_signal_handler, sender=Location)
+        post_save.connect(update_name_variations_signal_handler, sender=Gazetteer)
+        post_delete.connect(delete_name_variations_signal_handler, sender=Gazetteer)
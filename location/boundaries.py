@@ -0,0 +1,224 @@
+"""Cached administrative boundary GeoDataFrames for geospatial processing."""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import AsWKB
+from django.db.models import Count, Max
+
+from .models import FULL_DETAIL, Location, SimplifiedBoundary
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import shapely
+
+logger = logging.getLogger(__name__)
+
+
+class BoundaryProvider:
+    """Provide ADM boundaries as GeoDataFrames with prebuilt spatial indexes.
+
+    Boundaries of an admin level are read from the database once as WKB
+    (no WKT round trip), written to a GeoParquet cache file and kept in
+    memory together with an STRtree over the geometries. The cache is keyed
+    on a fingerprint of the level's locations (count and latest
+    ``updated_at``), so edits made by any process are picked up on the next
+    call; ``Location`` save/delete signals additionally drop the in-memory
+    frames straight away.
+
+    Boundaries can also be served at a stored level of detail (see
+    ``SimplifiedBoundary``), e.g. the "analysis" level for raster and polygon
+    overlays that do not need full-resolution vertices. Point lookups keep
+    the full boundaries.
+
+    Returned GeoDataFrames are shared and must be treated as read-only.
+    geopandas and shapely are imported on first use so that the signal
+    handlers connected at startup stay cheap for web processes.
+
+    Usage:
+        from location.boundaries import boundary_provider
+
+        adm2_gdf = boundary_provider.get("2")
+        tree = boundary_provider.tree("2")
+        overlay_gdf = boundary_provider.get("2", detail="analysis")
+    """
+
+    COLUMNS = ["location_id", "pcode", "name", "admin_level_code", "geometry"]
+
+    def __init__(self, cache_dir: str | None = None):
+        """Initialize provider.
+
+        Args:
+            cache_dir: Directory of GeoParquet cache files (defaults to the LOCATION_BOUNDARY_CACHE_DIR setting)
+        """
+        self._cache_dir = cache_dir
+        self._frames: dict[tuple[str, str], tuple[str, gpd.GeoDataFrame]] = {}
+        self._trees: dict[tuple[str, str], tuple[str, shapely.STRtree]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache_dir(self) -> str:
+        """Directory of GeoParquet cache files."""
+        return self._cache_dir or getattr(settings, "LOCATION_BOUNDARY_CACHE_DIR", os.path.join("raw_data", "_boundaries"))
+
+    def get(self, admin_level_code: str, detail: str = FULL_DETAIL) -> "gpd.GeoDataFrame":
+        """Get boundaries of an admin level.
+
+        Args:
+            admin_level_code: AdmLevel code (e.g. "1", "2")
+            detail: Level of detail (key of BOUNDARY_DETAILS, or FULL_DETAIL for the full boundaries)
+
+        Returns:
+            GeoDataFrame: location_id, pcode, name, admin_level_code and geometry (EPSG:4326),
+            empty if the level has no boundaries
+        """
+        key = (str(admin_level_code), detail)
+        fingerprint = self._fingerprint(*key)
+
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+
+            gdf = self._read_cache_file(*key, fingerprint)
+            if gdf is None:
+                gdf = self._load_from_database(*key)
+                self._write_cache_file(*key, fingerprint, gdf)
+
+            self._frames[key] = (fingerprint, gdf)
+            return gdf
+
+    def tree(self, admin_level_code: str, detail: str = FULL_DETAIL) -> "shapely.STRtree":
+        """Get an STRtree over the boundaries of an admin level (same row order as ``get()``)."""
+        import shapely
+
+        key = (str(admin_level_code), detail)
+        gdf = self.get(*key)
+        fingerprint = self._frames[key][0]
+
+        with self._lock:
+            cached = self._trees.get(key)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+
+            tree = shapely.STRtree(gdf.geometry.values)
+            self._trees[key] = (fingerprint, tree)
+            return tree
+
+    def invalidate(self, admin_level_code: str | None = None, delete_files: bool = True) -> None:
+        """Drop cached boundaries of one admin level, or of all levels.
+
+        Args:
+            admin_level_code: AdmLevel code, or None for all levels
+            delete_files: Also delete the GeoParquet cache files (stale files are otherwise replaced on their next fingerprint mismatch)
+        """
+        with self._lock:
+            for key in list({*self._frames, *self._trees}):
+                if admin_level_code is None or key[0] == str(admin_level_code):
+                    self._frames.pop(key, None)
+                    self._trees.pop(key, None)
+
+            if not delete_files or not os.path.isdir(self.cache_dir):
+                return
+            for filename in os.listdir(self.cache_dir):
+                if admin_level_code is None or filename.startswith(f"adm{admin_level_code}-"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, filename))
+                    except FileNotFoundError:
+                        pass
+
+    def _fingerprint(self, code: str, detail: str) -> str:
+        """Summarise the current boundaries of an admin level in one aggregate query (two for simplified levels)."""
+        stats = Location.objects.filter(admin_level__code=code, boundary__isnull=False).aggregate(count=Count("id"), updated=Max("updated_at"))
+        updated = stats["updated"].isoformat() if stats["updated"] else ""
+        summary = f"{code}:{stats['count']}:{updated}"
+        if detail != FULL_DETAIL:
+            # Simplifications are replaced (new IDs) whenever they are recomputed
+            simplified = SimplifiedBoundary.objects.filter(location__admin_level__code=code, detail=detail).aggregate(count=Count("id"), latest=Max("id"))
+            summary = f"{summary}:{detail}:{simplified['count']}:{simplified['latest']}"
+        return hashlib.sha1(summary.encode()).hexdigest()[:12]
+
+    def _cache_path(self, code: str, detail: str, fingerprint: str) -> str:
+        """Path of the cache file of an admin level version."""
+        return os.path.join(self.cache_dir, f"adm{code}-{detail}-{fingerprint}.parquet")
+
+    def _read_cache_file(self, code: str, detail: str, fingerprint: str) -> "gpd.GeoDataFrame | None":
+        """Read a cached GeoParquet file, or None if missing or unreadable."""
+        import geopandas as gpd
+
+        path = self._cache_path(code, detail, fingerprint)
+        if not os.path.exists(path):
+            return None
+        try:
+            return gpd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable boundary cache {path}: {e}")
+            return None
+
+    def _write_cache_file(self, code: str, detail: str, fingerprint: str, gdf: "gpd.GeoDataFrame") -> None:
+        """Write a GeoParquet cache file, replacing older versions of the level."""
+        if gdf.empty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._cache_path(code, detail, fingerprint)
+            tmp_path = f"{path}.tmp"
+            gdf.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+
+            for filename in os.listdir(self.cache_dir):
+                if filename.startswith(f"adm{code}-{detail}-") and filename != os.path.basename(path):
+                    os.remove(os.path.join(self.cache_dir, filename))
+        except Exception as e:
+            logger.warning(f"Failed to write boundary cache for ADM{code} ({detail}): {e}")
+
+    def _load_from_database(self, code: str, detail: str) -> "gpd.GeoDataFrame":
+        """Load boundaries of an admin level from the database as WKB."""
+        import geopandas as gpd
+        import shapely
+
+        rows = list(
+            Location.objects.filter(admin_level__code=code, boundary__isnull=False)
+            .with_boundary(detail)
+            .annotate(wkb=AsWKB("display_boundary"))
+            .order_by("id")
+            .values_list("id", "geo_id", "name", "wkb")
+        )
+        if not rows:
+            logger.warning(f"No ADM{code} locations with boundaries found")
+            return gpd.GeoDataFrame(columns=self.COLUMNS, geometry="geometry", crs="EPSG:4326")
+
+        ids, pcodes, names, wkbs = zip(*rows, strict=True)
+        gdf = gpd.GeoDataFrame(
+            {"location_id": ids, "pcode": pcodes, "name": names, "admin_level_code": code},
+            geometry=shapely.from_wkb([bytes(wkb) for wkb in wkbs]),
+            crs="EPSG:4326",
+        )
+        logger.info(f"Loaded {len(gdf)} ADM{code} boundaries ({detail})")
+        return gdf
+
+
+# Location fields stored in boundary frames (with the translated name columns)
+BOUNDARY_FRAME_FIELDS = {"boundary", "name", "name_en", "name_ar", "geo_id", "admin_level"}
+
+
+def invalidate_boundaries_signal_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Drop in-memory boundaries when a location is saved or deleted.
+
+    Connect this to Location post_save and post_delete signals. Fixture
+    loading (``raw``) and saves that touch none of the boundary frame fields
+    are skipped. All levels are dropped so the handler never has to query the
+    instance's admin level; GeoParquet files are kept, since their
+    fingerprint already detects the change.
+    """
+    if raw or (update_fields is not None and BOUNDARY_FRAME_FIELDS.isdisjoint(update_fields)):
+        return
+    boundary_provider.invalidate(delete_files=False)
+
+
+# Global instance for easy access
+boundary_provider = BoundaryProvider()
@@ -0,0 +1,100 @@
+"""Gazetteer generation counter used to version in-process location caches."""
+
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import Location
+
+logger = logging.getLogger(__name__)
+
+
+class GazetteerGeneration:
+    """Process-wide view of a shared gazetteer generation counter.
+
+    The counter lives in the default Django cache (Redis in production), so a
+    ``Gazetteer`` or ``Location`` change in any process bumps it for every
+    worker. Caches built from gazetteer data remember the generation they
+    were built for and are dropped once it moves on.
+
+    Reading the shared counter is throttled to one cache read every
+    ``CHECK_INTERVAL`` seconds; bumps made in this process are seen
+    immediately. The counter is seeded from the clock, so an evicted key
+    never comes back with a value an older cache was built for.
+
+    Usage:
+        from location.cache import gazetteer_generation
+
+        if built_for != gazetteer_generation.current():
+            rebuild()
+    """
+
+    CACHE_KEY = "location:gazetteer:generation"
+    CHECK_INTERVAL = 5  # seconds between reads of the shared counter
+
+    def __init__(self):
+        """Initialize generation view."""
+        self._value: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        """Current generation, re-read from the shared cache at most every CHECK_INTERVAL seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if self._value is None or now - self._checked_at >= self.CHECK_INTERVAL:
+                self._value = self._read()
+                self._checked_at = now
+            return self._value
+
+    def bump(self) -> int:
+        """Start a new generation, invalidating caches in every process."""
+        with self._lock:
+            try:
+                self._read()
+                value = cache.incr(self.CACHE_KEY)
+            except Exception as e:
+                # Shared cache unavailable (or key evicted in between): fall back to a local bump
+                logger.warning(f"Could not bump shared gazetteer generation: {e}")
+                value = max(self._value or 0, time.time_ns()) + 1
+            self._value = value
+            self._checked_at = time.monotonic()
+            return value
+
+    def _read(self) -> int:
+        """Read the shared counter, seeding it if missing."""
+        try:
+            value = cache.get(self.CACHE_KEY)
+            if value is None:
+                cache.add(self.CACHE_KEY, time.time_ns(), timeout=None)
+                value = cache.get(self.CACHE_KEY)
+            if value is not None:
+                return int(value)
+        except Exception as e:
+            logger.warning(f"Could not read shared gazetteer generation: {e}")
+        return self._value if self._value is not None else time.time_ns()
+
+
+# Location fields that location matcher caches are built from (with the translated name columns)
+MATCHED_LOCATION_FIELDS = {"name", "name_en", "name_ar", "geo_id", "admin_level", "parent"}
+
+
+def bump_gazetteer_generation_signal_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Start a new gazetteer generation when a location or gazetteer entry changes.
+
+    Connect this to Gazetteer and Location post_save and post_delete signals.
+    Fixture loading (``raw``) and location saves that touch none of the
+    matched fields (e.g. boundary edits) are skipped. Bulk operations bypass
+    signals and should call ``gazetteer_generation.bump()``.
+    """
+    if raw:
+        return
+    if update_fields is not None and isinstance(instance, Location) and MATCHED_LOCATION_FIELDS.isdisjoint(update_fields):
+        return
+    gazetteer_generation.bump()
+
+
+# Global instance for easy access
+gazetteer_generation = GazetteerGeneration()
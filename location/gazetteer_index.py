@@ -0,0 +1,167 @@
+"""In-memory gazetteer index for fast exact and fuzzy name lookups."""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+from .models import Gazetteer
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """Normalise a location name for indexing (lowercase, single spaces)."""
+    return " ".join((name or "").lower().split())
+
+
+def name_ngrams(name: str, n: int = 3) -> set[str]:
+    """Character n-grams of a normalised name, padded so short names still produce grams."""
+    padded = f"  {name} "
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    """Lightweight gazetteer row held by the index."""
+
+    name: str
+    normalized: str
+    source: str
+    location_id: int
+    admin_level_code: str
+    parent_id: int | None
+
+
+class GazetteerIndex:
+    """In-process index over all Gazetteer names.
+
+    Built from a single query, it maps normalised names to their entries and
+    keeps a character trigram inverted index. Fuzzy lookups shortlist the
+    entries sharing the most trigrams with the query (Dice coefficient) and
+    only score that shortlist with ``SequenceMatcher``, so cost depends on the
+    query rather than on the gazetteer size. Scores keep the same meaning as
+    ``location.utils._calculate_similarity``, so existing thresholds apply.
+
+    Usage:
+        index = GazetteerIndex.build()
+        entry, score = index.best_match("Nyla", source="ACLED", min_similarity=0.8)
+    """
+
+    NGRAM_SIZE = 3
+    SHORTLIST_SIZE = 25
+
+    def __init__(self, entries: list[GazetteerEntry]):
+        """Index gazetteer entries.
+
+        Args:
+            entries: Entries to index
+        """
+        self.entries = entries
+        self._by_name: dict[str, list[int]] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._gram_counts: list[int] = []
+
+        for position, entry in enumerate(entries):
+            self._by_name.setdefault(entry.normalized, []).append(position)
+            grams = name_ngrams(entry.normalized, self.NGRAM_SIZE)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    @classmethod
+    def build(cls) -> "GazetteerIndex":
+        """Build the index from the database with one query."""
+        rows = Gazetteer.objects.order_by("id").values_list("name", "source", "location_id", "location__admin_level__code", "location__parent_id")
+        entries = [GazetteerEntry(name, normalize_name(name), source, location_id, admin_code, parent_id) for name, source, location_id, admin_code, parent_id in rows]
+        logger.debug(f"Built gazetteer index with {len(entries)} entries")
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def exact(self, name: str, source: str | None = None, exclude_source: str | None = None, admin_level=None, parent_id: int | None = None) -> list[GazetteerEntry]:
+        """Entries whose normalised name equals the query, after filtering."""
+        positions = self._by_name.get(normalize_name(name), [])
+        return [self.entries[p] for p in positions if self._accepts(self.entries[p], source, exclude_source, admin_level, parent_id)]
+
+    def best_match(
+        self,
+        name: str,
+        source: str | None = None,
+        exclude_source: str | None = None,
+        admin_level=None,
+        parent_id: int | None = None,
+        min_similarity: float = 0.8,
+        contains: str | None = None,
+        score_against: str | None = None,
+    ) -> tuple[GazetteerEntry | None, float]:
+        """Find the most similar entry to a name.
+
+        Args:
+            name: Name used to shortlist candidates
+            source: Only entries of this source
+            exclude_source: Exclude entries of this source
+            admin_level: Only entries whose location has this admin level code
+            parent_id: Only entries whose location has this parent
+            min_similarity: Minimum similarity score to accept
+            contains: Only entries whose name contains this text (case-insensitive)
+            score_against: Name scored against candidates (defaults to ``name``)
+
+        Returns:
+            tuple: (best entry or None, its similarity)
+        """
+        query = normalize_name(name)
+        if not query:
+            return None, 0.0
+        target = normalize_name(score_against) if score_against is not None else query
+        needle = normalize_name(contains) if contains is not None else None
+
+        best, best_score = None, 0.0
+        for position in self._shortlist(query, needle, source, exclude_source, admin_level, parent_id):
+            entry = self.entries[position]
+            score = 1.0 if entry.normalized == target else SequenceMatcher(None, target, entry.normalized).ratio()
+            if score > best_score and score >= min_similarity:
+                best, best_score = entry, score
+        return best, best_score
+
+    def _shortlist(self, query: str, needle: str | None, source, exclude_source, admin_level, parent_id) -> list[int]:
+        """Positions of the accepted entries sharing the most n-grams with the query, best first.
+
+        With a substring filter every matching entry is returned, as the filter
+        already narrows candidates down.
+        """
+        grams = name_ngrams(query, self.NGRAM_SIZE)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        allowed = None
+        if needle is not None:
+            # Substring matches must contain every inner n-gram of the needle
+            inner = {needle[i : i + self.NGRAM_SIZE] for i in range(len(needle) - self.NGRAM_SIZE + 1)}
+            if inner:
+                allowed = set.intersection(*(set(self._postings.get(gram, ())) for gram in inner))
+
+        candidates = [
+            position
+            for position in shared
+            if (allowed is None or position in allowed)
+            and (needle is None or needle in self.entries[position].normalized)
+            and self._accepts(self.entries[position], source, exclude_source, admin_level, parent_id)
+        ]
+        candidates.sort(key=lambda p: (-2 * shared[p] / (len(grams) + self._gram_counts[p]), p))
+        return candidates if needle is not None else candidates[: self.SHORTLIST_SIZE]
+
+    @staticmethod
+    def _accepts(entry: GazetteerEntry, source, exclude_source, admin_level, parent_id) -> bool:
+        """Whether an entry passes the source, admin level and parent filters."""
+        if source is not None and entry.source != source:
+            return False
+        if exclude_source is not None and entry.source == exclude_source:
+            return False
+        if admin_level is not None and entry.admin_level_code != str(admin_level):
+            return False
+        if parent_id is not None and entry.parent_id != parent_id:
+            return False
+        return True
@@ -25,11 +25,16 @@ class Command(BaseCommand):
             action='store_true',
             help='Force recomputation even if already computed',
         )
+        parser.add_argument(
+            '--per-task',
+            action='store_true',
+            help='With --all, queue one task per location instead of ranking them all in one batch task',
+        )
 
     def handle(self, *args, **options):
         if options['all']:
             self.stdout.write('Starting batch computation of potential matches...')
-            result = recompute_all_potential_matches.delay()
+            result = recompute_all_potential_matches.delay(batch=not options['per_task'], force=options['force'])
             self.stdout.write(
                 self.style.SUCCESS(f'Queued batch computation task: {result.id}')
             )
@@ -0,0 +1,16 @@
+"""Management command to rebuild the materialised location hierarchy."""
+
+from django.core.management.base import BaseCommand
+
+from location.models import Location
+
+
+class Command(BaseCommand):
+    """Recompute Location.path for all locations."""
+
+    help = "Rebuild materialised location paths (run after loaddata or bulk location imports)"
+
+    def handle(self, *args, **options):
+        """Handle the management command."""
+        changed = Location.objects.rebuild_paths()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt paths of {changed} locations"))
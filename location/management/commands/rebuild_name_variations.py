@@ -0,0 +1,19 @@
+"""Management command to rebuild the precomputed location name variations."""
+
+from django.core.management.base import BaseCommand
+
+from location.cache import gazetteer_generation
+from location.variations import rebuild_name_variations
+
+
+class Command(BaseCommand):
+    """Recompute NameVariation rows for all locations and gazetteer entries."""
+
+    help = "Rebuild precomputed location name variations (run after loaddata or bulk gazetteer imports)"
+
+    def handle(self, *args, **options):
+        """Handle the management command."""
+        count = rebuild_name_variations()
+        # Location matchers in every process reload the variation index
+        gazetteer_generation.bump()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} name variations"))
@@ -0,0 +1,23 @@
+"""Management command to precompute simplified location boundaries."""
+
+from django.core.management.base import BaseCommand
+
+from location.boundaries import boundary_provider
+from location.simplification import simplify_boundaries
+
+
+class Command(BaseCommand):
+    """Store SimplifiedBoundary rows at every level of detail for all locations."""
+
+    help = "Precompute simplified location boundaries (run after loaddata, boundary imports or tolerance changes)"
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument("--force", action="store_true", help="Recompute simplifications that are already up to date")
+
+    def handle(self, *args, **options):
+        """Handle the management command."""
+        refreshed = simplify_boundaries(force=options["force"])
+        # Overlay GeoDataFrames are reloaded at the new levels of detail
+        boundary_provider.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Simplified the boundaries of {refreshed} locations"))
@@ -0,0 +1,39 @@
+# Generated manually for pg_trgm fuzzy name search
+
+from django.db import migrations
+
+# GIN trigram indexes on UPPER(name) serve both pg_trgm similarity (`%`, similarity())
+# and Django's icontains lookups, which PostgreSQL compiles to UPPER(column) LIKE UPPER(...)
+TRIGRAM_INDEXES = [
+    ("location_name_en_trgm_idx", "location_location", "name_en"),
+    ("location_name_ar_trgm_idx", "location_location", "name_ar"),
+    ("gazetteer_name_trgm_idx", "location_gazetteer", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Install pg_trgm and create the trigram indexes (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (UPPER("{column}") gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Drop the trigram indexes, leaving the extension installed."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index_name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0011_add_point_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,38 @@
+# Generated manually for the materialised location hierarchy
+
+from django.db import migrations, models
+
+
+def populate_paths(apps, schema_editor):
+    """Derive the path of every existing location from its parent chain."""
+    Location = apps.get_model("location", "Location")
+    rows = {pk: (parent_id, geo_id) for pk, parent_id, geo_id in Location.objects.values_list("id", "parent_id", "geo_id")}
+    paths = {}
+
+    for pk in rows:
+        chain, current = [], pk
+        while current in rows and current not in paths and current not in chain:
+            chain.append(current)
+            current = rows[current][0]
+        prefix = paths.get(current, "")
+        for node in reversed(chain):
+            prefix = f"{prefix}/{rows[node][1]}" if prefix else rows[node][1]
+            paths[node] = prefix
+
+    Location.objects.bulk_update([Location(pk=pk, path=path) for pk, path in paths.items()], ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0012_trigram_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Materialised hierarchy: geo_ids from the root to this location', max_length=500),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0013_location_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NameVariation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('variation', models.CharField(help_text='Normalised name without articles and administrative or geographic suffixes', max_length=255)),
+                ('name', models.CharField(help_text='Name the variation was derived from', max_length=255)),
+                ('source', models.CharField(blank=True, default='', help_text='Gazetteer source of the name, empty for Location names', max_length=100)),
+                ('location', models.ForeignKey(help_text='Location this variation refers to', on_delete=django.db.models.deletion.CASCADE, related_name='name_variations', to='location.location')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['variation'], name='location_na_variati_b6a7b9_idx')],
+                'unique_together': {('location', 'source', 'variation')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-16 12:00
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0014_namevariation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimplifiedBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detail', models.CharField(choices=[('low', 'Low (country and state zoom)'), ('medium', 'Medium (state and locality zoom)'), ('high', 'High (locality zoom)'), ('analysis', 'Analysis (spatial overlays)')], help_text='Level of detail', max_length=20)),
+                ('tolerance', models.FloatField(help_text='Simplification tolerance in degrees')),
+                ('geometry', django.contrib.gis.db.models.fields.MultiPolygonField(help_text='Simplified boundary', srid=4326)),
+                ('boundary_hash', models.CharField(help_text='MD5 of the WKB of the boundary this was computed from', max_length=32)),
+                ('location', models.ForeignKey(help_text='Location whose boundary was simplified', on_delete=django.db.models.deletion.CASCADE, related_name='simplified_boundaries', to='location.location')),
+            ],
+            options={
+                'unique_together': {('location', 'detail')},
+            },
+        ),
+    ]
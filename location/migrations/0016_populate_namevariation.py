@@ -0,0 +1,33 @@
+# Generated manually to store the name variations of existing locations
+
+from django.db import migrations
+
+
+def populate_name_variations(apps, schema_editor):
+    """Compute the name variations of every existing location and gazetteer entry."""
+    from location.variations import canonical_variations, variation_suffixes
+
+    AdmLevel = apps.get_model("location", "AdmLevel")
+    Location = apps.get_model("location", "Location")
+    Gazetteer = apps.get_model("location", "Gazetteer")
+    NameVariation = apps.get_model("location", "NameVariation")
+
+    suffixes = variation_suffixes(AdmLevel.objects.values_list("name", flat=True))
+    names = [(pk, "", name) for pk, name_en, name_ar in Location.objects.values_list("id", "name_en", "name_ar") for name in (name_en, name_ar) if name]
+    names.extend(Gazetteer.objects.values_list("location_id", "source", "name"))
+
+    NameVariation.objects.all().delete()
+    variations = canonical_variations(names, suffixes)
+    rows = [NameVariation(location_id=location_id, source=source, variation=variation, name=name) for (location_id, source, variation), name in variations.items()]
+    NameVariation.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0015_simplifiedboundary'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_name_variations, migrations.RunPython.noop),
+    ]
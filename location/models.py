@@ -2,6 +2,16 @@
 
 from django.contrib.gis.db import models
 from django.core.validators import RegexValidator
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Substr
+
+# Separator of the geo_id labels in Location.path
+PATH_SEPARATOR = "/"
+
+# Simplification tolerances (degrees, EPSG:4326) of the stored boundary levels of detail
+BOUNDARY_DETAILS = {"low": 0.01, "medium": 0.003, "high": 0.0005, "analysis": 0.0002}
+# Level of detail of the unsimplified Location.boundary
+FULL_DETAIL = "full"
 
 
 class AdmLevel(models.Model):
@@ -19,8 +29,96 @@ class AdmLevel(models.Model):
         return f"Admin Level {self.code}: {self.name}"
 
 
+class LocationQuerySet(models.QuerySet):
+    """QuerySet with single-query hierarchy lookups based on ``Location.path``."""
+
+    def ancestors_of(self, *locations, include_self: bool = False):
+        """Ancestors of one or more locations, in one query.
+
+        Args:
+            *locations: Locations whose ancestors to select
+            include_self: Also select the locations themselves
+
+        Returns:
+            QuerySet: Ancestor locations
+        """
+        geo_ids = set()
+        for location in locations:
+            labels = location.path_labels
+            geo_ids.update(labels if include_self else labels[:-1])
+        return self.filter(geo_id__in=geo_ids)
+
+    def descendants_of(self, *locations, include_self: bool = False):
+        """Descendants of one or more locations, in one query.
+
+        Args:
+            *locations: Locations whose descendants to select
+            include_self: Also select the locations themselves
+
+        Returns:
+            QuerySet: Descendant locations
+        """
+        query = Q()
+        for location in locations:
+            query |= Q(path__startswith=f"{PATH_SEPARATOR.join(location.path_labels)}{PATH_SEPARATOR}")
+            if include_self:
+                query |= Q(pk=location.pk)
+        return self.filter(query) if query else self.none()
+
+    def rebuild_paths(self) -> int:
+        """Recompute the materialised path of every location from its parent chain.
+
+        Needed after writes that bypass ``Location.save()`` (``bulk_create``,
+        ``update()``, fixtures loaded with ``loaddata``).
+
+        Returns:
+            int: Number of locations whose path changed
+        """
+        rows = {pk: (parent_id, geo_id, path) for pk, parent_id, geo_id, path in Location.objects.values_list("id", "parent_id", "geo_id", "path")}
+        paths: dict[int, str] = {}
+
+        for pk in rows:
+            # Walk up to the first location with a known path (or the root), then build back down
+            chain, current = [], pk
+            while current in rows and current not in paths and current not in chain:
+                chain.append(current)
+                current = rows[current][0]
+            prefix = paths.get(current, "")
+            for node in reversed(chain):
+                prefix = f"{prefix}{PATH_SEPARATOR}{rows[node][1]}" if prefix else rows[node][1]
+                paths[node] = prefix
+
+        changed = [Location(pk=pk, path=path) for pk, path in paths.items() if path != rows[pk][2]]
+        Location.objects.bulk_update(changed, ["path"], batch_size=1000)
+        return len(changed)
+
+    def with_boundary(self, detail: str = FULL_DETAIL):
+        """Annotate ``display_boundary`` with the boundary at a level of detail.
+
+        The simplified geometry is read from ``SimplifiedBoundary`` and the
+        full ``boundary`` column is deferred; locations without a stored
+        simplification fall back to their full boundary.
+
+        Args:
+            detail: Key of BOUNDARY_DETAILS, or FULL_DETAIL
+
+        Returns:
+            QuerySet: Locations annotated with ``display_boundary``
+        """
+        if detail == FULL_DETAIL:
+            return self.annotate(display_boundary=F("boundary"))
+        simplified = SimplifiedBoundary.objects.filter(location=OuterRef("pk"), detail=detail).values("geometry")[:1]
+        return self.defer("boundary").annotate(display_boundary=Coalesce(Subquery(simplified), F("boundary"), output_field=models.MultiPolygonField()))
+
+
 class Location(models.Model):
-    """Hierarchical location model with geographic boundaries."""
+    """Hierarchical location model with geographic boundaries.
+
+    ``path`` materialises the hierarchy as the geo_ids from the root down to
+    the location (e.g. ``SD/SD_001/SD_001_002``). It is derived from the
+    parent chain on save, and descendants are re-pathed in one UPDATE when a
+    location moves, so ancestors and descendants are single-query lookups.
+    """
 
     parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.CASCADE, related_name="children", help_text="Parent location in hierarchy")
     admin_level = models.ForeignKey(AdmLevel, on_delete=models.PROTECT, related_name="locations", help_text="Administrative level of this location")
@@ -47,10 +145,13 @@ class Location(models.Model):
     )
 
     comment = models.TextField(null=True, blank=True, help_text="Additional information about the location")
+    path = models.CharField(max_length=500, blank=True, default="", db_index=True, editable=False, help_text="Materialised hierarchy: geo_ids from the root to this location")
 
     created_at = models.DateTimeField(blank=True, null=True, auto_now_add=True)
     updated_at = models.DateTimeField(blank=True, null=True, auto_now=True)
 
+    objects = LocationQuerySet.as_manager()
+
     class Meta:
         """Meta configuration for Location model."""
 
@@ -74,29 +175,63 @@ class Location(models.Model):
         """Get longitude from point geometry."""
         return self.point.x if self.point else None
 
-    def get_full_hierarchy(self):
-        """Return full hierarchical path from country to this location."""
-        hierarchy = [self]
+    def save(self, *args, **kwargs):
+        """Override save to keep the materialised path of this location and its descendants in sync."""
+        old_path = self.path
+        self.path = self.build_path()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.path != old_path:
+            kwargs["update_fields"] = {*update_fields, "path"}
+
+        super().save(*args, **kwargs)
+
+        # Re-path descendants when this location moved or its geo_id changed
+        if old_path and old_path != self.path:
+            Location.objects.filter(path__startswith=f"{old_path}{PATH_SEPARATOR}").update(path=Concat(Value(self.path), Substr("path", len(old_path) + 1)))
+
+    def build_path(self) -> str:
+        """Derive the materialised path from the parent chain."""
+        if not self.parent_id:
+            return self.geo_id
+        return f"{PATH_SEPARATOR.join(self.parent.path_labels)}{PATH_SEPARATOR}{self.geo_id}"
+
+    @property
+    def path_labels(self) -> list[str]:
+        """geo_ids from the root down to this location.
+
+        Walks the parent chain (one query per level) only if the path has not
+        been materialised yet.
+        """
+        if self.path:
+            return self.path.split(PATH_SEPARATOR)
+        labels = [self.geo_id]
         current = self.parent
         while current:
-            hierarchy.insert(0, current)
+            labels.insert(0, current.geo_id)
             current = current.parent
-        return hierarchy
+        return labels
+
+    def is_ancestor_of(self, other: "Location") -> bool:
+        """Whether this location is a strict ancestor of another, without queries."""
+        return self.geo_id in other.path_labels[:-1]
+
+    def get_ancestors(self):
+        """Get all ancestor locations in one query."""
+        return Location.objects.ancestors_of(self)
+
+    def get_full_hierarchy(self):
+        """Return full hierarchical path from country to this location."""
+        labels = self.path_labels
+        ancestors = {loc.geo_id: loc for loc in Location.objects.ancestors_of(self).select_related("admin_level")}
+        return [ancestors[geo_id] for geo_id in labels[:-1] if geo_id in ancestors] + [self]
 
     def get_children_at_level(self, admin_level_code):
         """Get all children at a specific administrative level."""
         return self.get_descendants().filter(admin_level__code=admin_level_code)
 
     def get_descendants(self):
-        """Get all descendant locations."""
-
-        def get_all_children(location):
-            children = list(location.children.all())
-            for child in list(children):
-                children.extend(get_all_children(child))
-            return children
-
-        return Location.objects.filter(id__in=[loc.id for loc in get_all_children(self)])
+        """Get all descendant locations in one query."""
+        return Location.objects.descendants_of(self)
 
 
 class Gazetteer(models.Model):
@@ -125,6 +260,64 @@ class Gazetteer(models.Model):
         return f"{self.name}{code_part} [{self.source}] -> {self.location.geo_id}"
 
 
+class NameVariation(models.Model):
+    """Precomputed normalised name variation of a location.
+
+    Rows are derived from Location names (``source`` empty) and Gazetteer
+    names by ``location.variations``, and kept up to date on save. The
+    location matcher loads them into an in-memory index for exact lookups of
+    name variations; rebuild them with ``manage.py rebuild_name_variations``.
+    """
+
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="name_variations", help_text="Location this variation refers to")
+    variation = models.CharField(max_length=255, help_text="Normalised name without articles and administrative or geographic suffixes")
+    name = models.CharField(max_length=255, help_text="Name the variation was derived from")
+    source = models.CharField(max_length=100, blank=True, default="", help_text="Gazetteer source of the name, empty for Location names")
+
+    class Meta:
+        """Meta configuration for NameVariation model."""
+
+        unique_together = [["location", "source", "variation"]]
+        indexes = [
+            models.Index(fields=["variation"]),
+        ]
+
+    def __str__(self):
+        return f"{self.variation} [{self.source or 'location'}] -> {self.location_id}"
+
+
+class SimplifiedBoundary(models.Model):
+    """Precomputed simplified boundary of a location at one level of detail.
+
+    Rows are derived from ``Location.boundary`` by ``location.simplification``
+    for every entry of BOUNDARY_DETAILS and refreshed when the boundary
+    changes; ``boundary_hash`` records the boundary they were computed from.
+    Maps and overlays select a level with ``Location.objects.with_boundary()``;
+    rebuild them with ``manage.py simplify_boundaries``.
+    """
+
+    DETAIL_CHOICES = [
+        ("low", "Low (country and state zoom)"),
+        ("medium", "Medium (state and locality zoom)"),
+        ("high", "High (locality zoom)"),
+        ("analysis", "Analysis (spatial overlays)"),
+    ]
+
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="simplified_boundaries", help_text="Location whose boundary was simplified")
+    detail = models.CharField(max_length=20, choices=DETAIL_CHOICES, help_text="Level of detail")
+    tolerance = models.FloatField(help_text="Simplification tolerance in degrees")
+    geometry = models.MultiPolygonField(help_text="Simplified boundary")
+    boundary_hash = models.CharField(max_length=32, help_text="MD5 of the WKB of the boundary this was computed from")
+
+    class Meta:
+        """Meta configuration for SimplifiedBoundary model."""
+
+        unique_together = [["location", "detail"]]
+
+    def __str__(self):
+        return f"{self.location_id} [{self.detail}]"
+
+
 class UnmatchedLocation(models.Model):
     """Track locations that failed to match during data processing."""
 
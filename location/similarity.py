@@ -0,0 +1,326 @@
+"""Fuzzy location name ranking, backed by PostgreSQL pg_trgm where available."""
+
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+from .gazetteer_index import name_ngrams, normalize_name
+from .models import Gazetteer, Location
+from .utils import _calculate_similarity
+
+logger = logging.getLogger(__name__)
+
+# Gazetteer sources considered when suggesting matches
+DEFAULT_GAZETTEER_SOURCES = ("UNOCHA", "OpenStreetMap", "IDMC")
+
+# Candidates scored per branch before deduplication
+CANDIDATE_LIMIT = 100
+
+# Aliases whose pg_trgm availability has been checked
+_trigram_available: dict[str, bool] = {}
+
+# One indexed query per name. The `%` operator pre-selects rows through the GIN
+# trigram indexes on UPPER(...) (pg_trgm.similarity_threshold, 0.3 by default);
+# similarity() then ranks them and DISTINCT ON keeps each location's best name.
+TRIGRAM_RANK_SQL = """
+WITH query AS (SELECT UPPER(%(name)s) AS name)
+SELECT location_id, matched_name, score, match_source FROM (
+    SELECT DISTINCT ON (location_id) location_id, matched_name, score, match_source
+    FROM (
+        (
+            SELECT l.id AS location_id, l.name_en AS matched_name, similarity(UPPER(l.name_en), query.name) AS score,
+                   CASE WHEN UPPER(l.name_en) = query.name THEN 'exact' ELSE 'primary' END AS match_source, 0 AS priority
+            FROM location_location l, query
+            WHERE UPPER(l.name_en) %% query.name
+            ORDER BY score DESC LIMIT %(candidates)s
+        )
+        UNION ALL
+        (
+            SELECT l.id, l.name_en, similarity(UPPER(l.name_ar), query.name),
+                   CASE WHEN UPPER(l.name_ar) = query.name THEN 'exact' ELSE 'primary' END, 0
+            FROM location_location l, query
+            WHERE UPPER(l.name_ar) %% query.name
+            ORDER BY 3 DESC LIMIT %(candidates)s
+        )
+        UNION ALL
+        (
+            SELECT g.location_id, g.name, similarity(UPPER(g.name), query.name), 'gazetteer_' || g.source, 1
+            FROM location_gazetteer g, query
+            WHERE UPPER(g.name) %% query.name AND g.source = ANY(%(sources)s)
+            ORDER BY 3 DESC LIMIT %(candidates)s
+        )
+    ) candidates
+    WHERE score >= %(min_similarity)s
+    ORDER BY location_id, score DESC, priority
+) best
+ORDER BY score DESC, location_id
+LIMIT %(limit)s
+"""
+
+
+def trigram_search_enabled(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """Whether fuzzy ranking runs in the database with pg_trgm.
+
+    True on PostgreSQL with the pg_trgm extension installed, unless disabled
+    with the LOCATION_TRIGRAM_SEARCH setting. The extension check runs once
+    per process.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql" or not getattr(settings, "LOCATION_TRIGRAM_SEARCH", True):
+        return False
+
+    if using not in _trigram_available:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                _trigram_available[using] = cursor.fetchone() is not None
+        except Exception as e:
+            logger.warning(f"Could not check for the pg_trgm extension: {e}")
+            return False
+        if not _trigram_available[using]:
+            logger.warning("pg_trgm extension not installed, ranking location candidates in Python")
+    return _trigram_available[using]
+
+
+def rank_location_candidates(
+    name: str,
+    limit: int = 15,
+    min_similarity: float = 0.4,
+    gazetteer_sources: tuple[str, ...] = DEFAULT_GAZETTEER_SOURCES,
+) -> list[dict]:
+    """Rank locations whose name, Arabic name or gazetteer alias resembles a name.
+
+    On PostgreSQL this is a single query over GIN trigram indexes, scored with
+    pg_trgm ``similarity()``. Elsewhere (e.g. SpatiaLite in tests) candidates
+    are pre-filtered with ``icontains`` and scored with ``SequenceMatcher``.
+
+    Args:
+        name: Name to find candidates for
+        limit: Maximum number of candidates to return
+        min_similarity: Minimum similarity score of a candidate
+        gazetteer_sources: Gazetteer sources whose aliases are considered
+
+    Returns:
+        list: Match dictionaries (location_id, location_name, location_name_ar, admin_level,
+        admin_level_code, geo_id, matched_name, similarity_score, match_source), best first,
+        one per location
+    """
+    if not name or len(name.strip()) < 2:
+        return []
+
+    if trigram_search_enabled():
+        return _rank_with_trigrams(name.strip(), limit, min_similarity, gazetteer_sources)
+    return _rank_in_python(name, limit, min_similarity, gazetteer_sources)
+
+
+def _match_dict(location: Location, matched_name: str, score: float, match_source: str) -> dict:
+    """Serialise a candidate location the way UnmatchedLocation.potential_matches stores it."""
+    return {
+        "location_id": location.id,
+        "location_name": location.name,
+        "location_name_ar": getattr(location, "name_ar", ""),
+        "admin_level": location.admin_level.name,
+        "admin_level_code": location.admin_level.code,
+        "geo_id": location.geo_id,
+        "matched_name": matched_name,
+        "similarity_score": round(score, 3),
+        "match_source": match_source,
+    }
+
+
+def _rank_with_trigrams(name: str, limit: int, min_similarity: float, gazetteer_sources: tuple[str, ...]) -> list[dict]:
+    """Rank candidates in the database with pg_trgm."""
+    params = {"name": name, "candidates": CANDIDATE_LIMIT, "sources": list(gazetteer_sources), "min_similarity": min_similarity, "limit": limit}
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(TRIGRAM_RANK_SQL, params)
+        rows = cursor.fetchall()
+
+    locations = Location.objects.select_related("admin_level").in_bulk([row[0] for row in rows])
+    return [_match_dict(locations[location_id], matched_name, score, match_source) for location_id, matched_name, score, match_source in rows if location_id in locations]
+
+
+def _rank_in_python(name: str, limit: int, min_similarity: float, gazetteer_sources: tuple[str, ...]) -> list[dict]:
+    """Rank candidates pre-filtered with icontains using SequenceMatcher."""
+    potential_matches = []
+    query_name = name.lower().strip()
+
+    # Step 1: Get exact matches first (fastest)
+    exact_matches = Location.objects.select_related("admin_level").filter(Q(name__iexact=name) | Q(name_ar__iexact=name))[:10]
+    for location in exact_matches:
+        potential_matches.append(_match_dict(location, location.name, 1.0, "exact"))
+
+    query_prefix = query_name[:3] if len(query_name) > 3 else query_name
+    query_suffix = query_name[-3:] if len(query_name) > 3 else query_name
+    candidate_filter = Q(name__icontains=query_prefix) | Q(name__icontains=query_suffix) | Q(name__istartswith=query_prefix)
+
+    # Step 2: Get partial matches if we need more results
+    if len(potential_matches) < 10:
+        location_candidates = (
+            Location.objects.select_related("admin_level").filter(candidate_filter).exclude(id__in=[m["location_id"] for m in potential_matches])[:CANDIDATE_LIMIT]
+        )
+        for location in location_candidates:
+            location_name = location.name.lower().strip()
+            if not location_name:
+                continue
+
+            # Use the higher of the primary and Arabic name similarity
+            similarity = _calculate_similarity(query_name, location_name)
+            name_ar = getattr(location, "name_ar", "")
+            if name_ar:
+                similarity = max(similarity, _calculate_similarity(query_name, name_ar.lower().strip()))
+
+            if similarity >= min_similarity:
+                potential_matches.append(_match_dict(location, location.name, similarity, "primary"))
+
+    # Step 3: Check gazetteer only if we still need more matches
+    if len(potential_matches) < 10:
+        gazetteer_candidates = Gazetteer.objects.select_related("location", "location__admin_level").filter(candidate_filter, source__in=gazetteer_sources)[:50]
+        for gazetteer in gazetteer_candidates:
+            gazetteer_name = gazetteer.name.lower().strip()
+            if not gazetteer_name:
+                continue
+
+            similarity = _calculate_similarity(query_name, gazetteer_name)
+            if similarity >= min_similarity:
+                potential_matches.append(_match_dict(gazetteer.location, gazetteer.name, similarity, f"gazetteer_{gazetteer.source}"))
+
+    # Deduplicate by location_id, keeping the best match for each location
+    location_matches = {}
+    for match in potential_matches:
+        location_id = match["location_id"]
+        if location_id not in location_matches or match["similarity_score"] > location_matches[location_id]["similarity_score"]:
+            location_matches[location_id] = match
+
+    ranked = sorted(location_matches.values(), key=lambda x: x["similarity_score"], reverse=True)
+    return ranked[:limit]
+
+
+class BatchCandidateRanker:
+    """Rank candidates for many names against a corpus loaded once.
+
+    The corpus (Location English and Arabic names plus Gazetteer aliases of
+    the selected sources) is read with two ``values_list`` queries and turned
+    into a character trigram inverted index. For each query name, the
+    postings of its trigrams give the corpus names sharing at least one
+    trigram and their shared trigram counts (one ``numpy.unique``), from which
+    Dice similarities are computed for those names only. The top
+    ``SHORTLIST_SIZE`` of them are then scored with
+    ``SequenceMatcher``, so scores and thresholds keep the meaning they have in
+    ``rank_location_candidates``' Python path.
+
+    Usage:
+        ranker = BatchCandidateRanker.build()
+        matches = ranker.rank(["Nyalla", "Al Fashir"])
+    """
+
+    SHORTLIST_SIZE = 50
+
+    def __init__(self, entries: list[tuple[int, str, str, str]]):
+        """Index corpus entries.
+
+        Args:
+            entries: (location_id, name scored, name reported as matched_name, match_source) tuples
+        """
+        self.location_ids = np.array([entry[0] for entry in entries], dtype="int64")
+        self.names = [entry[1] for entry in entries]
+        self.matched_names = [entry[2] for entry in entries]
+        self.match_sources = [entry[3] for entry in entries]
+
+        postings: dict[str, list[int]] = {}
+        gram_counts = []
+        for position, name in enumerate(self.names):
+            grams = name_ngrams(normalize_name(name))
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.array(positions, dtype="int64") for gram, positions in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype="float64")
+
+    @classmethod
+    def build(cls, gazetteer_sources: tuple[str, ...] = DEFAULT_GAZETTEER_SOURCES) -> "BatchCandidateRanker":
+        """Load the candidate corpus from the database.
+
+        Args:
+            gazetteer_sources: Gazetteer sources whose aliases are candidates
+
+        Returns:
+            BatchCandidateRanker: Ranker over the corpus
+        """
+        entries = []
+        for location_id, name, name_ar in Location.objects.order_by("id").values_list("id", "name", "name_ar"):
+            if name and name.strip():
+                entries.append((location_id, name, name, "primary"))
+            if name_ar and name_ar.strip():
+                entries.append((location_id, name_ar, name, "primary"))
+
+        gazetteer_rows = Gazetteer.objects.filter(source__in=gazetteer_sources).order_by("id").values_list("location_id", "name", "source")
+        entries.extend((location_id, name, name, f"gazetteer_{source}") for location_id, name, source in gazetteer_rows if name and name.strip())
+
+        logger.info(f"Loaded {len(entries)} candidate names for batch ranking")
+        return cls(entries)
+
+    def rank(self, names: list[str], limit: int = 15, min_similarity: float = 0.4) -> list[list[dict]]:
+        """Rank candidates for each name.
+
+        Args:
+            names: Names to find candidates for
+            limit: Maximum number of candidates per name
+            min_similarity: Minimum similarity score of a candidate
+
+        Returns:
+            list: Per input name, match dictionaries in the format of ``rank_location_candidates``
+        """
+        scored = [self._score(name, self._shortlist(name), limit, min_similarity) for name in names]
+
+        # Load the details of every matched location in one query
+        location_ids = {location_id for matches in scored for location_id, _, _, _ in matches}
+        locations = Location.objects.select_related("admin_level").defer("boundary").in_bulk(location_ids)
+        return [
+            [_match_dict(locations[location_id], matched_name, score, source) for location_id, matched_name, score, source in matches if location_id in locations]
+            for matches in scored
+        ]
+
+    def _shortlist(self, name: str) -> np.ndarray:
+        """Corpus positions with the highest trigram Dice similarity to a name.
+
+        Shared trigram counts are accumulated over the postings of the name's
+        trigrams only, so memory grows with the number of candidates sharing a
+        trigram rather than with the corpus size.
+        """
+        grams = name_ngrams(normalize_name(name)) if name and name.strip() else set()
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return np.empty(0, dtype="int64")
+
+        positions, shared = np.unique(np.concatenate(postings), return_counts=True)
+        if len(positions) > self.SHORTLIST_SIZE:
+            dice = 2 * shared / (len(grams) + self._gram_counts[positions])
+            positions = positions[np.argpartition(-dice, self.SHORTLIST_SIZE - 1)[: self.SHORTLIST_SIZE]]
+        return positions
+
+    def _score(self, name: str, shortlist: np.ndarray, limit: int, min_similarity: float) -> list[tuple[int, str, float, str]]:
+        """Score a shortlist with SequenceMatcher, keeping the best candidate per location."""
+        query_name = (name or "").lower().strip()
+        if len(query_name) < 2:
+            return []
+
+        best: dict[int, tuple[int, str, float, str]] = {}
+        for position in shortlist.tolist():
+            candidate = self.names[position].lower().strip()
+            source = self.match_sources[position]
+            if candidate == query_name:
+                score = 1.0
+                source = "exact" if source == "primary" else source
+            else:
+                score = _calculate_similarity(query_name, candidate)
+            if score < min_similarity:
+                continue
+
+            location_id = int(self.location_ids[position])
+            if location_id not in best or score > best[location_id][2]:
+                best[location_id] = (location_id, self.matched_names[position], score, source)
+
+        return sorted(best.values(), key=lambda match: match[2], reverse=True)[:limit]
@@ -0,0 +1,169 @@
+"""Precomputed simplified boundaries (levels of detail) of locations.
+
+Each ``Location.boundary`` is simplified once per level of BOUNDARY_DETAILS
+(topology-preserving Douglas-Peucker) and stored in ``SimplifiedBoundary``.
+Map views read the level matching their zoom and spatial overlays read the
+analysis level, instead of serialising or intersecting full-resolution
+polygons every time.
+"""
+
+import hashlib
+import logging
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db import transaction
+
+from .models import BOUNDARY_DETAILS, FULL_DETAIL, Location, SimplifiedBoundary
+
+logger = logging.getLogger(__name__)
+
+# Highest map zoom level served by each level of detail (beyond the last, the full boundary)
+ZOOM_DETAILS = ((6, "low"), (9, "medium"), (12, "high"))
+
+# Level of detail of map views that do not request one
+DEFAULT_MAP_DETAIL = "medium"
+
+# Locations simplified per transaction by simplify_boundaries()
+BATCH_SIZE = 100
+
+
+def detail_for_zoom(zoom: int) -> str:
+    """Level of detail to serve at a web map zoom level."""
+    for max_zoom, detail in ZOOM_DETAILS:
+        if zoom <= max_zoom:
+            return detail
+    return FULL_DETAIL
+
+
+def resolve_detail(detail: str | None = None, zoom=None, default: str = DEFAULT_MAP_DETAIL) -> str:
+    """Level of detail from an explicit name or a map zoom level.
+
+    Args:
+        detail: Level name (key of BOUNDARY_DETAILS or FULL_DETAIL)
+        zoom: Web map zoom level, used if no level name is given
+        default: Level used if neither is given
+
+    Returns:
+        str: Level of detail
+
+    Raises:
+        ValueError: If the level name or zoom level is invalid
+    """
+    if detail:
+        if detail != FULL_DETAIL and detail not in BOUNDARY_DETAILS:
+            raise ValueError(f"Unknown level of detail: {detail}")
+        return detail
+    if zoom not in (None, ""):
+        return detail_for_zoom(int(zoom))
+    return default
+
+
+def boundary_hash(boundary) -> str:
+    """MD5 of the WKB of a boundary, to detect boundary changes."""
+    return hashlib.md5(bytes(boundary.wkb)).hexdigest()
+
+
+def simplify_boundary(boundary, tolerance: float) -> MultiPolygon | None:
+    """Simplify a boundary without creating invalid or self-intersecting rings.
+
+    Args:
+        boundary: MultiPolygon to simplify
+        tolerance: Maximum deviation in degrees
+
+    Returns:
+        MultiPolygon, or None if nothing is left
+    """
+    simplified = boundary.simplify(tolerance, preserve_topology=True)
+    if simplified.empty:
+        return None
+    if isinstance(simplified, Polygon):
+        return MultiPolygon(simplified, srid=boundary.srid)
+    if not isinstance(simplified, MultiPolygon):
+        polygons = [part for part in simplified if isinstance(part, Polygon)]
+        return MultiPolygon(polygons, srid=boundary.srid) if polygons else None
+    return simplified
+
+
+def simplified_rows(location: Location, digest: str) -> list[SimplifiedBoundary]:
+    """Compute the simplified boundaries of a location at every level of detail."""
+    rows = []
+    for detail, tolerance in BOUNDARY_DETAILS.items():
+        geometry = simplify_boundary(location.boundary, tolerance)
+        if geometry is not None:
+            rows.append(SimplifiedBoundary(location_id=location.pk, detail=detail, tolerance=tolerance, geometry=geometry, boundary_hash=digest))
+    return rows
+
+
+def refresh_simplified_boundaries(locations, force: bool = False) -> int:
+    """Recompute the simplified boundaries of locations whose boundary or tolerances changed.
+
+    Args:
+        locations: Locations (with ``boundary`` loaded)
+        force: Recompute even if the stored simplifications are up to date
+
+    Returns:
+        int: Number of locations whose simplifications were recomputed
+    """
+    locations = list(locations)
+    stored: dict[int, set] = {}
+    for location_id, detail, tolerance, digest in SimplifiedBoundary.objects.filter(location__in=[location.pk for location in locations]).values_list(
+        "location_id", "detail", "tolerance", "boundary_hash"
+    ):
+        stored.setdefault(location_id, set()).add((detail, tolerance, digest))
+
+    stale, rows = [], []
+    for location in locations:
+        if location.boundary is None:
+            if location.pk in stored:
+                stale.append(location.pk)
+            continue
+        digest = boundary_hash(location.boundary)
+        if not force and stored.get(location.pk) == {(detail, tolerance, digest) for detail, tolerance in BOUNDARY_DETAILS.items()}:
+            continue
+        stale.append(location.pk)
+        rows.extend(simplified_rows(location, digest))
+
+    if stale:
+        with transaction.atomic():
+            SimplifiedBoundary.objects.filter(location_id__in=stale).delete()
+            SimplifiedBoundary.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(stale)
+
+
+def simplify_boundaries(force: bool = False) -> int:
+    """Bring the simplified boundaries of all locations up to date.
+
+    Boundaries are streamed in batches, so only ``BATCH_SIZE`` full
+    geometries are held in memory at a time.
+
+    Args:
+        force: Recompute even if the stored simplifications are up to date
+
+    Returns:
+        int: Number of locations whose simplifications were recomputed
+    """
+    SimplifiedBoundary.objects.filter(location__boundary__isnull=True).delete()
+
+    refreshed, batch = 0, []
+    for location in Location.objects.filter(boundary__isnull=False).only("id", "boundary").order_by("id").iterator(chunk_size=BATCH_SIZE):
+        batch.append(location)
+        if len(batch) == BATCH_SIZE:
+            refreshed += refresh_simplified_boundaries(batch, force=force)
+            batch = []
+    if batch:
+        refreshed += refresh_simplified_boundaries(batch, force=force)
+
+    logger.info(f"Simplified the boundaries of {refreshed} locations")
+    return refreshed
+
+
+def refresh_simplified_boundaries_signal_handler(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute the simplified boundaries of a saved location if its boundary changed.
+
+    Connect this to the Location post_save signal. Fixture loading (``raw``)
+    and saves that do not touch the boundary are skipped; run
+    ``simplify_boundaries`` after loading fixtures.
+    """
+    if raw or (update_fields is not None and "boundary" not in update_fields):
+        return
+    refresh_simplified_boundaries([instance])
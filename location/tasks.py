@@ -5,7 +5,6 @@ from datetime import UTC, datetime
 
 from celery import shared_task
 from django.db import transaction
-from django.db.models import Q
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +23,8 @@ def compute_potential_matches(self, unmatched_location_id: int):
         dict: Results summary including number of matches found
     """
     try:
-        from location.models import Gazetteer, Location, UnmatchedLocation
-        from location.utils import _calculate_similarity
+        from location.models import UnmatchedLocation
+        from location.similarity import rank_location_candidates
 
         # Get the unmatched location
         try:
@@ -48,130 +47,12 @@ def compute_potential_matches(self, unmatched_location_id: int):
                 "skipped": True,
             }
 
-        potential_matches = []
-        query_name = unmatched.name.lower().strip()
-
-        # Search through locations with database-level filtering
-        # PERFORMANCE: Use database queries to filter candidates before similarity calculation
-
-        if not query_name or len(query_name) < 2:
-            logger.warning(f"Query name too short: '{query_name}'")
+        if not unmatched.name or len(unmatched.name.strip()) < 2:
+            logger.warning(f"Query name too short: '{unmatched.name}'")
             return {"matches_found": 0}
 
-        # Step 1: Get exact matches first (fastest)
-        exact_matches = Location.objects.select_related("admin_level").filter(Q(name__iexact=unmatched.name) | Q(name_ar__iexact=unmatched.name))[:10]
-
-        for location in exact_matches:
-            potential_matches.append(
-                {
-                    "location_id": location.id,
-                    "location_name": location.name,
-                    "location_name_ar": getattr(location, "name_ar", ""),
-                    "admin_level": location.admin_level.name,
-                    "admin_level_code": location.admin_level.code,
-                    "geo_id": location.geo_id,
-                    "matched_name": location.name,
-                    "similarity_score": 1.0,
-                    "match_source": "exact",
-                }
-            )
-
-        # Step 2: Get partial matches if we need more results
-        if len(potential_matches) < 10:
-            # Use database filtering to get candidates
-            query_prefix = query_name[:3] if len(query_name) > 3 else query_name
-            query_suffix = query_name[-3:] if len(query_name) > 3 else query_name
-
-            # Get location candidates with database-level filtering
-            location_candidates = (
-                Location.objects.select_related("admin_level")
-                .filter(Q(name__icontains=query_prefix) | Q(name__icontains=query_suffix) | Q(name__istartswith=query_prefix))
-                .exclude(id__in=[m["location_id"] for m in potential_matches])[:100]
-            )  # Limit candidates
-
-            # Calculate similarities only for these pre-filtered candidates
-            for location in location_candidates:
-                name = location.name.lower().strip()
-                if not name:
-                    continue
-
-                # Calculate similarity with primary name
-                similarity = _calculate_similarity(query_name, name)
-
-                # Also check Arabic name if available
-                similarity_ar = 0
-                name_ar = getattr(location, "name_ar", "")
-                if name_ar and query_name:
-                    name_ar_lower = name_ar.lower().strip()
-                    similarity_ar = _calculate_similarity(query_name, name_ar_lower)
-
-                # Use the higher similarity score
-                final_similarity = max(similarity, similarity_ar)
-
-                # Higher threshold to reduce low-quality matches
-                if final_similarity >= 0.4:
-                    potential_matches.append(
-                        {
-                            "location_id": location.id,
-                            "location_name": location.name,
-                            "location_name_ar": getattr(location, "name_ar", ""),
-                            "admin_level": location.admin_level.name,
-                            "admin_level_code": location.admin_level.code,
-                            "geo_id": location.geo_id,
-                            "matched_name": location.name,
-                            "similarity_score": round(final_similarity, 3),
-                            "match_source": "primary",
-                        }
-                    )
-
-        # Step 3: Check gazetteer only if we still need more matches
-        if len(potential_matches) < 10:
-            # Limit gazetteer search to main sources and use database filtering
-            gazetteer_candidates = Gazetteer.objects.select_related(
-                "location", "location__admin_level"
-            ).filter(
-                Q(name__icontains=query_prefix) | Q(name__icontains=query_suffix) | Q(name__istartswith=query_prefix),
-                source__in=["UNOCHA", "OpenStreetMap", "IDMC"],  # Limit to main sources
-            )[:50]  # Limit candidates
-
-            for gazetteer in gazetteer_candidates:
-                name = gazetteer.name.lower().strip()
-                if not name:
-                    continue
-
-                similarity = _calculate_similarity(query_name, name)
-
-                if similarity >= 0.4:
-                    # Check if we already have this location
-                    existing = next((m for m in potential_matches if m["location_id"] == gazetteer.location.id), None)
-                    if not existing or similarity > existing["similarity_score"]:
-                        if existing:
-                            potential_matches.remove(existing)
-                        potential_matches.append(
-                            {
-                                "location_id": gazetteer.location.id,
-                                "location_name": gazetteer.location.name,
-                                "location_name_ar": getattr(gazetteer.location, "name_ar", ""),
-                                "admin_level": gazetteer.location.admin_level.name,
-                                "admin_level_code": gazetteer.location.admin_level.code,
-                                "geo_id": gazetteer.location.geo_id,
-                                "matched_name": gazetteer.name,
-                                "similarity_score": round(similarity, 3),
-                                "match_source": f"gazetteer_{gazetteer.source}",
-                            }
-                        )
-
-        # Deduplicate by location_id, keeping the best match for each location
-        location_matches = {}
-        for match in potential_matches:
-            location_id = match["location_id"]
-            if location_id not in location_matches or match["similarity_score"] > location_matches[location_id]["similarity_score"]:
-                location_matches[location_id] = match
-
-        # Convert back to list and sort by similarity score (highest first), then take top 15
-        deduplicated_matches = list(location_matches.values())
-        deduplicated_matches.sort(key=lambda x: x["similarity_score"], reverse=True)
-        top_matches = deduplicated_matches[:15]
+        # Ranked in one indexed pg_trgm query on PostgreSQL, in Python otherwise
+        top_matches = rank_location_candidates(unmatched.name, limit=15)
 
         # Update the unmatched location with computed matches
         with transaction.atomic():
@@ -204,17 +85,32 @@ def compute_potential_matches(self, unmatched_location_id: int):
 
 
 @shared_task
-def recompute_all_potential_matches():
+def recompute_all_potential_matches(batch: bool = True, force: bool = False):
     """Recompute potential matches for all pending unmatched locations.
 
-    This can be run as a maintenance task to refresh all suggestions.
+    This can be run as a maintenance task to refresh all suggestions. In batch
+    mode the candidate corpus is loaded once, all names are ranked against it
+    in this task and the results are written with a single ``bulk_update``,
+    instead of queueing one ``compute_potential_matches`` task per location.
+
+    Args:
+        batch: Rank all locations in this task (False queues one task per location)
+        force: Also recompute pending locations whose matches were already computed
+
+    Returns:
+        dict: Results summary
     """
     from location.models import UnmatchedLocation
 
     logger.info("Starting batch recomputation of potential matches")
 
     # Get all unmatched locations that need computation
-    unmatched_locations = UnmatchedLocation.objects.filter(status="pending", potential_matches_computed_at__isnull=True)
+    unmatched_locations = UnmatchedLocation.objects.filter(status="pending")
+    if not force:
+        unmatched_locations = unmatched_locations.filter(potential_matches_computed_at__isnull=True)
+
+    if batch:
+        return _rank_unmatched_locations_in_batch(unmatched_locations)
 
     total_count = unmatched_locations.count()
     logger.info(f"Found {total_count} unmatched locations to process")
@@ -228,3 +124,37 @@ def recompute_all_potential_matches():
     logger.info(f"Queued {len(task_ids)} computation tasks")
 
     return {"total_locations": total_count, "tasks_queued": len(task_ids), "task_ids": task_ids}
+
+
+def _rank_unmatched_locations_in_batch(unmatched_locations) -> dict:
+    """Rank candidates for many unmatched locations at once and save them in one bulk update.
+
+    Args:
+        unmatched_locations: UnmatchedLocation queryset to compute matches for
+
+    Returns:
+        dict: Results summary
+    """
+    from location.models import UnmatchedLocation
+    from location.similarity import BatchCandidateRanker
+
+    unmatched_list = list(unmatched_locations.only("id", "name"))
+    logger.info(f"Found {len(unmatched_list)} unmatched locations to process")
+    if not unmatched_list:
+        return {"total_locations": 0, "updated": 0, "with_matches": 0}
+
+    ranker = BatchCandidateRanker.build()
+    ranked = ranker.rank([unmatched.name for unmatched in unmatched_list], limit=15)
+
+    computed_at = datetime.now(UTC)
+    for unmatched, matches in zip(unmatched_list, ranked, strict=True):
+        unmatched.potential_matches = matches
+        unmatched.potential_matches_computed_at = computed_at
+
+    with transaction.atomic():
+        UnmatchedLocation.objects.bulk_update(unmatched_list, ["potential_matches", "potential_matches_computed_at"], batch_size=500)
+
+    with_matches = sum(1 for matches in ranked if matches)
+    logger.info(f"Computed potential matches for {len(unmatched_list)} unmatched locations ({with_matches} with candidates)")
+
+    return {"total_locations": len(unmatched_list), "updated": len(unmatched_list), "with_matches": with_matches}
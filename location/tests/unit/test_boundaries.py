@@ -0,0 +1,101 @@
+"""Unit tests for the cached ADM boundary provider."""
+
+import os
+import tempfile
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase
+from shapely.geometry import Point
+
+from location.boundaries import BoundaryProvider, boundary_provider
+from location.models import AdmLevel, Location
+
+
+def square(x, y):
+    """Build a unit-square MultiPolygon with its lower-left corner at (x, y)."""
+    return MultiPolygon([Polygon(((x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1), (x, y)))], srid=4326)
+
+
+class BoundaryProviderTests(TestCase):
+    """Tests for BoundaryProvider caching and invalidation."""
+
+    def setUp(self):
+        """Set up locations with boundaries and a provider with a temporary cache."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.provider = BoundaryProvider(cache_dir=self.tmp_dir.name)
+
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2, boundary=square(0, 0))
+        self.kass = Location.objects.create(geo_id="SD_001_002", name="Kass", admin_level=self.admin2, boundary=square(2, 0))
+        Location.objects.create(geo_id="SD_001_003", name="No Boundary", admin_level=self.admin2)
+
+    def tearDown(self):
+        """Remove the temporary cache."""
+        self.tmp_dir.cleanup()
+
+    def test_boundaries_loaded_and_cached(self):
+        """Test that boundaries are loaded once and then served from memory."""
+        gdf = self.provider.get("2")
+
+        self.assertEqual(sorted(gdf["pcode"]), ["SD_001_001", "SD_001_002"])
+        self.assertEqual(list(gdf.columns), BoundaryProvider.COLUMNS)
+        self.assertEqual(gdf.crs.to_epsg(), 4326)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+
+        # Only the fingerprint query runs once cached
+        with self.assertNumQueries(1):
+            self.assertIs(self.provider.get("2"), gdf)
+
+    def test_cache_file_reused_by_new_provider(self):
+        """Test that another process-level provider reads the GeoParquet cache."""
+        self.provider.get("2")
+        other = BoundaryProvider(cache_dir=self.tmp_dir.name)
+
+        with self.assertNumQueries(1):
+            gdf = other.get("2")
+        self.assertEqual(len(gdf), 2)
+
+    def test_location_change_invalidates_cache(self):
+        """Test that editing a boundary is reflected on the next call."""
+        self.assertEqual(len(self.provider.get("2")), 2)
+
+        self.kass.boundary = None
+        self.kass.save()
+
+        self.assertEqual(list(self.provider.get("2")["pcode"]), ["SD_001_001"])
+
+    def test_tree_queries_boundaries(self):
+        """Test that the STRtree indexes rows in GeoDataFrame order."""
+        gdf = self.provider.get("2")
+        hits = self.provider.tree("2").query(Point(2.5, 0.5), predicate="intersects")
+
+        self.assertEqual([gdf.iloc[i]["location_id"] for i in hits], [self.kass.id])
+
+    def test_signal_clears_global_provider(self):
+        """Test that Location saves drop the global provider's in-memory cache."""
+        boundary_provider._frames[("2", "full")] = ("stale", None)
+
+        self.nyala.save()
+
+        self.assertNotIn(("2", "full"), boundary_provider._frames)
+
+    def test_signal_skips_unrelated_saves(self):
+        """Test that saves touching no boundary frame field keep the in-memory cache."""
+        boundary_provider._frames[("2", "full")] = ("stale", None)
+
+        self.nyala.save(update_fields=["comment"])
+        self.assertIn(("2", "full"), boundary_provider._frames)
+
+        self.nyala.save(update_fields=["boundary"])
+        self.assertNotIn(("2", "full"), boundary_provider._frames)
+
+    def test_invalidate_can_keep_cache_files(self):
+        """Test that in-memory invalidation leaves GeoParquet files for fingerprint checks."""
+        self.provider.get("2")
+
+        self.provider.invalidate(delete_files=False)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+        self.assertEqual(self.provider._frames, {})
+
+        self.provider.invalidate()
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
@@ -0,0 +1,99 @@
+"""Unit tests for the gazetteer generation counter and versioned matcher caches."""
+
+from django.test import TestCase
+
+from location.cache import GazetteerGeneration, gazetteer_generation
+from location.models import AdmLevel, Gazetteer, Location
+from location.utils import LocationMatcher
+
+
+class GazetteerGenerationTests(TestCase):
+    """Tests for GazetteerGeneration and its signal handlers."""
+
+    def setUp(self):
+        """Set up a location to change."""
+        self.admin1 = AdmLevel.objects.create(code="1", name="State")
+        self.darfur = Location.objects.create(geo_id="SD_01", name="South Darfur", admin_level=self.admin1)
+
+    def test_bump_changes_generation(self):
+        """Test that bumping starts a new, larger generation."""
+        before = gazetteer_generation.current()
+        after = gazetteer_generation.bump()
+
+        self.assertGreater(after, before)
+        self.assertEqual(gazetteer_generation.current(), after)
+
+    def test_generation_shared_through_cache(self):
+        """Test that a bump in one view is seen by another after the check interval."""
+        other = GazetteerGeneration()
+        other.CHECK_INTERVAL = 0
+        gazetteer_generation.bump()
+
+        self.assertEqual(other.current(), gazetteer_generation.current())
+
+    def test_model_changes_bump_generation(self):
+        """Test that Gazetteer and Location saves and deletes start new generations."""
+        generations = [gazetteer_generation.current()]
+
+        entry = Gazetteer.objects.create(source="ACLED", name="S. Darfur", location=self.darfur)
+        generations.append(gazetteer_generation.current())
+        entry.delete()
+        generations.append(gazetteer_generation.current())
+        self.darfur.name = "Janub Darfur"
+        self.darfur.save()
+        generations.append(gazetteer_generation.current())
+
+        self.assertEqual(len(set(generations)), 4)
+
+    def test_unrelated_location_saves_keep_generation(self):
+        """Test that location saves touching no matched field do not start a new generation."""
+        before = gazetteer_generation.current()
+
+        self.darfur.save(update_fields=["comment"])
+        self.assertEqual(gazetteer_generation.current(), before)
+
+        self.darfur.save(update_fields=["name"])
+        self.assertNotEqual(gazetteer_generation.current(), before)
+
+
+class VersionedMatcherCacheTests(TestCase):
+    """Tests for LocationMatcher caches keyed by gazetteer generation."""
+
+    def setUp(self):
+        """Set up locations and a matcher."""
+        self.admin1 = AdmLevel.objects.create(code="1", name="State")
+        self.darfur = Location.objects.create(geo_id="SD_01", name="South Darfur", admin_level=self.admin1)
+        Gazetteer.objects.create(source="ACLED", name="Janub Darfur", location=self.darfur)
+        self.matcher = LocationMatcher()
+
+    def test_warm_matcher_resolves_without_queries(self):
+        """Test that repeated names resolve from memory."""
+        self.assertEqual(self.matcher.match_location("Janub Darfur", source="ACLED"), self.darfur)
+        self.assertIsNone(self.matcher.match_location("Atlantis", source="ACLED"))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.matcher.match_location("Janub Darfur", source="ACLED"), self.darfur)
+            self.assertIsNone(self.matcher.match_location("Atlantis", source="ACLED"))
+
+    def test_gazetteer_change_clears_cached_results(self):
+        """Test that a cached miss is re-resolved once a matching entry is added."""
+        self.assertIsNone(self.matcher.match_location("Atlantis", source="ACLED"))
+
+        Gazetteer.objects.create(source="ACLED", name="Atlantis", location=self.darfur)
+
+        self.assertEqual(self.matcher.match_location("Atlantis", source="ACLED"), self.darfur)
+
+    def test_code_table_shared_until_gazetteer_changes(self):
+        """Test that code tables are built once per generation."""
+        table = self.matcher.get_code_table("ACLED", admin_level="1")
+        self.assertEqual(table["janub darfur"], self.darfur)
+        self.assertEqual(table["geo_SD_01"], self.darfur)
+
+        with self.assertNumQueries(0):
+            self.assertIs(self.matcher.get_code_table("ACLED", admin_level="1"), table)
+
+        Gazetteer.objects.create(source="ACLED", name="Nyala Town", code="NY1", location=self.darfur)
+
+        rebuilt = self.matcher.get_code_table("ACLED", admin_level="1")
+        self.assertIsNot(rebuilt, table)
+        self.assertEqual(rebuilt["NY1"], self.darfur)
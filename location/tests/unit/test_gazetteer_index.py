@@ -0,0 +1,59 @@
+"""Unit tests for the in-memory gazetteer index."""
+
+from django.test import TestCase
+
+from location.gazetteer_index import GazetteerIndex, normalize_name
+from location.models import AdmLevel, Gazetteer, Location
+from location.utils import LocationMatcher
+
+
+class GazetteerIndexTests(TestCase):
+    """Tests for GazetteerIndex lookups and its use by LocationMatcher."""
+
+    def setUp(self):
+        """Set up locations and gazetteer entries."""
+        self.admin1 = AdmLevel.objects.create(code="1", name="State")
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+
+        self.darfur = Location.objects.create(geo_id="SD_001", name="South Darfur", admin_level=self.admin1)
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2, parent=self.darfur)
+        self.kass = Location.objects.create(geo_id="SD_001_002", name="Kass", admin_level=self.admin2, parent=self.darfur)
+
+        Gazetteer.objects.create(location=self.nyala, name="Nyala Town", source="ACLED")
+        Gazetteer.objects.create(location=self.kass, name="Kass Locality", source="ACLED")
+        Gazetteer.objects.create(location=self.darfur, name="Janub Darfur", source="IOM")
+
+        self.index = GazetteerIndex.build()
+
+    def test_normalize_name(self):
+        """Test that names are lowercased with collapsed whitespace."""
+        self.assertEqual(normalize_name("  Nyala   TOWN "), "nyala town")
+
+    def test_exact_lookup_with_filters(self):
+        """Test exact lookups honour source and admin level filters."""
+        self.assertEqual([e.location_id for e in self.index.exact("NYALA town")], [self.nyala.id])
+        self.assertEqual(self.index.exact("Nyala Town", source="IOM"), [])
+        self.assertEqual(self.index.exact("Nyala Town", admin_level=1), [])
+
+    def test_fuzzy_match_tolerates_typos(self):
+        """Test that a misspelt name finds the closest entry above the threshold."""
+        entry, score = self.index.best_match("Nyala Twon", source="ACLED", min_similarity=0.8)
+
+        self.assertEqual(entry.location_id, self.nyala.id)
+        self.assertGreaterEqual(score, 0.8)
+        self.assertEqual(self.index.best_match("Nyala Twon", source="IOM", min_similarity=0.8), (None, 0.0))
+        self.assertEqual(self.index.best_match("Nyala Twon", parent_id=self.kass.id, min_similarity=0.8), (None, 0.0))
+
+    def test_contains_filter(self):
+        """Test that substring filters restrict candidates like icontains."""
+        entry, _ = self.index.best_match("darfur", contains="darfur", score_against="Janub Darfur State", exclude_source="ACLED", min_similarity=0.75)
+
+        self.assertEqual(entry.location_id, self.darfur.id)
+        self.assertEqual(self.index.best_match("darfur", contains="darfur", exclude_source="IOM", min_similarity=0.1), (None, 0.0))
+
+    def test_matcher_fuzzy_step_uses_index(self):
+        """Test that LocationMatcher fuzzy gazetteer matching finds typos via the index."""
+        matcher = LocationMatcher()
+        matcher.gazetteer_index  # noqa: B018
+
+        self.assertEqual(matcher.match_location("Kass Localty", source="ACLED"), self.kass)
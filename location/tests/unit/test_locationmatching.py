@@ -1,14 +1,15 @@
 """Unit tests for enhanced location matching functionality."""
 
 import logging
-from datetime import timedelta
+from importlib import import_module
 from unittest.mock import patch
 
+from django.apps import apps
 from django.test import TestCase
-from django.utils import timezone
 
-from location.models import AdmLevel, Gazetteer, Location
+from location.models import AdmLevel, Gazetteer, Location, NameVariation
 from location.utils import LocationMatcher
+from location.variations import canonical_name, load_variation_suffixes, name_forms, rebuild_name_variations
 
 # Suppress debug logging during tests
 logging.disable(logging.DEBUG)
@@ -113,59 +114,82 @@ class LocationMatchingTestCase(TestCase):
         """Clean up after tests."""
         self.matcher.clear_cache()
 
-    def test_suffix_cache_loading_from_admin_levels(self):
-        """Test that admin level suffixes are correctly extracted from database."""
-        self.matcher._load_suffix_cache()
-
-        admin_suffixes = self.matcher._suffix_cache.get("admin", set())
+    def test_variation_suffixes_from_admin_levels(self):
+        """Test that admin level names and their plurals are stripped as suffixes."""
+        suffixes = load_variation_suffixes()
 
         # Should contain suffixes from our AdmLevel objects
-        self.assertIn(" state", admin_suffixes)
-        self.assertIn(" states", admin_suffixes)  # Plural form
-        self.assertIn(" locality", admin_suffixes)
-        self.assertIn(" localities", admin_suffixes)  # Plural form
+        self.assertIn(("state",), suffixes)
+        self.assertIn(("states",), suffixes)  # Plural form
+        self.assertIn(("locality",), suffixes)
+        self.assertIn(("localities",), suffixes)  # Plural form
+
+    def test_comma_separated_parts_are_looked_up(self):
+        """Test that country suffixes and other comma-separated parts yield lookup forms."""
+        forms = name_forms("Al Fasher, North Darfur State, Sudan")
+
+        self.assertEqual(forms[:4], ["Al Fasher, North Darfur State, Sudan", "Al Fasher", "North Darfur State", "Sudan"])
+        self.assertIn("North Darfur State Sudan", forms)
+
+    def test_geographic_suffixes_are_stripped(self):
+        """Test that geographic terms are removed from canonical variations."""
+        suffixes = load_variation_suffixes()
+
+        self.assertEqual(canonical_name("Al Fasher City", suffixes), canonical_name("Al Fasher", suffixes))
+        self.assertEqual(canonical_name("Khartoum State", suffixes), canonical_name("Khartoum", suffixes))
+        # A name is never reduced to nothing
+        self.assertEqual(canonical_name("City", suffixes), "city")
 
-    def test_country_suffix_detection_from_unmatched_locations(self):
-        """Test that country suffixes are detected from unmatched location patterns."""
-        self.matcher._load_suffix_cache()
+    def test_articles_and_spelling_normalised(self):
+        """Test that articles, punctuation, doubled letters and Arabic spelling variants are folded."""
+        suffixes = load_variation_suffixes()
 
-        country_suffixes = self.matcher._suffix_cache.get("country", set())
+        self.assertEqual(canonical_name("El-Fasher", suffixes), canonical_name("Fasher", suffixes))
+        self.assertEqual(canonical_name("Nyalla", suffixes), canonical_name("Nyala", suffixes))
+        self.assertEqual(canonical_name("Kassalah", suffixes), canonical_name("Kassala", suffixes))
+        self.assertEqual(canonical_name("الفَاشِر", suffixes), canonical_name("فاشر", suffixes))
+        self.assertEqual(canonical_name("أم درمان", suffixes), canonical_name("ام درمان", suffixes))
 
-        # Should detect ", sudan" from unmatched location patterns
-        self.assertIn(", sudan", country_suffixes)
+    def test_name_variations_stored_on_save(self):
+        """Test that variations of location and gazetteer names are stored and kept current."""
+        variations = set(NameVariation.objects.filter(location=self.al_fasher).values_list("source", "variation"))
+        self.assertEqual(variations, {("", "fasher"), ("OSM", "fasher")})
 
-    def test_geographic_suffix_extraction_from_existing_data(self):
-        """Test that geographic suffixes are extracted from location and gazetteer names."""
-        self.matcher._load_suffix_cache()
+        entry = Gazetteer.objects.create(location=self.al_fasher, name="El Fashir", source="UNOCHA")
+        self.assertTrue(NameVariation.objects.filter(location=self.al_fasher, source="UNOCHA", variation="fashir").exists())
 
-        geographic_suffixes = self.matcher._suffix_cache.get("geographic", set())
+        entry.delete()
+        self.assertFalse(NameVariation.objects.filter(location=self.al_fasher, source="UNOCHA").exists())
 
-        # Should extract "city" from "Al Fasher City" in gazetteer
-        self.assertIn(" city", geographic_suffixes)
+        # Rebuilding from scratch gives the same rows
+        stored = set(NameVariation.objects.values_list("location_id", "source", "variation"))
+        NameVariation.objects.all().delete()
+        rebuild_name_variations()
+        self.assertEqual(set(NameVariation.objects.values_list("location_id", "source", "variation")), stored)
 
-    def test_prefix_cache_loading(self):
-        """Test that prefixes are correctly extracted from existing location data."""
-        self.matcher._load_suffix_cache()  # This also loads prefixes
+    def test_migration_populates_name_variations(self):
+        """Test that the data migration stores the same variations as a rebuild."""
+        stored = set(NameVariation.objects.values_list("location_id", "source", "variation"))
+        NameVariation.objects.all().delete()
 
-        # Should detect "al " prefix from "Al Fasher"
-        self.assertIn("al ", self.matcher._prefix_cache)
+        import_module("location.migrations.0016_populate_namevariation").populate_name_variations(apps, None)
 
-    def test_name_variations_generation(self):
-        """Test that name variations are correctly generated using database-derived data."""
-        # Test with state suffix
-        variations = self.matcher._generate_name_variations("South Darfur State, Sudan")
+        self.assertEqual(set(NameVariation.objects.values_list("location_id", "source", "variation")), stored)
 
-        # Should generate variations by removing country and state suffixes
-        self.assertIn("South Darfur State, Sudan", variations)  # Original
-        self.assertIn("South Darfur", variations)  # Without ", Sudan" and " State"
-        self.assertIn("South Darfur State", variations)  # Without ", Sudan"
+    def test_variations_computed_while_none_stored(self):
+        """Test that variation matching keeps working before variations are stored."""
+        NameVariation.objects.all().delete()
 
-        # Test with prefix
-        variations = self.matcher._generate_name_variations("Fasher")
+        with self.assertLogs("location.variations", level="WARNING"):
+            self.assertEqual(LocationMatcher().variation_index.lookup("Fasher"), [(self.al_fasher.id, "Fasher")])
 
-        # Should add "Al " prefix since it exists in database
-        self.assertIn("Fasher", variations)  # Original
-        self.assertIn("Al Fasher", variations)  # With prefix
+    def test_name_variation_match_is_in_memory(self):
+        """Test that matching a name variation probes the in-memory index."""
+        self.matcher.variation_index  # noqa: B018
+
+        self.assertEqual(self.matcher.variation_index.lookup("Fasher"), [(self.al_fasher.id, "Fasher")])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.matcher.variation_index.lookup("Al Fasher, North Darfur State, Sudan", admin_level=1), [(self.north_darfur.id, "North Darfur State")])
 
     def test_enhanced_matching_with_country_suffix(self):
         """Test that locations with country suffixes are successfully matched."""
@@ -204,20 +228,17 @@ class LocationMatchingTestCase(TestCase):
         self.assertEqual(result.name, "Al Fasher")
 
     def test_cache_rebuilding_logic(self):
-        """Test that cache rebuilding works correctly based on data changes."""
-        # First load - should build cache
-        self.matcher._load_suffix_cache()
-        initial_timestamp = self.matcher._cache_timestamp
-
-        # Should not rebuild immediately
-        self.assertFalse(self.matcher._should_rebuild_cache())
+        """Test that the variation index is rebuilt only when the gazetteer changes."""
+        # First access - should build the index
+        index = self.matcher.variation_index
 
-        # Mock old timestamp to test time-based rebuilding
-        old_timestamp = timezone.now() - timedelta(hours=2)
-        self.matcher._cache_timestamp = old_timestamp
+        # Should not rebuild without data changes
+        self.assertIs(self.matcher.variation_index, index)
 
-        # Should rebuild due to age
-        self.assertTrue(self.matcher._should_rebuild_cache())
+        # New location data starts a new generation and forces a rebuild
+        kutum = Location.objects.create(name="Kutum Town", admin_level=self.locality_level, parent=self.north_darfur, geo_id="SDN_ND_KT")
+        self.assertIsNot(self.matcher.variation_index, index)
+        self.assertEqual(self.matcher.match_location("Kutum"), kutum)
 
     def test_cache_performance_with_repeated_calls(self):
         """Test that caching improves performance for repeated calls."""
@@ -254,6 +275,30 @@ class LocationMatchingTestCase(TestCase):
         self.assertIsNotNone(results["Al Fasher City"])
         self.assertEqual(results["Al Fasher City"].name, "Al Fasher")
 
+    def test_bulk_matching_reports_provenance(self):
+        """Test that bulk matching resolves exact tiers in bulk and reports how each name matched."""
+        names = ["South Darfur", "khartoum state", "SDN_ND", "Al Fasher", "South Darfur State, Sudan", "Atlantis", "", " South Darfur "]
+
+        results = self.matcher.bulk_match_locations_with_provenance(names, source="UNOCHA")
+
+        self.assertEqual(list(results), names)
+        self.assertEqual(results["South Darfur"].method, "gazetteer_exact")
+        self.assertEqual(results["khartoum state"].method, "other_gazetteer_exact")
+        self.assertEqual(results["khartoum state"].location, self.khartoum)
+        self.assertEqual(results["SDN_ND"].location, self.north_darfur)
+        self.assertEqual(results["SDN_ND"].method, "location_geo_id")
+        self.assertEqual(results["Al Fasher"].method, "location_name")
+        self.assertEqual(results["South Darfur State, Sudan"].location, self.south_darfur)
+        self.assertEqual(results["South Darfur State, Sudan"].method, "name_variation")
+        self.assertIsNone(results["Atlantis"])
+        self.assertIsNone(results[""])
+        self.assertEqual(results[" South Darfur "], results["South Darfur"])
+
+        # Results are cached for the gazetteer generation, also for match_location
+        with self.assertNumQueries(0):
+            self.assertEqual(self.matcher.bulk_match_locations(names, source="UNOCHA")["SDN_ND"], self.north_darfur)
+            self.assertEqual(self.matcher.match_location("Al Fasher", source="UNOCHA"), self.al_fasher)
+
     def test_empty_and_invalid_inputs(self):
         """Test handling of empty and invalid inputs."""
         # Empty string
@@ -305,37 +350,34 @@ class LocationMatchingTestCase(TestCase):
 
     @patch("location.utils.logger")
     def test_error_handling_in_cache_loading(self, mock_logger):
-        """Test that errors during cache loading are handled gracefully."""
+        """Test that errors while loading name variations are handled gracefully."""
         # Clear existing cache
         self.matcher.clear_cache()
 
         # Mock database error
-        with patch("location.utils.Location.objects.values_list", side_effect=Exception("Database error")):
+        with patch("location.utils.NameVariationIndex.build", side_effect=Exception("Database error")):
             # Should not raise exception
-            self.matcher._load_suffix_cache()
+            self.assertIsNone(self.matcher.match_location("Completely Fictional Place"))
 
             # Should log warning
             mock_logger.warning.assert_called()
-
-            # Cache should be in valid state (empty but not None)
-            self.assertIsInstance(self.matcher._suffix_cache, dict)
+            self.assertEqual(len(self.matcher.variation_index), 0)
 
     def test_cache_clear_functionality(self):
         """Test that cache clearing works correctly."""
         # Load cache
-        self.matcher._load_suffix_cache()
+        self.matcher.variation_index  # noqa: B018
 
         # Verify cache is populated
-        self.assertIsNotNone(self.matcher._cache_timestamp)
-        self.assertTrue(len(self.matcher._suffix_cache) > 0)
+        self.assertIsNotNone(self.matcher._generation)
+        self.assertTrue(len(self.matcher._variation_index) > 0)
 
         # Clear cache
         self.matcher.clear_cache()
 
         # Verify cache is cleared
-        self.assertIsNone(self.matcher._cache_timestamp)
-        self.assertEqual(len(self.matcher._suffix_cache), 0)
-        self.assertEqual(len(self.matcher._prefix_cache), 0)
+        self.assertIsNone(self.matcher._generation)
+        self.assertIsNone(self.matcher._variation_index)
 
     def test_case_insensitive_matching(self):
         """Test that enhanced matching is case insensitive."""
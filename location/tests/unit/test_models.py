@@ -113,6 +113,45 @@ class LocationModelTests(TestCase):
         admin2_children = self.country.get_children_at_level("2")
         self.assertIn(self.district, admin2_children)
 
+    def test_materialised_path(self):
+        """Test that paths are derived from the parent chain on save."""
+        self.assertEqual(self.country.path, "SD")
+        self.assertEqual(self.district.path, "SD/SD_001/SD_001_001")
+        self.assertTrue(self.state.is_ancestor_of(self.district))
+        self.assertFalse(self.district.is_ancestor_of(self.state))
+
+    def test_hierarchy_lookups_are_single_queries(self):
+        """Test that ancestors and descendants are fetched with one query each."""
+        with self.assertNumQueries(1):
+            self.assertEqual(self.district.get_full_hierarchy(), [self.country, self.state, self.district])
+        with self.assertNumQueries(1):
+            self.assertEqual(set(self.country.get_descendants()), {self.state, self.district})
+
+        other_state = Location.objects.create(geo_id="SD_002", name="Kassala", admin_level=self.admin1, parent=self.country)
+        with self.assertNumQueries(1):
+            ancestors = set(Location.objects.ancestors_of(self.district, other_state, include_self=True))
+        self.assertEqual(ancestors, {self.country, self.state, self.district, other_state})
+
+    def test_moving_location_updates_descendant_paths(self):
+        """Test that moving a location re-paths its descendants."""
+        other_country = Location.objects.create(geo_id="SS", name="South Sudan", admin_level=self.admin0)
+        self.state.parent = other_country
+        self.state.save()
+
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.path, "SS/SD_001/SD_001_001")
+        self.assertIn(self.district, other_country.get_descendants())
+        self.assertNotIn(self.district, self.country.get_descendants())
+
+    def test_rebuild_paths(self):
+        """Test that paths lost by writes bypassing save() can be rebuilt."""
+        Location.objects.update(path="")
+
+        self.assertEqual(Location.objects.rebuild_paths(), 3)
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.path, "SD/SD_001/SD_001_001")
+        self.assertEqual(Location.objects.rebuild_paths(), 0)
+
     def test_location_with_boundaries(self):
         """Test location with geographic boundaries."""
         # Create a polygon boundary
@@ -0,0 +1,115 @@
+"""Unit tests for fuzzy location candidate ranking, single and batched."""
+
+from django.test import TestCase, override_settings
+
+from location.models import AdmLevel, Gazetteer, Location, UnmatchedLocation
+from location.similarity import BatchCandidateRanker, rank_location_candidates, trigram_search_enabled
+from location.tasks import recompute_all_potential_matches
+
+
+class RankLocationCandidatesTests(TestCase):
+    """Tests for rank_location_candidates (Python path used on SpatiaLite)."""
+
+    def setUp(self):
+        """Set up locations and gazetteer aliases."""
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2)
+        self.nyala_north = Location.objects.create(geo_id="SD_001_002", name="Nyala North", admin_level=self.admin2)
+        self.kass = Location.objects.create(geo_id="SD_001_003", name="Kass", admin_level=self.admin2)
+        Gazetteer.objects.create(location=self.kass, source="UNOCHA", name="Nyalla")
+        Gazetteer.objects.create(location=self.kass, source="ACLED", name="Nyala Town")
+
+    def test_trigram_search_disabled_outside_postgresql(self):
+        """Test that SpatiaLite always uses the Python path."""
+        self.assertFalse(trigram_search_enabled())
+        with override_settings(LOCATION_TRIGRAM_SEARCH=False):
+            self.assertFalse(trigram_search_enabled())
+
+    def test_exact_match_ranked_first(self):
+        """Test that an exact name match comes first with full similarity."""
+        matches = rank_location_candidates("Nyala")
+
+        self.assertEqual(matches[0]["location_id"], self.nyala.id)
+        self.assertEqual(matches[0]["similarity_score"], 1.0)
+        self.assertEqual(matches[0]["match_source"], "exact")
+        self.assertEqual(matches[0]["admin_level_code"], "2")
+
+    def test_one_match_per_location_from_selected_sources(self):
+        """Test that gazetteer aliases of the selected sources are ranked once per location."""
+        matches = rank_location_candidates("Nyala")
+        by_location = {m["location_id"]: m for m in matches}
+
+        self.assertEqual(len(by_location), len(matches))
+        self.assertEqual(by_location[self.kass.id]["matched_name"], "Nyalla")
+        self.assertEqual(by_location[self.kass.id]["match_source"], "gazetteer_UNOCHA")
+        self.assertEqual([m["similarity_score"] for m in matches], sorted((m["similarity_score"] for m in matches), reverse=True))
+
+    def test_short_names_and_limit(self):
+        """Test that too-short names return nothing and the limit is applied."""
+        self.assertEqual(rank_location_candidates("N"), [])
+        self.assertEqual(len(rank_location_candidates("Nyala", limit=1)), 1)
+
+
+class BatchCandidateRankerTests(TestCase):
+    """Tests for BatchCandidateRanker and batch recomputation of potential matches."""
+
+    def setUp(self):
+        """Set up locations, gazetteer aliases and pending unmatched locations."""
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2)
+        self.kass = Location.objects.create(geo_id="SD_001_002", name="Kass", admin_level=self.admin2)
+        self.fasher = Location.objects.create(geo_id="SD_001_003", name="Al Fasher", admin_level=self.admin2)
+        Gazetteer.objects.create(location=self.fasher, source="UNOCHA", name="El Fasher")
+        Gazetteer.objects.create(location=self.kass, source="ACLED", name="Nyala Kass")
+
+    def test_rank_matches_single_name_ranking(self):
+        """Test that batch ranking agrees with ranking names one by one."""
+        names = ["Nyala", "El Fashir", "Kas"]
+        ranked = BatchCandidateRanker.build().rank(names)
+
+        for name, matches in zip(names, ranked, strict=True):
+            self.assertEqual([m["location_id"] for m in matches][:1], [m["location_id"] for m in rank_location_candidates(name)][:1])
+        self.assertEqual(ranked[0][0]["match_source"], "exact")
+        self.assertEqual(ranked[1][0]["match_source"], "gazetteer_UNOCHA")
+
+    def test_rank_excludes_other_sources_and_unrelated_names(self):
+        """Test that aliases of unselected sources and dissimilar names are not candidates."""
+        ranked = BatchCandidateRanker.build().rank(["Nyala Kass", "Zzyzx", ""])
+
+        self.assertNotIn("gazetteer_ACLED", {m["match_source"] for m in ranked[0]})
+        self.assertEqual(ranked[1], [])
+        self.assertEqual(ranked[2], [])
+
+    def test_shortlist_bounded_on_large_corpus(self):
+        """Test that shortlists keep the best trigram matches of a corpus larger than the shortlist."""
+        entries = [(position, f"Nyala Camp {position}", f"Nyala Camp {position}", "primary") for position in range(200)]
+        entries.append((200, "Nyala", "Nyala", "primary"))
+        ranker = BatchCandidateRanker(entries)
+
+        shortlist, unrelated = ranker._shortlist("Nyala"), ranker._shortlist("Zzyzx")
+
+        self.assertEqual(len(shortlist), BatchCandidateRanker.SHORTLIST_SIZE)
+        self.assertIn(200, shortlist.tolist())
+        self.assertEqual(len(unrelated), 0)
+
+    def test_recompute_all_in_batch(self):
+        """Test that the batch task writes matches for all pending locations."""
+        UnmatchedLocation.objects.bulk_create(
+            [
+                UnmatchedLocation(name="Nyalaa", source="ACLED"),
+                UnmatchedLocation(name="El Fashir", source="ACLED"),
+                UnmatchedLocation(name="Kass", source="ACLED", status="ignored"),
+            ]
+        )
+
+        result = recompute_all_potential_matches()
+
+        self.assertEqual(result["total_locations"], 2)
+        nyala = UnmatchedLocation.objects.get(name="Nyalaa")
+        self.assertIsNotNone(nyala.potential_matches_computed_at)
+        self.assertEqual(nyala.potential_matches[0]["location_id"], self.nyala.id)
+        self.assertIsNone(UnmatchedLocation.objects.get(name="Kass").potential_matches_computed_at)
+
+        # Already computed locations are skipped unless forced
+        self.assertEqual(recompute_all_potential_matches()["total_locations"], 0)
+        self.assertEqual(recompute_all_potential_matches(force=True)["total_locations"], 2)
@@ -0,0 +1,71 @@
+"""Unit tests for precomputed simplified location boundaries."""
+
+import math
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase
+
+from location.models import BOUNDARY_DETAILS, AdmLevel, Location, SimplifiedBoundary
+from location.simplification import detail_for_zoom, resolve_detail, simplify_boundaries
+
+
+def circle(x, y, radius=1.0, vertices=400):
+    """Build a finely sampled circular MultiPolygon centred on (x, y)."""
+    ring = [(x + radius * math.cos(2 * math.pi * i / vertices), y + radius * math.sin(2 * math.pi * i / vertices)) for i in range(vertices)]
+    return MultiPolygon([Polygon(ring + ring[:1])], srid=4326)
+
+
+class SimplifiedBoundaryTests(TestCase):
+    """Tests for SimplifiedBoundary generation, refresh and level selection."""
+
+    def setUp(self):
+        """Set up a locality with a detailed boundary."""
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2, boundary=circle(0, 0))
+
+    def test_saving_a_boundary_stores_every_level(self):
+        """Test that each level is stored with fewer vertices at coarser tolerances."""
+        rows = {row.detail: row for row in SimplifiedBoundary.objects.filter(location=self.nyala)}
+
+        self.assertEqual(set(rows), set(BOUNDARY_DETAILS))
+        self.assertLess(rows["low"].geometry.num_points, rows["medium"].geometry.num_points)
+        self.assertLess(rows["high"].geometry.num_points, self.nyala.boundary.num_points)
+        self.assertIsInstance(rows["low"].geometry, MultiPolygon)
+
+    def test_refresh_only_on_boundary_change(self):
+        """Test that unrelated saves keep the stored rows and boundary changes replace them."""
+        ids = set(SimplifiedBoundary.objects.values_list("id", flat=True))
+
+        self.nyala.comment = "Renamed"
+        self.nyala.save()
+        self.assertEqual(set(SimplifiedBoundary.objects.values_list("id", flat=True)), ids)
+
+        self.nyala.boundary = circle(5, 5)
+        self.nyala.save()
+        self.assertTrue(ids.isdisjoint(SimplifiedBoundary.objects.values_list("id", flat=True)))
+        low = SimplifiedBoundary.objects.get(location=self.nyala, detail="low")
+        self.assertAlmostEqual(low.geometry.centroid.x, 5, places=2)
+
+    def test_command_backfill_and_fallback(self):
+        """Test that locations without simplifications fall back to the full boundary until backfilled."""
+        SimplifiedBoundary.objects.all().delete()
+
+        location = Location.objects.with_boundary("low").get(pk=self.nyala.pk)
+        self.assertEqual(location.display_boundary.num_points, self.nyala.boundary.num_points)
+
+        self.assertEqual(simplify_boundaries(), 1)
+        self.assertEqual(simplify_boundaries(), 0)
+
+        location = Location.objects.with_boundary("low").get(pk=self.nyala.pk)
+        self.assertLess(location.display_boundary.num_points, self.nyala.boundary.num_points)
+
+    def test_level_selection(self):
+        """Test that zoom levels and explicit names map to levels of detail."""
+        self.assertEqual(detail_for_zoom(5), "low")
+        self.assertEqual(detail_for_zoom(8), "medium")
+        self.assertEqual(detail_for_zoom(15), "full")
+        self.assertEqual(resolve_detail(zoom="11"), "high")
+        self.assertEqual(resolve_detail("analysis", zoom="3"), "analysis")
+        self.assertEqual(resolve_detail(), "medium")
+        with self.assertRaises(ValueError):
+            resolve_detail("coarse")
@@ -0,0 +1,63 @@
+"""Unit tests for coordinate-based location matching."""
+
+import tempfile
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase, override_settings
+
+from location.boundaries import boundary_provider
+from location.models import AdmLevel, Location
+from location.spatial import point_locator
+
+
+def square(x, y):
+    """Build a unit-square MultiPolygon with its lower-left corner at (x, y)."""
+    return MultiPolygon([Polygon(((x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1), (x, y)))], srid=4326)
+
+
+class PointLocatorTests(TestCase):
+    """Tests for PointLocator with both lookup backends."""
+
+    def setUp(self):
+        """Set up ADM1 and ADM2 boundaries and a temporary boundary cache."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(LOCATION_BOUNDARY_CACHE_DIR=self.tmp_dir.name)
+        self.settings_override.enable()
+
+        self.admin1 = AdmLevel.objects.create(code="1", name="State")
+        self.admin2 = AdmLevel.objects.create(code="2", name="Locality")
+        state_boundary = MultiPolygon([Polygon(((0, 0), (4, 0), (4, 1), (0, 1), (0, 0)))], srid=4326)
+        self.state = Location.objects.create(geo_id="SD_001", name="South Darfur", admin_level=self.admin1, boundary=state_boundary)
+        self.nyala = Location.objects.create(geo_id="SD_001_001", name="Nyala", admin_level=self.admin2, parent=self.state, boundary=square(0, 0))
+        self.kass = Location.objects.create(geo_id="SD_001_002", name="Kass", admin_level=self.admin2, parent=self.state, boundary=square(1, 0))
+        boundary_provider.invalidate()
+
+    def tearDown(self):
+        """Drop cached boundaries and remove the temporary cache."""
+        boundary_provider.invalidate()
+        self.settings_override.disable()
+        self.tmp_dir.cleanup()
+
+    def test_locate_many_in_memory(self):
+        """Test that points map to ADM2 boundaries in input order."""
+        points = [(0.5, 0.5), (0.5, 1.5), (0.5, 3.5), (0.5, 0.5), (None, 1.0), ("bad", 1.0), (95.0, 0.5)]
+
+        locations = point_locator.locate_many(points)
+
+        self.assertEqual(locations, [self.nyala, self.kass, None, self.nyala, None, None, None])
+
+    def test_shared_border_and_admin_level(self):
+        """Test that border points resolve to the lowest ID and other levels can be searched."""
+        self.assertEqual(point_locator.locate(0.5, 1.0), self.nyala)
+        self.assertEqual(point_locator.locate("0.5", "3.5", admin_level_code="1"), self.state)
+
+    @override_settings(LOCATION_POINT_LOOKUP="database")
+    def test_database_backend_matches_memory(self):
+        """Test that the spatial query backend gives the same results."""
+        self.assertEqual(point_locator.locate_many([(0.5, 1.5), (0.5, 1.0), (5.0, 5.0)]), [self.kass, self.nyala, None])
+
+    @override_settings(LOCATION_POINT_LOOKUP="off")
+    def test_disabled(self):
+        """Test that no points are located when point lookup is off."""
+        with self.assertNumQueries(0):
+            self.assertEqual(point_locator.locate_many([(0.5, 0.5)]), [None])
@@ -1,12 +1,16 @@
 """Location matching utilities for geographic data processing."""
 
 import logging
+from dataclasses import dataclass
 from difflib import SequenceMatcher
 
 from django.db.models import Q
-from django.utils import timezone
+from django.db.models.functions import Lower
 
+from .cache import gazetteer_generation
+from .gazetteer_index import GazetteerIndex
 from .models import Gazetteer, Location
+from .variations import NameVariationIndex
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +38,109 @@ def _calculate_similarity(str1: str, str2: str) -> float:
     return SequenceMatcher(None, s1, s2).ratio()
 
 
+@dataclass(frozen=True)
+class LocationMatch:
+    """A matched location and how it was matched.
+
+    ``method`` is one of gazetteer_exact, gazetteer_code, location_name,
+    location_geo_id, other_gazetteer_exact, gazetteer_fuzzy, name_variation,
+    other_gazetteer_variation, other_gazetteer_fuzzy, or cached for names
+    resolved earlier by ``match_location``.
+    """
+
+    location: Location
+    method: str
+    matched_name: str = ""
+
+
 class LocationMatcher:
-    """Utility class for matching location names to database locations."""
+    """Utility class for matching location names to database locations.
+
+    All caches (match results, matched locations, the gazetteer and name
+    variation indexes and code tables) are versioned by the shared gazetteer
+    generation (see ``location.cache``). They are kept for the life of the
+    process and dropped only when a ``Gazetteer`` or ``Location`` changes, so
+    a warm matcher (e.g. the global ``location_matcher`` in a Celery worker)
+    resolves repeated names without database queries.
+    """
 
     def __init__(self):
         """Initialize location matcher with caching."""
         self._location_cache: dict[str, Location] = {}
-        self._gazetteer_cache: dict[str, dict[str, list[Gazetteer]]] = {}
-        self._suffix_cache: dict[str, set[str]] = {}
-        self._prefix_cache: set[str] = set()
-        self._cache_timestamp = None
+        self._match_details: dict[str, LocationMatch] = {}
+        self._locations_by_id: dict[int, Location] = {}
+        self._code_tables: dict[tuple, dict[str, Location]] = {}
+        self._gazetteer_index: GazetteerIndex | None = None
+        self._variation_index: NameVariationIndex | None = None
+        self._generation: int | None = None
+
+    def _ensure_current(self):
+        """Drop caches built for an older gazetteer generation."""
+        generation = gazetteer_generation.current()
+        if generation != self._generation:
+            if self._generation is not None:
+                logger.debug("Gazetteer changed, clearing location matcher caches")
+            self.clear_cache()
+            self._generation = generation
+
+    @property
+    def gazetteer_index(self) -> GazetteerIndex:
+        """In-memory index of all gazetteer names, built once per gazetteer generation."""
+        self._ensure_current()
+        if self._gazetteer_index is None:
+            self._gazetteer_index = GazetteerIndex.build()
+        return self._gazetteer_index
+
+    @property
+    def variation_index(self) -> NameVariationIndex:
+        """In-memory index of precomputed name variations, built once per gazetteer generation."""
+        self._ensure_current()
+        if self._variation_index is None:
+            try:
+                self._variation_index = NameVariationIndex.build()
+            except Exception as e:
+                logger.warning(f"Could not load name variations: {e}")
+                self._variation_index = NameVariationIndex({}, [])
+        return self._variation_index
+
+    def get_code_table(self, source: str, admin_level: int | str | None = None) -> dict[str, Location]:
+        """Lookup table of a source's gazetteer codes and names plus location geo_ids.
+
+        Keys are gazetteer codes, lowercase gazetteer names and ``geo_<geo_id>``
+        of the locations at ``admin_level`` (all levels if None). The table is
+        built once per gazetteer generation and shared by every caller in the
+        process, so it must be treated as read-only.
+
+        Args:
+            source: Gazetteer source (e.g. "IOM_DTM")
+            admin_level: Admin level code of the locations keyed by geo_id
+
+        Returns:
+            dict: Lookup key to Location
+        """
+        self._ensure_current()
+        key = (source, None if admin_level is None else str(admin_level))
+        table = self._code_tables.get(key)
+        if table is not None:
+            return table
+
+        table = {}
+        for entry in Gazetteer.objects.filter(source=source).select_related("location", "location__admin_level"):
+            if entry.code:
+                table[entry.code] = entry.location
+            if entry.name:
+                table[entry.name.lower()] = entry.location
+
+        locations = Location.objects.select_related("admin_level")
+        if admin_level is not None:
+            locations = locations.filter(admin_level__code=str(admin_level))
+        for location in locations:
+            if location.geo_id:
+                table[f"geo_{location.geo_id}"] = location
+
+        logger.debug(f"Built {source} code table with {len(table)} entries")
+        self._code_tables[key] = table
+        return table
 
     def match_location(
         self,
@@ -73,6 +170,7 @@ class LocationMatcher:
         if not location_name or not location_name.strip():
             return None
 
+        self._ensure_current()
         location_name = location_name.strip()
         cache_key = f"{location_name}:{source}:{admin_level}:{parent_location.id if parent_location else None}"
 
@@ -161,28 +259,17 @@ class LocationMatcher:
         except (Gazetteer.DoesNotExist, Gazetteer.MultipleObjectsReturned):
             pass
         
-        # 1c. Fuzzy match by name within the same source
+        # 1c. Fuzzy match by name within the same source (n-gram index instead of a full scan)
         try:
-            query = Q(source=source)
-            if admin_level is not None:
-                query &= Q(location__admin_level__code=str(admin_level))
-            if parent_location:
-                query &= Q(location__parent=parent_location)
-            
-            candidates = Gazetteer.objects.select_related("location").filter(query)
-            
-            best_match = None
-            best_similarity = 0.0
-            min_similarity = 0.8  # High threshold for fuzzy matching
-            
-            for candidate in candidates:
-                similarity = _calculate_similarity(location_name, candidate.name)
-                if similarity > best_similarity and similarity >= min_similarity:
-                    best_similarity = similarity
-                    best_match = candidate.location
-            
-            if best_match:
-                return best_match
+            entry, _ = self.gazetteer_index.best_match(
+                location_name,
+                source=source,
+                admin_level=admin_level,
+                parent_id=parent_location.id if parent_location else None,
+                min_similarity=0.8,  # High threshold for fuzzy matching
+            )
+            if entry:
+                return self._get_location(entry.location_id)
         except Exception:
             pass
         
@@ -214,20 +301,19 @@ class LocationMatcher:
         except (Location.DoesNotExist, Location.MultipleObjectsReturned):
             pass
         
-        # 2c. Try name variations (with/without common prefixes/suffixes)
-        variations = self._generate_name_variations(location_name)
-        all_matches = []
-        for variation in variations:
-            location = self._exact_location_match(variation, admin_level, parent_location)
-            if location:
-                all_matches.append((location, variation))
-        
+        # 2c. Try precomputed name variations (articles, suffixes, comma-separated parts, spelling)
+        all_matches = [
+            (self._get_location(location_id), form)
+            for location_id, form in self.variation_index.lookup(location_name, admin_level=admin_level, parent_id=parent_location.id if parent_location else None)
+        ]
+        all_matches = [(location, form) for location, form in all_matches if location]
+
         # If we have matches, prefer more specific locations (higher admin level codes)
         if all_matches:
             return self._select_best_match(all_matches, location_name)
-        
+
         return None
-    
+
     def _select_best_match(self, matches: list[tuple], original_name: str) -> Location:
         """Select the best match from multiple candidates."""
         # Sort by admin level code (higher codes are more specific) and name similarity
@@ -270,99 +356,32 @@ class LocationMatcher:
         except (Gazetteer.DoesNotExist, Gazetteer.MultipleObjectsReturned):
             pass
         
-        # 3b. Fuzzy match with variations from other sources
-        variations = self._generate_name_variations(location_name)
-        for variation in variations:
-            try:
-                query = Q(name__icontains=variation)
-                if current_source:
-                    query &= ~Q(source=current_source)
-                if admin_level is not None:
-                    query &= Q(location__admin_level__code=str(admin_level))
-                if parent_location:
-                    query &= Q(location__parent=parent_location)
-                
-                candidates = Gazetteer.objects.select_related("location").filter(query)
-                
-                best_match = None
-                best_similarity = 0.0
-                min_similarity = 0.75  # Lower threshold for other sources
-                
-                for candidate in candidates:
-                    similarity = _calculate_similarity(location_name, candidate.name)
-                    if similarity > best_similarity and similarity >= min_similarity:
-                        best_similarity = similarity
-                        best_match = candidate.location
-                
-                if best_match:
-                    return best_match
-            except Exception:
-                continue
-        
+        # 3b. Precomputed name variations from other sources
+        parent_id = parent_location.id if parent_location else None
+        for location_id, _ in self.variation_index.lookup(location_name, admin_level=admin_level, parent_id=parent_id, gazetteer=True, exclude_source=current_source or None):
+            return self._get_location(location_id)
+
+        # 3c. Fuzzy match by name from other sources
+        try:
+            entry, _ = self.gazetteer_index.best_match(
+                location_name,
+                exclude_source=current_source or None,
+                admin_level=admin_level,
+                parent_id=parent_id,
+                min_similarity=0.75,  # Lower threshold for other sources
+            )
+            if entry:
+                return self._get_location(entry.location_id)
+        except Exception:
+            pass
+
         return None
 
-    def _generate_name_variations(self, location_name: str) -> list[str]:
-        """Generate variations using database-derived suffixes and prefixes."""
-        self._load_suffix_cache()  # Lazy load
-        
-        variations = [location_name]
-        
-        # Generate variations by removing suffixes (including chained removal)
-        self._add_suffix_variations(location_name, variations)
-        
-        # Add prefix variations
-        self._add_prefix_variations(location_name, variations)
-        
-        return list(set(variations))  # Remove duplicates
-        
-    def _add_suffix_variations(self, location_name: str, variations: list[str]):
-        """Add variations by removing suffixes, including chained removal."""
-        all_suffixes = self._suffix_cache.get('all', set())
-        
-        # Use a queue to handle chained suffix removal
-        to_process = [location_name]
-        processed = set()
-        
-        while to_process:
-            current_name = to_process.pop(0)
-            
-            if current_name in processed:
-                continue
-            processed.add(current_name)
-            
-            current_lower = current_name.lower()
-            
-            # Try removing each suffix
-            for suffix in all_suffixes:
-                if current_lower.endswith(suffix.lower()):
-                    clean_name = current_name[:-len(suffix)].strip()
-                    if clean_name and clean_name not in processed:
-                        variations.append(clean_name)
-                        to_process.append(clean_name)  # Process this for further suffix removal
-        
-        # Additional fallback: try comma-separated parsing for complex location names
-        self._add_comma_variations(location_name, variations)
-    
-    def _add_comma_variations(self, location_name: str, variations: list[str]):
-        """Add variations by parsing comma-separated location names."""
-        if ',' in location_name:
-            parts = [part.strip() for part in location_name.split(',')]
-            
-            # Add individual parts (except very short ones that are likely articles)
-            for part in parts:
-                if len(part) > 2 and part not in variations:
-                    variations.append(part)
-            
-            # Add combinations of adjacent parts
-            for i in range(len(parts) - 1):
-                combined = ', '.join(parts[i:i+2])
-                if combined not in variations:
-                    variations.append(combined)
-                    
-                # Also add without comma
-                combined_no_comma = ' '.join(parts[i:i+2])
-                if combined_no_comma not in variations:
-                    variations.append(combined_no_comma)
+    def _get_location(self, location_id: int) -> Location | None:
+        """Load a matched location by ID, once per gazetteer generation."""
+        if location_id not in self._locations_by_id:
+            self._locations_by_id[location_id] = Location.objects.select_related("admin_level", "parent").filter(pk=location_id).first()
+        return self._locations_by_id[location_id]
 
     def bulk_match_locations(
         self,
@@ -371,7 +390,9 @@ class LocationMatcher:
         admin_level: int = None,
         parent_location: Location = None,
     ) -> dict[str, Location | None]:
-        """Match multiple location names efficiently using exact matching only.
+        """Match multiple location names in bulk.
+
+        See ``bulk_match_locations_with_provenance`` for the matching strategy.
 
         Args:
             location_names: List of names to match
@@ -382,16 +403,191 @@ class LocationMatcher:
         Returns:
             Dictionary mapping location names to Location instances
         """
-        results = {}
+        matches = self.bulk_match_locations_with_provenance(location_names, source, admin_level, parent_location)
+        return {name: match.location if match else None for name, match in matches.items()}
+
+    def bulk_match_locations_with_provenance(
+        self,
+        location_names: list[str],
+        source: str = None,
+        admin_level: int = None,
+        parent_location: Location = None,
+    ) -> dict[str, LocationMatch | None]:
+        """Match multiple location names in bulk, reporting how each was matched.
+
+        Names are stripped and deduplicated, and names already resolved in this
+        gazetteer generation are served from the match cache. Exact gazetteer
+        names and codes, Location names and geo_ids are resolved for all
+        remaining names with a handful of ``IN`` queries; only the names left
+        over go through the in-memory gazetteer and name variation indexes. Unlike
+        ``match_location``, an exact match of any tier wins over a fuzzy match.
+
+        Args:
+            location_names: List of names to match
+            source: Data source name
+            admin_level: Expected administrative level
+            parent_location: Parent location for hierarchical matching
+
+        Returns:
+            Dictionary mapping each input name to a LocationMatch, or None if unmatched
+        """
+        self._ensure_current()
+        parent_id = parent_location.id if parent_location else None
 
-        # Pre-load gazetteer data for this source if specified
-        if source and source not in self._gazetteer_cache:
-            self._load_gazetteer_cache(source)
+        resolved: dict[str, LocationMatch | None] = {}
+        pending = []
+        for name in dict.fromkeys((name or "").strip() for name in location_names):
+            if not name:
+                continue
+            cache_key = f"{name}:{source}:{admin_level}:{parent_id}"
+            if cache_key in self._location_cache:
+                location = self._location_cache[cache_key]
+                resolved[name] = self._match_details.get(cache_key) or (LocationMatch(location, "cached", name) if location else None)
+            else:
+                pending.append(name)
+
+        if pending:
+            level = None if admin_level is None else str(admin_level)
+            found = self._bulk_exact_matches(pending, source, level, parent_location)
+            found.update(self._bulk_fuzzy_matches([name for name in pending if name not in found], source, level, parent_location))
+
+            for name in pending:
+                cache_key = f"{name}:{source}:{admin_level}:{parent_id}"
+                match = found.get(name)
+                self._location_cache[cache_key] = match.location if match else None
+                if match:
+                    self._match_details[cache_key] = match
+                resolved[name] = match
+
+            logger.debug(f"Bulk matched {len(found)} of {len(pending)} new location names ({len(resolved) - len(pending)} cached)")
+
+        return {name: resolved.get((name or "").strip()) for name in location_names}
+
+    def _bulk_exact_matches(self, names: list[str], source: str | None, level: str | None, parent_location: Location | None) -> dict[str, LocationMatch]:
+        """Resolve exact gazetteer, code, Location name and geo_id matches for many names.
+
+        Tiers are applied per name in ``match_location`` order: source gazetteer
+        name, source gazetteer code, Location name, geo_id, then other sources'
+        gazetteer names. Ambiguous codes, geo_ids and other-source names are skipped.
+        """
+        lookups = list({name.lower() for name in names})
+        gazetteer = Gazetteer.objects.select_related("location__admin_level", "location__parent")
+        if level is not None:
+            gazetteer = gazetteer.filter(location__admin_level__code=level)
+        if parent_location:
+            gazetteer = gazetteer.filter(location__parent=parent_location)
+
+        by_name: dict[str, list[Gazetteer]] = {}
+        for entry in gazetteer.annotate(lookup=Lower("name")).filter(lookup__in=lookups).order_by("id"):
+            by_name.setdefault(entry.lookup, []).append(entry)
+
+        by_code: dict[str, list[Gazetteer]] = {}
+        if source:
+            for entry in gazetteer.filter(source=source).annotate(lookup=Lower("code")).filter(lookup__in=lookups).order_by("id"):
+                by_code.setdefault(entry.lookup, []).append(entry)
+
+        by_location_name = self._location_name_table(lookups, level, parent_location)
+
+        by_geo_id: dict[str, list[Location]] = {}
+        for location in self._locations_query(level, parent_location).annotate(lookup=Lower("geo_id")).filter(lookup__in=lookups):
+            by_geo_id.setdefault(location.lookup, []).append(location)
+
+        matches = {}
+        for name in names:
+            lookup = name.lower()
+            entries = by_name.get(lookup, [])
+            source_entries = [entry for entry in entries if entry.source == source] if source else []
+            other_entries = [entry for entry in entries if not source or entry.source != source]
+            codes = by_code.get(lookup, [])
+            geo_ids = by_geo_id.get(lookup, [])
+
+            if source_entries:
+                matches[name] = LocationMatch(source_entries[0].location, "gazetteer_exact", source_entries[0].name)
+            elif len(codes) == 1:
+                matches[name] = LocationMatch(codes[0].location, "gazetteer_code", codes[0].code)
+            elif lookup in by_location_name:
+                location = by_location_name[lookup]
+                matches[name] = LocationMatch(location, "location_name", location.name)
+            elif len(geo_ids) == 1:
+                matches[name] = LocationMatch(geo_ids[0], "location_geo_id", geo_ids[0].geo_id)
+            elif len(other_entries) == 1:
+                matches[name] = LocationMatch(other_entries[0].location, "other_gazetteer_exact", other_entries[0].name)
+
+        return matches
+
+    def _bulk_fuzzy_matches(self, names: list[str], source: str | None, level: str | None, parent_location: Location | None) -> dict[str, LocationMatch]:
+        """Match names left over after exact matching.
+
+        Per name: fuzzy match within the source gazetteer, precomputed Location
+        name variation, other sources' gazetteer name variation, then fuzzy
+        match within other sources. Lookups run in memory and all matched
+        locations are loaded with one query.
+        """
+        if not names:
+            return {}
+
+        index = self.gazetteer_index
+        variations = self.variation_index
+        parent_id = parent_location.id if parent_location else None
+
+        hits: dict[str, tuple[str, list[tuple[int, str]]]] = {}
+        for name in names:
+            if source:
+                entry, _ = index.best_match(name, source=source, admin_level=level, parent_id=parent_id, min_similarity=0.8)
+                if entry:
+                    hits[name] = ("gazetteer_fuzzy", [(entry.location_id, entry.name)])
+                    continue
+
+            candidates = variations.lookup(name, admin_level=level, parent_id=parent_id)
+            if candidates:
+                hits[name] = ("name_variation", candidates)
+                continue
 
-        for name in location_names:
-            results[name] = self.match_location(name, source, admin_level, parent_location)
+            candidates = variations.lookup(name, admin_level=level, parent_id=parent_id, gazetteer=True, exclude_source=source or None)
+            if candidates:
+                hits[name] = ("other_gazetteer_variation", candidates[:1])
+                continue
 
-        return results
+            entry, _ = index.best_match(name, exclude_source=source or None, admin_level=level, parent_id=parent_id, min_similarity=0.75)
+            if entry:
+                hits[name] = ("other_gazetteer_fuzzy", [(entry.location_id, entry.name)])
+
+        # Load all matched locations with one query
+        missing = {location_id for _, candidates in hits.values() for location_id, _ in candidates} - set(self._locations_by_id)
+        if missing:
+            self._locations_by_id.update(Location.objects.select_related("admin_level", "parent").in_bulk(missing))
+
+        matches = {}
+        for name, (method, candidates) in hits.items():
+            candidates = [(self._locations_by_id[location_id], matched_name) for location_id, matched_name in candidates if self._locations_by_id.get(location_id)]
+            if candidates:
+                # Prefer more specific locations among variation matches
+                location = self._select_best_match(candidates, name)
+                matches[name] = LocationMatch(location, method, next(matched_name for match, matched_name in candidates if match == location))
+
+        return matches
+
+    def _locations_query(self, level: str | None, parent_location: Location | None):
+        """Locations filtered by admin level code and parent."""
+        locations = Location.objects.select_related("admin_level", "parent")
+        if level is not None:
+            locations = locations.filter(admin_level__code=level)
+        if parent_location:
+            locations = locations.filter(parent=parent_location)
+        return locations
+
+    def _location_name_table(self, lookups, level: str | None, parent_location: Location | None) -> dict[str, Location]:
+        """Map lowercase names to Locations with that English (preferred) or Arabic name, in one query."""
+        lookups = list(lookups)
+        if not lookups:
+            return {}
+
+        english, arabic = {}, {}
+        locations = self._locations_query(level, parent_location).annotate(lookup_en=Lower("name_en"), lookup_ar=Lower("name_ar"))
+        for location in locations.filter(Q(lookup_en__in=lookups) | Q(lookup_ar__in=lookups)):
+            english.setdefault(location.lookup_en, location)
+            arabic.setdefault(location.lookup_ar, location)
+        return {lookup: english.get(lookup) or arabic[lookup] for lookup in lookups if lookup in english or lookup in arabic}
 
     def _exact_gazetteer_match(
         self,
@@ -475,18 +671,6 @@ class LocationMatcher:
                     return parent_matches.first()
             return locations.first()
 
-    def _load_gazetteer_cache(self, source: str):
-        """Load gazetteer data for a source into cache."""
-        self._gazetteer_cache[source] = {}
-
-        entries = Gazetteer.objects.select_related("location", "location__admin_level").filter(source=source)
-
-        for entry in entries:
-            admin_code = entry.location.admin_level.code
-            if admin_code not in self._gazetteer_cache[source]:
-                self._gazetteer_cache[source][admin_code] = []
-            self._gazetteer_cache[source][admin_code].append(entry)
-
     def get_locations_at_level(self, admin_level: int, parent: Location = None) -> list[Location]:
         """Get all locations at a specific administrative level."""
         query = Q(admin_level__code=str(admin_level))
@@ -517,191 +701,15 @@ class LocationMatcher:
 
         return list(locations_query[:limit])
 
-    def _should_rebuild_cache(self) -> bool:
-        """Check if suffix cache needs rebuilding based on data changes."""
-        if not self._cache_timestamp:
-            return True
-            
-        # Check if new locations/gazetteer entries added since last cache
-        cache_age = timezone.now() - self._cache_timestamp
-        
-        # Rebuild cache if it's older than 1 hour and there's new data
-        if cache_age.total_seconds() > 3600:
-            recent_locations = Location.objects.filter(
-                created_at__gt=self._cache_timestamp
-            ).exists()
-            
-            # Check if UnmatchedLocation model exists (might not in all deployments)
-            try:
-                from .models import UnmatchedLocation
-                recent_unmatched = UnmatchedLocation.objects.filter(
-                    first_seen__gt=self._cache_timestamp
-                ).exists()
-            except ImportError:
-                recent_unmatched = False
-            
-            return recent_locations or recent_unmatched
-        
-        return False
-
-    def _pluralize(self, word: str) -> str:
-        """Apply English pluralization rules."""
-        word = word.lower()
-        
-        # Handle common irregular plurals
-        irregular_plurals = {
-            'child': 'children',
-            'person': 'people',
-            'man': 'men',
-            'woman': 'women',
-            'foot': 'feet',
-            'tooth': 'teeth',
-        }
-        
-        if word in irregular_plurals:
-            return irregular_plurals[word]
-        
-        # Standard pluralization rules
-        if word.endswith('s') or word.endswith('ss') or word.endswith('sh') or \
-           word.endswith('ch') or word.endswith('x') or word.endswith('z'):
-            return word + 'es'
-        elif word.endswith('y') and len(word) > 1 and word[-2] not in 'aeiou':
-            return word[:-1] + 'ies'
-        elif word.endswith('f'):
-            return word[:-1] + 'ves'
-        elif word.endswith('fe'):
-            return word[:-2] + 'ves'
-        elif word.endswith('o') and len(word) > 1 and word[-2] not in 'aeiou':
-            return word + 'es'
-        else:
-            return word + 's'
-
-    def _load_suffix_cache(self):
-        """Extract common suffixes from existing location and gazetteer data."""
-        if self._suffix_cache and not self._should_rebuild_cache():
-            return  # Use existing cache
-            
-        logger.debug("Loading suffix cache from database")
-        
-        # Clear existing cache
-        self._suffix_cache.clear()
-        
-        # 1. Extract admin level suffixes from AdmLevel names
-        admin_suffixes = set()
-        try:
-            from .models import AdmLevel
-            for level in AdmLevel.objects.all():
-                level_name = level.name.lower()
-                admin_suffixes.add(f" {level_name}")
-                # Add plural forms with proper English pluralization
-                if not level_name.endswith('s'):
-                    plural = self._pluralize(level_name)
-                    admin_suffixes.add(f" {plural}")
-        except Exception as e:
-            logger.warning(f"Could not load admin level suffixes: {e}")
-        
-        # 2. Extract country suffixes by analyzing existing data patterns
-        country_suffixes = set()
-        try:
-            # Look for patterns in unmatched locations
-            from .models import UnmatchedLocation
-            unmatched_names = UnmatchedLocation.objects.values_list('name', flat=True)
-            
-            for name in unmatched_names:
-                name_lower = name.lower()
-                # Look for ", countryname" patterns
-                if ', ' in name_lower:
-                    potential_country = name_lower.split(', ')[-1].strip()
-                    # Countries are usually 1-2 words
-                    if len(potential_country.split()) <= 2:
-                        country_suffixes.add(f", {potential_country}")
-        except ImportError:
-            # UnmatchedLocation model might not exist in all deployments
-            logger.debug("UnmatchedLocation model not available, skipping country suffix detection")
-        except Exception as e:
-            logger.warning(f"Could not analyze unmatched locations: {e}")
-        
-        # 3. Extract geographic suffixes from location names
-        geographic_suffixes = set()
-        try:
-            all_names = list(Location.objects.values_list('name', flat=True))
-            all_names.extend(Gazetteer.objects.values_list('name', flat=True))
-            
-            # Common geographic terms that might be suffixes
-            common_geo_terms = {
-                'city', 'town', 'village', 'district', 'area', 'zone',
-                'province', 'region', 'territory', 'division', 'department'
-            }
-            
-            for name in all_names:
-                words = name.lower().split()
-                if len(words) > 1 and words[-1] in common_geo_terms:
-                    geographic_suffixes.add(f" {words[-1]}")
-        except Exception as e:
-            logger.warning(f"Could not extract geographic suffixes: {e}")
-        
-        # Store in cache by category
-        self._suffix_cache['admin'] = admin_suffixes
-        self._suffix_cache['country'] = country_suffixes  
-        self._suffix_cache['geographic'] = geographic_suffixes
-        
-        # Create combined list for quick access
-        self._suffix_cache['all'] = admin_suffixes | country_suffixes | geographic_suffixes
-        
-        # Load prefix cache as well
-        self._load_prefix_cache()
-        
-        # Update timestamp
-        self._cache_timestamp = timezone.now()
-        
-        logger.debug(f"Loaded {len(self._suffix_cache['all'])} suffixes: admin={len(admin_suffixes)}, country={len(country_suffixes)}, geographic={len(geographic_suffixes)}")
-
-    def _load_prefix_cache(self):
-        """Extract common prefixes from existing location data."""
-        try:
-            # Get all location names
-            all_names = list(Location.objects.values_list('name', flat=True))
-            all_names.extend(Gazetteer.objects.values_list('name', flat=True))
-            
-            # Look for common directional and article prefixes
-            potential_prefixes = {'al ', 'el ', 'the ', 'north ', 'south ', 'east ', 'west ', 'central ', 'upper ', 'lower '}
-            
-            self._prefix_cache.clear()
-            for name in all_names:
-                name_lower = name.lower()
-                for prefix in potential_prefixes:
-                    if name_lower.startswith(prefix):
-                        self._prefix_cache.add(prefix)
-            
-            logger.debug(f"Loaded {len(self._prefix_cache)} prefixes from database")
-        except Exception as e:
-            logger.warning(f"Could not load prefix cache: {e}")
-
-    def _add_prefix_variations(self, location_name: str, variations: list[str]):
-        """Add prefix variations based on existing location patterns."""
-        base_name = location_name.lower()
-        
-        # If no prefix exists, try adding common ones found in database
-        has_prefix = any(base_name.startswith(prefix) for prefix in self._prefix_cache)
-        if not has_prefix:
-            for prefix in self._prefix_cache:
-                prefixed_name = f"{prefix.title()}{location_name}"
-                variations.append(prefixed_name)
-        
-        # If prefix exists, try removing it
-        for prefix in self._prefix_cache:
-            if base_name.startswith(prefix):
-                clean_name = location_name[len(prefix):].strip()
-                if clean_name:
-                    variations.append(clean_name)
-
     def clear_cache(self):
         """Clear internal caches."""
         self._location_cache.clear()
-        self._gazetteer_cache.clear()
-        self._suffix_cache.clear()
-        self._prefix_cache.clear()
-        self._cache_timestamp = None
+        self._match_details.clear()
+        self._locations_by_id.clear()
+        self._code_tables.clear()
+        self._gazetteer_index = None
+        self._variation_index = None
+        self._generation = None
 
 
 # Global instance for easy access
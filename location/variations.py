@@ -0,0 +1,314 @@
+"""Precomputed name variations for exact location lookups.
+
+Location and Gazetteer names are reduced to a canonical variation: lowercase,
+without diacritics or punctuation, with common Arabic spelling and
+transliteration differences folded, and without leading articles or trailing
+administrative/geographic terms (e.g. "El-Fasher City" and "Al Fasher" both
+become "fasher"). Variations are stored in ``NameVariation`` and loaded into
+a ``NameVariationIndex``, so matching a name variation is a few dictionary
+probes instead of generated strings each hitting the database.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from django.db import DatabaseError, transaction
+
+from .models import AdmLevel, Gazetteer, Location, NameVariation
+
+logger = logging.getLogger(__name__)
+
+# Trailing terms dropped from names (admin level names are added from the database)
+GEOGRAPHIC_TERMS = ("city", "town", "village", "district", "area", "zone", "province", "region", "territory", "division", "department")
+
+# Leading articles dropped from names
+ARTICLES = ("al", "el", "the")
+ARABIC_ARTICLE = "ال"
+
+# Arabic letter variants folded to one form, and diacritics (tashkeel) and tatweel removed
+ARABIC_LETTERS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه"})
+ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+
+# Romanisations of the same Arabic sound (applied before doubled letters are collapsed)
+TRANSLITERATIONS = (("ou", "u"), ("oo", "u"), ("ee", "i"))
+
+PUNCTUATION = re.compile(r"[^\w\s]|_")
+DOUBLED_LETTERS = re.compile(r"(\w)\1+")
+
+
+def pluralize(word: str) -> str:
+    """Apply English pluralization rules."""
+    word = word.lower()
+
+    # Handle common irregular plurals
+    irregular_plurals = {
+        "child": "children",
+        "person": "people",
+        "man": "men",
+        "woman": "women",
+        "foot": "feet",
+        "tooth": "teeth",
+    }
+
+    if word in irregular_plurals:
+        return irregular_plurals[word]
+
+    # Standard pluralization rules
+    if word.endswith(("s", "sh", "ch", "x", "z")):
+        return word + "es"
+    elif word.endswith("y") and len(word) > 1 and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    elif word.endswith("fe"):
+        return word[:-2] + "ves"
+    elif word.endswith("f"):
+        return word[:-1] + "ves"
+    elif word.endswith("o") and len(word) > 1 and word[-2] not in "aeiou":
+        return word + "es"
+    else:
+        return word + "s"
+
+
+def normalize_variation(name: str) -> str:
+    """Normalise spelling: lowercase, no diacritics or punctuation, folded Arabic letters and transliterations."""
+    name = unicodedata.normalize("NFKD", (name or "").lower())
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    name = ARABIC_MARKS.sub("", name.translate(ARABIC_LETTERS))
+    name = PUNCTUATION.sub(" ", name)
+
+    words = []
+    for word in name.split():
+        for spelling, replacement in TRANSLITERATIONS:
+            word = word.replace(spelling, replacement)
+        word = DOUBLED_LETTERS.sub(r"\1", word)
+        if len(word) > 3 and word.endswith("ah"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def variation_suffixes(admin_level_names) -> list[tuple[str, ...]]:
+    """Normalised trailing terms (singular and plural), longest first."""
+    terms = {*admin_level_names, *GEOGRAPHIC_TERMS}
+    suffixes = {tuple(normalize_variation(form).split()) for term in terms if term for form in (term, pluralize(term))}
+    return sorted((suffix for suffix in suffixes if suffix), key=len, reverse=True)
+
+
+def load_variation_suffixes() -> list[tuple[str, ...]]:
+    """Trailing terms for the current admin levels."""
+    return variation_suffixes(AdmLevel.objects.values_list("name", flat=True))
+
+
+def canonical_name(name: str, suffixes: list[tuple[str, ...]]) -> str:
+    """Reduce a name to its canonical variation.
+
+    Args:
+        name: Location name
+        suffixes: Trailing terms from ``variation_suffixes``
+
+    Returns:
+        str: Canonical variation, empty if nothing is left
+    """
+    words = normalize_variation(name).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    if words and words[0].startswith(ARABIC_ARTICLE) and len(words[0]) > len(ARABIC_ARTICLE) + 1:
+        words[0] = words[0][len(ARABIC_ARTICLE) :]
+
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in suffixes:
+            if len(words) > len(suffix) and tuple(words[-len(suffix) :]) == suffix:
+                words = words[: -len(suffix)]
+                stripped = True
+                break
+    return " ".join(words)
+
+
+def name_forms(name: str) -> list[str]:
+    """A name followed by its comma-separated parts and adjacent pairs of parts.
+
+    "Al Fasher, North Darfur State, Sudan" also yields "Al Fasher", "North
+    Darfur State", "Sudan", "Al Fasher North Darfur State" and "North Darfur
+    State Sudan".
+    """
+    forms = [name]
+    parts = [part.strip() for part in name.split(",") if part.strip()]
+    if len(parts) > 1:
+        forms.extend(part for part in parts if len(part) > 2)
+        forms.extend(" ".join(parts[i : i + 2]) for i in range(len(parts) - 1))
+    return forms
+
+
+def canonical_variations(names, suffixes: list[tuple[str, ...]]) -> dict[tuple[int, str, str], str]:
+    """Canonical variations of (location_id, source, name) triples.
+
+    Returns:
+        dict: Name each (location_id, source, variation) was first derived from
+    """
+    variations = {}
+    for location_id, source, name in names:
+        variation = canonical_name(name, suffixes)
+        if variation:
+            variations.setdefault((location_id, source, variation[:255]), name)
+    return variations
+
+
+def variation_rows(location_ids=None, suffixes: list[tuple[str, ...]] | None = None) -> list[NameVariation]:
+    """Compute the name variations of locations and their gazetteer entries.
+
+    Args:
+        location_ids: Only these locations (all if None)
+        suffixes: Trailing terms (loaded from the admin levels if None)
+
+    Returns:
+        list: Unsaved NameVariation rows, one per location, source and variation
+    """
+    if suffixes is None:
+        suffixes = load_variation_suffixes()
+
+    locations = Location.objects.all()
+    gazetteer = Gazetteer.objects.all()
+    if location_ids is not None:
+        locations = locations.filter(pk__in=location_ids)
+        gazetteer = gazetteer.filter(location_id__in=location_ids)
+
+    names = [(pk, "", name) for pk, name_en, name_ar in locations.values_list("id", "name_en", "name_ar") for name in (name_en, name_ar) if name]
+    names.extend(gazetteer.values_list("location_id", "source", "name"))
+
+    return [
+        NameVariation(location_id=location_id, source=source, variation=variation, name=name)
+        for (location_id, source, variation), name in canonical_variations(names, suffixes).items()
+    ]
+
+
+def rebuild_name_variations(location_ids=None) -> int:
+    """Replace the stored name variations of locations (all if None).
+
+    Returns:
+        int: Number of variations stored
+    """
+    rows = variation_rows(location_ids)
+    with transaction.atomic():
+        existing = NameVariation.objects.all()
+        if location_ids is not None:
+            existing = existing.filter(location_id__in=location_ids)
+        existing.delete()
+        NameVariation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+@dataclass(frozen=True)
+class VariationEntry:
+    """Lightweight name variation held by the index."""
+
+    location_id: int
+    source: str
+    admin_level_code: str
+    parent_id: int | None
+
+
+class NameVariationIndex:
+    """In-process index of the stored name variations.
+
+    Built from a single query. If no variations have been stored yet (e.g.
+    before ``rebuild_name_variations`` first ran), they are computed in memory
+    instead.
+
+    Usage:
+        index = NameVariationIndex.build()
+        for location_id, form in index.lookup("Al Fasher, North Darfur State, Sudan"):
+            ...
+    """
+
+    def __init__(self, entries: dict[str, list[VariationEntry]], suffixes: list[tuple[str, ...]]):
+        """Initialize index.
+
+        Args:
+            entries: Variation to entries
+            suffixes: Trailing terms the variations were computed with
+        """
+        self.entries = entries
+        self.suffixes = suffixes
+
+    @classmethod
+    def build(cls) -> "NameVariationIndex":
+        """Build the index from the stored variations, computing them in memory while none are stored."""
+        suffixes = load_variation_suffixes()
+        try:
+            with transaction.atomic():
+                rows = list(NameVariation.objects.values_list("variation", "location_id", "source", "location__admin_level__code", "location__parent_id"))
+        except DatabaseError as e:
+            logger.warning(f"Could not read stored name variations: {e}")
+            rows = []
+
+        if not rows and Location.objects.exists():
+            logger.warning("No stored name variations, computing them in memory (run rebuild_name_variations)")
+            levels = dict(Location.objects.values_list("id", "admin_level__code"))
+            parents = dict(Location.objects.values_list("id", "parent_id"))
+            rows = [(row.variation, row.location_id, row.source, levels.get(row.location_id), parents.get(row.location_id)) for row in variation_rows(suffixes=suffixes)]
+
+        entries: dict[str, list[VariationEntry]] = {}
+        for variation, location_id, source, admin_level_code, parent_id in rows:
+            entries.setdefault(variation, []).append(VariationEntry(location_id, source, admin_level_code, parent_id))
+        logger.debug(f"Built name variation index with {len(rows)} variations")
+        return cls(entries, suffixes)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def lookup(
+        self,
+        name: str,
+        admin_level=None,
+        parent_id: int | None = None,
+        gazetteer: bool = False,
+        exclude_source: str | None = None,
+    ) -> list[tuple[int, str]]:
+        """Find locations having a variation of the name or of one of its comma-separated parts.
+
+        Args:
+            name: Name to look up
+            admin_level: Only locations with this admin level code
+            parent_id: Only locations with this parent
+            gazetteer: Look up gazetteer name variations instead of Location names
+            exclude_source: Exclude gazetteer variations of this source
+
+        Returns:
+            list: (location_id, name form) pairs, one per location, in form order
+        """
+        matches = {}
+        for form in name_forms(name):
+            for entry in self.entries.get(canonical_name(form, self.suffixes), ()):
+                if entry.location_id in matches or bool(entry.source) != gazetteer:
+                    continue
+                if exclude_source is not None and entry.source == exclude_source:
+                    continue
+                if admin_level is not None and entry.admin_level_code != str(admin_level):
+                    continue
+                if parent_id is not None and entry.parent_id != parent_id:
+                    continue
+                matches[entry.location_id] = form
+        return list(matches.items())
+
+
+def update_name_variations_signal_handler(sender, instance, raw=False, **kwargs):
+    """Recompute the name variations of a saved location or gazetteer entry.
+
+    Connect this to Location and Gazetteer post_save signals. Fixture loading
+    (``raw``) is skipped; run ``rebuild_name_variations`` afterwards.
+    """
+    if raw:
+        return
+    rebuild_name_variations([instance.location_id if isinstance(instance, Gazetteer) else instance.pk])
+
+
+def delete_name_variations_signal_handler(sender, instance, **kwargs):
+    """Drop the variations of a deleted gazetteer entry.
+
+    Connect this to the Gazetteer post_delete signal. Only the entry's own rows
+    are deleted (no rebuild), so cascading deletes of a location stay valid.
+    """
+    NameVariation.objects.filter(location_id=instance.location_id, source=instance.source, name=instance.name).delete()
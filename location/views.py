@@ -17,6 +17,8 @@ from django.views.generic import CreateView, DeleteView, DetailView, ListView, U
 
 from .forms import GazetteerForm, LocationForm
 from .models import AdmLevel, Gazetteer, Location, UnmatchedLocation
+from .similarity import rank_location_candidates, trigram_search_enabled
+from .simplification import resolve_detail
 from .utils import location_matcher
 
 # =============================================================================
@@ -447,18 +449,21 @@ def bulk_match_locations_api(request):
             except Location.DoesNotExist:
                 return JsonResponse({"success": False, "error": f"Parent location with id {parent_id} not found"}, status=400)
 
-        # Perform bulk matching
-        results = location_matcher.bulk_match_locations(location_names=location_names, source=source, admin_level=admin_level, parent_location=parent_location)
+        # Perform bulk matching (exact matches in bulk, fuzzy matching only for the rest)
+        results = location_matcher.bulk_match_locations_with_provenance(location_names=location_names, source=source, admin_level=admin_level, parent_location=parent_location)
 
         # Serialize results
         serialized_results = {}
-        for name, location in results.items():
-            if location:
+        for name, match in results.items():
+            if match:
+                location = match.location
                 serialized_results[name] = {
                     "id": location.id,
                     "geo_id": location.geo_id,
                     "name": location.name,
                     "admin_level": {"code": location.admin_level.code, "name": location.admin_level.name},
+                    "match_method": match.method,
+                    "matched_name": match.matched_name,
                 }
             else:
                 serialized_results[name] = None
@@ -530,17 +535,26 @@ def location_browser_view(request):
 @require_http_methods(["GET"])
 @login_required
 def browser_locations_api(request):
-    """API endpoint for location browser - returns locations with GeoJSON boundaries."""
+    """API endpoint for location browser - returns locations with GeoJSON boundaries.
+
+    Boundaries are simplified to the level of detail given by the ``detail``
+    parameter (low, medium, high, analysis or full) or by the map ``zoom``
+    level, and to the medium level otherwise.
+    """
     try:
         admin_level_code = request.GET.get("admin_level", "0")
         parent_id = request.GET.get("parent_id")
+        try:
+            detail = resolve_detail(request.GET.get("detail"), request.GET.get("zoom"))
+        except ValueError:
+            return JsonResponse({"success": False, "error": "Invalid detail or zoom parameter"}, status=400)
 
         query = Q(admin_level__code=admin_level_code)
 
         if parent_id:
             query &= Q(parent_id=parent_id)
 
-        locations = Location.objects.filter(query).select_related("admin_level", "parent").prefetch_related("children").order_by("name")
+        locations = Location.objects.filter(query).with_boundary(detail).select_related("admin_level", "parent").prefetch_related("children").order_by("name")
 
         features = []
         for location in locations:
@@ -553,8 +567,8 @@ def browser_locations_api(request):
                 "has_children": location.children.exists(),
             }
 
-            if location.boundary:
-                feature = {"type": "Feature", "properties": properties, "geometry": json.loads(location.boundary.geojson)}
+            if location.display_boundary:
+                feature = {"type": "Feature", "properties": properties, "geometry": json.loads(location.display_boundary.geojson)}
             elif location.point:
                 feature = {"type": "Feature", "properties": properties, "geometry": json.loads(location.point.geojson)}
             else:
@@ -917,6 +931,31 @@ def location_search_api(request):
                     }
                 )
 
+        # Top up with fuzzy (misspelt) matches when the database can rank them with pg_trgm
+        if len(results) < limit and trigram_search_enabled():
+            seen = {r["id"] for r in results}
+            fuzzy_matches = [m for m in rank_location_candidates(query, limit=limit) if m["location_id"] not in seen][: limit - len(results)]
+            fuzzy_locations = Location.objects.select_related("admin_level", "parent").in_bulk([m["location_id"] for m in fuzzy_matches])
+
+            for match in fuzzy_matches:
+                location = fuzzy_locations[match["location_id"]]
+                hierarchy = location.get_full_hierarchy()
+                hierarchy_text = " > ".join([loc.name for loc in hierarchy])
+
+                results.append(
+                    {
+                        "id": location.id,
+                        "geo_id": location.geo_id,
+                        "name": location.name,
+                        "name_ar": getattr(location, "name_ar", ""),
+                        "admin_level": {"code": location.admin_level.code, "name": location.admin_level.name},
+                        "hierarchy_text": hierarchy_text,
+                        "match_type": "fuzzy",
+                        "matched_name": match["matched_name"],
+                        "similarity_score": match["similarity_score"],
+                    }
+                )
+
         return JsonResponse({"success": True, "results": results, "query": query, "total_found": len(results)})
 
     except ValueError:
@@ -73,6 +73,10 @@ fixtures=(
 for fixture in "${fixtures[@]}"; do
     uv run python manage.py loaddata "$fixture"
 done
+# loaddata bypasses Location.save() and signals, so materialise the location hierarchy, name variations and simplified boundaries afterwards
+uv run python manage.py rebuild_location_paths
+uv run python manage.py rebuild_name_variations
+uv run python manage.py simplify_boundaries
 # load compressed variabledata fixture
 # gzip -dc data_pipeline/fixtures/data_pipeline.variabledata.json.gz | uv run python manage.py loaddata -
 